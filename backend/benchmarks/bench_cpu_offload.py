@@ -0,0 +1,108 @@
+"""Benchmark: p99 inter-token latency of concurrent streams under mixed CPU load.
+
+Runs ``--streams`` fake token streams (one token every ``--tick`` ms) on one
+event loop while a mixed load repeatedly post-processes large vocabulary
+outputs (normalize + parse) and decodes 10MB base64 images through
+``run_cpu``. The gaps between consecutive tokens of every stream are
+collected and reported for three placements of the CPU work:
+
+- ``inline``: on the event loop (the previous behaviour)
+- ``thread``: CPU_EXECUTOR=thread
+- ``process``: CPU_EXECUTOR=process
+
+Usage:
+    cd backend
+    uv run python benchmarks/bench_cpu_offload.py [--streams 20] [--seconds 5] [--tick 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import time
+
+from tutor.agents.vocabulary import _build_vocabulary_result
+from tutor.config import get_settings
+from tutor.services.executor import run_cpu, shutdown_cpu_executor
+from tutor.services.image import decode_image
+
+_ENTRY = (
+    "## {word}\n\n**Definition:** a word used in the passage ({i}).\n\n"
+    "**Example:** *The {word} was used in a sentence.*\n\n---\n\n"
+)
+
+
+def _vocabulary_output(words: int) -> str:
+    return "".join(_ENTRY.format(word=f"word{i}", i=i) for i in range(words))
+
+
+async def _stream(tick: float, stop: float, gaps: list[float]) -> None:
+    last = time.perf_counter()
+    while last < stop:
+        await asyncio.sleep(tick)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def _load(stop: float, vocab: str, image: str) -> int:
+    jobs = 0
+    while time.perf_counter() < stop:
+        await run_cpu(_build_vocabulary_result, vocab, size=len(vocab))
+        await run_cpu(decode_image, image, "image/jpeg", size=len(image))
+        jobs += 2
+        await asyncio.sleep(0)
+    return jobs
+
+
+async def _run(streams: int, seconds: float, tick: float, vocab: str, image: str):
+    stop = time.perf_counter() + seconds
+    gaps: list[float] = []
+    results = await asyncio.gather(
+        _load(stop, vocab, image),
+        *(_stream(tick, stop, gaps) for _ in range(streams)),
+    )
+    return gaps, results[0]
+
+
+def _configure(mode: str) -> None:
+    settings = get_settings()
+    shutdown_cpu_executor()
+    if mode == "inline":
+        settings.CPU_INLINE_MAX_MS = float("inf")
+        settings.CPU_INLINE_MAX_SIZE = 2**62
+    else:
+        settings.CPU_EXECUTOR = mode
+        settings.CPU_INLINE_MAX_MS = 0.0
+        settings.CPU_INLINE_MAX_SIZE = 0
+
+
+def main(streams: int, seconds: float, tick_ms: float) -> None:
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    vocab = _vocabulary_output(400)
+    raw = b"\xff\xd8\xff\xe0" + os.urandom(10 * 1024 * 1024 - 4)
+    image = base64.b64encode(raw).decode("ascii")
+
+    print(f"{streams} streams, token every {tick_ms} ms, {seconds} s per mode")
+    print(f"{'mode':<8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'jobs':>6}")
+    for mode in ("inline", "thread", "process"):
+        _configure(mode)
+        gaps, jobs = asyncio.run(_run(streams, seconds, tick_ms / 1000, vocab, image))
+        shutdown_cpu_executor()
+        q = statistics.quantiles(gaps, n=100)
+        print(
+            f"{mode:<8} {q[49] * 1000:>8.2f} {q[98] * 1000:>8.2f} "
+            f"{max(gaps) * 1000:>8.2f} {jobs:>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--tick", type=float, default=5.0, help="ms between tokens")
+    args = parser.parse_args()
+    main(args.streams, args.seconds, args.tick)
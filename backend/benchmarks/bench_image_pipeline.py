@@ -0,0 +1,154 @@
+"""Benchmark: event-loop CPU per image request, LangGraph path vs direct path.
+
+Compares the CPU time the event loop spends orchestrating one analyze-image
+request when OCR and supervisor run through ``graph.astream_events`` (the
+previous implementation) versus the direct OCR-then-analyze pipeline in
+``tutor.routers.tutor._stream_image_events``.
+
+All LLM-backed nodes are replaced with stubs that return immediately, so the
+measured time is orchestration overhead only (event creation, filtering,
+queues, SSE formatting).
+
+Usage:
+    cd backend
+    uv run python benchmarks/bench_image_pipeline.py [--requests 200] [--tokens 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+from tutor import graph as graph_module  # noqa: E402
+from tutor.routers import tutor as tutor_router  # noqa: E402
+from tutor.schemas import (  # noqa: E402
+    GrammarResult,
+    ReadingResult,
+    SupervisorAnalysis,
+    VocabularyResult,
+)
+
+EXTRACTED_TEXT = "The quick brown fox jumps over the lazy dog. " * 10
+
+
+async def _stub_image_processor(state):
+    return {"extracted_text": EXTRACTED_TEXT, "input_text": EXTRACTED_TEXT, "task_type": "analyze"}
+
+
+async def _stub_supervisor(state):
+    if state.get("task_type") not in ("analyze", "image_process") or not state.get("input_text"):
+        return {}
+    return {"supervisor_analysis": SupervisorAnalysis()}
+
+
+def _make_agent(result_key: str, result, tokens: int):
+    async def _agent(state, token_queue=None):
+        if token_queue is not None:
+            for i in range(tokens):
+                await token_queue.put(f"t{i} ")
+            await token_queue.put(None)
+        return {result_key: result}
+
+    return _agent
+
+
+async def _graph_path(graph, input_state: dict, session_id: str):
+    """Previous implementation: LangGraph events for OCR + supervisor."""
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _producer() -> None:
+        async for event in graph.astream_events(
+            input_state, version="v2", config={"recursion_limit": 50}
+        ):
+            await queue.put(event)
+        await queue.put(None)
+
+    task = asyncio.create_task(_producer())
+    extracted_text = ""
+    supervisor_analysis = None
+    while (event := await queue.get()) is not None:
+        if event["event"] == "on_chain_end" and event.get("name") == "image_processor":
+            extracted_text = event.get("data", {}).get("output", {}).get("extracted_text", "")
+        if event["event"] == "on_chain_end" and event.get("name") == "supervisor":
+            analysis = event.get("data", {}).get("output", {}).get("supervisor_analysis")
+            if analysis is not None:
+                supervisor_analysis = analysis
+    await task
+
+    analyze_state = {
+        **input_state,
+        "input_text": extracted_text,
+        "task_type": "analyze",
+        "supervisor_analysis": supervisor_analysis,
+    }
+    async for frame in tutor_router._stream_analyze_events(analyze_state, session_id):
+        yield frame
+
+
+async def _run(label: str, stream_factory, requests: int) -> tuple[str, list[float], float]:
+    samples = []
+    wall_start = time.perf_counter()
+    for i in range(requests):
+        input_state = {
+            "messages": [],
+            "level": 3,
+            "session_id": f"bench-{i}",
+            "input_text": "",
+            "task_type": "image_process",
+            "image_data": "aGVsbG8=",
+            "mime_type": "image/png",
+        }
+        cpu_start = time.process_time()
+        async for _ in stream_factory(input_state, f"bench-{i}"):
+            pass
+        samples.append((time.process_time() - cpu_start) * 1000)
+    return label, samples, time.perf_counter() - wall_start
+
+
+async def main(requests: int, tokens: int) -> None:
+    agents = {
+        "reading_node": _make_agent("reading_result", ReadingResult(content="r"), tokens),
+        "grammar_node": _make_agent("grammar_result", GrammarResult(content="g"), tokens),
+        "vocabulary_node": _make_agent("vocabulary_result", VocabularyResult(), tokens),
+    }
+    with (
+        patch.object(graph_module, "image_processor_node", _stub_image_processor),
+        patch.object(graph_module, "supervisor_node", _stub_supervisor),
+        patch.object(tutor_router, "image_processor_node", _stub_image_processor),
+        patch.object(tutor_router, "supervisor_node", _stub_supervisor),
+        patch.multiple(tutor_router, **agents),
+    ):
+        graph = graph_module.create_graph()
+
+        # Warm up both paths once so import/compile costs are excluded
+        await _run("warmup", lambda s, sid: _graph_path(graph, s, sid), 3)
+        await _run("warmup", tutor_router._stream_image_events, 3)
+
+        results = [
+            await _run("langgraph", lambda s, sid: _graph_path(graph, s, sid), requests),
+            await _run("direct", tutor_router._stream_image_events, requests),
+        ]
+
+    print(f"requests={requests} tokens_per_agent={tokens}")
+    print(f"{'path':<10} {'cpu mean ms':>12} {'cpu p50 ms':>11} {'cpu p99 ms':>11} {'wall s':>8}")
+    for label, samples, wall in results:
+        ordered = sorted(samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(
+            f"{label:<10} {statistics.mean(samples):>12.3f} "
+            f"{statistics.median(samples):>11.3f} {p99:>11.3f} {wall:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.tokens))
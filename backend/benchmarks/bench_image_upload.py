@@ -0,0 +1,134 @@
+"""Benchmark: server peak RSS for concurrent image uploads, base64 JSON vs binary.
+
+Starts the API in a child process (uvicorn, OCR stubbed to hold each image
+for a moment so uploads overlap), fires N concurrent 10 MB uploads at either
+``/tutor/analyze-image`` (base64 JSON) or ``/tutor/analyze-image/upload``
+(multipart), and reports the server's peak resident set size (VmHWM).
+
+Linux only (reads /proc/<pid>/status).
+
+Usage:
+    cd backend
+    uv run python benchmarks/bench_image_upload.py [--clients 50] [--size-mb 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+_OCR_HOLD_SECONDS = 0.5
+
+
+def _serve(port: int) -> None:
+    """Child process: run the app with OCR replaced by a short sleep."""
+    from unittest.mock import patch
+
+    import uvicorn
+
+    async def stub_ocr(state, token_queue=None):
+        await asyncio.sleep(_OCR_HOLD_SECONDS)
+        if token_queue is not None:
+            await token_queue.put(None)
+        return {"extracted_text": "", "input_text": ""}
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    with patch("tutor.routers.tutor.image_processor_node", stub_ocr):
+        from tutor.main import create_app
+
+        uvicorn.run(create_app(), host="127.0.0.1", port=port, log_level="warning")
+
+
+def _rss_mb(pid: int, field: str) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _run_clients(port: int, mode: str, image: bytes, clients: int) -> float:
+    base = f"http://127.0.0.1:{port}/api/v1"
+    if mode == "json":
+        # Encode once; every client sends the same body
+        body = json.dumps(
+            {"image_data": base64.b64encode(image).decode(), "mime_type": "image/jpeg", "level": 3}
+        ).encode()
+        url, headers = f"{base}/tutor/analyze-image", {"Content-Type": "application/json"}
+    else:
+        boundary = "benchboundary"
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="p.jpg"\r\n'
+            "Content-Type: image/jpeg\r\n\r\n".encode()
+            + image
+            + f'\r\n--{boundary}\r\nContent-Disposition: form-data; name="level"\r\n\r\n3\r\n'
+            f"--{boundary}--\r\n".encode()
+        )
+        url = f"{base}/tutor/analyze-image/upload"
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+    async with httpx.AsyncClient(timeout=120) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post(url, content=body, headers=headers) for _ in range(clients))
+        )
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses), {r.status_code for r in responses}
+    return elapsed
+
+
+def _wait_ready(port: int) -> None:
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/v1/health", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def main(clients: int, size_mb: int) -> None:
+    image = b"\xff\xd8\xff\xe0" + os.urandom(size_mb * 1024 * 1024 - 4)
+    print(f"{clients} concurrent uploads of {size_mb} MB")
+    print(f"{'mode':<10} {'idle MB':>8} {'peak MB':>8} {'per upload MB':>14} {'wall s':>7}")
+    for mode in ("json", "multipart"):
+        port = _free_port()
+        server = subprocess.Popen([sys.executable, __file__, "--serve", str(port)])
+        try:
+            _wait_ready(port)
+            idle = _rss_mb(server.pid, "VmRSS")
+            elapsed = asyncio.run(_run_clients(port, mode, image, clients))
+            peak = _rss_mb(server.pid, "VmHWM")
+        finally:
+            server.terminate()
+            server.wait()
+        print(
+            f"{mode:<10} {idle:>8.0f} {peak:>8.0f} {(peak - idle) / clients:>14.1f} {elapsed:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--size-mb", type=int, default=10)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        _serve(args.serve)
+    else:
+        main(args.clients, args.size_mb)
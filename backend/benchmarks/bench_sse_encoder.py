@@ -0,0 +1,98 @@
+"""Benchmark: SSE frames per second, str formatters vs the bytes encoder.
+
+Encodes a stream of short LLM-style tokens (English and Korean) as
+``reading_token`` events with the ``format_*`` functions of
+``tutor.services.streaming`` (plus the UTF-8 encoding the response applies
+to every str chunk) and with ``SSEEncoder``, using the stdlib JSON encoder
+and orjson. Also compares sending a burst of frames one ASGI message at a
+time with joining them into a single chunk.
+
+Usage:
+    cd backend
+    uv run python benchmarks/bench_sse_encoder.py [--frames 200000] [--burst 64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from tutor.services.streaming import (
+    SSEEncoder,
+    format_reading_token,
+    format_section_done,
+    orjson,
+)
+
+_TOKENS = [" the", " quick", " fox", "문장", " 해석", "\n\n", "###", " 1", " /", " 읽기"]
+
+
+def _stdlib_dumps(data: object) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _rate(fn, tokens: list[str]) -> float:
+    start = time.perf_counter()
+    for token in tokens:
+        fn(token)
+    return len(tokens) / (time.perf_counter() - start)
+
+
+def main(frames: int, burst: int) -> None:
+    tokens = [_TOKENS[i % len(_TOKENS)] for i in range(frames)]
+    stdlib = SSEEncoder(dumps=_stdlib_dumps)
+    candidates = {
+        "format_reading_token + encode": lambda t: format_reading_token(t).encode(),
+        "SSEEncoder.token (stdlib json)": lambda t: stdlib.token("reading", t),
+    }
+    if orjson is not None:
+        fast = SSEEncoder()
+        candidates["SSEEncoder.token (orjson)"] = lambda t: fast.token("reading", t)
+
+    print(f"{'token frames':<32} {'frames/s':>12} {'speedup':>8}")
+    baseline = None
+    for label, fn in candidates.items():
+        rate = max(_rate(fn, tokens) for _ in range(3))
+        baseline = baseline or rate
+        print(f"{label:<32} {rate:>12,.0f} {rate / baseline:>7.1f}x")
+
+    encoder = SSEEncoder()
+    done = max(_rate(lambda _: format_section_done("reading").encode(), tokens) for _ in range(3))
+    cached = max(_rate(lambda _: encoder.section_done("reading"), tokens) for _ in range(3))
+    print(f"{'format_section_done + encode':<32} {done:>12,.0f} {1.0:>7.1f}x")
+    print(f"{'SSEEncoder.section_done':<32} {cached:>12,.0f} {cached / done:>7.1f}x")
+
+    bursts = [
+        [encoder.token("reading", t) for t in tokens[i : i + burst]]
+        for i in range(0, frames, burst)
+    ]
+    separate = asyncio.run(_send_all(frame for chunk in bursts for frame in chunk))
+    joined = asyncio.run(_send_all(SSEEncoder.join(chunk) for chunk in bursts))
+    print(
+        f"\nbursts of {burst} frames: {frames:,} ASGI sends in {separate * 1e3:.1f} ms, "
+        f"{len(bursts):,} joined sends in {joined * 1e3:.1f} ms"
+    )
+
+
+async def _send_all(chunks) -> float:
+    """Time awaiting one ASGI body message per chunk, as StreamingResponse does."""
+    sent = 0
+
+    async def send(message: dict) -> None:
+        nonlocal sent
+        sent += len(message["body"])
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200_000)
+    parser.add_argument("--burst", type=int, default=64)
+    args = parser.parse_args()
+    main(args.frames, args.burst)
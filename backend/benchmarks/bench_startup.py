@@ -0,0 +1,100 @@
+"""Benchmark: cold-start time to first healthy response, with an import-time profile.
+
+Starts the API with uvicorn in a fresh interpreter N times and measures the
+wall time from process spawn until ``GET /api/v1/health`` first returns 200.
+Then runs ``python -X importtime -c "import tutor.main"`` and prints the
+modules with the largest cumulative import time.
+
+``--src`` points at another source tree (e.g. a ``git worktree`` of an older
+commit) to compare before/after.
+
+Usage:
+    cd backend
+    uv run python benchmarks/bench_startup.py [--runs 5] [--top 15] [--src src]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _env(src: Path) -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": str(src), "OPENAI_API_KEY": "bench"}
+
+
+def time_to_healthy(src: Path) -> float:
+    """Spawn uvicorn and return seconds until the health check first succeeds."""
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "tutor.main:app", "--port", str(port),
+         "--log-level", "warning"],
+        env=_env(src),
+    )
+    try:
+        while time.perf_counter() - start < 120:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/api/v1/health", timeout=1).is_success:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError("server did not become healthy within 120 s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def import_profile(src: Path, top: int) -> tuple[float, list[tuple[float, str]]]:
+    """Return total import time of tutor.main and the slowest top-level imports (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tutor.main"],
+        env=_env(src), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative) / 1000, name.rstrip()))
+    total = next(ms for ms, name in rows if name.strip() == "tutor.main")
+    # Only direct children of tutor.main (two-space indent) so times do not overlap
+    children = [(ms, name.strip()) for ms, name in rows if name.startswith("   ")
+                and not name.startswith("    ")]
+    return total, sorted(children, reverse=True)[:top]
+
+
+def main(src: Path, runs: int, top: int) -> None:
+    times = [time_to_healthy(src) for _ in range(runs)]
+    print(f"time to first healthy response ({runs} runs): "
+          f"median {statistics.median(times):.2f} s, min {min(times):.2f} s")
+
+    total, slowest = import_profile(src, top)
+    print(f"\nimport tutor.main: {total:.0f} ms; slowest direct imports (cumulative):")
+    for ms, name in slowest:
+        print(f"{ms:>8.0f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--src", type=Path, default=Path(__file__).parent.parent / "src")
+    args = parser.parse_args()
+    main(args.src.resolve(), args.runs, args.top)
@@ -7,14 +7,22 @@ Supports JPEG, PNG, and WebP image formats.
 
 from __future__ import annotations
 
+import asyncio
+import base64
 import logging
-
-from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
-
-from tutor.config import get_settings
+import time
+from typing import TYPE_CHECKING
+
+from tutor.config import Settings, get_settings
+from tutor.services.blob_store import get_blob_store
+from tutor.services.image import preprocess_image_bytes
+from tutor.services.ocr_cache import content_hash, get_ocr_cache, record_lookup
+from tutor.services.usage import record_llm_usage
 from tutor.state import TutorState
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
 logger = logging.getLogger(__name__)
 
 OCR_PROMPT = """Extract only the main reading passage text from this image.
@@ -24,59 +32,190 @@ Rules:
 - Preserve: Original paragraph structure and line breaks
 - Output: Plain text only, no markdown"""
 
+# Vision input tokens per image when usage must be estimated: a low-detail
+# image is a flat 85 tokens; high detail adds 170 per 512px tile (2x2 typical)
+_IMAGE_INPUT_TOKENS = {"low": 85}
+_DEFAULT_IMAGE_INPUT_TOKENS = 765
+
 
-async def image_processor_node(state: TutorState) -> dict:
+def _prepare_image(
+    image_data: str | None, image_bytes: bytes | None, mime_type: str, settings: Settings
+) -> tuple[str, str, str]:
+    """Hash the upload and downscale/recompress it for the vision call.
+
+    Reuses the buffer decoded during request validation (or received as a
+    binary upload) from the blob store when available. Falls back to the original image if it
+    cannot be decoded or if preprocessing would not make it smaller.
+
+    Returns:
+        Tuple of (base64 image data, mime type, content hash)
+    """
+    if image_bytes is None:
+        image_bytes = base64.b64decode(image_data)
+    key = content_hash(image_bytes, namespace=f"{settings.OCR_MODEL}:{settings.OCR_DETAIL}")
+
+    def original() -> tuple[str, str, str]:
+        encoded = image_data or base64.b64encode(image_bytes).decode("ascii")
+        return encoded, mime_type, key
+
+    if not settings.OCR_PREPROCESS:
+        return original()
+
+    try:
+        prepared = preprocess_image_bytes(
+            image_bytes, settings.OCR_DETAIL, settings.OCR_JPEG_QUALITY
+        )
+    except Exception as e:
+        logger.warning(f"Image preprocessing skipped: {e}")
+        return original()
+
+    original_chars = (len(image_bytes) + 2) // 3 * 4
+    if len(prepared.data) >= len(image_bytes):
+        return original()
+
+    encoded = base64.b64encode(prepared.data).decode("ascii")
+    logger.info(
+        f"Image preprocessed to {prepared.width}x{prepared.height}: "
+        f"{original_chars} -> {len(encoded)} base64 chars"
+    )
+    return encoded, prepared.mime_type, key
+
+
+def create_ocr_llm(settings: Settings) -> BaseChatModel:
+    """Create the vision client used for OCR.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        ChatOpenAI client for OCR_MODEL
+    """
+    from langchain_openai import ChatOpenAI
+
+    # @MX:NOTE: [AUTO] Uses ChatOpenAI directly (not get_llm factory) for Vision-specific parameters (detail, image_url content type).
+    # @MX:REASON: get_llm() factory does not support Vision-specific HumanMessage image_url format.
+    return ChatOpenAI(
+        model=settings.OCR_MODEL,
+        max_tokens=settings.OCR_MAX_TOKENS,
+        api_key=settings.OPENAI_API_KEY,
+        stream_usage=True,
+    )
+
+
+async def _run_ocr(
+    image_data: str, mime_type: str, settings: Settings, token_queue: asyncio.Queue | None
+) -> str:
+    """Call the vision model and return the transcription, streaming it if asked."""
+    from langchain_core.messages import HumanMessage
+
+    llm = create_ocr_llm(settings)
+    message = HumanMessage(content=[
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{mime_type};base64,{image_data}",
+                "detail": settings.OCR_DETAIL,
+            },
+        },
+        {"type": "text", "text": OCR_PROMPT},
+    ])
+    started = time.perf_counter()
+    usage = None
+    if token_queue is None:
+        response = await llm.ainvoke([message])
+        accumulated = response.content
+        usage = getattr(response, "usage_metadata", None)
+    else:
+        accumulated = ""
+        async for chunk in llm.astream([message]):
+            if isinstance(chunk_usage := getattr(chunk, "usage_metadata", None), dict):
+                usage = chunk_usage
+            token = chunk.content if hasattr(chunk, "content") else ""
+            if isinstance(token, str) and token:
+                accumulated += token
+                await token_queue.put(token)
+        await token_queue.put(None)  # sentinel: streaming complete
+
+    record_llm_usage(
+        "ocr",
+        usage if isinstance(usage, dict) else None,
+        model=settings.OCR_MODEL,
+        prompt=OCR_PROMPT,
+        completion=accumulated,
+        latency=time.perf_counter() - started,
+        extra_input_tokens=_IMAGE_INPUT_TOKENS.get(settings.OCR_DETAIL, _DEFAULT_IMAGE_INPUT_TOKENS),
+    )
+    return accumulated.strip()
+
+
+async def image_processor_node(state: TutorState, token_queue: asyncio.Queue | None = None) -> dict:
     """
     Extract text from image using OpenAI Vision API.
 
     Sends the base64 image to ChatOpenAI with a text extraction prompt.
     Returns extracted text or raises RuntimeError on failure.
 
+    Repeated uploads of the same image are answered from the OCR cache
+    (content hash of the image bytes).
+
     Args:
-        state: TutorState containing image_data (base64) and mime_type fields
+        state: TutorState containing mime_type and either image_ref (blob store
+            id of the decoded image) or image_data (base64)
+        token_queue: Optional asyncio.Queue to stream the transcription as it is
+            generated. Each token is put as a string. A None sentinel is put when
+            streaming completes (or on error) to signal the consumer to stop reading.
 
     Returns:
         Dictionary with "extracted_text" and "input_text" keys
     """
     try:
-        image_data = state.get("image_data", "")
+        image_data = state.get("image_data")
+        image_ref = state.get("image_ref")
+        image_bytes = get_blob_store().get(image_ref) if image_ref else None
         mime_type = state.get("mime_type", "image/jpeg")
 
-        if not image_data:
+        if not image_data and not image_bytes:
             logger.warning("No image_data provided to image_processor_node")
+            if token_queue is not None:
+                await token_queue.put(None)
             return {"extracted_text": "", "input_text": "", "task_type": "analyze"}
 
         settings = get_settings()
 
-        # @MX:NOTE: [AUTO] Uses ChatOpenAI directly (not get_llm factory) for Vision-specific parameters (detail, image_url content type).
-        # @MX:REASON: get_llm() factory does not support Vision-specific HumanMessage image_url format.
-        llm = ChatOpenAI(
-            model=settings.OCR_MODEL,
-            max_tokens=settings.OCR_MAX_TOKENS,
-            api_key=settings.OPENAI_API_KEY,
+        # Hashing and Pillow work are CPU-bound; keep them off the event loop
+        image_data, mime_type, cache_key = await asyncio.to_thread(
+            _prepare_image, image_data, image_bytes, mime_type, settings
         )
-        message = HumanMessage(content=[
-            {
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:{mime_type};base64,{image_data}",
-                    "detail": settings.OCR_DETAIL,
-                },
-            },
-            {"type": "text", "text": OCR_PROMPT},
-        ])
-        response = await llm.ainvoke([message])
-        extracted_text = response.content.strip()
+
+        if settings.OCR_CACHE_ENABLED:
+            cache = get_ocr_cache()
+            cached_text = cache.lookup(cache_key)
+            record_lookup(cached_text is not None, cache)
+            if cached_text is not None:
+                logger.info("OCR cache hit")
+                if token_queue is not None:
+                    await token_queue.put(cached_text)
+                    await token_queue.put(None)
+                return {"extracted_text": cached_text, "input_text": cached_text, "task_type": "analyze"}
+
+        extracted_text = await _run_ocr(image_data, mime_type, settings, token_queue)
 
         if not extracted_text:
             logger.info("OpenAI Vision returned empty response")
             raise RuntimeError("이미지에서 텍스트를 찾을 수 없습니다. 영어 텍스트가 포함된 이미지를 업로드해 주세요.")
 
+        if settings.OCR_CACHE_ENABLED:
+            get_ocr_cache().store(cache_key, extracted_text)
+
         logger.info(f"OpenAI Vision extracted {len(extracted_text)} characters")
         return {"extracted_text": extracted_text, "input_text": extracted_text, "task_type": "analyze"}
 
     except RuntimeError:
+        if token_queue is not None:
+            await token_queue.put(None)  # sentinel: ensure consumer loop exits
         raise
     except Exception as e:
         logger.error(f"Error in image_processor_node: {e}")
+        if token_queue is not None:
+            await token_queue.put(None)  # sentinel: ensure consumer loop exits
         raise RuntimeError("이미지 처리 중 오류가 발생했습니다. 다시 시도해 주세요.")
@@ -9,11 +9,21 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 
 from tutor.config import get_settings
 from tutor.models.llm import get_llm
+from tutor.models.router import served_model
 from tutor.prompts import get_level_instructions, render_prompt
 from tutor.schemas import ReadingResult
+from tutor.services.executor import run_cpu
+from tutor.services.token_budget import (
+    finish_reason_of,
+    plan_max_tokens,
+    record_budget_outcome,
+    truncation_error,
+)
+from tutor.services.usage import record_llm_usage
 from tutor.state import TutorState
 from tutor.utils.markdown_normalizer import normalize_reading_output
 
@@ -38,7 +48,8 @@ async def reading_node(state: TutorState, token_queue: asyncio.Queue | None = No
     """
     try:
         settings = get_settings()
-        llm = get_llm(settings.READING_MODEL, max_tokens=6144)
+        budget = plan_max_tokens("reading", state, settings.READING_MODEL)
+        llm = get_llm(settings.READING_MODEL, max_tokens=budget.max_tokens, role="reading")
 
         level = state.get("level", 3)
         input_text = state.get("input_text", "")
@@ -54,16 +65,27 @@ async def reading_node(state: TutorState, token_queue: asyncio.Queue | None = No
                 f"학습 포커스: {', '.join(supervisor_analysis.focus_summary)}"
             )
 
-        prompt = render_prompt(
-            "reading.md",
-            text=input_text,
-            level=level,
-            level_instructions=level_instructions,
-            supervisor_context=supervisor_context,
-        )
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        # Static instructions first so the provider can reuse the cached prefix;
+        # only the passage message differs between requests
+        messages = [
+            SystemMessage(content=render_prompt(
+                "reading.md", level=level, level_instructions=level_instructions
+            )),
+            HumanMessage(content=render_prompt(
+                "passage.md", text=input_text, supervisor_context=supervisor_context
+            )),
+        ]
 
         accumulated = ""
-        async for chunk in llm.astream(prompt):
+        usage = None
+        finish_reason = None
+        started = time.perf_counter()
+        async for chunk in llm.astream(messages):
+            if isinstance(chunk_usage := getattr(chunk, "usage_metadata", None), dict):
+                usage = chunk_usage
+            finish_reason = finish_reason_of(chunk) or finish_reason
             raw = chunk.content if hasattr(chunk, "content") else ""
             if not isinstance(raw, str):
                 continue
@@ -75,8 +97,23 @@ async def reading_node(state: TutorState, token_queue: asyncio.Queue | None = No
 
         if token_queue is not None:
             await token_queue.put(None)  # sentinel: streaming complete
-
-        content = normalize_reading_output(accumulated)
+        record = record_llm_usage(
+            "reading",
+            usage,
+            model=served_model(llm, settings.READING_MODEL),
+            prompt=messages,
+            completion=accumulated,
+            latency=time.perf_counter() - started,
+        )
+        truncated = record_budget_outcome(budget, record.output_tokens, finish_reason)
+
+        content = await run_cpu(normalize_reading_output, accumulated, size=len(accumulated))
+        if truncated:
+            # Reported so the incomplete section is never cached
+            return {
+                "reading_result": ReadingResult(content=content),
+                "reading_error": truncation_error(budget),
+            }
         return {"reading_result": ReadingResult(content=content)}
 
     except Exception as e:
@@ -14,10 +14,13 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 
 from tutor.config import get_settings
 from tutor.models.llm import get_llm
+from tutor.models.router import served_model
 from tutor.schemas import SentenceEntry, SupervisorAnalysis
+from tutor.services.usage import record_llm_usage
 from tutor.state import TutorState
 
 logger = logging.getLogger(__name__)
@@ -61,7 +64,7 @@ async def supervisor_node(state: TutorState) -> dict:
 
     try:
         settings = get_settings()
-        llm = get_llm(settings.SUPERVISOR_MODEL, max_tokens=1024, timeout=30)
+        llm = get_llm(settings.SUPERVISOR_MODEL, max_tokens=1024, timeout=30, role="supervisor")
 
         prompt = f"""다음 영어 지문을 분석하여 JSON 형식으로 응답하라.
 
@@ -87,8 +90,18 @@ async def supervisor_node(state: TutorState) -> dict:
 - overall_difficulty: 전체 지문 난이도 1-5
 - focus_summary: 전체 학습 포커스 우선순위"""
 
+        started = time.perf_counter()
         response = await llm.ainvoke(prompt)
         content = response.content if hasattr(response, "content") else str(response)
+        usage = getattr(response, "usage_metadata", None)
+        record_llm_usage(
+            "supervisor",
+            usage if isinstance(usage, dict) else None,
+            model=served_model(llm, settings.SUPERVISOR_MODEL),
+            prompt=prompt,
+            completion=content if isinstance(content, str) else "",
+            latency=time.perf_counter() - started,
+        )
 
         # Parse JSON from response
         start = content.find("{")
@@ -10,11 +10,21 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+import time
 
 from tutor.config import get_settings
 from tutor.models.llm import get_llm
+from tutor.models.router import served_model
 from tutor.prompts import get_level_instructions, render_prompt
 from tutor.schemas import VocabularyResult, VocabularyWordEntry
+from tutor.services.executor import run_cpu
+from tutor.services.token_budget import (
+    finish_reason_of,
+    plan_max_tokens,
+    record_budget_outcome,
+    truncation_error,
+)
+from tutor.services.usage import record_llm_usage
 from tutor.state import TutorState
 from tutor.utils.markdown_normalizer import normalize_vocabulary_output
 
@@ -81,6 +91,19 @@ def _parse_vocabulary_words(content: str) -> list[VocabularyWordEntry]:
     return words
 
 
+def _build_vocabulary_result(accumulated: str) -> VocabularyResult:
+    """Normalize and parse the streamed output (module-level so a process pool can run it).
+
+    Args:
+        accumulated: Raw streamed LLM output
+
+    Returns:
+        VocabularyResult with the parsed word entries
+    """
+    content = normalize_vocabulary_output(accumulated)
+    return VocabularyResult(words=_parse_vocabulary_words(content))
+
+
 async def vocabulary_node(state: TutorState, token_queue: asyncio.Queue | None = None) -> dict:
     """
     Process text for vocabulary etymology explanation.
@@ -102,7 +125,8 @@ async def vocabulary_node(state: TutorState, token_queue: asyncio.Queue | None =
         Dictionary with "vocabulary_result" key containing VocabularyResult
     """
     settings = get_settings()
-    llm = get_llm(settings.VOCABULARY_MODEL, max_tokens=8192)
+    budget = plan_max_tokens("vocabulary", state, settings.VOCABULARY_MODEL)
+    llm = get_llm(settings.VOCABULARY_MODEL, max_tokens=budget.max_tokens, role="vocabulary")
 
     level = state.get("level", 3)
     input_text = state.get("input_text", "")
@@ -118,17 +142,28 @@ async def vocabulary_node(state: TutorState, token_queue: asyncio.Queue | None =
             f"학습 포커스: {', '.join(supervisor_analysis.focus_summary)}"
         )
 
-    prompt = render_prompt(
-        "vocabulary.md",
-        text=input_text,
-        level=level,
-        level_instructions=level_instructions,
-        supervisor_context=supervisor_context,
-    )
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    # Static instructions first so the provider can reuse the cached prefix;
+    # only the passage message differs between requests
+    messages = [
+        SystemMessage(content=render_prompt(
+            "vocabulary.md", level=level, level_instructions=level_instructions
+        )),
+        HumanMessage(content=render_prompt(
+            "passage.md", text=input_text, supervisor_context=supervisor_context
+        )),
+    ]
 
     try:
         accumulated = ""
-        async for chunk in llm.astream(prompt):
+        usage = None
+        finish_reason = None
+        started = time.perf_counter()
+        async for chunk in llm.astream(messages):
+            if isinstance(chunk_usage := getattr(chunk, "usage_metadata", None), dict):
+                usage = chunk_usage
+            finish_reason = finish_reason_of(chunk) or finish_reason
             raw = chunk.content if hasattr(chunk, "content") else ""
             if not isinstance(raw, str):
                 continue  # skip non-text chunks (multimodal/tool-use)
@@ -140,10 +175,21 @@ async def vocabulary_node(state: TutorState, token_queue: asyncio.Queue | None =
 
         if token_queue is not None:
             await token_queue.put(None)  # sentinel: streaming complete
+        record = record_llm_usage(
+            "vocabulary",
+            usage,
+            model=served_model(llm, settings.VOCABULARY_MODEL),
+            prompt=messages,
+            completion=accumulated,
+            latency=time.perf_counter() - started,
+        )
+        truncated = record_budget_outcome(budget, record.output_tokens, finish_reason)
 
-        content = normalize_vocabulary_output(accumulated)
-        words = _parse_vocabulary_words(content)
-        return {"vocabulary_result": VocabularyResult(words=words)}
+        result = await run_cpu(_build_vocabulary_result, accumulated, size=len(accumulated))
+        if truncated:
+            # Reported so the incomplete section is never cached
+            return {"vocabulary_result": result, "vocabulary_error": truncation_error(budget)}
+        return {"vocabulary_result": result}
     except Exception as e:
         logger.error(f"Error in vocabulary_node: {e}")
         if token_queue is not None:
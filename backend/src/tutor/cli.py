@@ -0,0 +1,104 @@
+"""Command-line tools for AI English Tutor.
+
+``tutor-pregenerate`` analyses a JSONL workbook of passages ahead of class
+and stores the results in the analysis cache the API serves from:
+
+    tutor-pregenerate workbook.jsonl --concurrency 4
+
+Each line is {"id": "p1", "text": "...", "level": 3} ("id" is optional).
+Progress is printed per passage and a JSON report (counts, failures,
+throughput, cost) at the end. Results are committed one by one, so an
+interrupted run resumes where it stopped when started again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+from tutor.config import get_settings
+from tutor.services.analysis_cache import AnalysisCache
+from tutor.services.batch import (
+    BatchFormatError,
+    BatchItem,
+    BatchReport,
+    parse_batch_items,
+    run_batch,
+)
+
+
+async def _pregenerate(
+    items: list[BatchItem],
+    cache: AnalysisCache,
+    concurrency: int,
+    report: BatchReport,
+) -> None:
+    async for outcome in run_batch(items, cache, concurrency):
+        report.add(outcome)
+        detail = f" ({outcome.error})" if outcome.error else ""
+        print(
+            f"[{report.completed}/{report.total}] {outcome.item_id}: {outcome.status}"
+            f" {outcome.seconds:.1f}s{detail}",
+            flush=True,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the pre-generation CLI.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Exit status: 0 if every passage is cached, 1 if some failed, 2 on bad
+        input, 130 if interrupted
+    """
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="tutor-pregenerate",
+        description="Analyse a JSONL file of passages into the analysis cache.",
+    )
+    parser.add_argument("passages", type=Path, help="JSONL file: {\"text\", \"level\", \"id\"?}")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.BATCH_CONCURRENCY,
+        help="passages analysed at the same time",
+    )
+    parser.add_argument(
+        "--cache", default=settings.ANALYSIS_CACHE_PATH, help="analysis cache SQLite file",
+    )
+    parser.add_argument("--report", type=Path, help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(levelname)s %(name)s: %(message)s")
+
+    try:
+        with args.passages.open(encoding="utf-8") as f:
+            items = parse_batch_items(f)
+    except (OSError, BatchFormatError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    ttl_hours = settings.ANALYSIS_CACHE_TTL_HOURS
+    cache = AnalysisCache(args.cache, ttl_seconds=ttl_hours * 3600 if ttl_hours > 0 else None)
+    report = BatchReport(total=len(items))
+    status = 0
+    try:
+        asyncio.run(_pregenerate(items, cache, args.concurrency, report))
+    except KeyboardInterrupt:
+        print("interrupted: finished passages are cached; run again to resume", file=sys.stderr)
+        status = 130
+    finally:
+        cache.close()
+
+    summary = json.dumps(report.as_dict(), ensure_ascii=False, indent=2)
+    print(summary)
+    if args.report:
+        args.report.write_text(summary + "\n", encoding="utf-8")
+    return status or (1 if report.counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
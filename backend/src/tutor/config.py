@@ -25,10 +25,110 @@ class Settings(BaseSettings):
         OCR_MODEL: Model for image OCR via OpenAI Vision (default: gpt-4o-mini)
         OCR_DETAIL: Vision API detail level (default: low)
         OCR_MAX_TOKENS: Maximum tokens for OCR response (default: 2048)
+        MODEL_ROUTING_ENABLED: Route agent calls between each role's model and its
+            MODEL_FALLBACKS by measured latency and health (default: True)
+        MODEL_FALLBACKS: Comma-separated role=model|model fallback backends per agent
+            role (supervisor, reading, grammar, vocabulary); roles without one call
+            their model directly (default: "")
+        MODEL_CIRCUIT_FAILURE_THRESHOLD: Consecutive failures that open a backend's
+            circuit breaker (default: 3)
+        MODEL_CIRCUIT_COOLDOWN_SECONDS: Time an open circuit waits before one probe
+            call is let through (default: 30.0)
+        OCR_PREPROCESS: Downscale, grayscale and recompress images before OCR (default: True)
+        OCR_JPEG_QUALITY: JPEG quality of the preprocessed OCR image (default: 85)
+        OCR_CACHE_ENABLED: Reuse OCR text for repeated uploads of the same image
+            (default: True)
+        OCR_CACHE_MAX_ENTRIES: Maximum cached OCR transcriptions (default: 10000)
+        OCR_SEGMENT_MIN_CHARS: Minimum paragraph length analyzed as its own segment
+            while OCR is still streaming (default: 300)
+        TOKEN_BUDGET_ENABLED: Size each agent call's max_tokens from the passage's
+            sentence count and learned output ratios instead of a fixed limit
+            (default: True)
+        TOKEN_BUDGET_MIN_TOKENS: Smallest max_tokens granted by the budget (default: 1024)
+        PROMPTS_HOT_RELOAD: Poll prompt templates and reload them when their file
+            changes (default: False)
+        PROMPTS_RELOAD_INTERVAL_SECONDS: Prompt hot-reload polling interval (default: 2.0)
+        PRELOAD_ON_STARTUP: Import the LLM client stack, compile the chat graph and
+            warm the LLM connections in the background after startup instead of on
+            the first request (default: True)
+        READINESS_CACHE_SECONDS: How long a readiness result is reused before the
+            checks run again (default: 5.0)
+        READINESS_CHECK_LLM: Warm and verify the LLM connection pools as part of
+            readiness (default: True)
+        READINESS_LLM_TIMEOUT_SECONDS: Timeout of the LLM readiness check (default: 5.0)
+        LOOP_MONITOR_INTERVAL_SECONDS: Event-loop lag sampling interval (default: 0.5)
+        LOOP_BLOCK_DETECTOR: Sample the stack of whatever blocks the event loop longer
+            than LOOP_BLOCK_THRESHOLD_MS and log it (debug; default: False)
+        LOOP_BLOCK_THRESHOLD_MS: Blocking-call detector threshold (default: 100)
+        CPU_EXECUTOR: Worker pool for CPU-bound post-processing and image decoding,
+            "thread" or "process" (default: thread)
+        CPU_EXECUTOR_WORKERS: Worker count; 0 uses min(4, CPU count) (default: 0)
+        CPU_INLINE_MAX_MS: Jobs predicted to finish faster than this run inline on
+            the event loop instead of the pool (default: 2.0)
+        CPU_INLINE_MAX_SIZE: Input size below which a job kind not yet measured runs
+            inline (default: 16384)
+        STREAM_REPLAY_MAX_BYTES: Replay buffer size per analysis stream, for resuming
+            after a dropped connection (default: 2097152)
+        STREAM_REPLAY_TTL_SECONDS: How long a finished stream stays resumable
+            (default: 300)
+        SSE_COMPRESSION_ENABLED: Gzip SSE responses for clients that send
+            Accept-Encoding: gzip, flushing every frame (default: True)
+        SSE_COMPRESSION_LEVEL: zlib level of SSE compression, 1-9 (default: 6)
+        WS_MAX_OPERATIONS: Operations running at the same time on one /tutor/ws
+            connection (default: 4)
+        WS_SEND_QUEUE_SIZE: Messages buffered per WebSocket connection before its
+            operations wait for the client to read (default: 64)
+        ADMISSION_CONTROL_ENABLED: Shed or degrade new analyses when the worker is
+            overloaded (default: True)
+        ADMISSION_MAX_STREAMS: SSE streams in flight at which new analyses get
+            503 + Retry-After; 0 disables the limit (default: 64)
+        ADMISSION_MAX_QUEUED_TOKENS: Estimated LLM output tokens of running
+            pipelines at which new analyses are shed; 0 disables (default: 500000)
+        ADMISSION_MAX_LOOP_LAG_MS: Event-loop lag (p90 of recent samples) at which new
+            analyses are shed; 0 disables (default: 250)
+        ADMISSION_DEGRADE_RATIO: Fraction of any limit from which new analyses
+            are streamed final-only, one event per section (default: 0.8)
+        ADMISSION_RETRY_AFTER_SECONDS: Retry-After of a shed request at the limit,
+            scaled up with the overload (default: 5)
+        RATE_LIMIT_ENABLED: Charge requests' estimated LLM tokens to per-IP and
+            per-session token buckets and answer 429 when one is empty. Opt-in: enable
+            it with RATE_LIMIT_TRUST_FORWARDED behind the frontend proxy, or every
+            user shares the proxy's bucket (default: False)
+        RATE_LIMITS: Comma-separated endpoint=tokens/seconds bucket sizes and refill
+            times; endpoints: analyze, analyze_image, chat (default:
+            analyze=300000/3600,analyze_image=300000/3600,chat=100000/3600)
+        RATE_LIMIT_BACKEND: Bucket store, "memory" (per worker) or "sqlite" (shared
+            by the workers of a host via RATE_LIMIT_PATH) (default: memory)
+        RATE_LIMIT_PATH: SQLite file of the shared bucket store
+            (default: .cache/rate_limits.sqlite3)
+        RATE_LIMIT_TRUST_FORWARDED: Take the client IP from X-Forwarded-For, which
+            the Next.js API routes forward; only set it when clients cannot reach
+            the backend directly (default: False)
+        JOBS_MAX_CONCURRENCY: Analysis jobs (POST /tutor/jobs) run at the same time;
+            further jobs queue (default: 4)
+        JOBS_MAX_QUEUED: Jobs allowed to wait for a slot; further submissions get
+            503 with Retry-After (0: no limit) (default: 32)
+        JOBS_TTL_SECONDS: How long a finished job can be fetched (default: 3600)
+        ANALYSIS_CACHE_ENABLED: Serve repeated text analyses from the persistent
+            analysis cache (default: True)
+        ANALYSIS_CACHE_PATH: SQLite file of the analysis cache, shared with the
+            pre-generation CLI (default: .cache/analysis.sqlite3)
+        ANALYSIS_CACHE_TTL_HOURS: Maximum age of a served analysis; 0 keeps results
+            until prompts or models change (default: 0)
+        SENTENCE_CACHE_ENABLED: Cache reading sections per sentence and only
+            re-read new or changed sentences of an edited passage
+            (requires ANALYSIS_CACHE_ENABLED, default: True)
+        BATCH_CONCURRENCY: Passages analysed at the same time by a batch (default: 4)
+        BATCH_MAX_ITEMS: Maximum passages per POST /tutor/batch request (default: 200)
         HOST: Server host address (default: 0.0.0.0)
         PORT: Server port (default: 8000)
         CORS_ORIGINS: Comma-separated list of allowed origins (default: http://localhost:3000)
         SESSION_TTL_HOURS: Session time-to-live in hours (default: 24)
+        BLOB_TTL_SECONDS: Lifetime of an uploaded image that is never released,
+            e.g. after an early client disconnect; images held by a queued job
+            do not expire (default: 300)
+        USAGE_IN_DONE_EVENT: Include the request's token usage and estimated cost
+            in the final "done" SSE event (default: False)
     """
 
     # LLM API Keys
@@ -48,6 +148,82 @@ class Settings(BaseSettings):
     OCR_DETAIL: str = "low"
     OCR_MAX_TOKENS: int = 2048
 
+    # Model Routing and Failover
+    MODEL_ROUTING_ENABLED: bool = True
+    MODEL_FALLBACKS: str = ""
+    MODEL_CIRCUIT_FAILURE_THRESHOLD: int = 3
+    MODEL_CIRCUIT_COOLDOWN_SECONDS: float = 30.0
+
+    # OCR Pipeline
+    OCR_PREPROCESS: bool = True
+    OCR_JPEG_QUALITY: int = 85
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_MAX_ENTRIES: int = 10000
+    OCR_SEGMENT_MIN_CHARS: int = 300
+
+    # Output Token Budget
+    TOKEN_BUDGET_ENABLED: bool = True
+    TOKEN_BUDGET_MIN_TOKENS: int = 1024
+
+    # Prompt Templates
+    PROMPTS_HOT_RELOAD: bool = False
+    PROMPTS_RELOAD_INTERVAL_SECONDS: float = 2.0
+
+    # Startup and Readiness
+    PRELOAD_ON_STARTUP: bool = True
+    READINESS_CACHE_SECONDS: float = 5.0
+    READINESS_CHECK_LLM: bool = True
+    READINESS_LLM_TIMEOUT_SECONDS: float = 5.0
+
+    # Event Loop Monitoring
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.5
+    LOOP_BLOCK_DETECTOR: bool = False
+    LOOP_BLOCK_THRESHOLD_MS: float = 100.0
+
+    # CPU-bound Work Offloading
+    CPU_EXECUTOR: str = "thread"
+    CPU_EXECUTOR_WORKERS: int = 0
+    CPU_INLINE_MAX_MS: float = 2.0
+    CPU_INLINE_MAX_SIZE: int = 16384
+
+    # Streaming (replay, compression, WebSocket)
+    STREAM_REPLAY_MAX_BYTES: int = 2 * 1024 * 1024
+    STREAM_REPLAY_TTL_SECONDS: float = 300.0
+    SSE_COMPRESSION_ENABLED: bool = True
+    SSE_COMPRESSION_LEVEL: int = 6
+    WS_MAX_OPERATIONS: int = 4
+    WS_SEND_QUEUE_SIZE: int = 64
+
+    # Admission Control
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_STREAMS: int = 64
+    ADMISSION_MAX_QUEUED_TOKENS: int = 500_000
+    ADMISSION_MAX_LOOP_LAG_MS: float = 250.0
+    ADMISSION_DEGRADE_RATIO: float = 0.8
+    ADMISSION_RETRY_AFTER_SECONDS: int = 5
+
+    # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMITS: str = "analyze=300000/3600,analyze_image=300000/3600,chat=100000/3600"
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_PATH: str = ".cache/rate_limits.sqlite3"
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+
+    # Background Jobs
+    JOBS_MAX_CONCURRENCY: int = 4
+    JOBS_MAX_QUEUED: int = 32
+    JOBS_TTL_SECONDS: float = 3600.0
+
+    # Analysis Cache
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_PATH: str = ".cache/analysis.sqlite3"
+    ANALYSIS_CACHE_TTL_HOURS: float = 0.0
+    SENTENCE_CACHE_ENABLED: bool = True
+
+    # Batch Analysis
+    BATCH_CONCURRENCY: int = 4
+    BATCH_MAX_ITEMS: int = 200
+
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
@@ -56,6 +232,12 @@ class Settings(BaseSettings):
     # Session Configuration
     SESSION_TTL_HOURS: int = 24
 
+    # Image Blob Store
+    BLOB_TTL_SECONDS: int = 300
+
+    # Usage Reporting
+    USAGE_IN_DONE_EVENT: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -12,15 +12,22 @@ and chat task types.
 
 from __future__ import annotations
 
-from langgraph.constants import END, START
-from langgraph.graph import StateGraph
-from langgraph.types import Send
+import threading
+from typing import TYPE_CHECKING
 
 from tutor.agents.aggregator import aggregator_node
 from tutor.agents.image_processor import image_processor_node
 from tutor.agents.supervisor import supervisor_node
 from tutor.state import TutorState
 
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+    from langgraph.types import Send
+
+# Compiled graph (lazy: LangGraph is only imported and compiled on first use)
+_graph: CompiledStateGraph | None = None
+_graph_lock = threading.Lock()
+
 
 def route_after_image(state: TutorState) -> list[Send]:
     """
@@ -42,9 +49,17 @@ def route_after_image(state: TutorState) -> list[Send]:
     """
     # @MX:NOTE: [AUTO] Re-routes OCR text through supervisor for pre-analysis
     # @MX:SPEC: SPEC-IMAGE-001
+    from langgraph.types import Send
+
     extracted_text = state.get("extracted_text", "")
     if extracted_text:
-        new_state = {**state, "input_text": extracted_text, "task_type": "analyze"}
+        # The analysis agents never need the image; don't carry it further
+        new_state = {
+            **state,
+            "input_text": extracted_text,
+            "task_type": "analyze",
+            "image_data": None,
+        }
         return [Send("supervisor", new_state)]
     return [Send("aggregator", state)]
 
@@ -78,6 +93,8 @@ def route_by_task(state: TutorState) -> list[Send]:
         >>> route_by_task({"task_type": "image_process", ...})
         [Send('image_processor', {...})]
     """
+    from langgraph.types import Send
+
     task_type = state.get("task_type", "analyze")
 
     if task_type == "analyze":
@@ -137,6 +154,14 @@ def create_graph():
         ...     "image_data": "...",
         ... })
     """
+    from langgraph.constants import END, START
+    from langgraph.graph import StateGraph
+
+    # LangGraph resolves the routing functions' ``list[Send]`` annotations
+    # against this module's globals
+    global Send
+    from langgraph.types import Send
+
     workflow = StateGraph(TutorState)
 
     # Add nodes to the graph
@@ -162,6 +187,25 @@ def create_graph():
     return workflow.compile()
 
 
-# Global graph instance for convenient importing
-# This can be imported as: from tutor.graph import graph
-graph = create_graph()
+def get_graph() -> CompiledStateGraph:
+    """Get the compiled workflow graph, compiling it on first use.
+
+    Compilation is deferred so that importing this module (and the API
+    router) does not pay for LangGraph at startup.
+
+    Returns:
+        The shared compiled StateGraph
+    """
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = create_graph()
+    return _graph
+
+
+def __getattr__(name: str) -> object:
+    """Keep ``from tutor.graph import graph`` working; compiles on first access."""
+    if name == "graph":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,31 @@
 """FastAPI application for AI English Tutor.
 
 Main entry point for the FastAPI application. Creates and configures
-the app with CORS middleware and API routers.
+the app with CORS, admission control and SSE compression middleware and
+API routers.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from tutor.config import settings
+from tutor.middleware import AdmissionMiddleware, SSECompressionMiddleware
+from tutor.prompts import AGENT_PROMPT_VARIABLES, get_prompt_registry
 from tutor.routers import tutor
+from tutor.services.executor import shutdown_cpu_executor
+from tutor.services.jobs import get_job_manager
+from tutor.services.loop_monitor import get_loop_monitor
+from tutor.services.readiness import get_readiness_probe
+from tutor.services.replay import get_stream_registry
+from tutor.services.usage import load_encodings
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +34,69 @@ logging.basicConfig(
 )
 
 
+def _preload_dependencies() -> None:
+    """Import the LLM client stack, compile the chat graph and load tokenizers.
+
+    These are loaded lazily so the server answers health checks quickly
+    after a restart; running this in the background right after startup
+    keeps the cost off the first real request. Token counts are estimated
+    by characters until the tokenizers are loaded.
+    """
+    import langchain_core.messages  # noqa: F401
+    import langchain_openai  # noqa: F401
+
+    from tutor.graph import get_graph
+
+    get_graph()
+    load_encodings({
+        "",  # admission control counts without a model
+        settings.SUPERVISOR_MODEL,
+        settings.READING_MODEL,
+        settings.GRAMMAR_MODEL,
+        settings.VOCABULARY_MODEL,
+        settings.OCR_MODEL,
+    })
+
+
+async def _warm_up() -> None:
+    """Preload dependencies off the loop, then open the LLM connection pools."""
+    await asyncio.to_thread(_preload_dependencies)
+    await get_readiness_probe().check()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Load prompt templates at startup and run the background startup tasks.
+
+    Starts the event-loop monitor, the optional prompt hot-reload task and,
+    unless disabled, preloads heavy dependencies in a worker thread and warms
+    the LLM connections once the server is accepting requests.
+
+    Args:
+        app: The FastAPI application
+    """
+    registry = get_prompt_registry()
+    registry.validate(AGENT_PROMPT_VARIABLES)
+
+    tasks = [asyncio.create_task(get_loop_monitor().run())]
+    if settings.PROMPTS_HOT_RELOAD:
+        tasks.append(asyncio.create_task(
+            registry.watch(settings.PROMPTS_RELOAD_INTERVAL_SECONDS)
+        ))
+    if settings.PRELOAD_ON_STARTUP:
+        tasks.append(asyncio.create_task(_warm_up()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await get_job_manager().close()
+        await get_stream_registry().close()
+        shutdown_cpu_executor()
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application.
 
@@ -37,8 +113,21 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
+    # Shed new analyses with 503 + Retry-After under overload (inside CORS, so
+    # the rejection carries CORS headers)
+    if settings.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(
+            AdmissionMiddleware,
+            paths=[
+                "/api/v1/tutor/analyze",
+                "/api/v1/tutor/analyze-image",
+                "/api/v1/tutor/analyze-image/upload",
+            ],
+        )
+
     # Configure CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -48,6 +137,10 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Gzip SSE responses for clients that accept it, flushing every frame
+    if settings.SSE_COMPRESSION_ENABLED:
+        app.add_middleware(SSECompressionMiddleware, level=settings.SSE_COMPRESSION_LEVEL)
+
     # Include routers
     app.include_router(tutor.router, prefix="/api/v1")
 
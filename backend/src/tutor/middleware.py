@@ -0,0 +1,140 @@
+"""ASGI middleware for AI English Tutor.
+
+AdmissionMiddleware rejects new analyses with 503 and ``Retry-After`` while
+the worker is overloaded (see ``tutor.services.admission``), before their
+body (possibly a large image) is read.
+
+SSECompressionMiddleware gzips Server-Sent Events responses (analyze,
+analyze-image, chat and the stream/job resume endpoints) for clients that
+advertise ``Accept-Encoding: gzip``; other clients get the identity
+encoding. Analysis streams repeat the same JSON envelope around every
+Korean markdown token, so they compress well, but buffering would defeat
+streaming: every body message the app sends is compressed and flushed
+with ``Z_SYNC_FLUSH``, so the client can decode each frame as soon as it
+arrives while the compressor keeps its window across frames.
+
+Raw and compressed byte counts are recorded as the
+``sse_compression_{input,output,saved}_bytes_total`` metrics.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tutor.services.admission import get_admission_controller
+from tutor.services.metrics import metrics
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return whether an Accept-Encoding header allows a gzip response.
+
+    Args:
+        accept_encoding: The header value, or None if absent
+
+    Returns:
+        True if gzip (or "*") is listed without q=0
+    """
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value) > 0
+            except ValueError:
+                return True
+        return True
+    return False
+
+
+class AdmissionMiddleware:
+    """Shed POSTs to the analysis endpoints with 503 while the worker is overloaded."""
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str]) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            paths: Request paths under admission control
+        """
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"] in self.paths
+            and (controller := get_admission_controller()).state() == "shed"
+        ):
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(controller.shed())},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class SSECompressionMiddleware:
+    """Gzip text/event-stream responses with a sync flush after every message."""
+
+    def __init__(self, app: ASGIApp, level: int = 6) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            level: zlib compression level (1 = fastest, 9 = smallest)
+        """
+        self.app = app
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http" or not accepts_gzip(Headers(scope=scope).get("accept-encoding")):
+            await self.app(scope, receive, send)
+            return
+
+        compressor = None
+        raw_bytes = sent_bytes = 0
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal compressor, raw_bytes, sent_bytes
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if (
+                    headers.get("content-type", "").startswith("text/event-stream")
+                    and "content-encoding" not in headers
+                ):
+                    compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                    headers["Content-Encoding"] = "gzip"
+                    headers.add_vary_header("Accept-Encoding")
+                    if "content-length" in headers:
+                        del headers["content-length"]
+            elif message["type"] == "http.response.body" and compressor is not None:
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                data = compressor.compress(body) + compressor.flush(
+                    zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+                )
+                raw_bytes += len(body)
+                sent_bytes += len(data)
+                message = {**message, "body": data}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_compressed)
+        finally:
+            if compressor is not None:
+                metrics.inc("sse_compressed_streams_total")
+                metrics.inc("sse_compression_input_bytes_total", raw_bytes)
+                metrics.inc("sse_compression_output_bytes_total", sent_bytes)
+                metrics.inc("sse_compression_saved_bytes_total", raw_bytes - sent_bytes)
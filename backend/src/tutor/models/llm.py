@@ -8,17 +8,29 @@ Supported model prefixes:
 - glm-*: Zhipu AI GLM models via OpenAI-compatible API (ChatOpenAI + base_url)
 
 Claude models are not supported. Configure model env vars to use gpt-* or glm-* models.
+
+Agent calls pass their role; roles with MODEL_FALLBACKS get a client that
+routes between the candidate models (see tutor.models.router).
 """
 
 from __future__ import annotations
 
-from langchain_core.language_models import BaseChatModel
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING
 
 from tutor.config import get_settings
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+    from tutor.models.router import RoutedChatModel
+
 
-def get_llm(model_name: str, max_tokens: int | None = None, timeout: int = 120) -> BaseChatModel:
+def get_llm(
+    model_name: str,
+    max_tokens: int | None = None,
+    timeout: int = 120,
+    role: str | None = None,
+) -> BaseChatModel | RoutedChatModel:
     """Get LLM client instance based on model name.
 
     Factory function that returns the appropriate LangChain LLM client
@@ -30,9 +42,12 @@ def get_llm(model_name: str, max_tokens: int | None = None, timeout: int = 120)
         max_tokens: Maximum tokens for the response. Defaults to 4096.
             Set explicitly to 6144 for reading/vocabulary agents.
         timeout: Request timeout in seconds. Defaults to 120.
+        role: Agent role of the call (e.g. "reading"). If the role has
+            MODEL_FALLBACKS and MODEL_ROUTING_ENABLED is set, a RoutedChatModel
+            choosing between model_name and the fallbacks per call is returned.
 
     Returns:
-        Configured LangChain LLM client instance
+        Configured LangChain LLM client instance, or a routed client
 
     Raises:
         ValueError: If model_name starts with "claude-" (not supported)
@@ -57,7 +72,24 @@ def get_llm(model_name: str, max_tokens: int | None = None, timeout: int = 120)
             f"Got: {model_name}"
         )
 
+    if role is not None and get_settings().MODEL_ROUTING_ENABLED:
+        from tutor.models.router import get_model_router
+
+        router = get_model_router()
+        if router.has_fallbacks(role):
+            return router.llm(role, model_name, max_tokens, timeout)
+    return create_llm(model_name, max_tokens, timeout)
+
+
+def create_llm(model_name: str, max_tokens: int | None = None, timeout: int = 120) -> BaseChatModel:
+    """Create the LangChain client of one model (see get_llm).
+
+    Raises:
+        ValueError: If GLM_API_KEY is missing for a glm-* model or the prefix is unknown
+    """
     settings = get_settings()
+    # Imported on first use: langchain-openai pulls in the whole openai SDK (~1 s)
+    from langchain_openai import ChatOpenAI
 
     if model_name.startswith("gpt-"):
         return ChatOpenAI(
@@ -67,6 +99,8 @@ def get_llm(model_name: str, max_tokens: int | None = None, timeout: int = 120)
             max_tokens=max_tokens if max_tokens is not None else 4096,
             api_key=settings.OPENAI_API_KEY,
             streaming=True,
+            # Report token usage (incl. cached prompt tokens) on the final chunk
+            stream_usage=True,
         )
 
     if model_name.startswith("glm-"):
@@ -0,0 +1,422 @@
+"""Latency-aware model routing with failover for AI English Tutor.
+
+Each agent role (supervisor, reading, grammar, vocabulary) may have several
+candidate backends: its configured model plus the ``MODEL_FALLBACKS`` of the
+role. Every call goes to the best-performing healthy candidate, ranked by
+rolling (EWMA) time to first token, output throughput and error rate, which
+are tracked per role and backend since prompts and output lengths differ by
+role. A backend not yet measured ranks first so that every candidate is
+measured once.
+
+A call that fails before its first token moves on to the next candidate; a
+stream that fails after tokens were delivered is not retried, since the
+consumer already has part of the answer. A backend failing
+``MODEL_CIRCUIT_FAILURE_THRESHOLD`` times in a row has its circuit opened
+and is skipped for ``MODEL_CIRCUIT_COOLDOWN_SECONDS``; then one probe call
+is let through, which closes the circuit on success.
+
+Metrics:
+- ``llm_backend_requests_total{role,backend,result}``: calls per backend
+- ``llm_backend_ttft_seconds{role,backend}``: time to first token
+- ``llm_backend_failovers_total{role,backend}``: calls moved past a failing backend
+- ``llm_backend_switches_total{role,backend}``: the role's serving backend changed
+- ``llm_backend_circuit_open{role,backend}``: 1 while the circuit is open
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING, Any, Literal
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+# Output tokens of a typical section, used to weigh throughput against TTFT
+_SCORE_TOKENS = 500
+
+# Global model router instance (lazy-initialized)
+_model_router: ModelRouter | None = None
+
+
+class BackendUnavailableError(Exception):
+    """Raised when every candidate backend of a role has an open circuit."""
+
+    def __init__(self, role: str) -> None:
+        """Initialize the error.
+
+        Args:
+            role: The agent role without a healthy backend
+        """
+        super().__init__(f"No healthy model backend for {role}")
+        self.role = role
+
+
+def parse_model_fallbacks(spec: str) -> dict[str, list[str]]:
+    """Parse a MODEL_FALLBACKS setting.
+
+    Args:
+        spec: Comma-separated ``role=model|model`` entries
+
+    Returns:
+        Dict of agent role to fallback model names, in order of preference
+
+    Raises:
+        ValueError: If an entry has no role or no model
+
+    Example:
+        >>> parse_model_fallbacks("reading=glm-4-flash, grammar=gpt-4o|glm-4-flash")
+        {'reading': ['glm-4-flash'], 'grammar': ['gpt-4o', 'glm-4-flash']}
+    """
+    fallbacks = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        role, _, models = entry.partition("=")
+        names = [name.strip() for name in models.split("|") if name.strip()]
+        if not role.strip() or not names:
+            raise ValueError(f"Invalid model fallback {entry!r}, expected role=model|model")
+        fallbacks[role.strip()] = names
+    return fallbacks
+
+
+class Backend:
+    """Rolling performance and circuit breaker of one model for one role."""
+
+    def __init__(self, role: str, model: str, alpha: float = 0.2) -> None:
+        """Initialize the backend.
+
+        Args:
+            role: Agent role the statistics belong to
+            model: Model name passed to the client factory
+            alpha: EWMA weight of the newest observation
+        """
+        self.role = role
+        self.model = model
+        self._alpha = alpha
+        self.ttft: float | None = None
+        self.throughput: float | None = None
+        self.error_rate = 0.0
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def _ewma(self, current: float | None, value: float) -> float:
+        return value if current is None else current + self._alpha * (value - current)
+
+    def score(self) -> float:
+        """Expected seconds to deliver a typical section, inflated by errors.
+
+        Lower is better; an unmeasured backend scores 0.
+        """
+        if self.ttft is None:
+            return 0.0
+        seconds = self.ttft
+        if self.throughput:
+            seconds += _SCORE_TOKENS / self.throughput
+        return seconds / (1.0 - min(self.error_rate, 0.9))
+
+    def record_success(self, ttft: float, tokens: int, seconds: float) -> None:
+        """Fold a successful call into the rolling statistics.
+
+        Args:
+            ttft: Seconds until the first token (the whole call if not streamed)
+            tokens: Output tokens generated after the first one
+            seconds: Seconds from the first to the last token
+        """
+        self.ttft = self._ewma(self.ttft, ttft)
+        if tokens > 0 and seconds > 0:
+            self.throughput = self._ewma(self.throughput, tokens / seconds)
+        self.error_rate = self._ewma(self.error_rate, 0.0)
+        self.failures = 0
+        if self.state != "closed":
+            logger.info(f"Circuit of {self.model} for {self.role} closed")
+            metrics.set_gauge("llm_backend_circuit_open", 0, role=self.role, backend=self.model)
+        self.state = "closed"
+
+    def record_failure(self, now: float, threshold: int) -> None:
+        """Count a failed call and open the circuit after too many in a row.
+
+        Args:
+            now: Current time (monotonic seconds)
+            threshold: Consecutive failures that open the circuit
+        """
+        self.error_rate = self._ewma(self.error_rate, 1.0)
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= threshold:
+            if self.state != "open":
+                logger.warning(
+                    f"Circuit of {self.model} for {self.role} opened "
+                    f"after {self.failures} failures"
+                )
+            self.state = "open"
+            self.opened_at = now
+            metrics.set_gauge("llm_backend_circuit_open", 1, role=self.role, backend=self.model)
+
+
+class ModelRouter:
+    """Routes each agent call to the best healthy candidate backend of its role."""
+
+    def __init__(
+        self,
+        factory: Callable[[str, int | None, int], BaseChatModel],
+        fallbacks: dict[str, list[str]] | None = None,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            factory: Creates a client from (model, max_tokens, timeout)
+            fallbacks: Fallback models per role, tried after the role's own model
+            failure_threshold: Consecutive failures that open a backend's circuit
+            cooldown_seconds: Time an open circuit waits before a probe call
+            clock: Monotonic time source
+        """
+        self._factory = factory
+        self._fallbacks = fallbacks or {}
+        self._threshold = failure_threshold
+        self._cooldown = cooldown_seconds
+        self._clock = clock
+        self._backends: dict[tuple[str, str], Backend] = {}
+        self._serving: dict[str, str] = {}
+
+    def has_fallbacks(self, role: str) -> bool:
+        """Return whether the role has fallback backends configured."""
+        return bool(self._fallbacks.get(role))
+
+    def backend(self, role: str, model: str) -> Backend:
+        """Return (creating it on first use) the statistics of a role's backend."""
+        key = (role, model)
+        if key not in self._backends:
+            self._backends[key] = Backend(role, model)
+        return self._backends[key]
+
+    def candidates(self, role: str, model: str) -> list[Backend]:
+        """Return the backends a call should try, best first.
+
+        Backends with an open circuit are left out during their cooldown;
+        afterwards one call tries them first as a probe (a failing probe
+        only costs a failover).
+
+        Args:
+            role: Agent role
+            model: The role's configured model
+
+        Returns:
+            Backends in the order to try them (empty if all circuits are open)
+        """
+        models = list(dict.fromkeys([model, *self._fallbacks.get(role, [])]))
+        now = self._clock()
+        ranked = []
+        for index, name in enumerate(models):
+            backend = self.backend(role, name)
+            if backend.state == "half_open":
+                continue  # a probe is already in flight
+            if backend.state == "open":
+                if now - backend.opened_at < self._cooldown:
+                    continue
+                ranked.append((-1.0, index, backend))
+            else:
+                ranked.append((backend.score(), index, backend))
+        return [backend for _, _, backend in sorted(ranked, key=lambda r: r[:2])]
+
+    def llm(
+        self, role: str, model: str, max_tokens: int | None = None, timeout: int = 120
+    ) -> RoutedChatModel:
+        """Create a routed client for one agent call.
+
+        Args:
+            role: Agent role
+            model: The role's configured model
+            max_tokens: Maximum tokens for the response
+            timeout: Request timeout in seconds
+
+        Returns:
+            A client with the ``astream``/``ainvoke`` interface of a chat model
+        """
+        return RoutedChatModel(self, role, model, max_tokens, timeout)
+
+    def now(self) -> float:
+        """Current time of the router's clock."""
+        return self._clock()
+
+    def start(self, backend: Backend, max_tokens: int | None, timeout: int) -> BaseChatModel:
+        """Create the client for an attempt, marking a probe of an open circuit."""
+        if backend.state == "open":
+            backend.state = "half_open"
+        return self._factory(backend.model, max_tokens, timeout)
+
+    def succeeded(
+        self, backend: Backend, ttft: float, tokens: int = 0, seconds: float = 0.0
+    ) -> None:
+        """Record a successful attempt (see Backend.record_success)."""
+        metrics.inc(
+            "llm_backend_requests_total", role=backend.role, backend=backend.model, result="ok"
+        )
+        metrics.observe("llm_backend_ttft_seconds", ttft, role=backend.role, backend=backend.model)
+        backend.record_success(ttft, tokens, seconds)
+        previous = self._serving.get(backend.role)
+        if previous != backend.model:
+            self._serving[backend.role] = backend.model
+            if previous is not None:
+                logger.info(f"Model for {backend.role} switched from {previous} to {backend.model}")
+                metrics.inc("llm_backend_switches_total", role=backend.role, backend=backend.model)
+
+    def failed(self, backend: Backend, error: Exception, failover: bool) -> None:
+        """Record a failed attempt.
+
+        Args:
+            backend: The failed backend
+            error: The error of the attempt
+            failover: Whether the call moves on to another backend
+        """
+        logger.warning(f"Model {backend.model} failed for {backend.role}: {error}")
+        metrics.inc(
+            "llm_backend_requests_total", role=backend.role, backend=backend.model, result="error"
+        )
+        if failover:
+            metrics.inc("llm_backend_failovers_total", role=backend.role, backend=backend.model)
+        backend.record_failure(self._clock(), self._threshold)
+
+    def release(self, backend: Backend) -> None:
+        """End an attempt; an abandoned probe (e.g. cancelled) leaves the circuit open."""
+        if backend.state == "half_open":
+            backend.state = "open"
+
+
+class RoutedChatModel:
+    """Chat client for one agent call that fails over between a role's backends."""
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        role: str,
+        model: str,
+        max_tokens: int | None,
+        timeout: int,
+    ) -> None:
+        """Initialize the client (see ModelRouter.llm)."""
+        self._router = router
+        self._role = role
+        self._model = model
+        self._max_tokens = max_tokens
+        self._timeout = timeout
+        self.served_model: str | None = None
+
+    async def astream(self, input: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        """Stream the response of the best backend, failing over until the first token.
+
+        Raises:
+            BackendUnavailableError: If every backend's circuit is open
+            Exception: The last backend's error if all attempts failed, or the
+                serving backend's error if it fails mid-stream
+        """
+        router = self._router
+        error: Exception = BackendUnavailableError(self._role)
+        candidates = router.candidates(self._role, self._model)
+        for index, backend in enumerate(candidates):
+            started = router.now()
+            first = last = None
+            chunks = 0
+            output_tokens = None
+            try:
+                llm = router.start(backend, self._max_tokens, self._timeout)
+                async for chunk in llm.astream(input, **kwargs):
+                    last = router.now()
+                    if first is None:
+                        first = last
+                        self.served_model = backend.model
+                    elif getattr(chunk, "content", None):
+                        chunks += 1
+                    if isinstance(usage := getattr(chunk, "usage_metadata", None), dict):
+                        output_tokens = usage.get("output_tokens")
+                    yield chunk
+            except Exception as e:
+                router.failed(backend, e, failover=first is None and index < len(candidates) - 1)
+                if first is not None:
+                    raise  # part of the answer was delivered; a retry would repeat it
+                error = e
+            else:
+                if first is None:
+                    router.succeeded(backend, router.now() - started)
+                else:
+                    tokens = output_tokens - 1 if output_tokens else chunks
+                    router.succeeded(backend, first - started, tokens, last - first)
+                return
+            finally:
+                router.release(backend)
+        raise error
+
+    async def ainvoke(self, input: Any, **kwargs: Any) -> Any:
+        """Invoke the best backend, failing over to the next one on errors.
+
+        Raises:
+            BackendUnavailableError: If every backend's circuit is open
+            Exception: The last backend's error if all attempts failed
+        """
+        router = self._router
+        error: Exception = BackendUnavailableError(self._role)
+        candidates = router.candidates(self._role, self._model)
+        for index, backend in enumerate(candidates):
+            started = router.now()
+            try:
+                llm = router.start(backend, self._max_tokens, self._timeout)
+                response = await llm.ainvoke(input, **kwargs)
+            except Exception as e:
+                router.failed(backend, e, failover=index < len(candidates) - 1)
+                error = e
+            else:
+                router.succeeded(backend, router.now() - started)
+                self.served_model = backend.model
+                return response
+            finally:
+                router.release(backend)
+        raise error
+
+
+def served_model(llm: object, default: str) -> str:
+    """Return the model that served a call, for usage accounting.
+
+    Args:
+        llm: The client returned by get_llm
+        default: The configured model, used for direct (unrouted) clients
+
+    Returns:
+        The serving backend's model for a routed client, else ``default``
+    """
+    if isinstance(llm, RoutedChatModel) and llm.served_model:
+        return llm.served_model
+    return default
+
+
+def get_model_router() -> ModelRouter:
+    """Get or create the global model router instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global ModelRouter instance
+
+    Raises:
+        ValueError: If MODEL_FALLBACKS is invalid
+    """
+    global _model_router
+    if _model_router is None:
+        from tutor.models.llm import create_llm
+
+        settings = get_settings()
+        _model_router = ModelRouter(
+            create_llm,
+            parse_model_fallbacks(settings.MODEL_FALLBACKS),
+            failure_threshold=settings.MODEL_CIRCUIT_FAILURE_THRESHOLD,
+            cooldown_seconds=settings.MODEL_CIRCUIT_COOLDOWN_SECONDS,
+        )
+    return _model_router
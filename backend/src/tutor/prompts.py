@@ -3,10 +3,20 @@ Prompt loading system for AI English Tutor.
 
 Loads prompt templates from .md files and provides variable substitution.
 Also manages level-specific instructions for different comprehension levels.
+
+Templates are parsed once into a PromptRegistry and rendered from memory;
+placeholders are validated at load time and each template exposes a content
+hash for use in cache keys. The registry can optionally poll the prompts
+directory and reload templates whose mtime changed.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
+import string
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -15,6 +25,8 @@ import yaml
 if TYPE_CHECKING:
     pass
 
+logger = logging.getLogger(__name__)
+
 # Directory paths
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 LEVEL_INSTRUCTIONS_PATH = PROMPTS_DIR / "level_instructions.yaml"
@@ -22,6 +34,270 @@ LEVEL_INSTRUCTIONS_PATH = PROMPTS_DIR / "level_instructions.yaml"
 # Cache for level instructions (YAML uses int keys for levels 1-5)
 _level_instructions_cache: dict[int, dict[str, str]] | None = None
 
+# Global prompt registry instance (lazy-initialized)
+_prompt_registry: PromptRegistry | None = None
+
+_FORMATTER = string.Formatter()
+
+# Variables each agent passes when rendering its prompt; these templates are
+# validated at startup and on reload so a bad edit fails fast
+AGENT_PROMPT_VARIABLES: dict[str, frozenset[str]] = {
+    # System messages: static per agent and level (prefix-cacheable)
+    "reading.md": frozenset({"level", "level_instructions"}),
+    "grammar.md": frozenset({"level", "level_instructions"}),
+    "vocabulary.md": frozenset({"level", "level_instructions"}),
+    # User message shared by all agents: the variable passage
+    "passage.md": frozenset({"text", "supervisor_context"}),
+}
+
+
+class PromptTemplateError(ValueError):
+    """Raised when a prompt template cannot be parsed."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A parsed prompt template."""
+
+    name: str
+    source: str
+    fields: frozenset[str]
+    content_hash: str
+    mtime_ns: int = 0
+    error: str | None = None
+
+    @classmethod
+    def parse(cls, name: str, source: str, mtime_ns: int = 0) -> PromptTemplate:
+        """Parse a template and validate its placeholders.
+
+        Args:
+            name: Template name (file name)
+            source: Template text using str.format placeholders
+            mtime_ns: Modification time of the source file
+
+        Returns:
+            The parsed template
+
+        Raises:
+            PromptTemplateError: If braces are unbalanced or a placeholder is
+                not a plain name (positional, attribute or index access)
+        """
+        fields: set[str] = set()
+        try:
+            parsed = list(_FORMATTER.parse(source))
+        except ValueError as e:
+            raise PromptTemplateError(f"Invalid prompt template {name}: {e}") from e
+        for _, field, format_spec, _ in parsed:
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise PromptTemplateError(
+                    f"Invalid placeholder {{{field}}} in prompt template {name}; "
+                    "use a plain name and escape literal braces as {{ }}"
+                )
+            if format_spec and "{" in format_spec:
+                raise PromptTemplateError(
+                    f"Nested placeholder in {{{field}:{format_spec}}} in prompt template {name}"
+                )
+            fields.add(field)
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        return cls(name, source, frozenset(fields), digest, mtime_ns)
+
+    def render(self, /, **variables) -> str:
+        """Substitute variables into the template.
+
+        Args:
+            **variables: Values for the template placeholders (extra keys are ignored)
+
+        Returns:
+            The rendered prompt
+
+        Raises:
+            PromptTemplateError: If the template failed to parse
+            KeyError: If a placeholder has no value
+        """
+        if self.error is not None:
+            raise PromptTemplateError(self.error)
+        missing = self.fields - variables.keys()
+        if missing:
+            raise KeyError(f"Missing variables for prompt {self.name}: {sorted(missing)}")
+        return self.source.format_map(variables)
+
+
+class PromptRegistry:
+    """In-memory registry of parsed prompt templates for one directory."""
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            directory: Directory containing the .md prompt templates
+        """
+        self.directory = directory
+        self._templates: dict[str, PromptTemplate] = {}
+
+    def load_all(self) -> None:
+        """Load and parse every .md template in the directory.
+
+        Files that are not valid format templates (e.g. reference text with
+        literal JSON braces) are kept with their parse error, which is raised
+        if they are rendered; use validate() for templates that must render.
+        """
+        self._templates = {
+            path.name: self._load(path) for path in sorted(self.directory.glob("*.md"))
+        }
+
+    def validate(self, required: dict[str, frozenset[str]]) -> None:
+        """Check that templates exist, parse, and only use the given variables.
+
+        Args:
+            required: Template name -> variables its caller provides
+
+        Raises:
+            FileNotFoundError: If a required template doesn't exist
+            PromptTemplateError: If any template is malformed or uses an
+                unknown placeholder (all problems are reported)
+        """
+        errors = [
+            error
+            for name, variables in required.items()
+            if (error := _check_template(self.get(name), variables)) is not None
+        ]
+        if errors:
+            raise PromptTemplateError("; ".join(errors))
+
+    def get(self, name: str) -> PromptTemplate:
+        """Return a template, loading it from disk on first use if not preloaded.
+
+        Args:
+            name: Template file name (e.g. "reading.md")
+
+        Returns:
+            The parsed template
+
+        Raises:
+            FileNotFoundError: If the template file doesn't exist
+            PromptTemplateError: If the template is malformed
+        """
+        template = self._templates.get(name)
+        if template is None:
+            path = self.directory / name
+            if not path.exists():
+                raise FileNotFoundError(f"Prompt file not found: {path}")
+            template = self._load(path)
+            self._templates = {**self._templates, name: template}
+        return template
+
+    def render(self, name: str, /, **variables) -> str:
+        """Render a template from memory.
+
+        Args:
+            name: Template file name
+            **variables: Keyword arguments for template variables
+
+        Returns:
+            Rendered prompt with variables substituted
+
+        Raises:
+            FileNotFoundError: If the template doesn't exist
+            KeyError: If a required variable is not provided
+        """
+        return self.get(name).render(**variables)
+
+    def content_hash(self, name: str) -> str:
+        """Return the content hash of a template, for use in cache keys.
+
+        Args:
+            name: Template file name
+
+        Returns:
+            Hex digest that changes whenever the template text changes
+        """
+        return self.get(name).content_hash
+
+    def reload_changed(self) -> list[str]:
+        """Reload templates whose file mtime changed and pick up new files.
+
+        A template that fails to parse, or that an agent renders and now uses
+        a variable the agent does not pass, keeps its previous version. The
+        template map is replaced in one assignment, so concurrent renders
+        see either the old or the new set. Blocking: run in a worker thread.
+
+        Returns:
+            Names of the templates that were reloaded
+        """
+        templates = dict(self._templates)
+        changed: list[str] = []
+        for path in sorted(self.directory.glob("*.md")):
+            current = templates.get(path.name)
+            try:
+                if current is not None and path.stat().st_mtime_ns == current.mtime_ns:
+                    continue
+                template = self._load(path)
+            except OSError as e:
+                logger.error(f"Keeping previous version of prompt {path.name}: {e}")
+                continue
+            required = AGENT_PROMPT_VARIABLES.get(path.name)
+            error = template.error if required is None else _check_template(template, required)
+            if error is not None and current is not None:
+                logger.error(f"Keeping previous version of prompt {path.name}: {error}")
+                continue
+            templates[path.name] = template
+            changed.append(path.name)
+        if changed:
+            self._templates = templates
+        return changed
+
+    async def watch(self, interval: float) -> None:
+        """Poll for changed templates until cancelled.
+
+        Args:
+            interval: Seconds between polls
+        """
+        while True:
+            await asyncio.sleep(interval)
+            changed = await asyncio.to_thread(self.reload_changed)
+            if changed:
+                logger.info(f"Reloaded prompt templates: {', '.join(changed)}")
+
+    @staticmethod
+    def _load(path: Path) -> PromptTemplate:
+        mtime_ns = path.stat().st_mtime_ns
+        source = path.read_text(encoding="utf-8")
+        try:
+            return PromptTemplate.parse(path.name, source, mtime_ns)
+        except PromptTemplateError as e:
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+            return PromptTemplate(path.name, source, frozenset(), digest, mtime_ns, str(e))
+
+
+def _check_template(template: PromptTemplate, variables: frozenset[str]) -> str | None:
+    """Return an error message if the template can't be rendered with ``variables``."""
+    if template.error is not None:
+        return template.error
+    unknown = template.fields - variables
+    if unknown:
+        return f"Prompt template {template.name} uses unknown placeholders: {sorted(unknown)}"
+    return None
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get or create the global prompt registry, loading all templates.
+
+    The registry is rebuilt if PROMPTS_DIR has been changed.
+
+    Returns:
+        The global PromptRegistry instance
+    """
+    global _prompt_registry
+    if _prompt_registry is None or _prompt_registry.directory != PROMPTS_DIR:
+        registry = PromptRegistry(PROMPTS_DIR)
+        registry.load_all()
+        _prompt_registry = registry
+    return _prompt_registry
+
 
 def load_prompt(prompt_name: str) -> str:
     """
@@ -46,7 +322,10 @@ def load_prompt(prompt_name: str) -> str:
 
 def render_prompt(prompt_name: str, **variables) -> str:
     """
-    Load and render a prompt with variable substitution.
+    Render a prompt with variable substitution.
+
+    Renders from the in-memory PromptRegistry; the file is only read the
+    first time (or when hot reload sees it change).
 
     Args:
         prompt_name: Name of the prompt file
@@ -59,8 +338,7 @@ def render_prompt(prompt_name: str, **variables) -> str:
         FileNotFoundError: If the prompt file doesn't exist
         KeyError: If a required variable is not provided
     """
-    template = load_prompt(prompt_name)
-    return template.format(**variables)
+    return get_prompt_registry().render(prompt_name, **variables)
 
 
 def _load_level_instructions() -> dict[str, dict[int, dict[str, str]]]:
@@ -9,72 +9,140 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from collections.abc import AsyncGenerator
+import math
+import uuid
+from collections.abc import AsyncGenerator, Callable, Iterator
+from contextlib import contextmanager, nullcontext
 from typing import cast
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.requests import HTTPConnection
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
 from tutor.agents.grammar import grammar_node
+from tutor.agents.image_processor import image_processor_node
 from tutor.agents.reading import reading_node
 from tutor.agents.supervisor import supervisor_node
 from tutor.agents.vocabulary import vocabulary_node
-from tutor.graph import graph
-from tutor.schemas import AnalyzeImageRequest, AnalyzeRequest, ChatRequest
+from tutor.config import get_settings
+from tutor.graph import get_graph
+from tutor.schemas import (
+    AnalyzeImageJobRequest,
+    AnalyzeImageRequest,
+    AnalyzeRequest,
+    ChatRequest,
+    JobRequest,
+    WSAnalyzeImageMessage,
+    WSAnalyzeMessage,
+    WSCancelMessage,
+    WSChatMessage,
+    WSMessage,
+)
 from tutor.services import session_manager
-from tutor.services.image import validate_image
+from tutor.services.admission import estimate_llm_tokens, get_admission_controller
+from tutor.services.analysis_cache import (
+    AnalysisCache,
+    AnalysisResult,
+    PassageSegment,
+    analysis_key,
+    get_analysis_cache,
+    index_sentences,
+    plan_segments,
+)
+from tutor.services.batch import (
+    BatchFormatError,
+    BatchItem,
+    BatchReport,
+    parse_batch_items,
+    run_batch,
+)
+from tutor.services.blob_store import get_blob_store
+from tutor.services.executor import run_cpu
+from tutor.services.image import (
+    MAX_IMAGE_SIZE_MB,
+    ImageValidationError,
+    check_image_bytes,
+    decode_image,
+)
+from tutor.services.jobs import Job, JobQueueFullError, get_job_manager
+from tutor.services.loop_monitor import get_loop_monitor
+from tutor.services.metrics import metrics
+from tutor.services.multiplex import OperationRejectedError, SessionMultiplexer
+from tutor.services.rate_limit import RateLimitExceededError, get_rate_limiter
+from tutor.services.readiness import get_readiness_probe
+from tutor.services.replay import (
+    ReplayGoneError,
+    StreamRun,
+    get_stream_registry,
+    parse_last_event_id,
+)
 from tutor.services.streaming import (
-    format_done_event,
-    format_error_event,
-    format_grammar_error,
-    format_grammar_token,
-    format_reading_error,
-    format_reading_token,
-    format_section_done,
-    format_vocabulary_chunk,
-    format_vocabulary_error,
-    format_vocabulary_token,
+    HEARTBEAT_INTERVAL_SECONDS,
+    SSE_HEARTBEAT_FRAME,
+    is_heartbeat,
+    sse_encoder,
+)
+from tutor.services.upload import UploadFormatError, UploadTooLargeError, read_image_upload
+from tutor.services.usage import (
+    USAGE_WINDOW_SECONDS,
+    current_usage_ledger,
+    get_usage_tracker,
+    track_request_usage,
 )
 from tutor.state import TutorState
+from tutor.utils.markdown_normalizer import normalize_reading_output
+from tutor.utils.text_segments import (
+    ParagraphAccumulator,
+    SentenceHeadingRenumberer,
+    split_sentences,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["tutor"])
 
 
-_HEARTBEAT_INTERVAL_SECONDS = 5
-_SSE_HEARTBEAT_COMMENT = ": heartbeat\n\n"
+@contextmanager
+def _stream_in_flight() -> Iterator[None]:
+    """Count an SSE response in the sse_streams_in_flight gauge while it streams."""
+    metrics.add_gauge("sse_streams_in_flight", 1)
+    try:
+        yield
+    finally:
+        metrics.add_gauge("sse_streams_in_flight", -1)
 
 
-async def _merge_agent_streams(
-    reading_queue: asyncio.Queue,
-    grammar_queue: asyncio.Queue,
-    vocab_queue: asyncio.Queue,
-) -> AsyncGenerator[str, None]:
-    """Merge 3 agent token queues into a single SSE stream using FIRST_COMPLETED.
+def _done_event(session_id: str) -> bytes:
+    """Encode the done event, with the request's token usage if enabled."""
+    ledger = current_usage_ledger()
+    usage = None
+    if ledger is not None and get_settings().USAGE_IN_DONE_EVENT:
+        usage = ledger.summary()
+    return sse_encoder.done(session_id, usage=usage)
+
+
+async def _merge_agent_streams(queues: dict[str, asyncio.Queue]) -> AsyncGenerator[bytes, None]:
+    """Merge agent token queues into a single SSE stream using FIRST_COMPLETED.
 
     Each agent delivers tokens via its queue. A None sentinel signals completion.
     Uses asyncio.wait(FIRST_COMPLETED) to interleave tokens in arrival order.
 
     Args:
-        reading_queue: Queue for reading agent tokens
-        grammar_queue: Queue for grammar agent tokens
-        vocab_queue: Queue for vocabulary agent tokens
+        queues: Token queue per stream name ("ocr", "reading", "grammar", "vocabulary")
 
     Yields:
-        Formatted SSE event strings (reading_token, grammar_token, vocabulary_token)
-        or SSE heartbeat comments on timeout.
+        Encoded SSE events ({name}_token) or SSE heartbeat comments on timeout.
     """
-    queues = {
-        "reading": reading_queue,
-        "grammar": grammar_queue,
-        "vocabulary": vocab_queue,
-    }
-    formatters = {
-        "reading": format_reading_token,
-        "grammar": format_grammar_token,
-        "vocabulary": format_vocabulary_token,
-    }
     active = set(queues.keys())
 
     while active:
@@ -85,13 +153,13 @@ async def _merge_agent_streams(
 
         done, pending = await asyncio.wait(
             list(get_tasks.values()),
-            timeout=_HEARTBEAT_INTERVAL_SECONDS,
+            timeout=HEARTBEAT_INTERVAL_SECONDS,
             return_when=asyncio.FIRST_COMPLETED,
         )
 
         if not done:
             # Timeout: no tokens arrived -> emit heartbeat
-            yield _SSE_HEARTBEAT_COMMENT
+            yield SSE_HEARTBEAT_FRAME
             for t in pending:
                 t.cancel()
             continue
@@ -109,16 +177,83 @@ async def _merge_agent_streams(
             if token is None:
                 active.discard(agent_name)
             else:
-                yield formatters[agent_name](token)
+                yield sse_encoder.token(agent_name, token)
 
         for t in pending:
             t.cancel()
 
 
+def _section_completion_events(
+    reading_outcome: dict | BaseException,
+    grammar_outcome: dict | BaseException,
+    vocab_outcome: dict | BaseException,
+) -> list[bytes]:
+    """Build the section done/error events emitted after all tokens are streamed.
+
+    Args:
+        reading_outcome: reading_node result dict or the exception it raised
+        grammar_outcome: grammar_node result dict or the exception it raised
+        vocab_outcome: vocabulary_node result dict or the exception it raised
+
+    Returns:
+        Encoded SSE events in section order
+    """
+    events = []
+
+    # Reading result
+    if isinstance(reading_outcome, Exception):
+        events.append(sse_encoder.section_error("reading", str(reading_outcome)))
+    elif isinstance(reading_outcome, dict) and reading_outcome.get("reading_error"):
+        events.append(sse_encoder.section_error("reading", reading_outcome["reading_error"]))
+    events.append(sse_encoder.section_done("reading"))
+
+    # Grammar result
+    if isinstance(grammar_outcome, Exception):
+        events.append(sse_encoder.section_error("grammar", str(grammar_outcome)))
+    elif isinstance(grammar_outcome, dict) and grammar_outcome.get("grammar_error"):
+        events.append(sse_encoder.section_error("grammar", grammar_outcome["grammar_error"]))
+    events.append(sse_encoder.section_done("grammar"))
+
+    # Vocabulary result
+    if isinstance(vocab_outcome, Exception):
+        events.append(sse_encoder.section_error("vocabulary", str(vocab_outcome)))
+    elif isinstance(vocab_outcome, dict):
+        vocab_error = vocab_outcome.get("vocabulary_error")
+        vocabulary_result = vocab_outcome.get("vocabulary_result")
+        if vocab_error:
+            events.append(sse_encoder.section_error("vocabulary", vocab_error))
+        elif vocabulary_result and hasattr(vocabulary_result, "model_dump"):
+            data = vocabulary_result.model_dump()
+            if data.get("words"):
+                events.append(sse_encoder.event("vocabulary_chunk", data))
+    events.append(sse_encoder.section_done("vocabulary"))
+
+    return events
+
+
+async def _heartbeat_until_done(task: asyncio.Task) -> AsyncGenerator[bytes, None]:
+    """Yield SSE heartbeat comments until ``task`` finishes.
+
+    The task is never cancelled here; the caller reads its result (or
+    exception) once this generator is exhausted.
+
+    Args:
+        task: The asyncio.Task to wait on
+
+    Yields:
+        SSE heartbeat comments, one per ``HEARTBEAT_INTERVAL_SECONDS`` of waiting
+    """
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=HEARTBEAT_INTERVAL_SECONDS)
+        if done:
+            return
+        yield SSE_HEARTBEAT_FRAME
+
+
 async def _stream_analyze_events(
     input_state: dict,
     session_id: str,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Stream analyze flow events using direct asyncio.Task parallel execution.
 
     Bypasses LangGraph for the analyze flow. Calls supervisor directly,
@@ -130,14 +265,20 @@ async def _stream_analyze_events(
         session_id: Session ID for the done event
 
     Yields:
-        Formatted SSE event strings
+        Encoded SSE events
     """
+    agent_tasks: list[asyncio.Task] = []
     try:
         # Step 1: Supervisor direct call (skip if supervisor_analysis already in state)
         supervisor_analysis = input_state.get("supervisor_analysis")
         if supervisor_analysis is None:
-            supervisor_result = await supervisor_node(cast(TutorState, input_state))
-            supervisor_analysis = supervisor_result.get("supervisor_analysis")
+            supervisor_task = asyncio.create_task(supervisor_node(cast(TutorState, input_state)))
+            try:
+                async for heartbeat in _heartbeat_until_done(supervisor_task):
+                    yield heartbeat
+            finally:
+                supervisor_task.cancel()
+            supervisor_analysis = supervisor_task.result().get("supervisor_analysis")
 
         agent_state = {**input_state, "supervisor_analysis": supervisor_analysis}
 
@@ -156,9 +297,12 @@ async def _stream_analyze_events(
         vocab_task = asyncio.create_task(
             vocabulary_node(cast(TutorState, agent_state), token_queue=vocab_queue)
         )
+        agent_tasks = [reading_task, grammar_task, vocab_task]
 
         # Step 4: Merge token streams from all 3 queues
-        async for sse_event in _merge_agent_streams(reading_queue, grammar_queue, vocab_queue):
+        async for sse_event in _merge_agent_streams(
+            {"reading": reading_queue, "grammar": grammar_queue, "vocabulary": vocab_queue}
+        ):
             yield sse_event
 
         # Step 5: Await all results (exceptions captured, not raised)
@@ -167,168 +311,692 @@ async def _stream_analyze_events(
         )
 
         # Step 6: Emit section done + error events
-        # Reading result
-        if isinstance(results[0], Exception):
-            yield format_reading_error(str(results[0]))
-        yield format_section_done("reading")
-
-        # Grammar result
-        if isinstance(results[1], Exception):
-            yield format_grammar_error(str(results[1]))
-        yield format_section_done("grammar")
-
-        # Vocabulary result
-        if isinstance(results[2], Exception):
-            yield format_vocabulary_error(str(results[2]))
-        else:
-            vocab_result = results[2]
-            if isinstance(vocab_result, dict):
-                vocab_error = vocab_result.get("vocabulary_error")
-                vocabulary_result = vocab_result.get("vocabulary_result")
-                if vocab_error:
-                    yield format_vocabulary_error(vocab_error)
-                elif vocabulary_result and hasattr(vocabulary_result, "model_dump"):
-                    data = vocabulary_result.model_dump()
-                    if data.get("words"):
-                        yield format_vocabulary_chunk(data)
-        yield format_section_done("vocabulary")
-
-        yield format_done_event(session_id)
+        for sse_event in _section_completion_events(*results):
+            yield sse_event
+
+        yield _done_event(session_id)
 
     except asyncio.CancelledError:
         raise
     except Exception as e:
         logger.error(f"Error in _stream_analyze_events: {e}")
-        yield format_error_event(str(e), "processing_error")
+        yield sse_encoder.error(str(e), "processing_error")
+    finally:
+        # Stop the agents if the stream is closed early (e.g. a cancelled job)
+        for task in agent_tasks:
+            task.cancel()
+
+
+async def _relay_segments(segments: asyncio.Queue, out_queue: asyncio.Queue) -> None:
+    """Forward per-segment agent tokens to one queue, in segment order.
+
+    Tokens of a later segment are held until every earlier segment has
+    finished, and ``### 문장 N`` headings are renumbered so that sentence
+    numbers continue across segments.
+
+    Args:
+        segments: Queue of per-segment token queues; None marks the last segment
+        out_queue: Destination token queue; receives a None sentinel at the end
+    """
+    renumberer = SentenceHeadingRenumberer()
+    emitted = False
+    try:
+        while (segment_queue := await segments.get()) is not None:
+            renumberer.start_segment()
+            separator = "\n\n" if emitted else ""
+            while (token := await segment_queue.get()) is not None:
+                if text := renumberer.feed(token):
+                    await out_queue.put(separator + text)
+                    separator = ""
+                    emitted = True
+            if text := renumberer.flush():
+                await out_queue.put(separator + text)
+                emitted = True
+    finally:
+        out_queue.put_nowait(None)  # sentinel: relay complete
+
+
+async def _analyze_segment(
+    segment_state: dict,
+    reading_queue: asyncio.Queue,
+    grammar_queue: asyncio.Queue,
+) -> list[dict | BaseException]:
+    """Run supervisor, then reading and grammar, on one OCR paragraph segment.
+
+    Args:
+        segment_state: State dict whose input_text is the paragraph segment
+        reading_queue: Token queue for this segment's reading output
+        grammar_queue: Token queue for this segment's grammar output
+
+    Returns:
+        [reading outcome, grammar outcome], each a result dict or exception
+    """
+    try:
+        supervisor_result = await supervisor_node(cast(TutorState, segment_state))
+    except BaseException:
+        reading_queue.put_nowait(None)
+        grammar_queue.put_nowait(None)
+        raise
+    agent_state = {
+        **segment_state,
+        "supervisor_analysis": supervisor_result.get("supervisor_analysis"),
+    }
+    outcomes = await asyncio.gather(
+        reading_node(cast(TutorState, agent_state), token_queue=reading_queue),
+        grammar_node(cast(TutorState, agent_state), token_queue=grammar_queue),
+        return_exceptions=True,
+    )
+    # Agents always send their sentinel; make sure a raised exception does too
+    for outcome, queue in zip(outcomes, (reading_queue, grammar_queue), strict=True):
+        if isinstance(outcome, BaseException):
+            queue.put_nowait(None)
+    return outcomes
+
+
+def _combine_segment_outcomes(
+    segment_outcomes: list[list[dict | BaseException] | BaseException],
+) -> tuple[dict | BaseException, dict | BaseException]:
+    """Reduce per-segment outcomes to one reading and one grammar outcome.
+
+    Args:
+        segment_outcomes: _analyze_segment results (or the exception it raised)
+
+    Returns:
+        (reading outcome, grammar outcome): the last failure of each section,
+        or an empty dict if every segment succeeded
+    """
+    combined: list[dict | BaseException] = [{}, {}]
+    for outcome in segment_outcomes:
+        if isinstance(outcome, BaseException):
+            return outcome, outcome
+        for i, section in enumerate(("reading", "grammar")):
+            if isinstance(outcome[i], BaseException) or outcome[i].get(f"{section}_error"):
+                combined[i] = outcome[i]
+    return combined[0], combined[1]
+
+
+async def _stream_image_events(
+    input_state: dict,
+    session_id: str,
+) -> AsyncGenerator[bytes, None]:
+    """Stream image flow events, pipelining analysis behind streaming OCR.
+
+    Calls image_processor_node directly (no LangGraph) with a token queue so
+    the transcription is streamed to the client as ``ocr_token`` events.
+    Each completed paragraph is analyzed as soon as it arrives (supervisor,
+    then reading and grammar), and the per-paragraph outputs are relayed in
+    order with continuous sentence numbering. Vocabulary selection needs the
+    whole passage, so the vocabulary agent starts once OCR has finished.
+
+    The image blob referenced by ``image_ref`` is owned by this pipeline
+    and released as soon as OCR finishes, before the analysis runs.
+
+    Args:
+        input_state: The state dict with image_ref (or image_data), mime_type, level, etc.
+        session_id: Session ID for the done event
+
+    Yields:
+        Encoded SSE events
+    """
+    settings = get_settings()
+
+    # The agents never need the image itself
+    analysis_state = {
+        **input_state,
+        "task_type": "analyze",
+        "image_data": None,
+        "image_ref": None,
+    }
+
+    ocr_queue: asyncio.Queue = asyncio.Queue()
+    ocr_out: asyncio.Queue = asyncio.Queue()
+    reading_segments: asyncio.Queue = asyncio.Queue()
+    grammar_segments: asyncio.Queue = asyncio.Queue()
+    reading_queue: asyncio.Queue = asyncio.Queue()
+    grammar_queue: asyncio.Queue = asyncio.Queue()
+    vocab_queue: asyncio.Queue = asyncio.Queue()
+
+    segment_tasks: list[asyncio.Task] = []
+    ocr_task = asyncio.create_task(
+        image_processor_node(cast(TutorState, input_state), token_queue=ocr_queue)
+    )
+    # Guarantee the pump's sentinel even if OCR fails before sending its own
+    ocr_task.add_done_callback(lambda _: ocr_queue.put_nowait(None))
+    if image_ref := input_state.get("image_ref"):
+        ocr_task.add_done_callback(lambda _: get_blob_store().release(image_ref))
+    relay_tasks = [
+        asyncio.create_task(_relay_segments(reading_segments, reading_queue)),
+        asyncio.create_task(_relay_segments(grammar_segments, grammar_queue)),
+    ]
+
+    def _launch_segment(paragraph: str) -> None:
+        segment_reading: asyncio.Queue = asyncio.Queue()
+        segment_grammar: asyncio.Queue = asyncio.Queue()
+        reading_segments.put_nowait(segment_reading)
+        grammar_segments.put_nowait(segment_grammar)
+        segment_tasks.append(asyncio.create_task(
+            _analyze_segment(
+                {**analysis_state, "input_text": paragraph}, segment_reading, segment_grammar
+            )
+        ))
+
+    async def _pump_ocr() -> asyncio.Task | None:
+        """Relay OCR tokens, launch paragraph segments, then start vocabulary."""
+        vocab_task = None
+        paragraphs = ParagraphAccumulator(min_chars=settings.OCR_SEGMENT_MIN_CHARS)
+        try:
+            while (token := await ocr_queue.get()) is not None:
+                ocr_out.put_nowait(token)
+                for paragraph in paragraphs.feed(token):
+                    _launch_segment(paragraph)
+            ocr_out.put_nowait(None)
+
+            extracted_text = (await ocr_task).get("extracted_text", "")
+            if extracted_text and (tail := paragraphs.flush()):
+                _launch_segment(tail)
+            reading_segments.put_nowait(None)
+            grammar_segments.put_nowait(None)
+
+            if extracted_text:
+                vocab_task = asyncio.create_task(vocabulary_node(
+                    cast(TutorState, {**analysis_state, "input_text": extracted_text}),
+                    token_queue=vocab_queue,
+                ))
+            return vocab_task
+        except BaseException:
+            # OCR failed: stop all downstream work so the merged stream ends
+            for task in (*segment_tasks, *relay_tasks):
+                task.cancel()
+            for queue in (ocr_out, reading_queue, grammar_queue):
+                queue.put_nowait(None)
+            raise
+        finally:
+            if vocab_task is None:
+                vocab_queue.put_nowait(None)
+
+    pump_task = asyncio.create_task(_pump_ocr())
+    try:
+        async for sse_event in _merge_agent_streams({
+            "ocr": ocr_out,
+            "reading": reading_queue,
+            "grammar": grammar_queue,
+            "vocabulary": vocab_queue,
+        }):
+            yield sse_event
+
+        vocab_task = await pump_task
+        if vocab_task is None:
+            # No text was extracted from the image - emit done event only
+            yield _done_event(session_id)
+            return
+
+        segment_outcomes = await asyncio.gather(*segment_tasks, return_exceptions=True)
+        reading_outcome, grammar_outcome = _combine_segment_outcomes(segment_outcomes)
+        (vocab_outcome,) = await asyncio.gather(vocab_task, return_exceptions=True)
+
+        for sse_event in _section_completion_events(
+            reading_outcome, grammar_outcome, vocab_outcome
+        ):
+            yield sse_event
+        yield _done_event(session_id)
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        yield sse_encoder.error(str(e), "processing_error")
+    finally:
+        for task in (ocr_task, pump_task, *relay_tasks, *segment_tasks):
+            task.cancel()
+
+
+async def _stream_incremental_events(
+    input_state: dict,
+    session_id: str,
+    segments: list[PassageSegment],
+) -> AsyncGenerator[bytes, None]:
+    """Stream a text analysis that reuses cached reading sections.
+
+    The supervisor runs once on the whole passage. Cached sentences are
+    replayed from the sentence cache and each run of new or changed
+    sentences is read as one segment; reading is relayed in passage order
+    with continuous sentence numbering, and the new sections are cached per
+    sentence afterwards. Grammar selects 3-5 sentences and vocabulary its
+    words from the whole passage, so both still run on all of it and the
+    grammar selection holds exactly as in a full analysis.
+
+    Args:
+        input_state: The state dict with input_text, level, etc.
+        session_id: Session ID for the done event
+        segments: The passage split by plan_segments
+
+    Yields:
+        Encoded SSE events
+    """
+    tasks: list[asyncio.Task] = []
+    try:
+        supervisor_task = asyncio.create_task(supervisor_node(cast(TutorState, input_state)))
+        try:
+            async for heartbeat in _heartbeat_until_done(supervisor_task):
+                yield heartbeat
+        finally:
+            supervisor_task.cancel()
+        supervisor_analysis = supervisor_task.result().get("supervisor_analysis")
+        agent_state = {**input_state, "supervisor_analysis": supervisor_analysis}
+        # Segments keep the passage-level focus but count their own sentences
+        # for the token budget
+        segment_analysis = (
+            supervisor_analysis.model_copy(update={"sentences": []})
+            if supervisor_analysis is not None
+            else None
+        )
+
+        reading_segments: asyncio.Queue = asyncio.Queue()
+        reading_queue: asyncio.Queue = asyncio.Queue()
+        grammar_queue: asyncio.Queue = asyncio.Queue()
+        vocab_queue: asyncio.Queue = asyncio.Queue()
+
+        generated: list[tuple[PassageSegment, asyncio.Task]] = []
+        for segment in segments:
+            segment_queue: asyncio.Queue = asyncio.Queue()
+            reading_segments.put_nowait(segment_queue)
+            if segment.cached is not None:
+                segment_queue.put_nowait(segment.cached)
+                segment_queue.put_nowait(None)
+                continue
+            segment_state = {
+                **agent_state,
+                "input_text": " ".join(segment.sentences),
+                "supervisor_analysis": segment_analysis,
+            }
+            generated.append((segment, asyncio.create_task(
+                reading_node(cast(TutorState, segment_state), token_queue=segment_queue)
+            )))
+        reading_segments.put_nowait(None)
+
+        grammar_task = asyncio.create_task(
+            grammar_node(cast(TutorState, agent_state), token_queue=grammar_queue)
+        )
+        vocab_task = asyncio.create_task(
+            vocabulary_node(cast(TutorState, agent_state), token_queue=vocab_queue)
+        )
+        tasks = [
+            asyncio.create_task(_relay_segments(reading_segments, reading_queue)),
+            grammar_task,
+            vocab_task,
+            *(task for _, task in generated),
+        ]
+        metrics.inc("sentence_segments_generated_total", len(generated))
+
+        async for sse_event in _merge_agent_streams(
+            {"reading": reading_queue, "grammar": grammar_queue, "vocabulary": vocab_queue}
+        ):
+            yield sse_event
+
+        reading_outcomes = await asyncio.gather(
+            *(task for _, task in generated), return_exceptions=True
+        )
+        grammar_outcome, vocab_outcome = await asyncio.gather(
+            grammar_task, vocab_task, return_exceptions=True
+        )
+        await asyncio.to_thread(
+            _index_segment_sentences,
+            get_analysis_cache(),
+            [segment for segment, _ in generated],
+            reading_outcomes,
+            input_state["level"],
+        )
+
+        # Report the last failed reading segment, if any
+        reading_outcome: dict | BaseException = {}
+        for outcome in reading_outcomes:
+            if isinstance(outcome, BaseException) or outcome.get("reading_error"):
+                reading_outcome = outcome
+        for sse_event in _section_completion_events(
+            reading_outcome, grammar_outcome, vocab_outcome
+        ):
+            yield sse_event
+        yield _done_event(session_id)
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Error in _stream_incremental_events: {e}")
+        yield sse_encoder.error(str(e), "processing_error")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _index_segment_sentences(
+    cache: AnalysisCache,
+    segments: list[PassageSegment],
+    reading_outcomes: list[dict | BaseException],
+    level: int,
+) -> None:
+    """Cache the per-sentence reading sections of successfully read segments."""
+    for segment, outcome in zip(segments, reading_outcomes, strict=True):
+        if isinstance(outcome, dict) and not outcome.get("reading_error") and (
+            result := outcome.get("reading_result")
+        ):
+            index_sentences(cache, segment.sentences, level, result.content)
+
+
+def _index_result_sentences(
+    cache: AnalysisCache, sentences: list[str], level: int, result: AnalysisResult
+) -> None:
+    """Cache the per-sentence reading sections of a whole-passage analysis."""
+    reading = normalize_reading_output("".join(result.text["reading"]))
+    index_sentences(cache, sentences, level, reading)
+
+
+async def _cached_analyze_events(
+    input_state: dict,
+    session_id: str,
+) -> AsyncGenerator[bytes, None]:
+    """Serve a text analysis from the analysis cache, or run it and cache the result.
+
+    On a miss with SENTENCE_CACHE_ENABLED, sentences whose reading sections
+    are already cached are reused and only the others are read. Only
+    complete results without section errors are stored.
+
+    Args:
+        input_state: The state dict with input_text and level
+        session_id: Session ID for the done event
+
+    Yields:
+        Encoded SSE events
+    """
+    cache = get_analysis_cache()
+    level = input_state["level"]
+    key = analysis_key(input_state["input_text"], level)
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        for event in cached.replay_events():
+            yield event
+        yield _done_event(session_id)
+        return
+
+    sentences: list[str] = []
+    segments: list[PassageSegment] = []
+    if get_settings().SENTENCE_CACHE_ENABLED:
+        sentences = split_sentences(input_state["input_text"])
+        segments = await asyncio.to_thread(plan_segments, cache, sentences, level)
+    incremental = any(segment.cached is not None for segment in segments)
+    if incremental:
+        stream = _stream_incremental_events(input_state, session_id, segments)
+    else:
+        stream = _stream_analyze_events(input_state, session_id)
 
+    result = AnalysisResult()
+    async for event in stream:
+        if not is_heartbeat(event):
+            result.feed(event)
+        yield event
+    if result.complete and not result.errors:
+        await asyncio.to_thread(cache.put, key, level, result)
+        if sentences and not incremental:
+            await asyncio.to_thread(_index_result_sentences, cache, sentences, level, result)
 
-async def _stream_graph_events(input_state: dict, session_id: str) -> AsyncGenerator[str, None]:
-    """Stream graph events as SSE tokens.
+
+async def _stream_tutor_events(input_state: dict, session_id: str) -> AsyncGenerator[bytes, None]:
+    """Stream tutor flow events as SSE tokens.
 
     For analyze task_type: Uses direct asyncio.Task parallel execution (SPEC-VOCAB-003).
     Reading, grammar, and vocabulary agents are run as concurrent asyncio.Tasks,
     each streaming tokens via their own asyncio.Queue.
 
-    For image_process task_type: Streams LangGraph events for OCR+supervisor,
-    then delegates to _stream_analyze_events with captured state.
+    For image_process task_type: Streams OCR directly (no LangGraph) and
+    analyzes each completed paragraph while the transcription continues.
+
+    With ADMISSION_CONTROL_ENABLED the pipeline's estimated LLM work is
+    reserved while it runs, and a pipeline started under high load is
+    streamed final-only.
 
     Args:
         input_state: The initial state dict
         session_id: The session ID for the done event
 
     Yields:
-        Formatted SSE event strings
+        Encoded SSE events
     """
-    task_type = input_state.get("task_type", "analyze")
+    if input_state.get("task_type", "analyze") == "image_process":
+        stream = _stream_image_events(input_state, session_id)
+    elif get_settings().ANALYSIS_CACHE_ENABLED:
+        stream = _cached_analyze_events(input_state, session_id)
+    else:
+        stream = _stream_analyze_events(input_state, session_id)
 
-    if task_type == "analyze":
-        # Direct asyncio.Task execution, no LangGraph
-        async for event in _stream_analyze_events(input_state, session_id):
+    if get_settings().ADMISSION_CONTROL_ENABLED:
+        admission = get_admission_controller().admit(estimate_llm_tokens(input_state))
+    else:
+        admission = nullcontext(False)
+
+    with (
+        admission as degraded,
+        _stream_in_flight(),
+        track_request_usage(session_id, input_state.get("level")),
+    ):
+        if degraded:
+            stream = _final_only_events(stream)
+        async for event in stream:
             yield event
-        return
 
-    # image_process: run image_processor + supervisor via LangGraph
-    # then delegate to _stream_analyze_events with captured state
-    extracted_text = ""
-    supervisor_analysis = None
 
+async def _final_only_events(events: AsyncGenerator[bytes, None]) -> AsyncGenerator[bytes, None]:
+    """Collapse each section's token events into one, sent as the section ends.
+
+    Degraded responses under high load: the client receives the events of a
+    cached analysis (one token event per section) and the server writes a
+    handful of frames instead of one per LLM token.
+
+    Args:
+        events: Encoded SSE events of a pipeline
+
+    Yields:
+        The same events with each section's tokens joined
+    """
+    tokens: dict[str, list[str]] = {}
+    async for event in events:
+        if is_heartbeat(event):
+            yield event
+            continue
+        header, _, body = event.partition(b"\n")
+        event_type = header.removeprefix(b"event: ").decode()
+        section, _, suffix = event_type.rpartition("_")
+        if suffix == "token":
+            tokens.setdefault(section, []).append(json.loads(body.removeprefix(b"data: "))["token"])
+            continue
+        if event_type in ("done", "error"):
+            for name, parts in tokens.items():
+                yield sse_encoder.token(name, "".join(parts))
+            tokens.clear()
+        elif suffix in ("done", "error") and section in tokens:
+            yield sse_encoder.token(section, "".join(tokens.pop(section)))
+        yield event
+    for name, parts in tokens.items():
+        yield sse_encoder.token(name, "".join(parts))
+
+
+async def _follow_run(run: StreamRun, after: int = 0) -> AsyncGenerator[bytes, None]:
+    """Relay a detached run's events to one connection.
+
+    Events that are already buffered (a reconnect, or a burst while the
+    client was slow) are written as one chunk.
+
+    Args:
+        run: The run to follow
+        after: Sequence number of the last event the client already has
+
+    Yields:
+        SSE events with ids, heartbeat comments, or a final stream_gone error
+        if the client fell behind the replay buffer
+    """
     try:
-        async for event in _stream_with_heartbeat(input_state):
-            if event is None:
-                yield _SSE_HEARTBEAT_COMMENT
-                continue
+        async for chunk in run.subscribe(after, coalesce=True):
+            yield chunk
+    except ReplayGoneError as e:
+        yield sse_encoder.error(str(e), "stream_gone")
 
-            kind = event["event"]
 
-            # Capture extracted text from image_processor
-            if kind == "on_chain_end" and event.get("name") == "image_processor":
-                output = event.get("data", {}).get("output", {})
-                extracted_text = output.get("extracted_text", "")
+def _sse_response(events: AsyncGenerator[bytes, None], session_id: str) -> StreamingResponse:
+    """Wrap an SSE event stream in a response that names its session.
 
-            # Capture supervisor analysis (may fire twice; take the latest)
-            if kind == "on_chain_end" and event.get("name") == "supervisor":
-                output = event.get("data", {}).get("output", {})
-                analysis = output.get("supervisor_analysis")
-                if analysis is not None:
-                    supervisor_analysis = analysis
+    Args:
+        events: The SSE events to send
+        session_id: Session id, sent as X-Session-Id so clients can resume early
 
-        # Graph stream ended. Now stream the analyze phase.
-        if not extracted_text:
-            # No text was extracted from the image - emit done event only
-            yield format_done_event(session_id)
-            return
+    Returns:
+        StreamingResponse with SSE headers
+    """
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Session-Id": session_id,
+        },
+    )
 
-        analyze_state = {
-            **input_state,
-            "input_text": extracted_text,
-            "task_type": "analyze",
-            "supervisor_analysis": supervisor_analysis,
-        }
-        async for event in _stream_analyze_events(analyze_state, session_id):
-            yield event
 
-    except asyncio.CancelledError:
-        raise
-    except Exception as e:
-        yield format_error_event(str(e), "processing_error")
+def _analyze_state(text: str, level: int, session_id: str) -> dict:
+    """Build the initial state of a text analysis."""
+    return {
+        "messages": [],
+        "level": level,
+        "session_id": session_id,
+        "input_text": text,
+        "task_type": "analyze",
+    }
 
 
-async def _stream_with_heartbeat(input_state: dict) -> AsyncGenerator[dict | None]:
-    """Wrap graph.astream_events with periodic heartbeat signals.
+def _image_state(image_ref: str, mime_type: str, level: int, session_id: str) -> dict:
+    """Build the initial state of an image analysis of a stored image blob."""
+    return {
+        "messages": [],
+        "level": level,
+        "session_id": session_id,
+        "input_text": "",
+        "task_type": "image_process",
+        "image_ref": image_ref,
+        "mime_type": mime_type,
+    }
+
+
+async def _decode_image_request(image_data: str, mime_type: str) -> tuple[bytes, str]:
+    """Validate and decode a base64 image (off the loop for large payloads).
+
+    Raises:
+        HTTPException: 400 if the image is invalid
+    """
+    try:
+        return await run_cpu(decode_image, image_data, mime_type, size=len(image_data))
+    except ImageValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+
+def _resume_response(run: StreamRun, last_event_id: str | None) -> StreamingResponse:
+    """Build the SSE response that replays a run after Last-Event-ID.
+
+    Raises:
+        HTTPException: 400 if Last-Event-ID is invalid, 410 if the events
+            after it were evicted from the replay buffer
+    """
+    try:
+        after = parse_last_event_id(last_event_id, run.session_id) if last_event_id else 0
+        run.check_available(after)
+    except ValueError as e:
+        metrics.inc("stream_resumes_total", result="invalid")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except ReplayGoneError as e:
+        metrics.inc("stream_resumes_total", result="gone")
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e)) from e
 
-    Yields graph events as they arrive. When no event arrives within
-    ``_HEARTBEAT_INTERVAL_SECONDS``, yields ``None`` to signal that the
-    caller should emit an SSE keep-alive comment.
+    metrics.inc("stream_resumes_total", result="ok")
+    return _sse_response(_follow_run(run, after), run.session_id)
+
+
+def _start_tutor_stream(input_state: dict, session_id: str) -> StreamingResponse:
+    """Run the tutor pipeline detached from the connection and stream its events.
+
+    The pipeline keeps running if the client disconnects; the client can
+    reconnect to /tutor/streams/{session_id} with Last-Event-ID.
 
     Args:
-        input_state: The initial state dict forwarded to the graph.
+        input_state: The initial state dict
+        session_id: The session ID of the run
 
-    Yields:
-        A graph event dict, or ``None`` when the heartbeat interval elapses.
+    Returns:
+        StreamingResponse with SSE events
     """
-    queue: asyncio.Queue = asyncio.Queue()
+    run = get_stream_registry().start(session_id, _stream_tutor_events(input_state, session_id))
+    return _sse_response(_follow_run(run), session_id)
 
-    async def _producer() -> None:
-        async for event in graph.astream_events(
-            input_state, version="v2", config={"recursion_limit": 50}
-        ):
-            await queue.put(event)
-        await queue.put(None)  # sentinel indicating stream end
 
-    task = asyncio.create_task(_producer())
+def _client_ip(connection: HTTPConnection) -> str | None:
+    """Return the client address (from X-Forwarded-For if RATE_LIMIT_TRUST_FORWARDED)."""
+    if get_settings().RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = connection.headers.get("x-forwarded-for", "").split(",")[0].strip()
+        if forwarded:
+            return forwarded
+    return connection.client.host if connection.client else None
+
+
+async def _charge_rate_limit(
+    endpoint: str,
+    cost_state: dict,
+    connection: HTTPConnection,
+    session_id: str | None = None,
+) -> None:
+    """Charge a request's estimated LLM tokens to its client's token buckets.
+
+    Args:
+        endpoint: Rate-limited endpoint name ("analyze", "analyze_image", "chat")
+        cost_state: State fields the cost is estimated from (task_type,
+            input_text, level)
+        connection: The request or WebSocket, for the client address
+        session_id: Session the request belongs to, if any
+
+    Raises:
+        RateLimitExceededError: If a bucket of the client is exhausted
+    """
+    if get_settings().RATE_LIMIT_ENABLED:
+        await get_rate_limiter().charge(
+            endpoint, estimate_llm_tokens(cost_state), _client_ip(connection), session_id
+        )
+
 
+async def _enforce_rate_limit(
+    endpoint: str,
+    cost_state: dict,
+    connection: HTTPConnection,
+    session_id: str | None = None,
+) -> None:
+    """Charge an HTTP request to its client's token buckets (see _charge_rate_limit).
+
+    Raises:
+        HTTPException: 429 with Retry-After if a bucket of the client is exhausted
+    """
     try:
-        while True:
-            try:
-                event = await asyncio.wait_for(
-                    queue.get(), timeout=_HEARTBEAT_INTERVAL_SECONDS
-                )
-                if event is None:
-                    # Producer finished; stop iteration
-                    break
-                yield event
-            except TimeoutError:
-                # Check if producer task failed before sending heartbeat
-                if task.done() and not task.cancelled():
-                    try:
-                        task.result()  # raises if producer had an exception
-                    except Exception:
-                        break
-                yield None  # heartbeat signal
-    finally:
-        if not task.done():
-            task.cancel()
-            try:
-                await task
-            except (asyncio.CancelledError, Exception):
-                pass
+        await _charge_rate_limit(endpoint, cost_state, connection, session_id)
+    except RateLimitExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        ) from e
 
 
 @router.get("/health")
 async def health() -> dict:
     """Health check endpoint.
 
-    Returns service status and connectivity information.
+    Returns service status and the LLM connectivity seen by the most recent
+    readiness check ("unknown" until one has run). Never probes anything
+    itself; use /health/ready for that.
 
     Returns:
         Dict with status, LLM connectivity status, and version
@@ -341,15 +1009,134 @@ async def health() -> dict:
             "version": "0.1.0"
         }
     """
+    checks = get_readiness_probe().last_checks or {}
+    llm = checks.get("llm")
     return {
         "status": "healthy",
-        "openai": "connected",  # In production, would actually check connectivity
+        "openai": "unknown" if llm is None else "connected" if llm.ok else "unreachable",
         "version": "0.1.0",
     }
 
 
+@router.get("/health/live")
+async def health_live() -> dict:
+    """Liveness probe: the process is up and the event loop is responsive.
+
+    Returns:
+        Dict with status "alive"
+    """
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def health_ready() -> JSONResponse:
+    """Readiness probe: the instance can serve the first token quickly.
+
+    Checks that prompt templates and level instructions are loaded, the
+    session store answers and the LLM connection pools are warm. Check
+    results are cached for READINESS_CACHE_SECONDS; event-loop lag and the
+    in-flight stream count are measured on every call.
+
+    Returns:
+        200 with the readiness report if every check passed, else 503
+
+    Example:
+        >>> GET /api/v1/health/ready
+        {
+            "ready": true,
+            "checks": {"prompts": {"ok": true, "detail": "...", "latency_ms": 0.4}, ...},
+            "event_loop_lag_ms": 0.05,
+            "streams_in_flight": 3,
+            "checked_seconds_ago": 1.2
+        }
+    """
+    report = await get_readiness_probe().check()
+    return JSONResponse(
+        report,
+        status_code=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict:
+    """Return a snapshot of in-process metrics.
+
+    Returns:
+        Dict with "counters", "gauges" and "summaries" keyed by series name
+
+    Example:
+        >>> GET /api/v1/metrics
+        {
+            "counters": {"ocr_cache_lookups_total{result=hit}": 12.0},
+            "gauges": {"ocr_cache_entries": 40.0},
+            "summaries": {}
+        }
+    """
+    return metrics.snapshot()
+
+
+@router.get("/debug/loop-stalls")
+async def get_loop_stalls() -> dict:
+    """Return recent event-loop stalls caught by the blocking-call detector.
+
+    Empty unless LOOP_BLOCK_DETECTOR is enabled.
+
+    Returns:
+        Dict with "enabled" and "stalls" (newest first, each with the task that
+        held the loop, its duration and stack samples)
+    """
+    monitor = get_loop_monitor()
+    return {"enabled": monitor.detector_enabled, "stalls": monitor.recent_stalls()}
+
+
+@router.get("/usage")
+async def get_usage(
+    window: int = Query(default=300, ge=60, le=USAGE_WINDOW_SECONDS),
+) -> dict:
+    """Return LLM token usage and estimated cost of recently finished requests.
+
+    Args:
+        window: Look-back window in seconds (one-minute resolution)
+
+    Returns:
+        Dict with "window_seconds" and "total", "by_agent" and "by_level" totals
+
+    Example:
+        >>> GET /api/v1/usage?window=300
+        {
+            "window_seconds": 300,
+            "total": {"calls": 4, "input_tokens": 5120, "cost_usd": 0.0012, ...},
+            "by_agent": {"reading": {...}, "grammar": {...}},
+            "by_level": {"3": {...}}
+        }
+    """
+    return {"window_seconds": window, **get_usage_tracker().window_totals(window)}
+
+
+@router.get("/usage/sessions/{session_id}")
+async def get_session_usage(session_id: str) -> dict:
+    """Return LLM token usage and estimated cost of one session.
+
+    Args:
+        session_id: The session to report
+
+    Returns:
+        Dict with "session_id" and "total", "by_agent" and "by_level" totals
+
+    Raises:
+        HTTPException: 404 if no usage was recorded for the session
+    """
+    totals = get_usage_tracker().session_totals(session_id)
+    if totals is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No usage recorded for this session",
+        )
+    return {"session_id": session_id, **totals}
+
+
 @router.post("/tutor/analyze")
-async def analyze(request: AnalyzeRequest) -> StreamingResponse:
+async def analyze(request: AnalyzeRequest, http_request: Request) -> StreamingResponse:
     """Analyze text and stream results via Server-Sent Events.
 
     Executes reading, grammar, and vocabulary agents as concurrent asyncio.Tasks
@@ -358,10 +1145,14 @@ async def analyze(request: AnalyzeRequest) -> StreamingResponse:
 
     Args:
         request: AnalyzeRequest containing text and proficiency level
+        http_request: The HTTP request, for rate limiting by client
 
     Returns:
         StreamingResponse with SSE events
 
+    Raises:
+        HTTPException: 429 if the client's rate limit is exhausted
+
     SSE Events:
         - reading_token: Individual token from reading agent LLM stream
         - grammar_token: Individual token from grammar agent LLM stream
@@ -376,6 +1167,10 @@ async def analyze(request: AnalyzeRequest) -> StreamingResponse:
         - done: Session completion with session_id
         - error: Critical error information if processing fails
 
+    Every event carries an ``id: <session_id>:<seq>`` field and the session id
+    is sent in the X-Session-Id header; after a dropped connection, resume with
+    GET /tutor/streams/{session_id} and Last-Event-ID.
+
     Example:
         >>> POST /api/v1/tutor/analyze
         {
@@ -383,45 +1178,33 @@ async def analyze(request: AnalyzeRequest) -> StreamingResponse:
             "level": 3
         }
     """
-
-    async def generate() -> AsyncGenerator[str]:
-        """Generate SSE events from LangGraph execution."""
-        session_id = session_manager.create()
-        input_state = {
-            "messages": [],
-            "level": request.level,
-            "session_id": session_id,
-            "input_text": request.text,
-            "task_type": "analyze",
-        }
-        async for event in _stream_graph_events(input_state, session_id):
-            yield event
-
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-        },
+    await _enforce_rate_limit(
+        "analyze", {"input_text": request.text, "level": request.level}, http_request
     )
+    session_id = session_manager.create()
+    input_state = _analyze_state(request.text, request.level, session_id)
+    return _start_tutor_stream(input_state, session_id)
 
 
 @router.post("/tutor/analyze-image")
-async def analyze_image(request: AnalyzeImageRequest) -> StreamingResponse:
+async def analyze_image(
+    request: AnalyzeImageRequest, http_request: Request
+) -> StreamingResponse:
     """Analyze image and stream results via Server-Sent Events.
 
-    Processes the image to extract text, then runs the LangGraph pipeline
-    with the extracted text. Results are streamed as SSE events.
+    Extracts text from the image with a direct OCR call, then runs the
+    analyze pipeline on the extracted text. Results are streamed as SSE events.
 
     Args:
         request: AnalyzeImageRequest containing base64 image data and level
+        http_request: The HTTP request, for rate limiting by client
 
     Returns:
         StreamingResponse with SSE events
 
     Raises:
-        HTTPException: If image validation fails (400 status)
+        HTTPException: If image validation fails (400 status) or the client's
+            rate limit is exhausted (429 status)
 
     SSE Events:
         - Same as /tutor/analyze endpoint
@@ -434,41 +1217,335 @@ async def analyze_image(request: AnalyzeImageRequest) -> StreamingResponse:
             "level": 3
         }
     """
-    # Validate image
-    is_valid, error_msg = validate_image(request.image_data, request.mime_type)
-    if not is_valid:
+    await _enforce_rate_limit("analyze_image", {"task_type": "image_process"}, http_request)
+    # Validate and decode once; the decoded buffer is reused for OCR preprocessing
+    image_bytes, mime_type = await _decode_image_request(request.image_data, request.mime_type)
+    return _image_stream_response(image_bytes, mime_type, request.level)
+
+
+@router.post("/tutor/analyze-image/upload")
+async def analyze_image_upload(
+    request: Request,
+    level: int | None = Query(None, ge=1, le=5, description="English proficiency level (1-5)"),
+) -> StreamingResponse:
+    """Analyze an uploaded image file and stream results via Server-Sent Events.
+
+    Binary variant of /tutor/analyze-image that avoids the 33% base64
+    inflation and the JSON string copies. Accepts either:
+    - multipart/form-data with the image in a "file" part (and optionally a
+      "level" field), or
+    - a raw application/octet-stream or image/* body with ?level= in the query.
+
+    The body is streamed into a spooled buffer with the size limit enforced
+    while reading, and the image type is detected from its content.
+
+    Args:
+        request: The raw request whose body carries the image
+        level: English proficiency level (1-5); may instead be a form field
+
+    Returns:
+        StreamingResponse with SSE events
+
+    Raises:
+        HTTPException: 413 if the image is too large, 400 if the body or
+            image is invalid, 422 if level is missing or out of range, 429 if
+            the client's rate limit is exhausted
+
+    SSE Events:
+        - Same as /tutor/analyze endpoint
+
+    Example:
+        >>> POST /api/v1/tutor/analyze-image/upload?level=3
+        Content-Type: image/png
+        <binary image data>
+    """
+    await _enforce_rate_limit("analyze_image", {"task_type": "image_process"}, request)
+    try:
+        upload = await read_image_upload(
+            request.headers.get("content-type", ""),
+            request.headers.get("content-length"),
+            request.stream(),
+            MAX_IMAGE_SIZE_MB * 1024 * 1024,
+        )
+        mime_type = check_image_bytes(upload.data)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image exceeds limit ({MAX_IMAGE_SIZE_MB}MB)",
+        ) from e
+    except (UploadFormatError, ImageValidationError) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error_msg,
+            detail=str(e),
+        ) from e
+
+    if level is None:
+        form_level = upload.fields.get("level", "")
+        level = int(form_level) if form_level.isdigit() else None
+    if level is None or not 1 <= level <= 5:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="level must be an integer between 1 and 5",
         )
 
-    async def generate() -> AsyncGenerator[str]:
-        """Generate SSE events from image processing."""
-        session_id = session_manager.create()
-        input_state = {
-            "messages": [],
-            "level": request.level,
-            "session_id": session_id,
-            "input_text": "",
-            "task_type": "image_process",
-            "image_data": request.image_data,
-            "mime_type": request.mime_type,
-        }
-        async for event in _stream_graph_events(input_state, session_id):
-            yield event
+    return _image_stream_response(upload.data, mime_type, level)
 
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-        },
+
+def _image_stream_response(image_bytes: bytes, mime_type: str, level: int) -> StreamingResponse:
+    """Build the SSE response for a validated image.
+
+    The image is moved into the blob store so that state, and the response
+    closure, carry only its id.
+
+    Args:
+        image_bytes: Decoded image file bytes
+        mime_type: Detected image MIME type
+        level: English proficiency level (1-5)
+
+    Returns:
+        StreamingResponse with SSE events
+    """
+    session_id = session_manager.create()
+    input_state = _image_state(get_blob_store().put(image_bytes), mime_type, level, session_id)
+    return _start_tutor_stream(input_state, session_id)
+
+
+@router.get("/tutor/streams/{session_id}")
+async def resume_stream(
+    session_id: str,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Resume an analysis stream after a dropped connection.
+
+    Replays every event after Last-Event-ID from the run's buffer, including
+    sections that completed while the client was away, then follows the run
+    live until its done event. Without Last-Event-ID the whole run is replayed.
+
+    Args:
+        session_id: Session id of the run (X-Session-Id header or done event)
+        last_event_id: Id of the last event the client received
+
+    Returns:
+        StreamingResponse with the remaining SSE events
+
+    Raises:
+        HTTPException: 404 if the run is unknown or expired, 400 if
+            Last-Event-ID is invalid, 410 if the events after it were evicted
+
+    Example:
+        >>> GET /api/v1/tutor/streams/abc-123
+        Last-Event-ID: abc-123:42
+    """
+    run = get_stream_registry().get(session_id)
+    if run is None:
+        metrics.inc("stream_resumes_total", result="not_found")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No resumable stream for this session",
+        )
+    return _resume_response(run, last_event_id)
+
+
+async def _batch_events(items: list[BatchItem]) -> AsyncGenerator[bytes, None]:
+    """Run a batch into the analysis cache, reporting each passage as an SSE event."""
+    report = BatchReport(total=len(items))
+    async for outcome in run_batch(
+        items, get_analysis_cache(), get_settings().BATCH_CONCURRENCY
+    ):
+        report.add(outcome)
+        yield sse_encoder.event("batch_passage", {
+            "id": outcome.item_id,
+            "status": outcome.status,
+            "seconds": round(outcome.seconds, 2),
+            "error": outcome.error,
+            "completed": report.completed,
+            "total": report.total,
+        })
+    yield sse_encoder.event("batch_done", report.as_dict())
+
+
+@router.post("/tutor/batch")
+async def analyze_batch(request: Request) -> StreamingResponse:
+    """Pre-generate analyses of many passages into the analysis cache.
+
+    The body is JSONL, one {"text": ..., "level": 1-5, "id": optional} per
+    line (at most BATCH_MAX_ITEMS). Passages already cached are skipped, the
+    rest are analysed BATCH_CONCURRENCY at a time and cached as each one
+    finishes, so later /tutor/analyze requests for them are cache hits and
+    re-submitting an interrupted batch resumes it. The batch runs detached
+    from the connection; resume its progress stream with
+    /tutor/streams/{batch_id} (X-Session-Id header).
+
+    Args:
+        request: The raw request whose body carries the JSONL passages
+
+    Returns:
+        StreamingResponse with SSE events
+
+    Raises:
+        HTTPException: 400 if the body is not valid JSONL passages
+
+    SSE Events:
+        - batch_passage: id, status (cached/succeeded/failed), seconds, error,
+          completed and total
+        - batch_done: report with counts, failures, elapsed_seconds,
+          passages_per_minute and cost_usd
+
+    Example:
+        >>> POST /api/v1/tutor/batch
+        Content-Type: application/x-ndjson
+        {"id": "p1", "text": "The quick brown fox jumps over the lazy dog.", "level": 3}
+    """
+    body = (await request.body()).decode("utf-8", errors="replace")
+    try:
+        items = parse_batch_items(body.splitlines(), max_items=get_settings().BATCH_MAX_ITEMS)
+    except BatchFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    if not items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No passages")
+
+    batch_id = f"batch-{uuid.uuid4().hex}"
+    run = get_stream_registry().start(batch_id, _batch_events(items))
+    return _sse_response(_follow_run(run), batch_id)
+
+
+def _job_queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Job queue is full, retry later",
+        headers={"Retry-After": str(get_settings().ADMISSION_RETRY_AFTER_SECONDS)},
     )
 
 
+def _get_job_or_404(job_id: str) -> Job:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.post("/tutor/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(request: JobRequest, http_request: Request) -> dict:
+    """Submit a text or image analysis job and return at once.
+
+    The pipeline runs in the job pool (at most JOBS_MAX_CONCURRENCY jobs at
+    a time, the rest queue), independent of any HTTP connection.
+
+    Args:
+        request: AnalyzeJobRequest (kind "analyze") or AnalyzeImageJobRequest
+            (kind "image")
+        http_request: The HTTP request, for rate limiting by client
+
+    Returns:
+        The job status with job_id, session_id and state "queued"
+
+    Raises:
+        HTTPException: 400 if the image is invalid, 429 if the client's rate
+            limit is exhausted, 503 with Retry-After if JOBS_MAX_QUEUED jobs
+            are already waiting
+
+    Example:
+        >>> POST /api/v1/tutor/jobs
+        {"kind": "analyze", "text": "The quick brown fox jumps over the lazy dog.", "level": 3}
+    """
+    if get_job_manager().full:
+        raise _job_queue_full()
+    if isinstance(request, AnalyzeImageJobRequest):
+        await _enforce_rate_limit("analyze_image", {"task_type": "image_process"}, http_request)
+    else:
+        await _enforce_rate_limit(
+            "analyze", {"input_text": request.text, "level": request.level}, http_request
+        )
+
+    image_ref = None
+    session_id = session_manager.create()
+    if isinstance(request, AnalyzeImageJobRequest):
+        image_bytes, mime_type = await _decode_image_request(request.image_data, request.mime_type)
+        image_ref = get_blob_store().put(image_bytes)
+        input_state = _image_state(image_ref, mime_type, request.level, session_id)
+    else:
+        input_state = _analyze_state(request.text, request.level, session_id)
+
+    def cleanup() -> None:
+        if image_ref is not None:
+            get_blob_store().release(image_ref)
+
+    events = _stream_tutor_events(input_state, session_id)
+    try:
+        job = get_job_manager().submit(session_id, request.kind, events, cleanup)
+    except JobQueueFullError:
+        cleanup()  # filled up while the image was decoded; the pipeline never runs
+        raise _job_queue_full() from None
+    if image_ref is not None:
+        # The job's own hold keeps the image from expiring while the job is queued
+        get_blob_store().retain(image_ref)
+    return job.as_dict(include_result=False)
+
+
+@router.get("/tutor/jobs/{job_id}")
+async def get_job(job_id: str) -> dict:
+    """Return a job's state and its partial or final result.
+
+    While the job runs, the result holds the text streamed so far per
+    section; "completed_sections" lists the sections that finished.
+
+    Args:
+        job_id: The job id
+
+    Returns:
+        The job status with "result"
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired
+    """
+    return _get_job_or_404(job_id).as_dict()
+
+
+@router.get("/tutor/jobs/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Attach to a job's SSE stream.
+
+    Replays the job's events from the start (or after Last-Event-ID) and
+    follows it until the job ends. Events are the same as /tutor/analyze.
+
+    Args:
+        job_id: The job id
+        last_event_id: Id of the last event the client received
+
+    Returns:
+        StreamingResponse with SSE events
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired, 400 if
+            Last-Event-ID is invalid, 410 if the events after it were evicted
+    """
+    return _resume_response(_get_job_or_404(job_id).run, last_event_id)
+
+
+@router.delete("/tutor/jobs/{job_id}")
+async def cancel_job(job_id: str) -> dict:
+    """Cancel a queued or running job; finished jobs are left unchanged.
+
+    Args:
+        job_id: The job id
+
+    Returns:
+        The job status, "cancelled" unless it had already finished
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired
+    """
+    job = await get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job.as_dict()
+
+
 @router.post("/tutor/chat")
-async def chat(request: ChatRequest) -> StreamingResponse:
+async def chat(request: ChatRequest, http_request: Request) -> StreamingResponse:
     """Handle chat with session context via Server-Sent Events.
 
     Retrieves session history for context-aware conversation.
@@ -476,10 +1553,14 @@ async def chat(request: ChatRequest) -> StreamingResponse:
 
     Args:
         request: ChatRequest containing session_id, question, and level
+        http_request: The HTTP request, for rate limiting by client
 
     Returns:
         StreamingResponse with SSE events
 
+    Raises:
+        HTTPException: 429 if the client's or session's rate limit is exhausted
+
     SSE Events:
         - chat_chunk: Streaming response content
         - done: Session completion with session_id
@@ -493,6 +1574,13 @@ async def chat(request: ChatRequest) -> StreamingResponse:
             "level": 3
         }
     """
+    await _enforce_rate_limit(
+        "chat",
+        {"task_type": "chat", "input_text": request.question, "level": request.level},
+        http_request,
+        request.session_id,
+    )
+
     # Get or create session
     session = session_manager.get(request.session_id)
     if not session:
@@ -501,19 +1589,45 @@ async def chat(request: ChatRequest) -> StreamingResponse:
     else:
         session_id = request.session_id
 
-    async def generate() -> AsyncGenerator[str]:
-        """Generate SSE events from chat processing."""
+    return StreamingResponse(
+        _stream_chat_events(session, session_id, request.question, request.level),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+async def _stream_chat_events(
+    session: dict | None,
+    session_id: str,
+    question: str,
+    level: int,
+) -> AsyncGenerator[bytes, None]:
+    """Answer a chat question with the session's history as SSE events.
+
+    Args:
+        session: The session, as returned by session_manager.get
+        session_id: Session id of the conversation
+        question: The user question
+        level: English proficiency level (1-5)
+
+    Yields:
+        chat_chunk and done events, or an error event
+    """
+    with _stream_in_flight(), track_request_usage(session_id, level):
         try:
             # Add user message to session
-            session_manager.add_message(session_id, "user", request.question)
+            session_manager.add_message(session_id, "user", question)
 
             # Run LangGraph pipeline for chat
-            result = await graph.ainvoke(
+            result = await get_graph().ainvoke(
                 {
                     "messages": session.get("messages", []),
-                    "level": request.level,
+                    "level": level,
                     "session_id": session_id,
-                    "input_text": request.question,
+                    "input_text": question,
                     "task_type": "chat",
                 }
             )
@@ -522,18 +1636,193 @@ async def chat(request: ChatRequest) -> StreamingResponse:
             # For now, yield a simple chat response
             if result.get("reading_result"):
                 response_content = result["reading_result"].content
-                yield f"event: chat_chunk\ndata: {json.dumps({'content': response_content, 'role': 'assistant'})}\n\n"
+                yield sse_encoder.event(
+                    "chat_chunk", {"content": response_content, "role": "assistant"}
+                )
 
-            yield format_done_event(session_id)
+            yield _done_event(session_id)
 
         except Exception as e:
-            yield format_error_event(str(e), "processing_error")
+            yield sse_encoder.error(str(e), "processing_error")
 
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-        },
+
+_ws_message_adapter: TypeAdapter[WSMessage] = TypeAdapter(WSMessage)
+
+
+def _ws_operation_id(raw: str | bytes) -> str | None:
+    """Return the operation id of a client message that failed validation, if any."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    op_id = data.get("id") if isinstance(data, dict) else None
+    return op_id if isinstance(op_id, str) else None
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Summarize a pydantic ValidationError in one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'message'}: {e['msg']}"
+        for e in error.errors()
     )
+
+
+@router.websocket("/tutor/ws")
+async def tutor_websocket(websocket: WebSocket) -> None:
+    """Run a tutoring session over one WebSocket connection.
+
+    Clients send JSON text messages that start or cancel operations, each
+    tagged with a client-chosen id; operations run concurrently (at most
+    WS_MAX_OPERATIONS per connection) and their events are interleaved:
+
+        {"op": "analyze", "id": "a1", "text": "...", "level": 3}
+        {"op": "analyze_image", "id": "i1", "image_data": "...", "mime_type": "image/png",
+         "level": 3}
+        {"op": "chat", "id": "c1", "question": "...", "level": 3}
+        {"op": "cancel", "id": "a1"}
+
+    Every server message is one SSE event of the HTTP endpoints, tagged
+    with its operation: ``{"id": "a1", "event": "reading_token", "data":
+    {"token": "..."}}``. An operation ends with its done or error event;
+    a cancelled one with an error event of code "cancelled". Chat continues
+    the given session_id, or the session of the connection's latest analysis.
+
+    Operations are tied to the connection: they are cancelled when it
+    closes and, unlike the SSE endpoints, cannot be resumed.
+
+    Args:
+        websocket: The WebSocket connection
+    """
+    await websocket.accept()
+    settings = get_settings()
+    session_id: str | None = None
+    metrics.add_gauge("ws_connections", 1)
+    try:
+        async with SessionMultiplexer(
+            websocket.send_text,
+            max_operations=settings.WS_MAX_OPERATIONS,
+            send_queue_size=settings.WS_SEND_QUEUE_SIZE,
+        ) as mux:
+            while True:
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                raw = frame.get("text") or frame.get("bytes") or b""
+                try:
+                    message = _ws_message_adapter.validate_json(raw)
+                except ValidationError as e:
+                    await mux.reject(
+                        _ws_operation_id(raw), _validation_message(e), "invalid_message"
+                    )
+                    continue
+
+                if isinstance(message, WSCancelMessage):
+                    if not await mux.cancel(message.id):
+                        await mux.reject(
+                            message.id, "No running operation with this id", "unknown_operation"
+                        )
+                    continue
+
+                if (
+                    not isinstance(message, WSChatMessage)
+                    and settings.ADMISSION_CONTROL_ENABLED
+                    and (controller := get_admission_controller()).state() == "shed"
+                ):
+                    retry_after = controller.shed()
+                    await mux.reject(
+                        message.id,
+                        f"Server is overloaded, retry in {retry_after} seconds",
+                        "overloaded",
+                    )
+                    continue
+
+                try:
+                    await _charge_ws_operation(message, websocket, session_id)
+                except RateLimitExceededError as e:
+                    await mux.reject(message.id, str(e), "rate_limited")
+                    continue
+
+                try:
+                    session_id, events, cleanup = await _start_ws_operation(message, session_id)
+                except HTTPException as e:
+                    await mux.reject(message.id, str(e.detail), "invalid_image")
+                    continue
+                try:
+                    mux.start(message.id, events, cleanup)
+                except OperationRejectedError as e:
+                    if cleanup is not None:
+                        cleanup()
+                    await mux.reject(message.id, str(e), e.code)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        metrics.add_gauge("ws_connections", -1)
+
+
+async def _charge_ws_operation(
+    message: WSAnalyzeMessage | WSAnalyzeImageMessage | WSChatMessage,
+    websocket: WebSocket,
+    session_id: str | None,
+) -> None:
+    """Charge a WebSocket operation to the client's and the session's token buckets.
+
+    Raises:
+        RateLimitExceededError: If a bucket is exhausted
+    """
+    if isinstance(message, WSChatMessage):
+        await _charge_rate_limit(
+            "chat",
+            {"task_type": "chat", "input_text": message.question, "level": message.level},
+            websocket,
+            message.session_id or session_id,
+        )
+    elif isinstance(message, WSAnalyzeImageMessage):
+        await _charge_rate_limit(
+            "analyze_image", {"task_type": "image_process"}, websocket, session_id
+        )
+    else:
+        await _charge_rate_limit(
+            "analyze", {"input_text": message.text, "level": message.level}, websocket, session_id
+        )
+
+
+async def _start_ws_operation(
+    message: WSAnalyzeMessage | WSAnalyzeImageMessage | WSChatMessage,
+    session_id: str | None,
+) -> tuple[str, AsyncGenerator[bytes, None], Callable[[], object] | None]:
+    """Prepare the event stream of one WebSocket operation.
+
+    Args:
+        message: The validated analyze, analyze_image or chat message
+        session_id: Session of the connection's latest analysis, if any
+
+    Returns:
+        The connection's session id after this operation, the operation's
+        SSE events, and a cleanup called if the operation never starts
+
+    Raises:
+        HTTPException: 400 if the image is invalid
+    """
+    if isinstance(message, WSChatMessage):
+        chat_session_id = message.session_id or session_id
+        session = session_manager.get(chat_session_id) if chat_session_id else None
+        if not session:
+            chat_session_id = session_manager.create()
+            session = session_manager.get(chat_session_id)
+        events = _stream_chat_events(session, chat_session_id, message.question, message.level)
+        return chat_session_id, events, None
+
+    if isinstance(message, WSAnalyzeImageMessage):
+        image_bytes, mime_type = await _decode_image_request(message.image_data, message.mime_type)
+        image_ref = get_blob_store().put(image_bytes)
+        session_id = session_manager.create()
+        input_state = _image_state(image_ref, mime_type, message.level, session_id)
+
+        def cleanup() -> None:
+            get_blob_store().release(image_ref)
+
+        return session_id, _stream_tutor_events(input_state, session_id), cleanup
+
+    session_id = session_manager.create()
+    input_state = _analyze_state(message.text, message.level, session_id)
+    return session_id, _stream_tutor_events(input_state, session_id), None
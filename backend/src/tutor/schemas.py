@@ -6,7 +6,7 @@ Defines all data models for the AI English Tutor API.
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field
 
@@ -30,6 +30,21 @@ class AnalyzeImageRequest(BaseModel):
     level: int = Field(..., ge=1, le=5, description="English proficiency level (1-5)")
 
 
+class AnalyzeJobRequest(AnalyzeRequest):
+    """Request model for submitting a text analysis job."""
+
+    kind: Literal["analyze"] = Field(..., description="Job kind")
+
+
+class AnalyzeImageJobRequest(AnalyzeImageRequest):
+    """Request model for submitting an image analysis job."""
+
+    kind: Literal["image"] = Field(..., description="Job kind")
+
+
+JobRequest = Annotated[AnalyzeJobRequest | AnalyzeImageJobRequest, Field(discriminator="kind")]
+
+
 class ChatRequest(BaseModel):
     """Request model for chat conversation endpoint."""
 
@@ -38,6 +53,50 @@ class ChatRequest(BaseModel):
     level: int = Field(..., ge=1, le=5, description="English proficiency level (1-5)")
 
 
+# WebSocket Message Schemas (client -> server frames of /tutor/ws)
+
+
+class WSOperation(BaseModel):
+    """Base of WebSocket messages addressing one operation."""
+
+    id: str = Field(..., min_length=1, max_length=64, description="Client-chosen operation id")
+
+
+class WSAnalyzeMessage(WSOperation, AnalyzeRequest):
+    """Start a text analysis on a WebSocket connection."""
+
+    op: Literal["analyze"] = Field(..., description="Operation type")
+
+
+class WSAnalyzeImageMessage(WSOperation, AnalyzeImageRequest):
+    """Start an image analysis on a WebSocket connection."""
+
+    op: Literal["analyze_image"] = Field(..., description="Operation type")
+
+
+class WSChatMessage(WSOperation):
+    """Ask a chat question on a WebSocket connection."""
+
+    op: Literal["chat"] = Field(..., description="Operation type")
+    session_id: str | None = Field(
+        default=None, description="Session to continue (default: the connection's last analysis)"
+    )
+    question: str = Field(..., description="User question")
+    level: int = Field(..., ge=1, le=5, description="English proficiency level (1-5)")
+
+
+class WSCancelMessage(WSOperation):
+    """Cancel a running operation on a WebSocket connection."""
+
+    op: Literal["cancel"] = Field(..., description="Operation type")
+
+
+WSMessage = Annotated[
+    WSAnalyzeMessage | WSAnalyzeImageMessage | WSChatMessage | WSCancelMessage,
+    Field(discriminator="op"),
+]
+
+
 # Supervisor Analysis Schemas (SPEC-UPDATE-001)
 
 
@@ -5,17 +5,19 @@ Provides session management, SSE streaming, and image processing services.
 
 from tutor.services.image import (
     ImageValidationError,
+    decode_image,
     preprocess_image_for_llm,
-    validate_image,
 )
 from tutor.services.session import SessionManager, session_manager
 from tutor.services.streaming import (
+    SSEEncoder,
     format_done_event,
     format_error_event,
     format_grammar_chunk,
     format_reading_chunk,
     format_sse_event,
     format_vocabulary_chunk,
+    sse_encoder,
 )
 
 __all__ = [
@@ -29,8 +31,10 @@ __all__ = [
     "format_vocabulary_chunk",
     "format_done_event",
     "format_error_event",
+    "SSEEncoder",
+    "sse_encoder",
     # Image processing
-    "validate_image",
+    "decode_image",
     "preprocess_image_for_llm",
     "ImageValidationError",
 ]
@@ -0,0 +1,166 @@
+"""Admission control and load shedding for AI English Tutor.
+
+Without it an overloaded worker accepts every analysis and all streams slow
+down together. The controller combines three load signals, each as a
+fraction of its configured limit:
+
+- SSE streams in flight (``sse_streams_in_flight``)
+- estimated LLM output tokens of the pipelines running now
+  (``admission_queued_tokens``), reserved when a pipeline starts and
+  released when it ends
+- event-loop lag, as the p90 of the loop monitor's recent samples, so a
+  single slow callback does not shed requests on its own
+
+The highest fraction is the load. At ``ADMISSION_DEGRADE_RATIO`` of any
+limit new analyses are degraded to final-only responses (cache hits are
+served as always); at the limit they are shed with 503 and a
+``Retry-After`` that grows with the overload. Decisions are counted in
+``admission_requests_total{decision}``.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Literal
+
+from tutor.config import get_settings
+from tutor.services.loop_monitor import get_loop_monitor
+from tutor.services.metrics import metrics
+from tutor.services.token_budget import AGENT_MAX_TOKENS, count_sentences, get_token_budgeter
+from tutor.services.usage import count_tokens
+
+AdmissionState = Literal["accepted", "degraded", "shed"]
+
+# Global admission controller instance (lazy-initialized)
+_admission_controller: AdmissionController | None = None
+
+
+def estimate_llm_tokens(input_state: dict) -> int:
+    """Estimate the LLM output tokens a pipeline will generate.
+
+    Text analyses use the token budgeter's per-agent budgets and a chat turn
+    one reading-agent budget; image analyses, whose text is not known yet,
+    count the OCR limit and every agent's ceiling.
+
+    Args:
+        input_state: The initial state dict of the pipeline
+
+    Returns:
+        Estimated output tokens
+    """
+    if input_state.get("task_type") == "image_process":
+        return get_settings().OCR_MAX_TOKENS + sum(AGENT_MAX_TOKENS.values())
+    budgeter = get_token_budgeter()
+    level = input_state.get("level", 3)
+    sentences = count_sentences(input_state)  # type: ignore[arg-type]
+    passage_tokens = count_tokens(input_state.get("input_text", ""))
+    if input_state.get("task_type") == "chat":
+        return budgeter.budget("reading", level, sentences, passage_tokens)
+    return sum(
+        budgeter.budget(agent, level, sentences, passage_tokens) for agent in AGENT_MAX_TOKENS
+    )
+
+
+class AdmissionController:
+    """Decides whether new analyses run normally, degraded, or not at all."""
+
+    def __init__(
+        self,
+        max_streams: int = 64,
+        max_queued_tokens: int = 500_000,
+        max_loop_lag: float = 0.25,
+        degrade_ratio: float = 0.8,
+        retry_after_seconds: int = 5,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            max_streams: SSE streams in flight at which analyses are shed (0: no limit)
+            max_queued_tokens: Estimated LLM output tokens of running pipelines at
+                which analyses are shed (0: no limit)
+            max_loop_lag: Event-loop lag (seconds, p90 of recent samples) at which
+                analyses are shed (0: no limit)
+            degrade_ratio: Fraction of a limit from which analyses are degraded
+            retry_after_seconds: Retry-After of a shed request at the limit; scaled
+                up with the overload
+        """
+        self._max_streams = max_streams
+        self._max_queued_tokens = max_queued_tokens
+        self._max_loop_lag = max_loop_lag
+        self._degrade_ratio = degrade_ratio
+        self._retry_after = retry_after_seconds
+        self._queued_tokens = 0
+
+    @property
+    def queued_tokens(self) -> int:
+        """Estimated LLM output tokens of the pipelines running now."""
+        return self._queued_tokens
+
+    def load(self) -> float:
+        """Return the highest load signal as a fraction of its limit."""
+        signals = (
+            (metrics.get("sse_streams_in_flight"), self._max_streams),
+            (self._queued_tokens, self._max_queued_tokens),
+            (get_loop_monitor().lag_p90_seconds, self._max_loop_lag),
+        )
+        return max((value / limit for value, limit in signals if limit > 0), default=0.0)
+
+    def state(self) -> AdmissionState:
+        """Return the decision for a new analysis at the current load."""
+        load = self.load()
+        if load >= 1.0:
+            return "shed"
+        if load >= self._degrade_ratio:
+            return "degraded"
+        return "accepted"
+
+    def shed(self) -> int:
+        """Count a shed request and return its Retry-After in seconds."""
+        metrics.inc("admission_requests_total", decision="shed")
+        return max(1, math.ceil(self._retry_after * self.load()))
+
+    @contextmanager
+    def admit(self, tokens: int) -> Iterator[bool]:
+        """Run a pipeline under admission control, reserving its estimated work.
+
+        Pipelines are never refused here (the HTTP request was already
+        admitted); this decides whether the pipeline runs degraded.
+
+        Args:
+            tokens: Estimated LLM output tokens of the pipeline
+
+        Yields:
+            True if the pipeline should run degraded (final-only)
+        """
+        degraded = self.state() != "accepted"
+        metrics.inc("admission_requests_total", decision="degraded" if degraded else "accepted")
+        self._queued_tokens += tokens
+        metrics.set_gauge("admission_queued_tokens", self._queued_tokens)
+        try:
+            yield degraded
+        finally:
+            self._queued_tokens -= tokens
+            metrics.set_gauge("admission_queued_tokens", self._queued_tokens)
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the global admission controller instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global AdmissionController instance
+    """
+    global _admission_controller
+    if _admission_controller is None:
+        settings = get_settings()
+        _admission_controller = AdmissionController(
+            max_streams=settings.ADMISSION_MAX_STREAMS,
+            max_queued_tokens=settings.ADMISSION_MAX_QUEUED_TOKENS,
+            max_loop_lag=settings.ADMISSION_MAX_LOOP_LAG_MS / 1000,
+            degrade_ratio=settings.ADMISSION_DEGRADE_RATIO,
+            retry_after_seconds=settings.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+    return _admission_controller
@@ -0,0 +1,396 @@
+"""Persistent analysis result cache for AI English Tutor.
+
+A text analysis (reading, grammar and vocabulary) depends only on the
+passage, the learner level, the prompt templates and the models. Results
+are stored in SQLite under a key derived from all of them, so a passage
+analysed once, live or ahead of class by the batch pre-generation CLI, is
+served to every later request as a cache hit without any LLM call. Editing
+a prompt or switching a model changes the key, so stale results are never
+served.
+
+Reading explains every sentence of a passage in its own ``### 문장 N``
+section, so reading sections are also cached per sentence, keyed on the
+normalized sentence, level, reading prompt and model, and paired with
+sentences by the sentence each section quotes. A re-submitted passage with
+one corrected sentence then only reads that sentence again; plan_segments
+groups a passage into cached and to-be-generated runs. Grammar selects 3-5
+sentences of the whole passage, so it is not cached per sentence.
+
+SQLite lets the offline CLI and the API workers share one cache file
+(``ANALYSIS_CACHE_PATH``); WAL mode keeps readers from blocking the writer.
+Calls are synchronous and short; async callers run them in a thread.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from tutor.config import get_settings
+from tutor.prompts import get_level_instructions, get_prompt_registry
+from tutor.services.metrics import metrics
+from tutor.services.streaming import sse_encoder
+from tutor.utils.text_segments import pair_sentence_sections, split_sentence_sections
+
+SECTIONS = ("ocr", "reading", "grammar", "vocabulary")
+ANALYSIS_PROMPTS = ("supervisor.md", "reading.md", "grammar.md", "vocabulary.md", "passage.md")
+
+# Global analysis cache instance (lazy-initialized)
+_analysis_cache: AnalysisCache | None = None
+
+
+class AnalysisResult:
+    """Partial or final analysis result, folded from the pipeline's SSE events."""
+
+    def __init__(self) -> None:
+        """Initialize an empty result."""
+        self.text: dict[str, list[str]] = {section: [] for section in SECTIONS}
+        self.vocabulary_words: list[dict] | None = None
+        self.completed_sections: list[str] = []
+        self.errors: list[dict] = []
+        self.complete = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> AnalysisResult:
+        """Rebuild a complete result from ``as_dict()`` output.
+
+        Args:
+            data: Dict produced by as_dict
+
+        Returns:
+            The AnalysisResult, marked complete
+        """
+        result = cls()
+        for section in SECTIONS:
+            key = "ocr_text" if section == "ocr" else section
+            if data.get(key):
+                result.text[section].append(data[key])
+        result.vocabulary_words = data.get("vocabulary_words")
+        result.completed_sections = list(data.get("completed_sections", []))
+        result.errors = list(data.get("errors", []))
+        result.complete = True
+        return result
+
+    def feed(self, event: str | bytes) -> None:
+        """Apply one formatted SSE event to the result.
+
+        Args:
+            event: A formatted SSE event ("event: ...\\ndata: ...\\n\\n"), str or bytes
+        """
+        if isinstance(event, str):
+            event = event.encode()
+        header, _, body = event.partition(b"\n")
+        event_type = header.removeprefix(b"event: ").decode()
+        data = json.loads(body.removeprefix(b"data: "))
+        section, _, suffix = event_type.rpartition("_")
+        if event_type == "done":
+            self.complete = True
+        elif event_type == "error":
+            self.errors.append({"section": None, **data})
+        elif suffix == "token":
+            self.text[section].append(data["token"])
+        elif suffix == "done":
+            self.completed_sections.append(section)
+        elif suffix == "error":
+            self.errors.append({"section": section, **data})
+        elif event_type == "vocabulary_chunk":
+            self.vocabulary_words = data.get("words", [])
+
+    def replay_events(self) -> list[bytes]:
+        """Return the SSE events that deliver this result, in analyze order.
+
+        Each section's text is sent as a single token, followed by the section
+        done events and the vocabulary words, as a live analysis would end.
+
+        Returns:
+            Encoded SSE events (without the final done event)
+        """
+        events = []
+        for section in ("reading", "grammar", "vocabulary"):
+            if text := "".join(self.text[section]):
+                events.append(sse_encoder.token(section, text))
+        events.append(sse_encoder.section_done("reading"))
+        events.append(sse_encoder.section_done("grammar"))
+        if self.vocabulary_words:
+            events.append(sse_encoder.event("vocabulary_chunk", {"words": self.vocabulary_words}))
+        events.append(sse_encoder.section_done("vocabulary"))
+        return events
+
+    def as_dict(self) -> dict:
+        """Return the result as a JSON-serializable dict."""
+        return {
+            "ocr_text": "".join(self.text["ocr"]),
+            "reading": "".join(self.text["reading"]),
+            "grammar": "".join(self.text["grammar"]),
+            "vocabulary": "".join(self.text["vocabulary"]),
+            "vocabulary_words": self.vocabulary_words,
+            "completed_sections": self.completed_sections,
+            "errors": self.errors,
+        }
+
+
+def normalize_passage(text: str) -> str:
+    """Normalize a passage for cache keys (whitespace runs collapse to one space)."""
+    return " ".join(text.split())
+
+
+def analysis_key(text: str, level: int) -> str:
+    """Build the cache key of a text analysis.
+
+    Args:
+        text: The passage
+        level: Learner level (1-5)
+
+    Returns:
+        Hex SHA-256 over the normalized passage, level, level instructions,
+        prompt template hashes and agent models
+    """
+    settings = get_settings()
+    registry = get_prompt_registry()
+    material = {
+        "text": normalize_passage(text),
+        "level": level,
+        "instructions": get_level_instructions(level),
+        "prompts": [registry.content_hash(name) for name in ANALYSIS_PROMPTS],
+        "models": [
+            settings.SUPERVISOR_MODEL,
+            settings.READING_MODEL,
+            settings.GRAMMAR_MODEL,
+            settings.VOCABULARY_MODEL,
+        ],
+    }
+    return hashlib.sha256(json.dumps(material, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def sentence_key(sentence: str, level: int, section: str) -> str:
+    """Build the cache key of one sentence's reading or grammar section.
+
+    Args:
+        sentence: The sentence
+        level: Learner level (1-5)
+        section: "reading" or "grammar"
+
+    Returns:
+        Hex SHA-256 over the normalized sentence, level, level instructions,
+        the section's prompt template hashes and its model
+    """
+    settings = get_settings()
+    registry = get_prompt_registry()
+    model = settings.READING_MODEL if section == "reading" else settings.GRAMMAR_MODEL
+    material = {
+        "sentence": normalize_passage(sentence),
+        "level": level,
+        "section": section,
+        "instructions": get_level_instructions(level),
+        "prompts": [registry.content_hash(f"{section}.md"), registry.content_hash("passage.md")],
+        "model": model,
+    }
+    return hashlib.sha256(json.dumps(material, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class PassageSegment(NamedTuple):
+    """A run of consecutive sentences that is either cached or read together."""
+
+    sentences: list[str]
+    cached: str | None  # reading markdown, None if it must be generated
+
+
+class AnalysisCache:
+    """SQLite-backed store of complete analysis results and sentence sections."""
+
+    def __init__(self, path: str | Path, ttl_seconds: float | None = None) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file (":memory:" for a private in-memory cache)
+            ttl_seconds: Maximum age of a served entry; None keeps entries forever
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis ("
+            " key TEXT PRIMARY KEY, level INTEGER NOT NULL,"
+            " result TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sentence ("
+            " key TEXT PRIMARY KEY, content TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        """Return the number of stored results."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+
+    def get(self, key: str) -> AnalysisResult | None:
+        """Return the cached result for a key, or None.
+
+        Args:
+            key: Key from analysis_key
+
+        Returns:
+            The cached AnalysisResult, or None on a miss or expired entry
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result, created_at FROM analysis WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (self._ttl is not None and time.time() - row[1] > self._ttl):
+            metrics.inc("analysis_cache_lookups_total", result="miss")
+            return None
+        metrics.inc("analysis_cache_lookups_total", result="hit")
+        return AnalysisResult.from_dict(json.loads(row[0]))
+
+    def contains(self, key: str) -> bool:
+        """Return whether an unexpired result is stored for a key (not counted as a lookup)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at FROM analysis WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and (self._ttl is None or time.time() - row[0] <= self._ttl)
+
+    def put(self, key: str, level: int, result: AnalysisResult) -> None:
+        """Store a complete result (committed immediately).
+
+        Args:
+            key: Key from analysis_key
+            level: Learner level of the analysis
+            result: The complete AnalysisResult
+        """
+        payload = json.dumps(result.as_dict(), ensure_ascii=False)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO analysis (key, level, result, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, level, payload, time.time()),
+            )
+            self._db.commit()
+        metrics.inc("analysis_cache_writes_total")
+
+    def get_sentences(self, keys: list[str]) -> dict[str, str]:
+        """Return the cached sentence sections among the given keys.
+
+        Args:
+            keys: Keys from sentence_key
+
+        Returns:
+            Section markdown by key, for unexpired entries only
+        """
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT key, content, created_at FROM sentence WHERE key IN ({placeholders})",
+                keys,
+            ).fetchall()
+        now = time.time()
+        return {
+            key: content
+            for key, content, created_at in rows
+            if self._ttl is None or now - created_at <= self._ttl
+        }
+
+    def put_sentences(self, sections: dict[str, str]) -> None:
+        """Store sentence sections (committed immediately).
+
+        Args:
+            sections: Section markdown by key from sentence_key
+        """
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sentence (key, content, created_at) VALUES (?, ?, ?)",
+                [(key, content, now) for key, content in sections.items()],
+            )
+            self._db.commit()
+        metrics.inc("sentence_cache_writes_total", len(sections))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+def plan_segments(cache: AnalysisCache, sentences: list[str], level: int) -> list[PassageSegment]:
+    """Split a passage into cached sentences and runs of sentences to read.
+
+    A sentence is reused if its reading section is cached; consecutive
+    other sentences form one segment to be read together.
+
+    Args:
+        cache: The analysis cache
+        sentences: The passage sentences, from split_sentences
+        level: Learner level (1-5)
+
+    Returns:
+        Segments in passage order
+    """
+    keys = [sentence_key(sentence, level, "reading") for sentence in sentences]
+    found = cache.get_sentences(keys)
+    segments: list[PassageSegment] = []
+    for sentence, key in zip(sentences, keys, strict=True):
+        if key in found:
+            metrics.inc("sentence_cache_lookups_total", result="hit")
+            segments.append(PassageSegment([sentence], found[key]))
+            continue
+        metrics.inc("sentence_cache_lookups_total", result="miss")
+        if segments and segments[-1].cached is None:
+            segments[-1].sentences.append(sentence)
+        else:
+            segments.append(PassageSegment([sentence], None))
+    return segments
+
+
+def index_sentences(cache: AnalysisCache, sentences: list[str], level: int, markdown: str) -> int:
+    """Cache the per-sentence sections of one reading output.
+
+    Sections are paired with the sentences they quote; sentences without a
+    matching section (e.g. merged with a neighbour by the model) are not
+    stored and are read again next time.
+
+    Args:
+        cache: The analysis cache
+        sentences: Sentences of the read text, from split_sentences
+        level: Learner level (1-5)
+        markdown: The reading agent's normalized output for those sentences
+
+    Returns:
+        Number of sentences stored
+    """
+    paired = pair_sentence_sections(sentences, split_sentence_sections(markdown))
+    if paired:
+        cache.put_sentences({
+            sentence_key(sentences[i], level, "reading"): content
+            for i, content in paired.items()
+        })
+    return len(paired)
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get or create the global analysis cache instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global AnalysisCache instance
+    """
+    global _analysis_cache
+    if _analysis_cache is None:
+        settings = get_settings()
+        ttl_hours = settings.ANALYSIS_CACHE_TTL_HOURS
+        _analysis_cache = AnalysisCache(
+            settings.ANALYSIS_CACHE_PATH,
+            ttl_seconds=ttl_hours * 3600 if ttl_hours > 0 else None,
+        )
+    return _analysis_cache
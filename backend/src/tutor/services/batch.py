@@ -0,0 +1,260 @@
+"""Batch analysis and cache pre-generation for AI English Tutor.
+
+Teachers prepare a workbook of passages ahead of class. A batch runs the
+supervisor and the three agents on every passage with bounded concurrency
+and writes each complete result into the analysis cache as soon as it
+finishes, so classroom requests for those passages become cache hits.
+
+The cache doubles as the checkpoint: passages whose result is already
+cached are skipped, so an interrupted batch (Ctrl-C, deploy, crash) resumes
+where it stopped when it is run again, and only failed or unfinished
+passages cost LLM calls.
+
+Used by ``POST /api/v1/tutor/batch`` and the ``tutor-pregenerate`` CLI.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncGenerator, Iterable
+from dataclasses import dataclass, field
+from typing import Literal, cast
+
+from tutor.agents.grammar import grammar_node
+from tutor.agents.reading import reading_node
+from tutor.agents.supervisor import supervisor_node
+from tutor.agents.vocabulary import vocabulary_node
+from tutor.services.analysis_cache import AnalysisCache, AnalysisResult, analysis_key
+from tutor.services.metrics import metrics
+from tutor.services.usage import track_request_usage
+from tutor.state import TutorState
+
+logger = logging.getLogger(__name__)
+
+BatchStatus = Literal["cached", "succeeded", "failed"]
+
+
+class BatchFormatError(ValueError):
+    """Raised when a batch input line is not a valid passage."""
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One passage of a batch."""
+
+    id: str
+    text: str
+    level: int
+
+
+@dataclass(frozen=True)
+class BatchOutcome:
+    """What happened to one passage."""
+
+    item_id: str
+    status: BatchStatus
+    seconds: float = 0.0
+    cost_usd: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class BatchReport:
+    """Progress and throughput of a batch run."""
+
+    total: int
+    started_at: float = field(default_factory=time.monotonic)
+    counts: dict[str, int] = field(
+        default_factory=lambda: {"cached": 0, "succeeded": 0, "failed": 0}
+    )
+    failures: list[dict] = field(default_factory=list)
+    cost_usd: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        """Passages finished so far, whatever their status."""
+        return sum(self.counts.values())
+
+    def add(self, outcome: BatchOutcome) -> None:
+        """Record one passage outcome."""
+        self.counts[outcome.status] += 1
+        self.cost_usd += outcome.cost_usd
+        if outcome.status == "failed":
+            self.failures.append({"id": outcome.item_id, "error": outcome.error})
+
+    def as_dict(self) -> dict:
+        """Return the report as a JSON-serializable dict.
+
+        Throughput counts generated passages only; cached ones were skipped.
+        """
+        elapsed = time.monotonic() - self.started_at
+        generated = self.counts["succeeded"] + self.counts["failed"]
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            **self.counts,
+            "failures": self.failures,
+            "elapsed_seconds": round(elapsed, 2),
+            "passages_per_minute": round(generated / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+def parse_batch_items(lines: Iterable[str], max_items: int | None = None) -> list[BatchItem]:
+    """Parse JSONL passages: one {"text": ..., "level": 1-5, "id": optional} per line.
+
+    Args:
+        lines: JSONL lines; blank lines are ignored
+        max_items: Maximum number of passages accepted
+
+    Returns:
+        The batch items; ids default to the line number
+
+    Raises:
+        BatchFormatError: If a line is not a valid passage, an id repeats, or
+            there are more than max_items passages
+    """
+    items: list[BatchItem] = []
+    seen: set[str] = set()
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            text, level = data["text"], data["level"]
+        except (ValueError, TypeError, KeyError) as e:
+            raise BatchFormatError(f"line {number}: expected {{\"text\", \"level\"}}: {e}") from e
+        if not isinstance(text, str) or not 10 <= len(text) <= 5000:
+            raise BatchFormatError(f"line {number}: text must be 10-5000 characters")
+        if not isinstance(level, int) or not 1 <= level <= 5:
+            raise BatchFormatError(f"line {number}: level must be an integer between 1 and 5")
+        item_id = str(data.get("id", number))
+        if item_id in seen:
+            raise BatchFormatError(f"line {number}: duplicate id {item_id!r}")
+        seen.add(item_id)
+        items.append(BatchItem(id=item_id, text=text, level=level))
+        if max_items is not None and len(items) > max_items:
+            raise BatchFormatError(f"more than {max_items} passages")
+    return items
+
+
+async def _run_agent(node, state: dict) -> tuple[dict | BaseException, str]:
+    """Run one streaming agent, collecting its tokens as the client would see them."""
+    queue: asyncio.Queue = asyncio.Queue()
+    tokens: list[str] = []
+
+    async def drain() -> None:
+        while (token := await queue.get()) is not None:
+            tokens.append(token)
+
+    drainer = asyncio.create_task(drain())
+    try:
+        outcome = await node(cast(TutorState, state), token_queue=queue)
+    except Exception as e:
+        outcome = e
+    finally:
+        queue.put_nowait(None)  # in case the agent failed before its sentinel
+        await drainer
+    return outcome, "".join(tokens)
+
+
+async def analyze_passage(text: str, level: int, session_id: str) -> AnalysisResult:
+    """Run the supervisor and the three agents on one passage.
+
+    Args:
+        text: The passage
+        level: Learner level (1-5)
+        session_id: Session id the LLM usage is recorded under
+
+    Returns:
+        The AnalysisResult; errors lists any failed section
+    """
+    state = {
+        "messages": [],
+        "level": level,
+        "session_id": session_id,
+        "input_text": text,
+        "task_type": "analyze",
+    }
+    supervisor = await supervisor_node(cast(TutorState, state))
+    agent_state = {**state, "supervisor_analysis": supervisor.get("supervisor_analysis")}
+    outcomes = await asyncio.gather(
+        _run_agent(reading_node, agent_state),
+        _run_agent(grammar_node, agent_state),
+        _run_agent(vocabulary_node, agent_state),
+    )
+
+    result = AnalysisResult()
+    for section, (outcome, text_out) in zip(
+        ("reading", "grammar", "vocabulary"), outcomes, strict=True
+    ):
+        result.text[section].append(text_out)
+        error = outcome if isinstance(outcome, BaseException) else outcome.get(f"{section}_error")
+        if error:
+            result.errors.append({"section": section, "message": str(error)})
+        else:
+            result.completed_sections.append(section)
+        if section == "vocabulary" and isinstance(outcome, dict):
+            vocabulary = outcome.get("vocabulary_result")
+            if vocabulary is not None and vocabulary.words:
+                result.vocabulary_words = vocabulary.model_dump()["words"]
+    result.complete = True
+    return result
+
+
+async def _process(
+    item: BatchItem,
+    cache: AnalysisCache,
+    slots: asyncio.Semaphore,
+) -> BatchOutcome:
+    key = analysis_key(item.text, item.level)
+    if await asyncio.to_thread(cache.contains, key):
+        return BatchOutcome(item.id, "cached")
+    async with slots:
+        start = time.perf_counter()
+        with track_request_usage(f"batch-{item.id}", item.level) as ledger:
+            try:
+                result = await analyze_passage(item.text, item.level, f"batch-{item.id}")
+                error = "; ".join(f"{e['section']}: {e['message']}" for e in result.errors)
+            except Exception as e:
+                result, error = None, f"{type(e).__name__}: {e}"
+        cost = ledger.summary()["total"]["cost_usd"]
+        seconds = time.perf_counter() - start
+    if result is None or error:
+        logger.warning(f"Batch passage {item.id} failed: {error}")
+        return BatchOutcome(item.id, "failed", seconds, cost, error)
+    await asyncio.to_thread(cache.put, key, item.level, result)
+    return BatchOutcome(item.id, "succeeded", seconds, cost)
+
+
+async def run_batch(
+    items: list[BatchItem],
+    cache: AnalysisCache,
+    concurrency: int = 4,
+) -> AsyncGenerator[BatchOutcome, None]:
+    """Analyse passages into the cache, yielding outcomes as they finish.
+
+    Closing the generator cancels the passages still running; their results
+    are simply not cached, and a later run picks them up.
+
+    Args:
+        items: Passages to analyse
+        cache: Analysis cache that receives the results (and is the checkpoint)
+        concurrency: Passages analysed at the same time
+
+    Yields:
+        One BatchOutcome per passage, in completion order
+    """
+    slots = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.create_task(_process(item, cache, slots)) for item in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            outcome = await next_done
+            metrics.inc("batch_passages_total", status=outcome.status)
+            yield outcome
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,167 @@
+"""In-process blob store for AI English Tutor.
+
+Keeps large request payloads (uploaded images) out of agent state: the
+bytes are stored once and state carries only a short id. Blobs are
+reference counted and freed as soon as the last holder releases them. A
+TTL sweep reclaims blobs whose only holder never released them (e.g. a
+client that disconnected before its response stream started). Blobs
+retained by a further holder, such as a queued job, are in use and never
+expire; that holder must release them.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+
+# Global blob store instance (lazy-initialized)
+_blob_store: BlobStore | None = None
+
+
+class BlobNotFoundError(KeyError):
+    """Raised when a blob id is unknown, already released or expired."""
+
+    pass
+
+
+@dataclass
+class _Blob:
+    data: bytes
+    refs: int
+    expires_at: float
+
+
+class BlobStore:
+    """Reference-counted in-memory store of immutable byte blobs."""
+
+    def __init__(self, ttl_seconds: float = 300) -> None:
+        """Initialize the blob store.
+
+        Args:
+            ttl_seconds: Maximum lifetime of a blob that is never released
+                (default: 300)
+        """
+        self._blobs: dict[str, _Blob] = {}
+        self._ttl = ttl_seconds
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all stored blobs in bytes."""
+        return self._total_bytes
+
+    def put(self, data: bytes) -> str:
+        """Store bytes with a reference count of 1.
+
+        Args:
+            data: The payload to store (not copied)
+
+        Returns:
+            The blob id to carry in state instead of the bytes
+        """
+        self.sweep()
+        blob_id = uuid.uuid4().hex
+        self._blobs[blob_id] = _Blob(data, 1, time.monotonic() + self._ttl)
+        self._total_bytes += len(data)
+        self._record()
+        return blob_id
+
+    def get(self, blob_id: str) -> bytes:
+        """Return the bytes of a live blob.
+
+        Args:
+            blob_id: Id returned by put
+
+        Returns:
+            The stored bytes
+
+        Raises:
+            BlobNotFoundError: If the blob was released or expired
+        """
+        blob = self._blobs.get(blob_id)
+        if blob is None:
+            raise BlobNotFoundError(blob_id)
+        return blob.data
+
+    def retain(self, blob_id: str) -> None:
+        """Add a reference for an additional holder.
+
+        The blob does not expire while it has more than one holder.
+
+        Args:
+            blob_id: Id returned by put
+
+        Raises:
+            BlobNotFoundError: If the blob was released or expired
+        """
+        blob = self._blobs.get(blob_id)
+        if blob is None:
+            raise BlobNotFoundError(blob_id)
+        blob.refs += 1
+
+    def release(self, blob_id: str) -> bool:
+        """Drop one reference, freeing the blob when none remain.
+
+        Args:
+            blob_id: Id returned by put
+
+        Returns:
+            True if the blob was freed, False if references remain or the
+            blob no longer exists
+        """
+        blob = self._blobs.get(blob_id)
+        if blob is None:
+            return False
+        blob.refs -= 1
+        if blob.refs > 0:
+            return False
+        self._discard(blob_id)
+        return True
+
+    def sweep(self) -> int:
+        """Free blobs that outlived the TTL with only their first holder.
+
+        Returns:
+            Number of blobs freed
+        """
+        now = time.monotonic()
+        expired = [
+            blob_id
+            for blob_id, blob in self._blobs.items()
+            if blob.refs == 1 and blob.expires_at <= now
+        ]
+        for blob_id in expired:
+            self._discard(blob_id)
+        if expired:
+            metrics.inc("blob_store_expired_total", len(expired))
+        return len(expired)
+
+    def _discard(self, blob_id: str) -> None:
+        blob = self._blobs.pop(blob_id)
+        self._total_bytes -= len(blob.data)
+        self._record()
+
+    def _record(self) -> None:
+        metrics.set_gauge("blob_store_blobs", len(self._blobs))
+        metrics.set_gauge("blob_store_bytes", self._total_bytes)
+
+
+def get_blob_store() -> BlobStore:
+    """Get or create the global blob store instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global BlobStore instance
+    """
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(ttl_seconds=get_settings().BLOB_TTL_SECONDS)
+    return _blob_store
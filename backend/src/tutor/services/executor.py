@@ -0,0 +1,131 @@
+"""CPU-bound work offloading for AI English Tutor.
+
+Markdown normalization, vocabulary parsing and image decoding are plain
+synchronous work. Run inline on the event loop they stall token delivery
+for every concurrent stream, so ``run_cpu`` sends them to a worker pool:
+
+- ``thread`` (default): cheap hand-off. Pure-Python work still holds the
+  GIL but yields it every switch interval (5 ms), so the loop keeps running
+  between slices instead of waiting for the whole job.
+- ``process``: true parallelism at the cost of pickling arguments and
+  results; functions must be importable at module level.
+
+Small jobs are cheaper to run than to hand off, so execution is adaptive:
+the cost per input unit (e.g. character or byte) of each job kind is
+learned as an EWMA, and a job whose predicted run time is under
+``CPU_INLINE_MAX_MS`` runs inline. Until a kind has been measured, inputs
+smaller than ``CPU_INLINE_MAX_SIZE`` run inline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_EWMA_ALPHA = 0.2
+
+# Global executor instance (lazy-initialized)
+_cpu_executor: Executor | None = None
+_executor_lock = threading.Lock()
+
+# Job kind -> EWMA of seconds per input unit
+_cost_per_unit: dict[str, float] = {}
+
+
+def get_cpu_executor() -> Executor:
+    """Get or create the global CPU worker pool.
+
+    Returns:
+        A ThreadPoolExecutor or ProcessPoolExecutor, per CPU_EXECUTOR
+    """
+    global _cpu_executor
+    if _cpu_executor is None:
+        with _executor_lock:
+            if _cpu_executor is None:
+                settings = get_settings()
+                workers = settings.CPU_EXECUTOR_WORKERS or min(4, os.cpu_count() or 1)
+                if settings.CPU_EXECUTOR == "process":
+                    _cpu_executor = ProcessPoolExecutor(max_workers=workers)
+                else:
+                    _cpu_executor = ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix="cpu"
+                    )
+                logger.info(f"CPU executor: {settings.CPU_EXECUTOR} x {workers}")
+    return _cpu_executor
+
+
+def shutdown_cpu_executor() -> None:
+    """Shut down the global worker pool (it is recreated on next use)."""
+    global _cpu_executor
+    with _executor_lock:
+        executor, _cpu_executor = _cpu_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _should_inline(kind: str, size: int) -> bool:
+    settings = get_settings()
+    cost = _cost_per_unit.get(kind)
+    if cost is None:
+        return size < settings.CPU_INLINE_MAX_SIZE
+    return cost * size * 1000 < settings.CPU_INLINE_MAX_MS
+
+
+def _timed_call[T](func: Callable[..., T], *args: object) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _learn(kind: str, size: int, seconds: float) -> None:
+    if size <= 0:
+        return
+    per_unit = seconds / size
+    previous = _cost_per_unit.get(kind)
+    _cost_per_unit[kind] = (
+        per_unit if previous is None else previous + _EWMA_ALPHA * (per_unit - previous)
+    )
+
+
+async def run_cpu[T](
+    func: Callable[..., T], *args: object, size: int, kind: str | None = None
+) -> T:
+    """Run CPU-bound ``func(*args)`` inline or on the worker pool.
+
+    Args:
+        func: Synchronous function (module-level if CPU_EXECUTOR is "process")
+        *args: Positional arguments for func
+        size: Input size (characters, bytes, ...) used to predict the run time
+        kind: Job kind for cost tracking and metrics (default: func's name)
+
+    Returns:
+        The function's result
+
+    Raises:
+        Whatever func raises
+    """
+    kind = kind or func.__name__
+    if _should_inline(kind, size):
+        mode = "inline"
+        result, seconds = _timed_call(func, *args)
+    else:
+        mode = "offloaded"
+        loop = asyncio.get_running_loop()
+        result, seconds = await loop.run_in_executor(
+            get_cpu_executor(), functools.partial(_timed_call, func, *args)
+        )
+    _learn(kind, size, seconds)
+    metrics.inc("cpu_jobs_total", kind=kind, mode=mode)
+    metrics.observe("cpu_job_seconds", seconds, kind=kind)
+    return result
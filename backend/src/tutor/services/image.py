@@ -3,12 +3,33 @@
 Provides image validation, base64 encoding, and preprocessing for LLM consumption.
 """
 
-import base64
+import binascii
+import io
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps
 
 # Constants for image validation
 MAX_IMAGE_SIZE_MB = 10
 ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/webp"}
 
+# OpenAI Vision input resolution per detail level: "low" sees a single
+# 512x512 view; "high" fits the image in 2048x2048, then scales the
+# shortest side down to 768. Anything larger is resized away by the API.
+LOW_DETAIL_MAX_SIDE = 512
+HIGH_DETAIL_MAX_SIDE = 2048
+HIGH_DETAIL_SHORT_SIDE = 768
+
+# Pixels darker than this count as content when cropping page margins
+_MARGIN_CONTENT_THRESHOLD = 160
+# Padding kept around the detected content box, as a fraction of each side
+_MARGIN_PADDING = 0.02
+# Margin detection runs on a thumbnail no larger than this
+_MARGIN_PROBE_SIDE = 256
+
+# Base64 characters needed to sniff the longest magic number (WebP: 12 bytes)
+_MAGIC_PREFIX_CHARS = 16
+
 
 class ImageValidationError(Exception):
     """Raised when image validation fails."""
@@ -16,43 +37,121 @@ class ImageValidationError(Exception):
     pass
 
 
-def validate_image(image_data: str, mime_type: str) -> tuple[bool, str]:
-    """Validate image size and format.
+def base64_decoded_size(image_data: str) -> int:
+    """Compute the decoded size of base64 data without decoding it.
 
     Args:
-        image_data: Base64 encoded image data
-        mime_type: The image MIME type (e.g., "image/jpeg", "image/png")
+        image_data: Base64 encoded data (no whitespace or data-URL prefix)
 
     Returns:
-        Tuple of (is_valid, error_message)
-        - is_valid: True if validation passes, False otherwise
-        - error_message: Empty string if valid, error description if invalid
+        Number of bytes the data decodes to
 
-    Example:
-        >>> is_valid, error = validate_image("base64data...", "image/jpeg")
-        >>> if not is_valid:
-        ...     print(f"Validation failed: {error}")
+    Raises:
+        ImageValidationError: If the length is not a multiple of 4
     """
-    # Check MIME type
+    if len(image_data) % 4:
+        raise ImageValidationError("Invalid base64 data: length is not a multiple of 4")
+    padding = 2 if image_data.endswith("==") else 1 if image_data.endswith("=") else 0
+    return len(image_data) // 4 * 3 - padding
+
+
+def sniff_mime_type(head: bytes) -> str | None:
+    """Detect an allowed image type from its leading magic bytes.
+
+    Args:
+        head: The first bytes of the file (at least 12 for WebP)
+
+    Returns:
+        The detected MIME type, or None if it is not an allowed format
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _a2b(data: str) -> bytes:
+    """Strictly decode base64, raising ImageValidationError on bad input."""
+    try:
+        return binascii.a2b_base64(data, strict_mode=True)
+    except (binascii.Error, ValueError) as e:
+        raise ImageValidationError(f"Invalid base64 data: {e}") from e
+
+
+def _check_size(size: int) -> None:
+    """Reject images whose decoded size exceeds MAX_IMAGE_SIZE_MB."""
+    size_mb = size / (1024 * 1024)
+    if size_mb > MAX_IMAGE_SIZE_MB:
+        raise ImageValidationError(
+            f"Image size ({size_mb:.2f}MB) exceeds limit ({MAX_IMAGE_SIZE_MB}MB)"
+        )
+
+
+def _check_image(image_data: str, mime_type: str) -> str:
+    """Run the checks that need no full decode and return the detected type."""
     if mime_type not in ALLOWED_MIME_TYPES:
-        return (
-            False,
-            f"Unsupported image format: {mime_type}. Allowed: {ALLOWED_MIME_TYPES}",
+        raise ImageValidationError(
+            f"Unsupported image format: {mime_type}. Allowed: {ALLOWED_MIME_TYPES}"
         )
 
-    # Check size (base64 encoded size)
-    try:
-        decoded_size = len(base64.b64decode(image_data, validate=True))
-        size_mb = decoded_size / (1024 * 1024)
-        if size_mb > MAX_IMAGE_SIZE_MB:
-            return (
-                False,
-                f"Image size ({size_mb:.2f}MB) exceeds limit ({MAX_IMAGE_SIZE_MB}MB)",
-            )
-    except Exception as e:
-        return False, f"Invalid base64 data: {str(e)}"
+    _check_size(base64_decoded_size(image_data))
+
+    detected = sniff_mime_type(_a2b(image_data[:_MAGIC_PREFIX_CHARS]))
+    if detected is None:
+        raise ImageValidationError(f"Image content is not a valid {mime_type} file")
+    return detected
+
+
+def check_image_bytes(image_bytes: bytes) -> str:
+    """Validate raw (already decoded) image bytes, e.g. from a binary upload.
+
+    Args:
+        image_bytes: The uploaded file content
+
+    Returns:
+        The MIME type detected from the file's magic bytes
+
+    Raises:
+        ImageValidationError: If the file is too large or not an allowed format
+    """
+    _check_size(len(image_bytes))
+    detected = sniff_mime_type(image_bytes[:12])
+    if detected is None:
+        raise ImageValidationError(
+            f"Unsupported image content. Allowed: {ALLOWED_MIME_TYPES}"
+        )
+    return detected
 
-    return True, ""
+
+def decode_image(image_data: str, mime_type: str) -> tuple[bytes, str]:
+    """Validate base64 image data and decode it into a single buffer.
+
+    Size is computed arithmetically and the format is sniffed from the first
+    bytes before anything is decoded, so oversized or non-image uploads are
+    rejected cheaply. The payload is then validated and decoded in one strict
+    pass into a single immutable buffer, which callers reuse for hashing and
+    preprocessing (``io.BytesIO`` shares ``bytes`` without copying) instead
+    of decoding the string again.
+
+    The declared MIME type must be an allowed type, but the returned type is
+    the one detected from the content (browsers derive the declared type
+    from the file extension).
+
+    Args:
+        image_data: Base64 encoded image data
+        mime_type: The declared MIME type (e.g., "image/jpeg", "image/png")
+
+    Returns:
+        Tuple of (decoded bytes, detected MIME type)
+
+    Raises:
+        ImageValidationError: If the type, size, content or encoding is invalid
+    """
+    detected = _check_image(image_data, mime_type)
+    return _a2b(image_data), detected
 
 
 def preprocess_image_for_llm(image_data: str, mime_type: str) -> dict:
@@ -76,3 +175,112 @@ def preprocess_image_for_llm(image_data: str, mime_type: str) -> dict:
         "type": "image_url",
         "image_url": {"url": f"data:{mime_type};base64,{image_data}"},
     }
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """Image re-encoded for the vision API.
+
+    Attributes:
+        data: Encoded image bytes
+        mime_type: MIME type of ``data``
+        width: Width in pixels after preprocessing
+        height: Height in pixels after preprocessing
+    """
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+
+
+def vision_target_size(width: int, height: int, detail: str) -> tuple[int, int]:
+    """Compute the largest size the vision API actually uses for an image.
+
+    Args:
+        width: Source width in pixels
+        height: Source height in pixels
+        detail: Vision API detail level ("low", "high" or "auto")
+
+    Returns:
+        (width, height) no larger than the source image
+    """
+    if detail == "low":
+        scale = LOW_DETAIL_MAX_SIDE / max(width, height)
+    else:
+        scale = min(
+            HIGH_DETAIL_MAX_SIDE / max(width, height),
+            HIGH_DETAIL_SHORT_SIDE / min(width, height),
+        )
+    scale = min(1.0, scale)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _content_box(image: Image.Image) -> tuple[int, int, int, int] | None:
+    """Find the bounding box of dark (text) content, with a little padding."""
+    probe = image.copy()
+    probe.thumbnail((_MARGIN_PROBE_SIDE, _MARGIN_PROBE_SIDE))
+    mask = probe.point(lambda p: 255 if p < _MARGIN_CONTENT_THRESHOLD else 0)
+    box = mask.getbbox()
+    if box is None:
+        return None
+
+    sx = image.width / probe.width
+    sy = image.height / probe.height
+    pad_x = image.width * _MARGIN_PADDING
+    pad_y = image.height * _MARGIN_PADDING
+    left = max(0, int(box[0] * sx - pad_x))
+    top = max(0, int(box[1] * sy - pad_y))
+    right = min(image.width, int(box[2] * sx + pad_x))
+    bottom = min(image.height, int(box[3] * sy + pad_y))
+    if right - left < image.width * 0.2 or bottom - top < image.height * 0.2:
+        # Suspiciously small content region: keep the full frame
+        return None
+    return left, top, right, bottom
+
+
+def preprocess_image_bytes(image_bytes: bytes, detail: str, quality: int = 85) -> PreparedImage:
+    """Shrink an uploaded photo to what the vision API will actually look at.
+
+    Decodes once (using JPEG draft mode to skip full-resolution decoding when
+    possible), applies the EXIF orientation, converts to grayscale, crops
+    blank page margins, downsizes to the resolution used for ``detail`` and
+    re-encodes as JPEG. CPU-bound: call it from a worker thread.
+
+    Args:
+        image_bytes: Raw (decoded) image file bytes
+        detail: Vision API detail level ("low", "high" or "auto")
+        quality: JPEG quality for the re-encoded image (default: 85)
+
+    Returns:
+        The re-encoded image
+
+    Raises:
+        ImageValidationError: If the bytes cannot be decoded as an image
+    """
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        target = vision_target_size(image.width, image.height, detail)
+        # Decode JPEGs at the smallest scale that still leaves room for cropping
+        image.draft("L", (target[0] * 2, target[1] * 2))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("L")
+    except Exception as e:
+        raise ImageValidationError(f"Cannot decode image: {e}") from e
+
+    box = _content_box(image)
+    if box is not None:
+        image = image.crop(box)
+
+    target = vision_target_size(image.width, image.height, detail)
+    if target != image.size:
+        image = image.resize(target, Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=quality)
+    return PreparedImage(
+        data=output.getvalue(),
+        mime_type="image/jpeg",
+        width=image.width,
+        height=image.height,
+    )
@@ -0,0 +1,273 @@
+"""Asynchronous analysis jobs for AI English Tutor.
+
+``POST /api/v1/tutor/jobs`` returns a job id at once and the analyze or
+image pipeline runs later in a task pool of at most ``JOBS_MAX_CONCURRENCY``
+jobs; at most ``JOBS_MAX_QUEUED`` further jobs wait for a slot and
+submissions beyond that are rejected. A job's SSE events are buffered in a ``StreamRun`` (see
+``tutor.services.replay``), so any number of clients can attach to its
+stream, and also folded into a JSON result that can be polled while the job
+runs. Clients can cancel a job whether it is queued or running.
+
+Finished jobs are kept for ``JOBS_TTL_SECONDS``. The ``jobs`` gauge counts
+queued and running jobs, ``jobs_total`` counts jobs by final state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from typing import Literal
+
+from tutor.config import get_settings
+from tutor.services.analysis_cache import AnalysisResult
+from tutor.services.metrics import metrics
+from tutor.services.replay import StreamRun
+from tutor.services.streaming import is_heartbeat
+
+logger = logging.getLogger(__name__)
+
+JobState = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+JobKind = Literal["analyze", "image"]
+
+FINAL_STATES: frozenset[str] = frozenset({"succeeded", "failed", "cancelled"})
+
+# Global job manager instance (lazy-initialized)
+_job_manager: JobManager | None = None
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is full."""
+
+    pass
+
+
+class Job:
+    """One submitted analysis and its progress."""
+
+    def __init__(self, session_id: str, kind: JobKind, max_bytes: int) -> None:
+        """Initialize a queued job.
+
+        Args:
+            session_id: Session the analysis runs in (used in SSE event ids)
+            kind: "analyze" for text, "image" for image analysis
+            max_bytes: Replay buffer size limit of the job's event stream
+        """
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.kind = kind
+        self.state: JobState = "queued"
+        self.run = StreamRun(session_id, max_bytes)
+        self.result = AnalysisResult()
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a final state."""
+        return self.state in FINAL_STATES
+
+    def as_dict(self, include_result: bool = True) -> dict:
+        """Return the job status (and result so far) as a JSON-serializable dict.
+
+        Args:
+            include_result: Include the partial or final result
+
+        Returns:
+            Dict with id, session, kind, state, timestamps and optionally the result
+        """
+        data = {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "kind": self.kind,
+            "state": self.state,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result:
+            data["result"] = self.result.as_dict()
+        return data
+
+
+class JobManager:
+    """Runs submitted jobs with bounded concurrency and keeps them for a TTL."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        ttl_seconds: float = 3600.0,
+        max_bytes: int = 2 * 1024 * 1024,
+        max_queued: int = 32,
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            max_concurrency: Jobs allowed to run at the same time; others queue
+            ttl_seconds: How long a finished job can still be fetched
+            max_bytes: Replay buffer size limit per job
+            max_queued: Jobs allowed to wait for a slot (0: no limit)
+        """
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._max_queued = max_queued
+        self._queued = 0
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+        self._jobs: dict[str, Job] = {}
+
+    @property
+    def full(self) -> bool:
+        """Whether a submitted job would be rejected because the queue is full."""
+        return 0 < self._max_queued <= self._queued
+
+    def submit(
+        self,
+        session_id: str,
+        kind: JobKind,
+        events: AsyncIterator[str | bytes],
+        cleanup: Callable[[], object] | None = None,
+    ) -> Job:
+        """Queue a pipeline run as a job.
+
+        Args:
+            session_id: Session the analysis runs in
+            kind: "analyze" or "image"
+            events: SSE event stream of the pipeline; iterated once a slot is free
+            cleanup: Called when the job ends, whether it ran or was cancelled
+                while queued (e.g. to release a blob held for the job)
+
+        Returns:
+            The queued Job
+
+        Raises:
+            JobQueueFullError: If JOBS_MAX_QUEUED jobs are already waiting
+        """
+        if self.full:
+            metrics.inc("jobs_rejected_total")
+            raise JobQueueFullError(f"{self._queued} jobs are already queued")
+        self._purge()
+        job = Job(session_id, kind, self._max_bytes)
+        self._jobs[job.id] = job
+        self._queued += 1
+        metrics.add_gauge("jobs", 1, state="queued")
+        job.task = asyncio.create_task(self._execute(job, events, cleanup), name=f"job-{job.id}")
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return a job, or None if unknown or expired.
+
+        Args:
+            job_id: The job id
+
+        Returns:
+            The Job, or None
+        """
+        self._purge()
+        return self._jobs.get(job_id)
+
+    async def cancel(self, job_id: str) -> Job | None:
+        """Cancel a queued or running job and wait until it stopped.
+
+        Finished jobs are left as they are.
+
+        Args:
+            job_id: The job id
+
+        Returns:
+            The Job, or None if unknown or expired
+        """
+        job = self.get(job_id)
+        if job is not None and job.task is not None and not job.task.done():
+            job.task.cancel()
+            await asyncio.wait({job.task})
+        return job
+
+    async def close(self) -> None:
+        """Cancel all unfinished jobs (application shutdown)."""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _execute(
+        self,
+        job: Job,
+        events: AsyncIterator[str | bytes],
+        cleanup: Callable[[], object] | None,
+    ) -> None:
+        try:
+            async with self._slots:
+                self._transition(job, "running")
+                job.started_at = time.time()
+                metrics.observe("job_queue_seconds", job.started_at - job.created_at)
+                async for event in events:
+                    if is_heartbeat(event):  # heartbeats are the reader's job
+                        continue
+                    job.run.append(event)
+                    job.result.feed(event)
+            errors = job.result.errors
+            if not job.result.complete:
+                job.error = errors[-1]["message"] if errors else "Pipeline ended without a result"
+            self._transition(job, "succeeded" if job.result.complete else "failed")
+        except asyncio.CancelledError:
+            self._transition(job, "cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            self._transition(job, "failed")
+        finally:
+            if cleanup is not None:
+                cleanup()
+            if aclose := getattr(events, "aclose", None):
+                await aclose()  # stops the pipeline's agent tasks on cancel
+            job.finished_at = time.time()
+            job.run.finish()
+            if job.started_at is not None:
+                metrics.observe("job_run_seconds", job.finished_at - job.started_at)
+
+    def _transition(self, job: Job, state: JobState) -> None:
+        if job.state == "queued":
+            self._queued -= 1
+        metrics.add_gauge("jobs", -1, state=job.state)
+        job.state = state
+        if state in FINAL_STATES:
+            metrics.inc("jobs_total", state=state)
+        else:
+            metrics.add_gauge("jobs", 1, state=state)
+
+    def _purge(self) -> None:
+        cutoff = time.time() - self._ttl
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the global job manager instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global JobManager instance
+    """
+    global _job_manager
+    if _job_manager is None:
+        settings = get_settings()
+        _job_manager = JobManager(
+            max_concurrency=settings.JOBS_MAX_CONCURRENCY,
+            ttl_seconds=settings.JOBS_TTL_SECONDS,
+            max_bytes=settings.STREAM_REPLAY_MAX_BYTES,
+            max_queued=settings.JOBS_MAX_QUEUED,
+        )
+    return _job_manager
@@ -0,0 +1,222 @@
+"""Event-loop lag monitor and blocking-call detector for AI English Tutor.
+
+All SSE streams on a worker share one event loop, so any synchronous work
+(a large base64 decode, a disk read, a long regex pass) stalls token
+delivery for every stream at once.
+
+The monitor is a task that sleeps for a fixed tick and records how late it
+wakes up (``event_loop_lag_seconds``). Recent samples are kept so callers
+that act on lag (admission control) can use a high percentile instead of
+the last sample, which a single slow callback can spike. With the blocking-call detector on,
+a watchdog thread also checks the task's heartbeat; when the loop has not
+run for longer than the threshold it samples the loop thread's Python stack
+(``sys._current_frames``) until the loop comes back. Each stall is then
+logged and kept, with the task that held the loop and its stack samples,
+for ``GET /api/v1/debug/loop-stalls``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per stack sample and samples kept per stall
+STACK_LIMIT = 30
+MAX_SAMPLES_PER_STALL = 5
+# Lag samples kept for lag_p90_seconds
+LAG_WINDOW = 10
+
+# Global loop monitor instance (lazy-initialized)
+_loop_monitor: LoopMonitor | None = None
+
+
+@dataclass
+class LoopStall:
+    """One period during which the event loop did not run."""
+
+    started_at: float  # wall-clock time (time.time())
+    task: str
+    duration_ms: float = 0.0
+    samples: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        """Return the stall as a JSON-serializable dict."""
+        return {
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 1),
+            "task": self.task,
+            "samples": self.samples,
+        }
+
+
+def _describe_task(loop: asyncio.AbstractEventLoop) -> str:
+    """Name the task the loop is running (read from another thread; best effort)."""
+    task = asyncio.current_task(loop)
+    if task is None:
+        return "<callback>"
+    coro = task.get_coro()
+    return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+
+class LoopMonitor:
+    """Samples event-loop lag and, optionally, the stacks of blocking calls."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        block_threshold: float | None = None,
+        max_stalls: int = 50,
+        lag_window: int = LAG_WINDOW,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag samples
+            block_threshold: Seconds the loop may go without running before the
+                watchdog samples its stack; None disables the detector
+            max_stalls: Number of recent stalls kept
+            lag_window: Number of recent lag samples kept for lag_p90_seconds
+        """
+        self._interval = interval
+        self._threshold = block_threshold
+        # Tick faster than the threshold so a stall is noticed within it
+        self._tick = interval if block_threshold is None else min(interval, block_threshold / 4)
+        self._stalls: deque[LoopStall] = deque(maxlen=max_stalls)
+        self._lag = 0.0
+        self._lags: deque[float] = deque(maxlen=lag_window)
+        self._lock = threading.Lock()
+        self._stall: LoopStall | None = None
+        self._beat = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._stop = threading.Event()
+
+    @property
+    def detector_enabled(self) -> bool:
+        """Whether blocking calls are sampled."""
+        return self._threshold is not None
+
+    @property
+    def lag_seconds(self) -> float:
+        """The most recent lag sample (0.0 until the monitor has run one interval)."""
+        return self._lag
+
+    @property
+    def lag_p90_seconds(self) -> float:
+        """The 90th percentile of the last ``lag_window`` lag samples.
+
+        Samples not taken yet count as 0.0, so one spike (even right after
+        startup) is ignored; the lag has to last for several samples.
+        """
+        window = self._lags.maxlen or 1
+        ignored = window - math.ceil(0.9 * window)
+        samples = sorted(self._lags, reverse=True)
+        return samples[ignored] if ignored < len(samples) else 0.0
+
+    def recent_stalls(self) -> list[dict]:
+        """Return recent stalls, newest first."""
+        with self._lock:
+            return [stall.as_dict() for stall in reversed(self._stalls)]
+
+    async def run(self) -> None:
+        """Sample lag until cancelled (run as a background task)."""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        watchdog = None
+        if self._threshold is not None:
+            watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            watchdog.start()
+
+        since_sample = 0.0
+        try:
+            while True:
+                start = loop.time()
+                await asyncio.sleep(self._tick)
+                elapsed = loop.time() - start
+                self._beat = time.monotonic()
+                self._finish_stall(elapsed - self._tick)
+                since_sample += elapsed
+                if since_sample >= self._interval:
+                    self._record_lag(max(0.0, elapsed - self._tick))
+                    since_sample = 0.0
+        finally:
+            self._stop.set()
+            if watchdog is not None:
+                watchdog.join(timeout=1)
+
+    def _record_lag(self, lag: float) -> None:
+        """Record one lag sample."""
+        self._lag = lag
+        self._lags.append(lag)
+        metrics.observe("event_loop_lag_seconds", lag)
+
+    def _watch(self) -> None:
+        """Watchdog thread: sample the loop thread's stack while it is blocked."""
+        assert self._threshold is not None
+        while not self._stop.wait(self._threshold / 4):
+            beat = self._beat
+            if time.monotonic() - beat < self._threshold + self._tick:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            sample = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+            with self._lock:
+                if self._stall is None:
+                    self._stall = LoopStall(
+                        started_at=time.time() - (time.monotonic() - beat),
+                        task=_describe_task(self._loop),
+                    )
+                samples = self._stall.samples
+                if len(samples) < MAX_SAMPLES_PER_STALL and (not samples or samples[-1] != sample):
+                    samples.append(sample)
+
+    def _finish_stall(self, blocked: float) -> None:
+        """Close the stall the watchdog opened, if any (runs on the loop)."""
+        with self._lock:
+            stall, self._stall = self._stall, None
+            if stall is None:
+                return
+            stall.duration_ms = blocked * 1000
+            self._stalls.append(stall)
+        metrics.inc("event_loop_stalls_total")
+        metrics.observe("event_loop_stall_seconds", blocked)
+        logger.warning(
+            f"Event loop blocked for {stall.duration_ms:.0f} ms in {stall.task}:\n"
+            f"{stall.samples[-1] if stall.samples else ''}"
+        )
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get or create the global loop monitor instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global LoopMonitor instance
+    """
+    global _loop_monitor
+    if _loop_monitor is None:
+        settings = get_settings()
+        _loop_monitor = LoopMonitor(
+            interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+            block_threshold=(
+                settings.LOOP_BLOCK_THRESHOLD_MS / 1000 if settings.LOOP_BLOCK_DETECTOR else None
+            ),
+        )
+    return _loop_monitor
@@ -0,0 +1,154 @@
+"""In-process metrics for AI English Tutor.
+
+Provides labelled counters, gauges and summaries (count/sum/max plus
+percentiles over a bounded window of recent observations), exposed as a
+JSON snapshot by the ``/api/v1/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+# Recent observations kept per summary for percentile estimates
+SUMMARY_WINDOW = 1024
+
+
+def _series_key(name: str, labels: dict[str, object]) -> str:
+    """Build a Prometheus-style series key, e.g. ``name{a=1,b=x}``."""
+    if not labels:
+        return name
+    inner = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+    return f"{name}{{{inner}}}"
+
+
+class _Summary:
+    """Running count/sum/max with a bounded window for percentiles."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = float("-inf")
+        self.window: deque[float] = deque(maxlen=SUMMARY_WINDOW)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.window.append(value)
+
+    def snapshot(self) -> dict[str, float]:
+        ordered = sorted(self.window)
+
+        def pct(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters, gauges and summaries."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._summaries: dict[str, _Summary] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: object) -> None:
+        """Increase a counter.
+
+        Args:
+            name: Metric name (e.g. "ocr_cache_lookups_total")
+            value: Amount to add (default: 1)
+            **labels: Label values identifying the series
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        """Set a gauge to an absolute value.
+
+        Args:
+            name: Metric name
+            value: Current value
+            **labels: Label values identifying the series
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def add_gauge(self, name: str, delta: float, **labels: object) -> None:
+        """Move a gauge up or down by ``delta``.
+
+        Args:
+            name: Metric name
+            delta: Amount to add (negative to subtract)
+            **labels: Label values identifying the series
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0.0) + delta
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        """Record one observation in a summary.
+
+        Args:
+            name: Metric name (e.g. "ocr_latency_seconds")
+            value: Observed value
+            **labels: Label values identifying the series
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = _Summary()
+            summary.observe(value)
+
+    def get(self, name: str, **labels: object) -> float:
+        """Return the current value of a counter or gauge (0 if unset).
+
+        Args:
+            name: Metric name
+            **labels: Label values identifying the series
+
+        Returns:
+            The counter or gauge value
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key, 0.0))
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return all metrics as a JSON-serializable dict.
+
+        Returns:
+            Dict with "counters", "gauges" and "summaries" keyed by series
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {k: s.snapshot() for k, s in self._summaries.items()},
+            }
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -0,0 +1,211 @@
+"""Multiplexed tutoring operations over one WebSocket connection.
+
+``/api/v1/tutor/ws`` carries a whole tutoring session: analyze, image and
+chat operations run concurrently on one connection, each tagged with a
+client-chosen operation id. Operations produce the same SSE frames as the
+HTTP endpoints; ``tag_frame`` turns each one into a JSON text message
+``{"id": ..., "event": ..., "data": ...}`` by splicing the already encoded
+payload, so the event vocabulary is identical and nothing is serialized twice.
+
+All operations of a connection write into one bounded send queue drained by
+a single sender task. When the client reads slower than the operations
+produce, the queue fills and the operations wait (``ws_send_waits_total``)
+instead of buffering without limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from tutor.services.metrics import metrics
+from tutor.services.streaming import dumps_json, is_heartbeat, sse_encoder
+
+logger = logging.getLogger(__name__)
+
+
+def tag_frame(op_id: str | None, frame: bytes) -> bytes:
+    """Convert one SSE event frame into a tagged WebSocket message.
+
+    Args:
+        op_id: Operation id the frame belongs to (None for connection errors)
+        frame: Encoded SSE event ("event: ...\\ndata: ...\\n\\n"), not a heartbeat
+
+    Returns:
+        The JSON message as bytes
+    """
+    header, _, body = frame.partition(b"\n")
+    return b'{"id":%b,"event":"%b","data":%b}' % (
+        dumps_json(op_id),
+        header.removeprefix(b"event: "),
+        body.removeprefix(b"data: ").rstrip(b"\n"),
+    )
+
+
+class OperationRejectedError(Exception):
+    """An operation could not be started on this connection."""
+
+    def __init__(self, message: str, code: str) -> None:
+        """Initialize the error.
+
+        Args:
+            message: Human-readable reason
+            code: Error code sent to the client
+        """
+        super().__init__(message)
+        self.code = code
+
+
+class _Operation:
+    """One running operation of a connection."""
+
+    def __init__(self, cleanup: Callable[[], object] | None) -> None:
+        self.cleanup = cleanup
+        self.started = False
+        self.task: asyncio.Task | None = None
+
+
+class SessionMultiplexer:
+    """Runs a connection's operations concurrently and interleaves their events.
+
+    Use as an async context manager: entering starts the sender task,
+    leaving cancels every operation still running.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        max_operations: int = 4,
+        send_queue_size: int = 64,
+    ) -> None:
+        """Initialize the multiplexer.
+
+        Args:
+            send: Sends one text message to the client (e.g. WebSocket.send_text)
+            max_operations: Operations allowed to run at the same time
+            send_queue_size: Messages buffered for the client before operations wait
+        """
+        self._send = send
+        self._max_operations = max_operations
+        self._outbox: asyncio.Queue[bytes] = asyncio.Queue(send_queue_size)
+        self._operations: dict[str, _Operation] = {}
+        self._sender: asyncio.Task | None = None
+
+    @property
+    def active(self) -> int:
+        """Number of operations still running."""
+        return len(self._operations)
+
+    async def __aenter__(self) -> SessionMultiplexer:
+        self._sender = asyncio.create_task(self._drain(), name="ws-sender")
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    def start(
+        self,
+        op_id: str,
+        events: AsyncIterator[bytes],
+        cleanup: Callable[[], object] | None = None,
+    ) -> None:
+        """Start relaying an operation's SSE frames to the client.
+
+        Args:
+            op_id: Client-chosen operation id, unique among running operations
+            events: SSE event stream of the operation
+            cleanup: Called if the operation is cancelled before it starts
+
+        Raises:
+            OperationRejectedError: If the id is in use or too many operations run
+        """
+        if op_id in self._operations:
+            metrics.inc("ws_operations_total", result="rejected")
+            raise OperationRejectedError(f"Operation {op_id} is already running", "duplicate_id")
+        if len(self._operations) >= self._max_operations:
+            metrics.inc("ws_operations_total", result="rejected")
+            raise OperationRejectedError(
+                f"At most {self._max_operations} operations can run per connection",
+                "too_many_operations",
+            )
+        operation = self._operations[op_id] = _Operation(cleanup)
+        operation.task = asyncio.create_task(
+            self._relay(op_id, operation, events), name=f"ws-op-{op_id}"
+        )
+
+    async def cancel(self, op_id: str) -> bool:
+        """Cancel a running operation and wait until it stopped.
+
+        The operation's last message is an error event with code "cancelled".
+
+        Args:
+            op_id: The operation id
+
+        Returns:
+            True if the operation was running, False if unknown or finished
+        """
+        operation = self._operations.get(op_id)
+        if operation is None or operation.task is None:
+            return False
+        await self._stop([op_id])
+        await self.reject(op_id, "Operation cancelled", "cancelled")
+        return True
+
+    async def reject(self, op_id: str | None, message: str, code: str) -> None:
+        """Send an error event for an operation (or the connection, if op_id is None).
+
+        Args:
+            op_id: The operation id, if known
+            message: Error message
+            code: Error code
+        """
+        await self._put(tag_frame(op_id, sse_encoder.error(message, code)))
+
+    async def close(self) -> None:
+        """Cancel all running operations and stop the sender."""
+        await self._stop(list(self._operations))
+        if self._sender is not None:
+            self._sender.cancel()
+            await asyncio.gather(self._sender, return_exceptions=True)
+
+    async def _stop(self, op_ids: list[str]) -> None:
+        operations = [self._operations[op_id] for op_id in op_ids]
+        tasks = [op.task for op in operations if op.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for op_id, operation in zip(op_ids, operations, strict=True):
+            # A task cancelled before its first step never ran _relay's cleanup
+            self._operations.pop(op_id, None)
+            if not operation.started and operation.cleanup is not None:
+                operation.cleanup()
+
+    async def _relay(self, op_id: str, operation: _Operation, events: AsyncIterator[bytes]) -> None:
+        operation.started = True
+        try:
+            async for frame in events:
+                if not is_heartbeat(frame):  # the WebSocket protocol has its own keepalive
+                    await self._put(tag_frame(op_id, frame))
+            metrics.inc("ws_operations_total", result="completed")
+        except asyncio.CancelledError:
+            metrics.inc("ws_operations_total", result="cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"WebSocket operation {op_id} failed: {e}")
+            metrics.inc("ws_operations_total", result="failed")
+            await self.reject(op_id, str(e), "processing_error")
+        finally:
+            if aclose := getattr(events, "aclose", None):
+                await aclose()  # stops the pipeline's agent tasks on cancel
+            self._operations.pop(op_id, None)
+
+    async def _put(self, message: bytes) -> None:
+        if self._outbox.full():
+            metrics.inc("ws_send_waits_total")
+        await self._outbox.put(message)
+
+    async def _drain(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            await self._send(message.decode())
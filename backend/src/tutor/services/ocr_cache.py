@@ -0,0 +1,105 @@
+"""OCR result cache for AI English Tutor.
+
+Many students upload the same workbook page, e.g. a scan shared by the
+teacher. The cache returns previously extracted text for exact repeats
+(same image bytes), keyed by a content hash namespaced by the OCR settings.
+
+Photos of the same page taken separately are not matched: a perceptual
+hash that tolerates re-framing also matches different pages set in the
+same layout, and serving another page's text is worse than a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+
+# Global OCR cache instance (lazy-initialized)
+_ocr_cache: OcrCache | None = None
+
+
+def content_hash(image_data: str | bytes, namespace: str = "") -> str:
+    """Hash image content for exact-match lookups.
+
+    Args:
+        image_data: Image bytes or their base64 string
+        namespace: Extra key material (e.g. OCR model and detail) so results
+            produced under different OCR settings never collide
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    digest.update(image_data.encode("ascii") if isinstance(image_data, str) else image_data)
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """Bounded LRU cache of OCR text keyed by image content hash."""
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached transcriptions (LRU eviction)
+        """
+        self._max_entries = max_entries
+        # content hash -> text; order is LRU (oldest first)
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: str) -> str | None:
+        """Find cached text for an image.
+
+        Args:
+            key: Content hash of the image (see content_hash)
+
+        Returns:
+            The cached text, or None on a miss
+        """
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+        return text
+
+    def store(self, key: str, text: str) -> None:
+        """Cache the OCR text for an image, evicting the least recently used entry.
+
+        Args:
+            key: Content hash of the image
+            text: Extracted text
+        """
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def record_lookup(hit: bool, cache: OcrCache) -> None:
+    """Record lookup outcome metrics.
+
+    Args:
+        hit: Whether the lookup found cached text
+        cache: The cache that was queried
+    """
+    metrics.inc("ocr_cache_lookups_total", result="hit" if hit else "miss")
+    metrics.set_gauge("ocr_cache_entries", len(cache))
+
+
+def get_ocr_cache() -> OcrCache:
+    """Get or create the global OCR cache instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global OcrCache instance
+    """
+    global _ocr_cache
+    if _ocr_cache is None:
+        _ocr_cache = OcrCache(max_entries=get_settings().OCR_CACHE_MAX_ENTRIES)
+    return _ocr_cache
@@ -0,0 +1,309 @@
+"""Per-client token-bucket rate limiting for AI English Tutor.
+
+Requests are charged by their estimated LLM tokens (see
+``tutor.services.admission.estimate_llm_tokens``), not counted, so a client
+sending long passages or images exhausts its budget sooner than one asking
+short questions. Every limited endpoint has a bucket per client IP and,
+where the request belongs to a session (chat, WebSocket operations), one
+per session; a request must fit in all of its buckets.
+
+Limits are configured per endpoint in ``RATE_LIMITS``, e.g.
+``analyze=300000/3600`` (a bucket of 300k tokens that refills in an hour).
+Buckets live in process memory, or in a SQLite file shared by all workers
+of a host (``RATE_LIMIT_BACKEND=sqlite``), updated in one transaction so
+concurrent workers never overspend a bucket.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+
+# Takes between sweeps of idle (full) buckets
+_SWEEP_EVERY = 1000
+
+# Global rate limiter instance (lazy-initialized)
+_rate_limiter: RateLimiter | None = None
+
+
+class RateLimit(NamedTuple):
+    """A token bucket size and the time an empty bucket takes to refill."""
+
+    capacity: float
+    per_seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Refill rate in tokens per second."""
+        return self.capacity / self.per_seconds
+
+
+class Charge(NamedTuple):
+    """Tokens to take from one bucket."""
+
+    key: str
+    cost: float
+    limit: RateLimit
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a request does not fit in one of its token buckets."""
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        """Initialize the error.
+
+        Args:
+            endpoint: The limited endpoint
+            retry_after: Seconds until the request would fit
+        """
+        super().__init__(f"Rate limit exceeded for {endpoint}, retry in {retry_after:.0f} s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def parse_rate_limits(spec: str) -> dict[str, RateLimit]:
+    """Parse a RATE_LIMITS setting.
+
+    Args:
+        spec: Comma-separated ``endpoint=tokens/seconds`` entries
+
+    Returns:
+        Dict of endpoint name to RateLimit
+
+    Raises:
+        ValueError: If an entry is malformed or not positive
+
+    Example:
+        >>> parse_rate_limits("analyze=300000/3600, chat=100000/3600")
+        {'analyze': RateLimit(capacity=300000.0, per_seconds=3600.0), ...}
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        endpoint, _, limit = entry.partition("=")
+        capacity, _, per_seconds = limit.partition("/")
+        try:
+            parsed = RateLimit(float(capacity), float(per_seconds))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit {entry!r}, expected endpoint=tokens/seconds")
+        if not endpoint.strip() or parsed.capacity <= 0 or parsed.per_seconds <= 0:
+            raise ValueError(f"Invalid rate limit {entry!r}, expected endpoint=tokens/seconds")
+        limits[endpoint.strip()] = parsed
+    return limits
+
+
+def _refill(tokens: float, updated_at: float, limit: RateLimit, now: float) -> float:
+    return min(limit.capacity, tokens + max(0.0, now - updated_at) * limit.rate)
+
+
+def _shortfall(charges: list[Charge], levels: list[float]) -> float:
+    """Return the seconds until every charge fits (0.0 if they fit now)."""
+    wait = 0.0
+    for charge, tokens in zip(charges, levels, strict=True):
+        cost = min(charge.cost, charge.limit.capacity)  # a full bucket always admits one request
+        if tokens < cost:
+            wait = max(wait, (cost - tokens) / charge.limit.rate)
+    return wait
+
+
+class MemoryBucketStore:
+    """Token buckets in process memory (one worker)."""
+
+    def __init__(self, idle_seconds: float = 3600.0) -> None:
+        """Initialize the store.
+
+        Args:
+            idle_seconds: Buckets untouched this long are full again and dropped
+        """
+        self._idle = idle_seconds
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._takes = 0
+
+    async def take(self, charges: list[Charge], now: float) -> float:
+        """Take the charges' tokens from their buckets, all or nothing.
+
+        Args:
+            charges: Tokens to take per bucket
+            now: Current time (seconds)
+
+        Returns:
+            0.0 if the tokens were taken, else seconds until they would fit
+        """
+        levels = []
+        for charge in charges:
+            tokens, updated_at = self._buckets.get(charge.key, (charge.limit.capacity, now))
+            levels.append(_refill(tokens, updated_at, charge.limit, now))
+        wait = _shortfall(charges, levels)
+        if wait > 0:
+            return wait
+        for charge, tokens in zip(charges, levels, strict=True):
+            self._buckets[charge.key] = (tokens - min(charge.cost, charge.limit.capacity), now)
+        self._takes += 1
+        if self._takes % _SWEEP_EVERY == 0:
+            cutoff = now - self._idle
+            self._buckets = {k: v for k, v in self._buckets.items() if v[1] >= cutoff}
+        return 0.0
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file shared by the workers of one host."""
+
+    def __init__(self, path: str | Path, idle_seconds: float = 3600.0) -> None:
+        """Open (or create) the bucket database.
+
+        Args:
+            path: SQLite database file (":memory:" for a private store)
+            idle_seconds: Buckets untouched this long are full again and deleted
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._idle = idle_seconds
+        self._lock = threading.Lock()
+        self._takes = 0
+        self._db = sqlite3.connect(
+            str(path), check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS bucket ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    async def take(self, charges: list[Charge], now: float) -> float:
+        """Take the charges' tokens from their buckets, all or nothing.
+
+        Runs in a thread; the read and update are one IMMEDIATE transaction,
+        so workers sharing the file serialize on it.
+
+        Args:
+            charges: Tokens to take per bucket
+            now: Current time (seconds)
+
+        Returns:
+            0.0 if the tokens were taken, else seconds until they would fit
+        """
+        return await asyncio.to_thread(self._take, charges, now)
+
+    def _take(self, charges: list[Charge], now: float) -> float:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                levels = []
+                for charge in charges:
+                    row = self._db.execute(
+                        "SELECT tokens, updated_at FROM bucket WHERE key = ?", (charge.key,)
+                    ).fetchone()
+                    tokens, updated_at = row or (charge.limit.capacity, now)
+                    levels.append(_refill(tokens, updated_at, charge.limit, now))
+                wait = _shortfall(charges, levels)
+                if wait == 0:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO bucket (key, tokens, updated_at) VALUES (?, ?, ?)",
+                        [
+                            (charge.key, tokens - min(charge.cost, charge.limit.capacity), now)
+                            for charge, tokens in zip(charges, levels, strict=True)
+                        ],
+                    )
+                    self._takes += 1
+                    if self._takes % _SWEEP_EVERY == 0:
+                        self._db.execute(
+                            "DELETE FROM bucket WHERE updated_at < ?", (now - self._idle,)
+                        )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return wait
+
+
+class RateLimiter:
+    """Charges requests against per-IP and per-session token buckets."""
+
+    def __init__(
+        self,
+        store: MemoryBucketStore | SQLiteBucketStore,
+        limits: dict[str, RateLimit],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            store: Bucket store
+            limits: Limit per endpoint; endpoints without one are not limited
+            clock: Wall-clock time source (shared across workers)
+        """
+        self._store = store
+        self._limits = limits
+        self._clock = clock
+
+    async def charge(
+        self,
+        endpoint: str,
+        cost: float,
+        client_ip: str | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        """Charge a request's estimated LLM tokens to its client's buckets.
+
+        Args:
+            endpoint: Endpoint name (a key of RATE_LIMITS)
+            cost: Estimated LLM tokens of the request
+            client_ip: Client address, if known
+            session_id: Session the request belongs to, if any
+
+        Raises:
+            RateLimitExceededError: If the request does not fit in every bucket
+        """
+        limit = self._limits.get(endpoint)
+        if limit is None:
+            return
+        charges = [
+            Charge(f"{endpoint}:{scope}:{client}", cost, limit)
+            for scope, client in (("ip", client_ip), ("session", session_id))
+            if client
+        ]
+        if not charges:
+            return
+        wait = await self._store.take(charges, self._clock())
+        if wait > 0:
+            metrics.inc("rate_limit_requests_total", endpoint=endpoint, result="limited")
+            raise RateLimitExceededError(endpoint, wait)
+        metrics.inc("rate_limit_requests_total", endpoint=endpoint, result="allowed")
+        metrics.inc("rate_limit_charged_tokens_total", cost, endpoint=endpoint)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the global rate limiter instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global RateLimiter instance
+
+    Raises:
+        ValueError: If RATE_LIMITS or RATE_LIMIT_BACKEND is invalid
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = get_settings()
+        limits = parse_rate_limits(settings.RATE_LIMITS)
+        idle = max((limit.per_seconds for limit in limits.values()), default=3600.0)
+        store: MemoryBucketStore | SQLiteBucketStore
+        if settings.RATE_LIMIT_BACKEND == "sqlite":
+            store = SQLiteBucketStore(settings.RATE_LIMIT_PATH, idle_seconds=idle)
+        elif settings.RATE_LIMIT_BACKEND == "memory":
+            store = MemoryBucketStore(idle_seconds=idle)
+        else:
+            raise ValueError(
+                f"Unknown RATE_LIMIT_BACKEND {settings.RATE_LIMIT_BACKEND!r}, "
+                "expected 'memory' or 'sqlite'"
+            )
+        _rate_limiter = RateLimiter(store, limits)
+    return _rate_limiter
@@ -0,0 +1,204 @@
+"""Readiness probing for AI English Tutor.
+
+Liveness only says the process is up. Readiness says the instance can serve
+the first token quickly: prompt templates and level instructions are
+loaded, the session store answers, and the pooled LLM connections are
+open (an authenticated ``GET /models`` through every distinct client pool
+the agents and OCR use, which also verifies the API keys).
+
+Results are cached for ``READINESS_CACHE_SECONDS`` so that frequent load
+balancer probes cost nothing; concurrent probes share one refresh.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+
+from tutor.config import get_settings
+from tutor.prompts import AGENT_PROMPT_VARIABLES, get_level_instructions, get_prompt_registry
+from tutor.services.metrics import metrics
+from tutor.services.session import get_session_manager
+
+logger = logging.getLogger(__name__)
+
+LEVELS = range(1, 6)
+
+# Global readiness probe instance (lazy-initialized)
+_readiness_probe: ReadinessProbe | None = None
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """Outcome of one readiness check."""
+
+    ok: bool
+    detail: str
+    latency_ms: float
+
+
+def streams_in_flight() -> int:
+    """Return the number of SSE responses currently streaming."""
+    return int(metrics.get("sse_streams_in_flight"))
+
+
+async def event_loop_lag() -> float:
+    """Return how long (seconds) a callback scheduled now waits to run."""
+    start = time.perf_counter()
+    await asyncio.sleep(0)
+    return time.perf_counter() - start
+
+
+def _check_prompts() -> str:
+    get_prompt_registry().validate(AGENT_PROMPT_VARIABLES)
+    for level in LEVELS:
+        get_level_instructions(level)
+    return f"{len(AGENT_PROMPT_VARIABLES)} templates, {len(LEVELS)} levels"
+
+
+def _check_sessions() -> str:
+    sessions = get_session_manager()
+    session_id = sessions.create()
+    try:
+        if sessions.get(session_id) is None:
+            raise RuntimeError("session store did not return a new session")
+    finally:
+        sessions.delete(session_id)
+    return f"{len(sessions)} active"
+
+
+def _llm_clients() -> list:
+    """Build the OpenAI clients the agents and OCR use, one per distinct connection pool.
+
+    Includes the MODEL_FALLBACKS backends, so a failover does not start on a
+    cold pool.
+    """
+    from tutor.agents.image_processor import create_ocr_llm
+    from tutor.models.llm import get_llm
+    from tutor.models.router import parse_model_fallbacks
+
+    settings = get_settings()
+    # Agent models with the timeout their calls use (the timeout selects the pool)
+    roles = {
+        "supervisor": (settings.SUPERVISOR_MODEL, 30),
+        "reading": (settings.READING_MODEL, 120),
+        "grammar": (settings.GRAMMAR_MODEL, 120),
+        "vocabulary": (settings.VOCABULARY_MODEL, 120),
+    }
+    fallbacks = (
+        parse_model_fallbacks(settings.MODEL_FALLBACKS) if settings.MODEL_ROUTING_ENABLED else {}
+    )
+    agent_models = [
+        (name, timeout)
+        for role, (model, timeout) in roles.items()
+        for name in (model, *fallbacks.get(role, []))
+    ]
+    llms = [create_ocr_llm(settings)]
+    llms += [get_llm(model, timeout=timeout) for model, timeout in dict.fromkeys(agent_models)]
+    clients = {}
+    for llm in llms:
+        client = llm.root_async_client
+        # Clients sharing an httpx pool only need one warm-up request
+        clients.setdefault(id(client._client), client)
+    return list(clients.values())
+
+
+async def _check_llm(timeout: float) -> str:
+    # Building the clients imports langchain-openai on a cold worker; keep it off the loop
+    clients = await asyncio.to_thread(_llm_clients)
+    await asyncio.wait_for(
+        asyncio.gather(*(client.models.list() for client in clients)), timeout
+    )
+    return f"{len(clients)} connection pools warm"
+
+
+async def _timed(check: Callable[[], str | Awaitable[str]]) -> CheckResult:
+    start = time.perf_counter()
+    try:
+        result = check()
+        if asyncio.iscoroutine(result):
+            result = await result
+        ok, detail = True, result
+    except Exception as e:
+        ok, detail = False, f"{type(e).__name__}: {e}"
+    return CheckResult(ok=ok, detail=detail, latency_ms=(time.perf_counter() - start) * 1000)
+
+
+class ReadinessProbe:
+    """Runs the readiness checks and caches the result for a short interval."""
+
+    def __init__(self, cache_seconds: float = 5.0, llm_timeout: float = 5.0) -> None:
+        """Initialize the probe.
+
+        Args:
+            cache_seconds: How long a result is served without re-checking
+            llm_timeout: Timeout for warming the LLM connections, in seconds
+        """
+        self._cache_seconds = cache_seconds
+        self._llm_timeout = llm_timeout
+        self._checks: dict[str, CheckResult] | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def last_checks(self) -> dict[str, CheckResult] | None:
+        """Checks from the most recent refresh, or None if never run."""
+        return self._checks
+
+    async def check(self) -> dict:
+        """Return the readiness report, refreshing the checks if the cache expired.
+
+        Returns:
+            Dict with "ready", per-check results, event-loop lag, in-flight
+            stream count and the age of the cached checks
+        """
+        if self._expired():
+            async with self._lock:
+                if self._expired():
+                    await self._refresh()
+        checks = self._checks or {}
+        return {
+            "ready": all(c.ok for c in checks.values()),
+            "checks": {name: asdict(c) for name, c in checks.items()},
+            "event_loop_lag_ms": round(await event_loop_lag() * 1000, 3),
+            "streams_in_flight": streams_in_flight(),
+            "checked_seconds_ago": round(time.monotonic() - self._checked_at, 3),
+        }
+
+    def _expired(self) -> bool:
+        return self._checks is None or time.monotonic() - self._checked_at >= self._cache_seconds
+
+    async def _refresh(self) -> None:
+        checks = {
+            "prompts": await _timed(_check_prompts),
+            "sessions": await _timed(_check_sessions),
+        }
+        if get_settings().READINESS_CHECK_LLM:
+            checks["llm"] = await _timed(lambda: _check_llm(self._llm_timeout))
+        for name, result in checks.items():
+            if not result.ok:
+                logger.warning(f"Readiness check {name} failed: {result.detail}")
+            metrics.set_gauge("readiness_check_ok", float(result.ok), check=name)
+        self._checks = checks
+        self._checked_at = time.monotonic()
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    """Get or create the global readiness probe instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global ReadinessProbe instance
+    """
+    global _readiness_probe
+    if _readiness_probe is None:
+        settings = get_settings()
+        _readiness_probe = ReadinessProbe(
+            cache_seconds=settings.READINESS_CACHE_SECONDS,
+            llm_timeout=settings.READINESS_LLM_TIMEOUT_SECONDS,
+        )
+    return _readiness_probe
@@ -0,0 +1,267 @@
+"""Resumable SSE streams for AI English Tutor.
+
+An analysis run is driven by a background task, detached from the HTTP
+connection that started it, and every SSE event it produces is stamped
+with an ``id: <session_id>:<seq>`` field (seq increases monotonically from
+1) and appended to the run's replay buffer. HTTP responses only read from
+that buffer, so when the proxy or a mobile network drops the connection the
+agents keep running, and the client reconnects to
+``GET /api/v1/tutor/streams/{session_id}`` with ``Last-Event-ID`` to receive
+exactly the events it missed, including sections that completed meanwhile.
+
+Each buffer is bounded to ``STREAM_REPLAY_MAX_BYTES`` (oldest events are
+evicted first) and finished runs are kept for ``STREAM_REPLAY_TTL_SECONDS``.
+Heartbeat comments are not buffered; readers send their own while waiting.
+Events are buffered as UTF-8 bytes, ready to be written to the response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+from tutor.services.streaming import (
+    HEARTBEAT_INTERVAL_SECONDS,
+    SSE_HEARTBEAT_FRAME,
+    is_heartbeat,
+)
+
+logger = logging.getLogger(__name__)
+
+# Global stream registry instance (lazy-initialized)
+_stream_registry: StreamRegistry | None = None
+
+
+class ReplayGoneError(Exception):
+    """Raised when the requested position was evicted from the replay buffer."""
+
+
+def parse_last_event_id(value: str, session_id: str) -> int:
+    """Parse a Last-Event-ID header into the sequence number of that event.
+
+    Args:
+        value: Header value, "<session_id>:<seq>" or just "<seq>"
+        session_id: The session being resumed
+
+    Returns:
+        The sequence number of the last event the client received
+
+    Raises:
+        ValueError: If the value is malformed or belongs to another session
+    """
+    owner, _, seq = value.strip().rpartition(":")
+    if owner and owner != session_id:
+        raise ValueError("Last-Event-ID belongs to another session")
+    if not seq.isdigit():
+        raise ValueError(f"Invalid Last-Event-ID: {value!r}")
+    return int(seq)
+
+
+class StreamRun:
+    """The buffered SSE events of one analysis run."""
+
+    def __init__(self, session_id: str, max_bytes: int) -> None:
+        """Initialize the run.
+
+        Args:
+            session_id: Session the run belongs to (used in event ids)
+            max_bytes: Replay buffer size limit in bytes
+        """
+        self.session_id = session_id
+        self._id_prefix = f"id: {session_id}:".encode()
+        self._max_bytes = max_bytes
+        self._events: deque[bytes] = deque()
+        self._bytes = 0
+        self._first_seq = 1  # seq of self._events[0]
+        self._next_seq = 1
+        self._changed = asyncio.Event()
+        self.finished_at: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the run has produced its last event."""
+        return self.finished_at is not None
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (0 if none yet)."""
+        return self._next_seq - 1
+
+    def append(self, event: str | bytes) -> None:
+        """Stamp an SSE event with the next id and buffer it.
+
+        Args:
+            event: A formatted SSE event ("event: ...\\ndata: ...\\n\\n"), str or bytes
+        """
+        if isinstance(event, str):
+            event = event.encode()
+        framed = b"%b%d\n%b" % (self._id_prefix, self._next_seq, event)
+        self._next_seq += 1
+        self._events.append(framed)
+        self._bytes += len(framed)
+        while self._bytes > self._max_bytes and len(self._events) > 1:
+            self._bytes -= len(self._events.popleft())
+            self._first_seq += 1
+            metrics.inc("stream_replay_evicted_total")
+        self._notify()
+
+    def finish(self) -> None:
+        """Mark the run complete and wake up its readers."""
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    def check_available(self, after: int) -> None:
+        """Check that every event after ``after`` is still buffered.
+
+        Args:
+            after: Sequence number of the last event the reader has
+
+        Raises:
+            ReplayGoneError: If the next event was already evicted
+        """
+        if after + 1 < self._first_seq:
+            raise ReplayGoneError(
+                f"Events {after + 1}..{self._first_seq - 1} are no longer buffered"
+            )
+
+    async def subscribe(
+        self, after: int = 0, coalesce: bool = False
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield the buffered events after ``after``, then follow the run to its end.
+
+        Closing the generator (client disconnect) does not affect the run.
+
+        Args:
+            after: Sequence number of the last event the reader already has
+            coalesce: Yield all events that are already buffered as one chunk,
+                so a reader that fell behind catches up in a single write
+
+        Yields:
+            SSE events with id fields, or heartbeat comments while waiting
+
+        Raises:
+            ReplayGoneError: If the reader fell behind the replay buffer
+        """
+        position = min(after, self.last_seq)
+        while True:
+            changed = self._changed
+            self.check_available(position)
+            start = position + 1 - self._first_seq
+            pending = list(itertools.islice(self._events, start, None))
+            if coalesce and len(pending) > 1:
+                yield b"".join(pending)
+            else:
+                for event in pending:
+                    yield event
+            position += len(pending)
+            if pending:
+                continue  # more may have arrived while the reader was sending
+            if self.finished:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), HEARTBEAT_INTERVAL_SECONDS)
+            except TimeoutError:
+                yield SSE_HEARTBEAT_FRAME
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+
+class StreamRegistry:
+    """Runs SSE streams detached from their connection and keeps them for replay."""
+
+    def __init__(self, max_bytes: int = 2 * 1024 * 1024, ttl_seconds: float = 300.0) -> None:
+        """Initialize the registry.
+
+        Args:
+            max_bytes: Replay buffer size limit per run in bytes
+            ttl_seconds: How long a finished run stays resumable
+        """
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._runs: dict[str, StreamRun] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def start(self, session_id: str, events: AsyncIterator[str | bytes]) -> StreamRun:
+        """Start driving ``events`` in a background task and buffer its output.
+
+        Args:
+            session_id: Session id identifying the run
+            events: SSE event stream of the pipeline
+
+        Returns:
+            The new StreamRun; read it with ``subscribe()``
+        """
+        self._purge()
+        run = StreamRun(session_id, self._max_bytes)
+        self._runs[session_id] = run
+        task = asyncio.create_task(self._drive(run, events), name=f"stream-{session_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return run
+
+    def get(self, session_id: str) -> StreamRun | None:
+        """Return the run of a session, or None if unknown or expired.
+
+        Args:
+            session_id: The session id
+
+        Returns:
+            The StreamRun, or None
+        """
+        self._purge()
+        return self._runs.get(session_id)
+
+    async def close(self) -> None:
+        """Cancel all runs still in progress (application shutdown)."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _drive(self, run: StreamRun, events: AsyncIterator[str | bytes]) -> None:
+        metrics.add_gauge("stream_runs_active", 1)
+        try:
+            async for event in events:
+                if not is_heartbeat(event):  # heartbeats are the reader's job
+                    run.append(event)
+        except Exception as e:
+            logger.error(f"Stream {run.session_id} failed: {e}")
+        finally:
+            run.finish()
+            metrics.add_gauge("stream_runs_active", -1)
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        expired = [
+            session_id
+            for session_id, run in self._runs.items()
+            if run.finished_at is not None and now - run.finished_at > self._ttl
+        ]
+        for session_id in expired:
+            del self._runs[session_id]
+
+
+def get_stream_registry() -> StreamRegistry:
+    """Get or create the global stream registry instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global StreamRegistry instance
+    """
+    global _stream_registry
+    if _stream_registry is None:
+        settings = get_settings()
+        _stream_registry = StreamRegistry(
+            max_bytes=settings.STREAM_REPLAY_MAX_BYTES,
+            ttl_seconds=settings.STREAM_REPLAY_TTL_SECONDS,
+        )
+    return _stream_registry
@@ -26,6 +26,10 @@ class SessionManager:
         self._sessions: dict[str, dict] = {}
         self._ttl = timedelta(hours=ttl_hours)
 
+    def __len__(self) -> int:
+        """Return the number of stored sessions (including not yet purged expired ones)."""
+        return len(self._sessions)
+
     def create(self) -> str:
         """Create a new session and return session_id.
 
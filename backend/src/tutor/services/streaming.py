@@ -1,11 +1,125 @@
 """Server-Sent Events (SSE) streaming service for AI English Tutor.
 
 Formats LangGraph output as SSE events for real-time streaming.
+
+The ``format_*`` functions build ``str`` events with the stdlib JSON
+encoder. The analysis pipelines emit an event per LLM token, so they use
+``sse_encoder`` instead: it writes UTF-8 bytes directly, serializes with
+orjson when it is installed (it ships with the LangChain dependencies),
+and caches the ``event:`` prefixes and the static ``*_done`` frames. Both
+produce the same events; only JSON whitespace and escaping of non-ASCII
+characters differ.
 """
 
 import json
+from collections.abc import Callable
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder is used instead
+    orjson = None
+
+# Seconds without events after which a heartbeat comment keeps the connection open
+HEARTBEAT_INTERVAL_SECONDS = 5
+SSE_HEARTBEAT_COMMENT = ": heartbeat\n\n"
+SSE_HEARTBEAT_FRAME = SSE_HEARTBEAT_COMMENT.encode()
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 JSON, with orjson when it is installed.
+
+    Args:
+        data: JSON-serializable value
+
+    Returns:
+        The JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def is_heartbeat(event: str | bytes) -> bool:
+    """Return whether an SSE event (str or bytes) is a comment such as a heartbeat."""
+    return event[:1] in (":", b":")
+
+
+class SSEEncoder:
+    """Encodes SSE frames directly to bytes, caching their static parts."""
+
+    def __init__(self, dumps: Callable[[Any], bytes] = dumps_json) -> None:
+        """Initialize the encoder.
+
+        Args:
+            dumps: JSON serializer returning bytes (default: dumps_json)
+        """
+        self._dumps = dumps
+        self._prefixes: dict[str, bytes] = {}
+        self._token_prefixes: dict[str, bytes] = {}
+        self._done_frames: dict[str, bytes] = {}
+
+    def event(self, event_type: str, data: dict[str, Any]) -> bytes:
+        """Encode an SSE event.
+
+        Args:
+            event_type: The SSE event type
+            data: The data payload
+
+        Returns:
+            The frame ("event: ...\ndata: ...\n\n") as bytes
+        """
+        prefix = self._prefixes.get(event_type)
+        if prefix is None:
+            prefix = self._prefixes[event_type] = f"event: {event_type}\ndata: ".encode()
+        return prefix + self._dumps(data) + b"\n\n"
+
+    def token(self, section: str, token: str) -> bytes:
+        """Encode a ``{section}_token`` event; only the token itself is serialized.
+
+        Args:
+            section: Stream name ("ocr", "reading", "grammar", "vocabulary")
+            token: The token text
+
+        Returns:
+            The frame as bytes
+        """
+        prefix = self._token_prefixes.get(section)
+        if prefix is None:
+            prefix = self._token_prefixes[section] = (
+                f'event: {section}_token\ndata: {{"token":'.encode()
+            )
+        return prefix + self._dumps(token) + b"}\n\n"
+
+    def section_done(self, section: str) -> bytes:
+        """Return the (cached) ``{section}_done`` frame."""
+        frame = self._done_frames.get(section)
+        if frame is None:
+            frame = self._done_frames[section] = self.event(
+                f"{section}_done", {"section": section}
+            )
+        return frame
+
+    def section_error(self, section: str, message: str) -> bytes:
+        """Encode a ``{section}_error`` event (code "{section}_error")."""
+        code = f"{section}_error"
+        return self.event(code, {"message": message, "code": code})
+
+    def done(self, session_id: str, usage: dict | None = None) -> bytes:
+        """Encode the done event, as format_done_event."""
+        data: dict[str, Any] = {"session_id": session_id, "status": "complete"}
+        if usage is not None:
+            data["usage"] = usage
+        return self.event("done", data)
+
+    def error(self, message: str, code: str = "error") -> bytes:
+        """Encode an error event, as format_error_event."""
+        return self.event("error", {"message": message, "code": code})
+
+
+# Shared encoder instance; its caches only grow by the fixed set of event types
+sse_encoder = SSEEncoder()
+
 
 def format_sse_event(event_type: str, data: dict[str, Any]) -> str:
     """Format data as SSE event string.
@@ -60,16 +174,20 @@ def format_vocabulary_chunk(data: dict) -> str:
     return format_sse_event("vocabulary_chunk", data)
 
 
-def format_done_event(session_id: str) -> str:
+def format_done_event(session_id: str, usage: dict | None = None) -> str:
     """Format completion event as SSE event.
 
     Args:
         session_id: The completed session ID
+        usage: Optional token usage summary of the request, included as "usage"
 
     Returns:
         A formatted SSE event with event_type="done"
     """
-    return format_sse_event("done", {"session_id": session_id, "status": "complete"})
+    data: dict[str, Any] = {"session_id": session_id, "status": "complete"}
+    if usage is not None:
+        data["usage"] = usage
+    return format_sse_event("done", data)
 
 
 def format_error_event(message: str, code: str = "error") -> str:
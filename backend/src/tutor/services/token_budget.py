@@ -0,0 +1,232 @@
+"""Adaptive max_tokens budgeting for AI English Tutor agents.
+
+Output length grows with the passage: reading and grammar explain every
+sentence, vocabulary every notable word. A fixed ``max_tokens`` sized for
+the longest passage lets a runaway generation on a one-sentence input run
+for thousands of tokens. The budgeter instead predicts each call's output
+from the sentence count (taken from ``SupervisorAnalysis`` when available)
+and passage length, using output-per-sentence and output-to-input ratios
+learned per agent and level, and multiplies it by a headroom factor.
+
+Headroom adapts to truncations (a ``length`` finish reason): each
+truncated call widens it, each complete call narrows it slightly, which
+settles around a ~3% truncation rate. A truncated section is still
+streamed, but the agent reports it as a section error (see
+``truncation_error``), so it is shown as incomplete and never cached.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from typing import NamedTuple
+
+from tutor.config import get_settings
+from tutor.services.metrics import metrics
+from tutor.services.usage import count_tokens
+from tutor.state import TutorState
+
+# Upper bound per agent: the fixed limits used before budgeting
+AGENT_MAX_TOKENS = {"reading": 6144, "grammar": 4096, "vocabulary": 8192}
+
+# Starting estimates of output tokens per passage sentence / per passage token
+_PRIOR_TOKENS_PER_SENTENCE = {"reading": 320.0, "grammar": 280.0, "vocabulary": 220.0}
+_PRIOR_OUTPUT_RATIO = {"reading": 14.0, "grammar": 12.0, "vocabulary": 10.0}
+
+# Fixed output (headings, summaries) independent of passage length
+_OVERHEAD_TOKENS = 256
+
+_EWMA_ALPHA = 0.1
+_INITIAL_HEADROOM = 1.5
+_MIN_HEADROOM = 1.2
+_MAX_HEADROOM = 3.0
+_HEADROOM_GROWTH = 1.2  # per truncated call
+_HEADROOM_DECAY = 0.995  # per complete call
+
+# finish_reason (OpenAI) / stop_reason (Anthropic) of a call cut off by max_tokens
+_TRUNCATED_REASONS = ("length", "max_tokens")
+
+_SENTENCE_END = re.compile(r"[.!?]+(?:[\"')\]]*)(?:\s+|$)")
+
+# Global budgeter instance (lazy-initialized)
+_token_budgeter: TokenBudgeter | None = None
+
+
+class TokenBudget(NamedTuple):
+    """A planned output budget and the passage features it was derived from."""
+
+    agent: str
+    level: int
+    sentences: int
+    passage_tokens: int
+    max_tokens: int
+
+
+def count_sentences(state: TutorState) -> int:
+    """Count the passage's sentences, preferring the supervisor's segmentation.
+
+    Args:
+        state: TutorState with input_text and optionally supervisor_analysis
+
+    Returns:
+        Number of sentences (at least 1)
+    """
+    analysis = state.get("supervisor_analysis")
+    if analysis is not None and analysis.sentences:
+        return len(analysis.sentences)
+    return max(1, len(_SENTENCE_END.findall(state.get("input_text", "").strip())))
+
+
+class TokenBudgeter:
+    """Predicts per-call max_tokens from learned output ratios and truncation rate."""
+
+    def __init__(self, min_tokens: int = 1024) -> None:
+        """Initialize the budgeter with prior estimates.
+
+        Args:
+            min_tokens: Smallest budget ever granted
+        """
+        self._lock = threading.Lock()
+        self._min_tokens = min_tokens
+        # (agent, level) -> EWMA of output tokens per sentence / per passage token
+        self._per_sentence: dict[tuple[str, int], float] = {}
+        self._ratio: dict[tuple[str, int], float] = {}
+        # agent -> headroom multiplier and EWMA truncation rate
+        self._headroom: dict[str, float] = {}
+        self._truncation_rate: dict[str, float] = {}
+
+    def budget(self, agent: str, level: int, sentences: int, passage_tokens: int) -> int:
+        """Return the max_tokens to request for one call.
+
+        Args:
+            agent: Agent name (a key of AGENT_MAX_TOKENS)
+            level: Learner level (1-5)
+            sentences: Number of sentences in the passage
+            passage_tokens: Token count of the passage
+
+        Returns:
+            Output budget, clamped to [min_tokens, AGENT_MAX_TOKENS[agent]]
+        """
+        key = (agent, level)
+        with self._lock:
+            per_sentence = self._per_sentence.get(key, _PRIOR_TOKENS_PER_SENTENCE[agent])
+            ratio = self._ratio.get(key, _PRIOR_OUTPUT_RATIO[agent])
+            headroom = self._headroom.get(agent, _INITIAL_HEADROOM)
+        expected = max(per_sentence * sentences, ratio * passage_tokens) + _OVERHEAD_TOKENS
+        ceiling = AGENT_MAX_TOKENS[agent]
+        return max(min(self._min_tokens, ceiling), min(ceiling, math.ceil(expected * headroom)))
+
+    def observe(self, budget: TokenBudget, output_tokens: int, truncated: bool) -> None:
+        """Learn from a finished call.
+
+        Truncated outputs only bound the true length from below, so they widen
+        the headroom instead of updating the length estimates.
+
+        Args:
+            budget: The budget the call was made with
+            output_tokens: Tokens actually generated
+            truncated: Whether generation stopped at max_tokens
+        """
+        agent = budget.agent
+        key = (agent, budget.level)
+        with self._lock:
+            headroom = self._headroom.get(agent, _INITIAL_HEADROOM)
+            rate = self._truncation_rate.get(agent, 0.0)
+            if truncated:
+                headroom = min(_MAX_HEADROOM, headroom * _HEADROOM_GROWTH)
+            else:
+                headroom = max(_MIN_HEADROOM, headroom * _HEADROOM_DECAY)
+                content_tokens = max(0, output_tokens - _OVERHEAD_TOKENS)
+                self._per_sentence[key] = _ewma(
+                    self._per_sentence.get(key, _PRIOR_TOKENS_PER_SENTENCE[agent]),
+                    content_tokens / max(1, budget.sentences),
+                )
+                self._ratio[key] = _ewma(
+                    self._ratio.get(key, _PRIOR_OUTPUT_RATIO[agent]),
+                    content_tokens / max(1, budget.passage_tokens),
+                )
+            rate = _ewma(rate, 1.0 if truncated else 0.0)
+            self._headroom[agent] = headroom
+            self._truncation_rate[agent] = rate
+
+        metrics.inc("llm_budget_calls_total", agent=agent, truncated=str(truncated).lower())
+        metrics.set_gauge("llm_budget_truncation_rate", rate, agent=agent)
+        metrics.set_gauge("llm_budget_headroom", headroom, agent=agent)
+        if budget.max_tokens:
+            metrics.observe(
+                "llm_budget_utilization", output_tokens / budget.max_tokens, agent=agent
+            )
+
+
+def _ewma(current: float, value: float) -> float:
+    return current + _EWMA_ALPHA * (value - current)
+
+
+def plan_max_tokens(agent: str, state: TutorState, model: str) -> TokenBudget:
+    """Plan the max_tokens of an agent call for the passage in ``state``.
+
+    With TOKEN_BUDGET_ENABLED off, every call gets the agent's fixed ceiling.
+
+    Args:
+        agent: Agent name (a key of AGENT_MAX_TOKENS)
+        state: TutorState with input_text, level and optionally supervisor_analysis
+        model: Model name, used to count passage tokens
+
+    Returns:
+        The planned TokenBudget
+    """
+    level = state.get("level", 3)
+    sentences = count_sentences(state)
+    passage_tokens = count_tokens(state.get("input_text", ""), model)
+    if get_settings().TOKEN_BUDGET_ENABLED:
+        max_tokens = get_token_budgeter().budget(agent, level, sentences, passage_tokens)
+    else:
+        max_tokens = AGENT_MAX_TOKENS[agent]
+    metrics.observe("llm_budget_max_tokens", max_tokens, agent=agent)
+    return TokenBudget(agent, level, sentences, passage_tokens, max_tokens)
+
+
+def record_budget_outcome(budget: TokenBudget, output_tokens: int, finish_reason: str | None) -> bool:
+    """Feed a finished call back into the budgeter.
+
+    Args:
+        budget: The budget returned by plan_max_tokens
+        output_tokens: Tokens actually generated
+        finish_reason: Provider finish reason ("length"/"max_tokens" mean truncated)
+
+    Returns:
+        True if the output was truncated at max_tokens
+    """
+    truncated = finish_reason in _TRUNCATED_REASONS
+    get_token_budgeter().observe(budget, output_tokens, truncated=truncated)
+    return truncated
+
+
+def truncation_error(budget: TokenBudget) -> str:
+    """Return the section error message of an output cut off at max_tokens."""
+    return f"The {budget.agent} section was cut off at {budget.max_tokens} tokens"
+
+
+def finish_reason_of(chunk: object) -> str | None:
+    """Return the finish reason carried by a streamed chunk, if any."""
+    metadata = getattr(chunk, "response_metadata", None)
+    if isinstance(metadata, dict):
+        reason = metadata.get("finish_reason") or metadata.get("stop_reason")
+        if isinstance(reason, str):
+            return reason
+    return None
+
+
+def get_token_budgeter() -> TokenBudgeter:
+    """Get or create the global token budgeter instance.
+
+    Uses lazy initialization to avoid loading settings during module import.
+
+    Returns:
+        The global TokenBudgeter instance
+    """
+    global _token_budgeter
+    if _token_budgeter is None:
+        _token_budgeter = TokenBudgeter(min_tokens=get_settings().TOKEN_BUDGET_MIN_TOKENS)
+    return _token_budgeter
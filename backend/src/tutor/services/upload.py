@@ -0,0 +1,179 @@
+"""Streaming image upload parsing for AI English Tutor.
+
+Reads an image sent as ``multipart/form-data`` or as a raw binary body
+(``application/octet-stream`` / ``image/*``) without buffering the whole
+request: the body is consumed chunk by chunk, the file part is written to a
+spooled temporary file (in memory up to SPOOL_MAX_MEMORY, then on disk) and
+the size cap is enforced as bytes arrive, so oversized uploads are rejected
+after at most one chunk past the limit.
+"""
+
+from __future__ import annotations
+
+import tempfile
+from collections.abc import AsyncIterator
+from typing import NamedTuple
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Uploads larger than this spill from memory to a temporary file
+SPOOL_MAX_MEMORY = 1024 * 1024
+# Multipart field name carrying the image
+UPLOAD_FILE_FIELD = "file"
+# Allowance for multipart boundaries, part headers and form fields
+_MULTIPART_OVERHEAD = 64 * 1024
+# Largest accepted non-file form field value
+_MAX_FIELD_BYTES = 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the size limit."""
+
+    pass
+
+
+class UploadFormatError(Exception):
+    """Raised when an upload body is malformed or has no image."""
+
+    pass
+
+
+class ImageUpload(NamedTuple):
+    """A fully read image upload."""
+
+    data: bytes
+    fields: dict[str, str]
+
+
+class _MultipartImageSink:
+    """python-multipart callbacks that route the file part into a spool."""
+
+    def __init__(self, spool: tempfile.SpooledTemporaryFile, max_bytes: int) -> None:
+        self.spool = spool
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.file_seen = False
+        self.fields: dict[str, str] = {}
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._disposition = b""
+        self._name = ""
+        self._is_file = False
+        self._value = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": lambda data, start, end: self._header_field.extend(data[start:end]),
+            "on_header_value": lambda data, start, end: self._header_value.extend(data[start:end]),
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._name = ""
+        self._is_file = False
+        self._value.clear()
+
+    def on_header_end(self) -> None:
+        if bytes(self._header_field).lower() == b"content-disposition":
+            self._disposition = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._disposition)
+        self._name = params.get(b"name", b"").decode("utf-8", "replace")
+        if self._name == UPLOAD_FILE_FIELD:
+            if self.file_seen:
+                raise UploadFormatError(f"Only one '{UPLOAD_FILE_FIELD}' part is allowed")
+            self.file_seen = True
+            self._is_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._is_file:
+            self.size += end - start
+            if self.size > self.max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds {self.max_bytes} bytes")
+            self.spool.write(data[start:end])
+        else:
+            self._value.extend(data[start:end])
+            if len(self._value) > _MAX_FIELD_BYTES:
+                raise UploadFormatError(f"Form field '{self._name}' is too long")
+
+    def on_part_end(self) -> None:
+        if not self._is_file and self._name:
+            self.fields[self._name] = self._value.decode("utf-8", "replace")
+
+
+async def read_image_upload(
+    content_type: str,
+    content_length: str | None,
+    body: AsyncIterator[bytes],
+    max_bytes: int,
+) -> ImageUpload:
+    """Read an image upload from a streamed request body.
+
+    Args:
+        content_type: The request Content-Type header
+        content_length: The request Content-Length header, if sent
+        body: Async iterator over body chunks (e.g. ``request.stream()``)
+        max_bytes: Maximum size of the image itself
+
+    Returns:
+        ImageUpload with the image bytes and any other multipart form fields
+
+    Raises:
+        UploadTooLargeError: If the declared or actual size exceeds max_bytes
+        UploadFormatError: If the content type is unsupported, the multipart
+            body is malformed, or no image was sent
+    """
+    media_type, params = parse_options_header(content_type)
+    is_multipart = media_type == b"multipart/form-data"
+    is_binary = media_type == b"application/octet-stream" or media_type.startswith(b"image/")
+    if not is_multipart and not is_binary:
+        raise UploadFormatError(
+            "Content-Type must be multipart/form-data, application/octet-stream or image/*"
+        )
+
+    # Reject early when the client announces an oversized body
+    limit = max_bytes + (_MULTIPART_OVERHEAD if is_multipart else 0)
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spool:
+        fields: dict[str, str] = {}
+        if is_multipart:
+            boundary = params.get(b"boundary")
+            if not boundary:
+                raise UploadFormatError("Missing multipart boundary")
+            sink = _MultipartImageSink(spool, max_bytes)
+            parser = MultipartParser(boundary, sink.callbacks())
+            try:
+                async for chunk in body:
+                    parser.write(chunk)
+                parser.finalize()
+            except (UploadTooLargeError, UploadFormatError):
+                raise
+            except Exception as e:
+                raise UploadFormatError(f"Malformed multipart body: {e}") from e
+            if not sink.file_seen:
+                raise UploadFormatError(f"Missing '{UPLOAD_FILE_FIELD}' part")
+            fields = sink.fields
+        else:
+            size = 0
+            async for chunk in body:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                spool.write(chunk)
+
+        spool.seek(0)
+        data = spool.read()
+
+    if not data:
+        raise UploadFormatError("Uploaded image is empty")
+    return ImageUpload(data=data, fields=fields)
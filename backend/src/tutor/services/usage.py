@@ -0,0 +1,440 @@
+"""LLM token usage accounting for AI English Tutor.
+
+Records per-agent token counts from LangChain ``usage_metadata`` (reported
+on the final streamed chunk when the client is created with
+``stream_usage=True``), including provider-side prompt cache reads. When a
+provider omits usage, tokens are estimated locally from the prompt and
+completion text.
+
+Each request collects its calls in a ``UsageLedger`` held in a context
+variable, so agent tasks spawned by the router record into the ledger of
+the request that created them. Finished ledgers are aggregated per session
+and per one-minute window by the global ``UsageTracker``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from tutor.services.metrics import metrics
+
+if TYPE_CHECKING:
+    from tiktoken import Encoding
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens: (input, cached input, output). Longest matching prefix wins.
+MODEL_PRICES: dict[str, tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+}
+
+# Window totals are kept in one-minute buckets for this long
+USAGE_WINDOW_SECONDS = 3600
+_BUCKET_SECONDS = 60
+
+# Ledger of the request currently being served (None outside a request)
+_current_ledger: ContextVar[UsageLedger | None] = ContextVar("usage_ledger", default=None)
+
+# tiktoken encodings by model name, filled by load_encodings (None: unavailable)
+_encodings: dict[str, Encoding | None] = {}
+
+# Global usage tracker instance (lazy-initialized)
+_usage_tracker: UsageTracker | None = None
+
+
+@dataclass(frozen=True)
+class UsageRecord:
+    """Token usage of a single LLM call."""
+
+    agent: str
+    model: str
+    input_tokens: int
+    cached_input_tokens: int
+    output_tokens: int
+    estimated: bool = False
+    latency_seconds: float | None = None
+
+    @property
+    def cost_usd(self) -> float:
+        """Estimated cost from MODEL_PRICES (0 for unknown models)."""
+        return estimate_cost(
+            self.model, self.input_tokens, self.cached_input_tokens, self.output_tokens
+        )
+
+
+@dataclass
+class UsageTotals:
+    """Summed usage of any number of LLM calls."""
+
+    calls: int = 0
+    estimated_calls: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    latency_seconds: float = 0.0
+
+    def add(self, record: UsageRecord) -> None:
+        """Add one call to the totals."""
+        self.calls += 1
+        self.estimated_calls += record.estimated
+        self.input_tokens += record.input_tokens
+        self.cached_input_tokens += record.cached_input_tokens
+        self.output_tokens += record.output_tokens
+        self.cost_usd += record.cost_usd
+        self.latency_seconds += record.latency_seconds or 0.0
+
+    def as_dict(self) -> dict:
+        """Return the totals as a JSON-serializable dict."""
+        return {
+            "calls": self.calls,
+            "estimated_calls": self.estimated_calls,
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_seconds": round(self.latency_seconds, 3),
+        }
+
+
+def _summarize(records: Iterable[tuple[str, str, UsageRecord]]) -> dict:
+    """Aggregate (level, agent, record) triples into total/by_agent/by_level dicts."""
+    total = UsageTotals()
+    by_agent: dict[str, UsageTotals] = {}
+    by_level: dict[str, UsageTotals] = {}
+    for level, agent, record in records:
+        total.add(record)
+        by_agent.setdefault(agent, UsageTotals()).add(record)
+        by_level.setdefault(level, UsageTotals()).add(record)
+    return {
+        "total": total.as_dict(),
+        "by_agent": {k: v.as_dict() for k, v in sorted(by_agent.items())},
+        "by_level": {k: v.as_dict() for k, v in sorted(by_level.items())},
+    }
+
+
+@dataclass
+class UsageLedger:
+    """LLM calls made while serving one request."""
+
+    session_id: str
+    level: int | None = None
+    records: list[UsageRecord] = field(default_factory=list)
+
+    def add(self, record: UsageRecord) -> None:
+        """Append one call to the ledger."""
+        self.records.append(record)
+
+    def summary(self) -> dict:
+        """Return total and per-agent usage of the request.
+
+        Returns:
+            Dict with "total" and "by_agent" usage totals
+        """
+        summary = _summarize(("", r.agent, r) for r in self.records)
+        del summary["by_level"]
+        return summary
+
+
+def current_usage_ledger() -> UsageLedger | None:
+    """Return the ledger of the request being served, if any."""
+    return _current_ledger.get()
+
+
+@contextmanager
+def track_request_usage(session_id: str, level: int | None = None) -> Iterator[UsageLedger]:
+    """Collect the LLM usage of one request and aggregate it when done.
+
+    Tasks created inside the block inherit the ledger through their context.
+
+    Args:
+        session_id: Session the request belongs to
+        level: Learner level of the request (used to break down spend by level)
+
+    Yields:
+        The request's UsageLedger
+    """
+    ledger = UsageLedger(session_id=session_id, level=level)
+    token = _current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        # A streaming generator may be finalized from another context
+        with suppress(ValueError):
+            _current_ledger.reset(token)
+        get_usage_tracker().add(ledger)
+
+
+def estimate_cost(model: str, input_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+    """Estimate the USD cost of a call from MODEL_PRICES.
+
+    Args:
+        model: Model name; priced by the longest matching MODEL_PRICES prefix
+        input_tokens: Prompt tokens, including cached ones
+        cached_tokens: Prompt tokens read from the provider's prompt cache
+        output_tokens: Completion tokens
+
+    Returns:
+        Cost in USD, or 0.0 if the model has no known price
+    """
+    prefixes = [p for p in MODEL_PRICES if model.startswith(p)]
+    if not prefixes:
+        return 0.0
+    input_price, cached_price, output_price = MODEL_PRICES[max(prefixes, key=len)]
+    uncached = max(0, input_tokens - cached_tokens)
+    return (
+        uncached * input_price + cached_tokens * cached_price + output_tokens * output_price
+    ) / 1_000_000
+
+
+def _load_encoding(model: str) -> Encoding | None:
+    """Load the tiktoken encoding for a model, or None if unavailable."""
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable for {model!r}, estimating by characters: {e}")
+        return None
+
+
+def load_encodings(models: Iterable[str]) -> None:
+    """Load the tiktoken encodings of the given models.
+
+    tiktoken downloads the encoding files on first use, so this blocks and
+    is run in a worker thread at startup. Failures (e.g. no network) are
+    remembered so the fallback heuristic is used without retrying.
+
+    Args:
+        models: Model names to load encodings for
+    """
+    for model in models:
+        if model not in _encodings:
+            _encodings[model] = _load_encoding(model)
+
+
+def _encoding_for(model: str) -> Encoding | None:
+    """Return the loaded encoding for a model, or None if it is not loaded."""
+    return _encodings.get(model)
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """Count (or estimate) the tokens of a text.
+
+    Uses tiktoken once the model's encoding is loaded (see load_encodings),
+    so counting never downloads on the event loop. Otherwise assumes ~4
+    characters per token for ASCII and ~1.5 per token for other scripts
+    (e.g. Korean).
+
+    Args:
+        text: Text to count
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        Number of tokens
+    """
+    if not text:
+        return 0
+    encoding = _encoding_for(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def _prompt_text(prompt: object) -> str:
+    """Flatten a prompt (string or LangChain messages) to its text content."""
+    if prompt is None:
+        return ""
+    if isinstance(prompt, str):
+        return prompt
+    parts = []
+    for message in prompt if isinstance(prompt, list | tuple) else [prompt]:
+        content = getattr(message, "content", message)
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(
+                item["text"] for item in content if isinstance(item, dict) and "text" in item
+            )
+    return "\n".join(parts)
+
+
+def record_llm_usage(
+    agent: str,
+    usage: Mapping | None,
+    *,
+    model: str = "",
+    prompt: object = None,
+    completion: str = "",
+    latency: float | None = None,
+    extra_input_tokens: int = 0,
+) -> UsageRecord:
+    """Record token usage of one LLM call.
+
+    Updates the metrics registry and, inside ``track_request_usage``, the
+    current request's ledger. When the provider sent no usage, input and
+    output tokens are estimated from ``prompt`` and ``completion``.
+
+    Args:
+        agent: Agent name used as the metric label (e.g. "reading")
+        usage: LangChain usage_metadata dict, or None if the provider sent none
+        model: Model name (for pricing and tokenizer selection)
+        prompt: Prompt string or messages sent to the model (for estimation)
+        completion: Generated text (for estimation)
+        latency: Wall-clock duration of the call in seconds
+        extra_input_tokens: Input tokens not visible in the prompt text
+            (e.g. image tiles), added to the estimate
+
+    Returns:
+        The recorded UsageRecord
+    """
+    if usage:
+        input_tokens = usage.get("input_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        record = UsageRecord(
+            agent=agent,
+            model=model,
+            input_tokens=input_tokens,
+            cached_input_tokens=cached_tokens,
+            output_tokens=usage.get("output_tokens", 0),
+            latency_seconds=latency,
+        )
+    else:
+        metrics.inc("llm_usage_estimated_total", agent=agent)
+        record = UsageRecord(
+            agent=agent,
+            model=model,
+            input_tokens=count_tokens(_prompt_text(prompt), model) + extra_input_tokens,
+            cached_input_tokens=0,
+            output_tokens=count_tokens(completion, model),
+            estimated=True,
+            latency_seconds=latency,
+        )
+
+    metrics.inc("llm_calls_total", agent=agent)
+    metrics.inc("llm_input_tokens_total", record.input_tokens, agent=agent)
+    metrics.inc("llm_cached_input_tokens_total", record.cached_input_tokens, agent=agent)
+    metrics.inc("llm_output_tokens_total", record.output_tokens, agent=agent)
+    metrics.inc("llm_cost_usd_total", record.cost_usd, agent=agent)
+    if record.input_tokens and not record.estimated:
+        metrics.observe(
+            "llm_prompt_cache_hit_ratio",
+            record.cached_input_tokens / record.input_tokens,
+            agent=agent,
+        )
+    if latency is not None:
+        metrics.observe("llm_call_seconds", latency, agent=agent)
+
+    ledger = _current_ledger.get()
+    if ledger is not None:
+        ledger.add(record)
+    return record
+
+
+class UsageTracker:
+    """Aggregates finished request ledgers per session and per time window."""
+
+    def __init__(self, max_sessions: int = 10000, window_seconds: int = USAGE_WINDOW_SECONDS) -> None:
+        """Initialize the tracker.
+
+        Args:
+            max_sessions: Maximum sessions with retained totals (LRU eviction)
+            window_seconds: How far back window totals can be queried
+        """
+        self._lock = threading.Lock()
+        self._max_sessions = max_sessions
+        self._window_seconds = window_seconds
+        self._sessions: OrderedDict[str, list[tuple[str, str, UsageRecord]]] = OrderedDict()
+        # (bucket start, [(level, agent, record)]), oldest first
+        self._buckets: deque[tuple[float, list[tuple[str, str, UsageRecord]]]] = deque()
+
+    def add(self, ledger: UsageLedger, now: float | None = None) -> None:
+        """Aggregate a finished request.
+
+        Args:
+            ledger: The request's ledger
+            now: Completion time (default: time.time())
+        """
+        if not ledger.records:
+            return
+        now = time.time() if now is None else now
+        level = str(ledger.level) if ledger.level is not None else "unknown"
+        entries = [(level, r.agent, r) for r in ledger.records]
+        for _, _, record in entries:
+            metrics.inc("llm_cost_usd_by_level_total", record.cost_usd, level=level)
+
+        bucket_start = now - now % _BUCKET_SECONDS
+        with self._lock:
+            self._sessions.setdefault(ledger.session_id, []).extend(entries)
+            self._sessions.move_to_end(ledger.session_id)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+
+            if self._buckets and self._buckets[-1][0] == bucket_start:
+                self._buckets[-1][1].extend(entries)
+            else:
+                self._buckets.append((bucket_start, entries))
+            while self._buckets and self._buckets[0][0] <= now - self._window_seconds:
+                self._buckets.popleft()
+
+    def session_totals(self, session_id: str) -> dict | None:
+        """Return usage of a session, or None if nothing was recorded.
+
+        Returns:
+            Dict with "total", "by_agent" and "by_level" usage totals
+        """
+        with self._lock:
+            entries = list(self._sessions.get(session_id, ()))
+        return _summarize(entries) if entries else None
+
+    def window_totals(self, seconds: int, now: float | None = None) -> dict:
+        """Return usage of requests finished in the last ``seconds``.
+
+        Resolution is one minute: a bucket counts if it started within the window.
+
+        Args:
+            seconds: Window length, capped at the tracker's window
+            now: Reference time (default: time.time())
+
+        Returns:
+            Dict with "total", "by_agent" and "by_level" usage totals
+        """
+        now = time.time() if now is None else now
+        since = now - min(seconds, self._window_seconds)
+        with self._lock:
+            entries = [
+                entry
+                for start, bucket in self._buckets
+                if start + _BUCKET_SECONDS > since
+                for entry in bucket
+            ]
+        return _summarize(entries)
+
+
+def get_usage_tracker() -> UsageTracker:
+    """Get or create the global usage tracker instance.
+
+    Returns:
+        The global UsageTracker instance
+    """
+    global _usage_tracker
+    if _usage_tracker is None:
+        _usage_tracker = UsageTracker()
+    return _usage_tracker
@@ -33,6 +33,7 @@ class TutorState(TypedDict):
         task_type: Type of task to execute ("analyze" | "image_process" | "chat")
         supervisor_analysis: Optional pre-analysis result from supervisor LLM
         image_data: Optional base64-encoded image data for image processing
+        image_ref: Optional blob store id of the decoded image (see services.blob_store)
         mime_type: Optional MIME type of the uploaded image
     """
 
@@ -51,4 +52,5 @@ class TutorState(TypedDict):
     extracted_text: NotRequired[str | None]
     supervisor_analysis: NotRequired[SupervisorAnalysis | None]
     image_data: NotRequired[str | None]
+    image_ref: NotRequired[str | None]
     mime_type: NotRequired[str | None]
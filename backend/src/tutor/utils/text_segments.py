@@ -0,0 +1,250 @@
+"""Streaming text segmentation helpers for pipelined analysis.
+
+- ParagraphAccumulator: splits a token stream (e.g. streaming OCR output)
+  into completed paragraphs as soon as each blank-line boundary arrives.
+- SentenceHeadingRenumberer: rewrites ``### 문장 N`` headings in a token
+  stream so that sentence numbers continue across independently analyzed
+  segments instead of restarting at 1.
+- split_sentences / split_sentence_sections / pair_sentence_sections: pair
+  passage sentences with the per-sentence ``### 문장 N`` sections of an
+  analysis, by the English sentence each section quotes, so each section
+  can be cached and reused on its own.
+"""
+
+from __future__ import annotations
+
+import re
+from difflib import SequenceMatcher
+
+# Blank line (optionally containing whitespace) between two paragraphs
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+# A line that may still turn into a sentence heading once more tokens arrive
+_HEADING_PREFIX = re.compile(r"#{0,6}(?:[ \t]+(?:문(?:장[ \t]*\d*[ \t]*)?)?)?")
+
+# A complete sentence heading line
+_SENTENCE_HEADING = re.compile(r"(#{1,6}[ \t]+문장[ \t]*)(\d+)(.*)")
+
+# End of an English sentence: terminal punctuation and closing quotes/brackets,
+# then whitespace before a capitalized word (or the end of the text)
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?:\s+(?=[\"'(\[]*[A-Z0-9])|\s*$)")
+
+# Start of a sentence section: its heading line, with the "---" rule before it
+_SECTION_START = re.compile(
+    r"^(?:-{3,}[ \t]*\n(?:[ \t]*\n)*)?#{1,6}[ \t]+문장[ \t]*\d+[^\n]*$", re.MULTILINE
+)
+
+# A trailing "---" rule closing the last section
+_TRAILING_RULE = re.compile(r"(?:\n[ \t]*)*\n-{3,}[ \t]*$")
+
+# An English word, for comparing a quoted sentence with the passage
+_WORD = re.compile(r"[a-z0-9]+(?:['’][a-z]+)?")
+
+# Minimum word-sequence similarity for a section to quote a sentence
+_QUOTE_MATCH_RATIO = 0.8
+
+
+class ParagraphAccumulator:
+    """Accumulate streamed text and emit completed paragraphs.
+
+    Paragraphs shorter than ``min_chars`` are held back and merged with the
+    following paragraph, so a title line or a one-line fragment does not
+    become its own analysis segment.
+    """
+
+    def __init__(self, min_chars: int = 0) -> None:
+        """Initialize the accumulator.
+
+        Args:
+            min_chars: Minimum length of an emitted paragraph (default: 0)
+        """
+        self._min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, token: str) -> list[str]:
+        """Add a token and return any paragraphs completed by it.
+
+        Args:
+            token: The next chunk of streamed text
+
+        Returns:
+            Completed paragraphs in order (possibly empty)
+        """
+        self._buffer += token
+        paragraphs: list[str] = []
+        search_from = 0
+        while match := _PARAGRAPH_BREAK.search(self._buffer, search_from):
+            candidate = self._buffer[: match.start()].strip()
+            if len(candidate) < self._min_chars:
+                search_from = match.end()
+                continue
+            paragraphs.append(candidate)
+            self._buffer = self._buffer[match.end() :]
+            search_from = 0
+        return paragraphs
+
+    def flush(self) -> str:
+        """Return whatever text remains once the stream has ended.
+
+        Returns:
+            The final (possibly short) paragraph, or an empty string
+        """
+        remaining = self._buffer.strip()
+        self._buffer = ""
+        return remaining
+
+
+class SentenceHeadingRenumberer:
+    """Offset ``### 문장 N`` heading numbers in a token stream.
+
+    Text is passed through unchanged except for the current line while it
+    could still become a sentence heading; that line is held until its
+    newline arrives (or until it can no longer match).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the renumberer at the first segment."""
+        self._offset = 0
+        self._segment_max = 0
+        self._pending = ""
+        self._passthrough = False
+
+    def start_segment(self) -> None:
+        """Begin a new segment whose numbering continues the previous one."""
+        self._offset += self._segment_max
+        self._segment_max = 0
+
+    def feed(self, token: str) -> str:
+        """Process a token and return the text that is safe to emit.
+
+        Args:
+            token: The next chunk of streamed markdown
+
+        Returns:
+            Rewritten text (may be empty while a heading line is buffered)
+        """
+        out: list[str] = []
+        for part in re.split(r"(\n)", token):
+            if not part:
+                continue
+            if part == "\n":
+                out.append(self._rewrite(self._pending))
+                out.append("\n")
+                self._pending = ""
+                self._passthrough = False
+            elif self._passthrough:
+                out.append(part)
+            else:
+                self._pending += part
+                if not _HEADING_PREFIX.fullmatch(self._pending):
+                    out.append(self._pending)
+                    self._pending = ""
+                    self._passthrough = True
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Return any buffered text at the end of a segment.
+
+        Returns:
+            The rewritten pending line, or an empty string
+        """
+        line = self._rewrite(self._pending)
+        self._pending = ""
+        self._passthrough = False
+        return line
+
+    def _rewrite(self, line: str) -> str:
+        match = _SENTENCE_HEADING.fullmatch(line)
+        if not match:
+            return line
+        number = int(match.group(2))
+        self._segment_max = max(self._segment_max, number)
+        return f"{match.group(1)}{number + self._offset}{match.group(3)}"
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split a passage into sentences, with whitespace runs collapsed.
+
+    Args:
+        text: The passage
+
+    Returns:
+        Sentences in passage order (a trailing fragment without terminal
+        punctuation counts as a sentence)
+    """
+    sentences: list[str] = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        if sentence := " ".join(text[start : match.end()].split()):
+            sentences.append(sentence)
+        start = match.end()
+    if tail := " ".join(text[start:].split()):
+        sentences.append(tail)
+    return sentences
+
+
+def split_sentence_sections(markdown: str) -> list[str]:
+    """Split reading or grammar markdown into one section per sentence heading.
+
+    A section runs from its ``### 문장 N`` heading (and the ``---`` rule
+    before it) to the next one. Each section is renumbered as sentence 1,
+    so it can be replayed at any position through SentenceHeadingRenumberer.
+    Text before the first heading is dropped.
+
+    Args:
+        markdown: Normalized agent output
+
+    Returns:
+        Sections in order (empty if the output has no sentence headings)
+    """
+    starts = [match.start() for match in _SECTION_START.finditer(markdown)]
+    sections = []
+    ends = [*starts[1:], len(markdown)] if starts else []
+    for start, end in zip(starts, ends, strict=True):
+        section = _TRAILING_RULE.sub("", markdown[start:end].strip())
+        sections.append(_renumber_first_heading(section, 1))
+    return sections
+
+
+def _renumber_first_heading(section: str, number: int) -> str:
+    lines = section.split("\n")
+    for i, line in enumerate(lines):
+        if match := _SENTENCE_HEADING.fullmatch(line):
+            lines[i] = f"{match.group(1)}{number}{match.group(3)}"
+            break
+    return "\n".join(lines)
+
+
+def pair_sentence_sections(sentences: list[str], sections: list[str]) -> dict[int, str]:
+    """Pair sections with the sentences they quote.
+
+    Each section quotes its English sentence in a ``>`` block (with slash
+    chunking). Sections are matched by that quote rather than by position,
+    so a selective output (grammar explains only a few sentences) or one
+    that skips or reorders sentences is still paired correctly. Sections
+    whose quote matches no sentence are left out.
+
+    Args:
+        sentences: Passage sentences, from split_sentences
+        sections: Sections of the analysis, from split_sentence_sections
+
+    Returns:
+        Section by index of the sentence it quotes
+    """
+    words = [_WORD.findall(sentence.lower()) for sentence in sentences]
+    paired: dict[int, str] = {}
+    for section in sections:
+        quote = " ".join(
+            line.lstrip()[1:] for line in section.split("\n") if line.lstrip().startswith(">")
+        )
+        quoted = _WORD.findall(quote.lower())
+        best, best_ratio = None, _QUOTE_MATCH_RATIO
+        for i, sentence_words in enumerate(words):
+            if i in paired or not sentence_words:
+                continue
+            ratio = SequenceMatcher(None, sentence_words, quoted, autojunk=False).ratio()
+            if ratio >= best_ratio and (best is None or ratio > best_ratio):
+                best, best_ratio = i, ratio
+        if best is not None:
+            paired[best] = section
+    return paired
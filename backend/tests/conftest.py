@@ -10,18 +10,61 @@ import pytest
 def set_test_env():
     """Set test environment variables before each test and reset settings cache."""
     import tutor.config
+    import tutor.models.router
+    import tutor.services.admission
+    import tutor.services.analysis_cache
+    import tutor.services.blob_store
+    import tutor.services.executor
+    import tutor.services.jobs
+    import tutor.services.loop_monitor
+    import tutor.services.ocr_cache
+    import tutor.services.rate_limit
+    import tutor.services.readiness
+    import tutor.services.replay
+    import tutor.services.token_budget
+    import tutor.services.usage
 
-    # Reset cached settings to ensure test isolation
+    # Reset cached settings and service singletons to ensure test isolation
     tutor.config._settings = None
+    tutor.models.router._model_router = None
+    tutor.services.admission._admission_controller = None
+    tutor.services.analysis_cache._analysis_cache = None
+    tutor.services.blob_store._blob_store = None
+    tutor.services.executor.shutdown_cpu_executor()
+    tutor.services.executor._cost_per_unit.clear()
+    tutor.services.jobs._job_manager = None
+    tutor.services.loop_monitor._loop_monitor = None
+    tutor.services.ocr_cache._ocr_cache = None
+    tutor.services.rate_limit._rate_limiter = None
+    tutor.services.readiness._readiness_probe = None
+    tutor.services.replay._stream_registry = None
+    tutor.services.token_budget._token_budgeter = None
+    tutor.services.usage._usage_tracker = None
 
     # Set required environment variables for testing
     os.environ["OPENAI_API_KEY"] = "test-key-for-testing"
     os.environ["CORS_ORIGINS"] = "http://localhost:3000"
+    os.environ["ANALYSIS_CACHE_PATH"] = ":memory:"
     yield
     # Clean up after test
     tutor.config._settings = None
+    tutor.models.router._model_router = None
+    tutor.services.admission._admission_controller = None
+    tutor.services.analysis_cache._analysis_cache = None
+    tutor.services.blob_store._blob_store = None
+    tutor.services.executor.shutdown_cpu_executor()
+    tutor.services.executor._cost_per_unit.clear()
+    tutor.services.jobs._job_manager = None
+    tutor.services.loop_monitor._loop_monitor = None
+    tutor.services.ocr_cache._ocr_cache = None
+    tutor.services.rate_limit._rate_limiter = None
+    tutor.services.readiness._readiness_probe = None
+    tutor.services.replay._stream_registry = None
+    tutor.services.token_budget._token_budgeter = None
+    tutor.services.usage._usage_tracker = None
     os.environ.pop("OPENAI_API_KEY", None)
     os.environ.pop("CORS_ORIGINS", None)
+    os.environ.pop("ANALYSIS_CACHE_PATH", None)
 
 
 @pytest.fixture
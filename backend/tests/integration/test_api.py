@@ -6,6 +6,7 @@ Tests are written first (RED), then implementation follows (GREEN).
 
 from __future__ import annotations
 
+import asyncio
 import re
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -37,7 +38,7 @@ def mock_session_manager():
 def app_with_mocks(mock_graph, mock_session_manager):
     """Create FastAPI app with mocked dependencies."""
     # This will be implemented in GREEN phase
-    with patch("tutor.routers.tutor.graph", mock_graph), patch(
+    with patch("tutor.routers.tutor.get_graph", return_value=mock_graph), patch(
         "tutor.routers.tutor.session_manager", mock_session_manager
     ):
         from tutor.main import create_app
@@ -68,6 +69,69 @@ class TestHealthEndpoint:
         assert "openai" in data
         assert "version" in data
 
+    def test_liveness_endpoint(self, client):
+        """Test that liveness answers without probing dependencies."""
+        with patch("tutor.services.readiness._llm_clients") as llm_clients:
+            response = client.get("/api/v1/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+        llm_clients.assert_not_called()
+
+    def test_readiness_endpoint_reports_checks(self, client):
+        """Test that readiness returns 200 with check results once dependencies answer."""
+        llm_client = MagicMock()
+        llm_client.models.list = AsyncMock()
+        with patch("tutor.services.readiness._llm_clients", return_value=[llm_client]):
+            response = client.get("/api/v1/health/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["streams_in_flight"] == 0
+        assert client.get("/api/v1/health").json()["openai"] == "connected"
+
+    def test_readiness_endpoint_returns_503_when_llm_unreachable(self, client):
+        """Test that readiness fails while the LLM connection cannot be warmed."""
+        llm_client = MagicMock()
+        llm_client.models.list = AsyncMock(side_effect=ConnectionError("refused"))
+        with patch("tutor.services.readiness._llm_clients", return_value=[llm_client]):
+            response = client.get("/api/v1/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["checks"]["llm"]["ok"] is False
+        assert client.get("/api/v1/health").json()["openai"] == "unreachable"
+
+    def test_loop_stalls_endpoint(self, client):
+        """Test that the loop-stall report says whether the detector is enabled."""
+        response = client.get("/api/v1/debug/loop-stalls")
+
+        assert response.status_code == 200
+        assert response.json() == {"enabled": False, "stalls": []}
+
+    def test_lifespan_loads_prompts_and_runs_hot_reload(self, app_with_mocks, monkeypatch):
+        """Test that startup validates prompts and the reload task stops on shutdown."""
+        from tutor.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "PROMPTS_HOT_RELOAD", True)
+        monkeypatch.setattr(get_settings(), "PROMPTS_RELOAD_INTERVAL_SECONDS", 0.01)
+
+        with TestClient(app_with_mocks) as client:
+            assert client.get("/api/v1/health").status_code == 200
+
+    def test_metrics_endpoint_returns_snapshot(self, client):
+        """Test that the metrics endpoint exposes counters, gauges and summaries."""
+        from tutor.services.metrics import metrics
+
+        metrics.inc("ocr_cache_lookups_total", result="miss")
+
+        response = client.get("/api/v1/metrics")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"counters", "gauges", "summaries"}
+        assert data["counters"]["ocr_cache_lookups_total{result=miss}"] >= 1
+
 
 class TestAnalyzeEndpoint:
     """Tests for POST /api/v1/tutor/analyze endpoint."""
@@ -134,6 +198,471 @@ class TestAnalyzeEndpoint:
         assert "session_id" in done_event["data"]
         assert done_event["data"]["status"] == "complete"
 
+    def test_analyze_done_event_reports_usage_when_enabled(self, client, monkeypatch):
+        """Test that agent token usage is summarized in the done event and per session."""
+        from tutor.config import get_settings
+        from tutor.schemas import GrammarResult, ReadingResult, VocabularyResult
+        from tutor.services.usage import record_llm_usage
+
+        monkeypatch.setattr(get_settings(), "USAGE_IN_DONE_EVENT", True)
+
+        async def mock_supervisor_node(state):
+            record_llm_usage("supervisor", {"input_tokens": 300, "output_tokens": 100})
+            return {"supervisor_analysis": None}
+
+        def mock_agent(name, result):
+            async def node(state, token_queue=None):
+                await token_queue.put(f"{name} token")
+                await token_queue.put(None)
+                record_llm_usage(
+                    name,
+                    {"input_tokens": 1000, "output_tokens": 200,
+                     "input_token_details": {"cache_read": 512}},
+                    model="gpt-4o-mini",
+                )
+                return result
+            return node
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node",
+                   mock_agent("reading", {"reading_result": ReadingResult(content="r")})), \
+             patch("tutor.routers.tutor.grammar_node",
+                   mock_agent("grammar", {"grammar_result": GrammarResult(content="g")})), \
+             patch("tutor.routers.tutor.vocabulary_node",
+                   mock_agent("vocabulary", {"vocabulary_result": VocabularyResult(words=[])})):
+            response = client.post(
+                "/api/v1/tutor/analyze", json={"text": "This is a test text for analysis.", "level": 2}
+            )
+
+        done_event = next(
+            e for e in self._parse_sse_events(response.text) if e["event"] == "done"
+        )
+        usage = done_event["data"]["usage"]
+        assert usage["total"]["calls"] == 4
+        assert usage["total"]["input_tokens"] == 3300
+        assert usage["total"]["cached_input_tokens"] == 1536
+        assert usage["by_agent"]["reading"]["output_tokens"] == 200
+        assert usage["total"]["cost_usd"] > 0
+
+        session = client.get("/api/v1/usage/sessions/test-session-123").json()
+        assert session["total"]["calls"] == 4
+        assert set(session["by_level"]) == {"2"}
+
+        window = client.get("/api/v1/usage", params={"window": 300}).json()
+        assert window["window_seconds"] == 300
+        assert window["by_agent"]["supervisor"]["input_tokens"] == 300
+
+    def test_done_event_omits_usage_by_default(self, client):
+        """Test that the done event has no usage unless USAGE_IN_DONE_EVENT is set."""
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put(None)
+            return {}
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            response = client.post(
+                "/api/v1/tutor/analyze", json={"text": "This is a test text for analysis.", "level": 3}
+            )
+
+        done_event = next(
+            e for e in self._parse_sse_events(response.text) if e["event"] == "done"
+        )
+        assert "usage" not in done_event["data"]
+
+    def test_analyze_stream_can_be_resumed_with_last_event_id(self, client, monkeypatch):
+        """Test that events carry ids and a reconnect replays only what was missed."""
+        from tutor.config import get_settings
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put("token")
+            await token_queue.put(None)
+            return {}
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            response = client.post(
+                "/api/v1/tutor/analyze", json={"text": "This is a test text for analysis.", "level": 3}
+            )
+
+        assert response.headers["x-session-id"] == "test-session-123"
+        ids = re.findall(r"^id: (\S+)$", response.text, flags=re.MULTILINE)
+        assert ids == [f"test-session-123:{i}" for i in range(1, len(ids) + 1)]
+
+        resumed = client.get(
+            "/api/v1/tutor/streams/test-session-123", headers={"Last-Event-ID": ids[2]}
+        )
+        assert resumed.status_code == 200
+        assert re.findall(r"^id: (\S+)$", resumed.text, flags=re.MULTILINE) == ids[3:]
+        assert self._parse_sse_events(resumed.text)[-1]["event"] == "done"
+
+        assert client.get(
+            "/api/v1/tutor/streams/test-session-123", headers={"Last-Event-ID": "other:1"}
+        ).status_code == 400
+        assert client.get("/api/v1/tutor/streams/unknown").status_code == 404
+
+        # A tiny buffer keeps only the last event; earlier positions are gone
+        monkeypatch.setattr(get_settings(), "STREAM_REPLAY_MAX_BYTES", 1)
+        import tutor.services.replay
+
+        tutor.services.replay._stream_registry = None
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            client.post(
+                "/api/v1/tutor/analyze", json={"text": "This is a test text for analysis.", "level": 3}
+            )
+        assert client.get(
+            "/api/v1/tutor/streams/test-session-123", headers={"Last-Event-ID": "1"}
+        ).status_code == 410
+
+    def test_repeated_analysis_is_served_from_cache(self, client):
+        """Test that an identical passage and level is replayed without calling the agents."""
+        from tutor.schemas import VocabularyResult, VocabularyWordEntry
+
+        calls = []
+
+        async def mock_supervisor_node(state):
+            calls.append("supervisor")
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put("token")
+            await token_queue.put(None)
+            return {
+                "vocabulary_result": VocabularyResult(
+                    words=[VocabularyWordEntry(word="fox", content="여우")]
+                )
+            }
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            first = client.post(
+                "/api/v1/tutor/analyze", json={"text": "This is a test text for analysis.", "level": 3}
+            )
+            second = client.post(
+                "/api/v1/tutor/analyze",
+                json={"text": "This is a  test text for analysis.\n", "level": 3},
+            )
+
+        assert calls == ["supervisor"]
+        cached = self._parse_sse_events(second.text)
+        assert [e["event"] for e in cached] == [
+            "reading_token", "grammar_token", "vocabulary_token",
+            "reading_done", "grammar_done", "vocabulary_chunk", "vocabulary_done", "done",
+        ]
+        assert cached[0]["data"]["token"] == "token"
+        assert cached[5]["data"]["words"] == [{"word": "fox", "content": "여우"}]
+        live_types = {e["event"] for e in self._parse_sse_events(first.text)}
+        assert {e["event"] for e in cached} <= live_types
+
+    def test_truncated_analysis_is_not_cached(self, client):
+        """Test that a section cut off at max_tokens is reported and analysed again next time."""
+        from tutor.schemas import GrammarResult, ReadingResult, VocabularyResult
+
+        calls = []
+
+        async def mock_supervisor_node(state):
+            calls.append("supervisor")
+            return {"supervisor_analysis": None}
+
+        async def mock_reading_node(state, token_queue=None):
+            await token_queue.put(None)
+            return {"reading_result": ReadingResult(content="요약")}
+
+        async def mock_grammar_node(state, token_queue=None):
+            await token_queue.put("문법")
+            await token_queue.put(None)
+            return {
+                "grammar_result": GrammarResult(content="문법"),
+                "grammar_error": "The grammar section was cut off at 1024 tokens",
+            }
+
+        async def mock_vocabulary_node(state, token_queue=None):
+            await token_queue.put(None)
+            return {"vocabulary_result": VocabularyResult(words=[])}
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_reading_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_grammar_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_vocabulary_node):
+            responses = [
+                client.post(
+                    "/api/v1/tutor/analyze",
+                    json={"text": "This is a test text for analysis.", "level": 3},
+                )
+                for _ in range(2)
+            ]
+
+        assert calls == ["supervisor", "supervisor"]
+        for response in responses:
+            errors = [e for e in self._parse_sse_events(response.text) if e["event"] == "grammar_error"]
+            assert "cut off" in errors[0]["data"]["message"]
+
+    def test_edited_passage_only_rereads_changed_sentences(self, client):
+        """Test that unchanged sentences' reading is served from the sentence cache.
+
+        Grammar explains only a few selected sentences, so it is run on the
+        whole edited passage instead of being stitched from cached sections.
+        """
+        from tutor.schemas import GrammarResult, ReadingResult, VocabularyResult
+        from tutor.utils.text_segments import split_sentences
+
+        inputs: dict[str, list[str]] = {"reading": [], "grammar": [], "supervisor": []}
+
+        async def mock_supervisor_node(state):
+            inputs["supervisor"].append(state["input_text"])
+            return {"supervisor_analysis": None}
+
+        async def mock_reading_node(state, token_queue=None):
+            inputs["reading"].append(state["input_text"])
+            content = "\n\n".join(
+                f"---\n\n### 문장 {i}\n\n> {sentence}\n\n#### 읽기 지시\n\n끝까지 읽어라"
+                for i, sentence in enumerate(split_sentences(state["input_text"]), 1)
+            )
+            await token_queue.put(content)
+            await token_queue.put(None)
+            return {"reading_result": ReadingResult(content=content)}
+
+        async def mock_grammar_node(state, token_queue=None):
+            # Like grammar.md, explain only a few selected sentences
+            inputs["grammar"].append(state["input_text"])
+            selected = split_sentences(state["input_text"])[1::2]
+            content = "\n\n".join(
+                f"---\n\n### 문장 {i}\n\n> {sentence}\n\n#### 문법 포인트\n\n수동태"
+                for i, sentence in enumerate(selected, 1)
+            )
+            await token_queue.put(content)
+            await token_queue.put(None)
+            return {"grammar_result": GrammarResult(content=content)}
+
+        async def mock_vocabulary_node(state, token_queue=None):
+            await token_queue.put(None)
+            return {"vocabulary_result": VocabularyResult(words=[])}
+
+        def analyze(text):
+            with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+                 patch("tutor.routers.tutor.reading_node", mock_reading_node), \
+                 patch("tutor.routers.tutor.grammar_node", mock_grammar_node), \
+                 patch("tutor.routers.tutor.vocabulary_node", mock_vocabulary_node):
+                response = client.post("/api/v1/tutor/analyze", json={"text": text, "level": 3})
+            events = self._parse_sse_events(response.text)
+            return {
+                section: "".join(
+                    e["data"]["token"] for e in events if e["event"] == f"{section}_token"
+                )
+                for section in ("reading", "grammar")
+            }
+
+        sentences = [
+            "The fox runs.", "It jumsp high.", "The dog sleeps.", "A bird sings.",
+            "The sun rises.", "We walk home.", "She reads books.", "They play chess.",
+        ]
+        analyze(" ".join(sentences))
+        sentences[1] = "It jumps high."
+        edited = " ".join(sentences)
+        output = analyze(edited)
+
+        assert inputs["reading"][1:] == ["It jumps high."]
+        assert inputs["grammar"][1:] == [edited]
+        assert inputs["supervisor"][1:] == [edited]
+        assert output["reading"] == "\n\n".join(
+            f"---\n\n### 문장 {i}\n\n> {sentence}\n\n#### 읽기 지시\n\n끝까지 읽어라"
+            for i, sentence in enumerate(sentences, 1)
+        )
+        assert output["grammar"].count("### 문장") == 4
+        assert "> It jumps high." in output["grammar"]
+
+    def test_batch_endpoint_reports_each_passage(self, client):
+        """Test that POST /tutor/batch streams per-passage progress and a final report."""
+        import json
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put("token")
+            await token_queue.put(None)
+            return {}
+
+        body = "\n".join(
+            json.dumps({"id": f"p{level}", "text": "This is a test text for analysis.",
+                        "level": level})
+            for level in (1, 2)
+        )
+        with patch("tutor.services.batch.supervisor_node", mock_supervisor_node), \
+             patch("tutor.services.batch.reading_node", mock_node), \
+             patch("tutor.services.batch.grammar_node", mock_node), \
+             patch("tutor.services.batch.vocabulary_node", mock_node):
+            response = client.post("/api/v1/tutor/batch", content=body)
+
+        assert response.status_code == 200
+        assert response.headers["x-session-id"].startswith("batch-")
+        events = self._parse_sse_events(response.text)
+        passages = [e["data"] for e in events if e["event"] == "batch_passage"]
+        assert sorted(p["id"] for p in passages) == ["p1", "p2"]
+        assert all(p["status"] == "succeeded" for p in passages)
+        assert events[-1]["event"] == "batch_done"
+        assert events[-1]["data"]["succeeded"] == 2
+
+        assert client.post("/api/v1/tutor/batch", content="not json").status_code == 400
+        assert client.post("/api/v1/tutor/batch", content="").status_code == 400
+
+    def test_analyze_stream_is_gzipped_when_accepted(self, client):
+        """Test that SSE compression is negotiated through Accept-Encoding."""
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            for _ in range(20):
+                await token_queue.put("### 문장 1\n\n")
+            await token_queue.put(None)
+            return {}
+
+        responses = {}
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            for encoding in ("gzip", "identity"):
+                responses[encoding] = client.post(
+                    "/api/v1/tutor/analyze",
+                    json={"text": f"This is a {encoding} text for analysis.", "level": 3},
+                    headers={"Accept-Encoding": encoding},
+                )
+
+        assert responses["gzip"].headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in responses["identity"].headers
+        for response in responses.values():
+            events = self._parse_sse_events(response.text)
+            assert sum(e["event"] == "reading_token" for e in events) == 20
+            assert events[-1]["event"] == "done"
+
+    def test_analyze_is_shed_with_retry_after_when_overloaded(self, client, monkeypatch):
+        """Test that admission control rejects new analyses at the stream limit."""
+        from tutor.config import get_settings
+        from tutor.services.metrics import metrics
+
+        monkeypatch.setattr(get_settings(), "ADMISSION_MAX_STREAMS", 2)
+        metrics.add_gauge("sse_streams_in_flight", 2)
+        try:
+            response = client.post(
+                "/api/v1/tutor/analyze", json={"text": "This is a test text for analysis.", "level": 3}
+            )
+        finally:
+            metrics.add_gauge("sse_streams_in_flight", -2)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        assert response.json() == {"detail": "Server is overloaded, retry later"}
+
+    def test_degraded_analyze_streams_final_only(self, client, monkeypatch):
+        """Test that under high load each section arrives as a single token event."""
+        from tutor.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "ADMISSION_DEGRADE_RATIO", 0.0)
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            for token in ("### 문장 1", "\n\n", "해석"):
+                await token_queue.put(token)
+            await token_queue.put(None)
+            return {}
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            response = client.post(
+                "/api/v1/tutor/analyze", json={"text": "This is a degraded analysis.", "level": 3}
+            )
+
+        events = self._parse_sse_events(response.text)
+        reading = [e for e in events if e["event"] == "reading_token"]
+        assert [e["data"]["token"] for e in reading] == ["### 문장 1\n\n해석"]
+        assert events.index(reading[0]) < events.index(
+            next(e for e in events if e["event"] == "reading_done")
+        )
+        assert events[-1]["event"] == "done"
+
+    def test_analyze_is_rate_limited_by_estimated_tokens(self, client, monkeypatch):
+        """Test that a client over its token budget gets 429 with Retry-After."""
+        from tutor.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(get_settings(), "RATE_LIMITS", "analyze=100/60")
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put(None)
+            return {}
+
+        body = {"text": "This is a rate limited analysis.", "level": 3}
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            first = client.post("/api/v1/tutor/analyze", json=body)
+            second = client.post("/api/v1/tutor/analyze", json=body)
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert 0 < int(second.headers["retry-after"]) <= 60
+        assert "analyze" in second.json()["detail"]
+
+    def test_rate_limit_keys_on_forwarded_client_behind_proxy(self, client, monkeypatch):
+        """Test that users behind the frontend proxy get their own buckets."""
+        from tutor.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(get_settings(), "RATE_LIMIT_TRUST_FORWARDED", True)
+        monkeypatch.setattr(get_settings(), "RATE_LIMITS", "analyze=100/60")
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put(None)
+            return {}
+
+        body = {"text": "This is a rate limited analysis.", "level": 3}
+        statuses = []
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            for forwarded in ("203.0.113.1", "203.0.113.2, 10.0.0.1", "203.0.113.1"):
+                response = client.post(
+                    "/api/v1/tutor/analyze", json=body, headers={"X-Forwarded-For": forwarded}
+                )
+                statuses.append(response.status_code)
+
+        assert statuses == [200, 200, 429]
+
+    def test_session_usage_unknown_session_returns_404(self, client):
+        """Test that usage of a session with no recorded calls is a 404."""
+        response = client.get("/api/v1/usage/sessions/nope")
+
+        assert response.status_code == 404
+
     def test_analyze_endpoint_validates_input(self, client):
         """Test that analyze endpoint validates text length and level range."""
         # Test text too short
@@ -181,41 +710,59 @@ class TestAnalyzeImageEndpoint:
     """Tests for POST /api/v1/tutor/analyze-image endpoint."""
 
     def test_analyze_image_endpoint_streams_sse(self, client, mock_graph, mock_session_manager):
-        """Test that analyze-image endpoint processes image and streams SSE."""
-
-        # Mock astream_events as an async generator
-        async def mock_astream_events(*args, **kwargs):
-            chunk = MagicMock()
-            chunk.content = "Image text content."
-            yield {
-                "event": "on_chat_model_stream",
-                "metadata": {"langgraph_node": "reading"},
-                "data": {"chunk": chunk},
-            }
-            yield {
-                "event": "on_chain_end",
-                "name": "reading",
-                "data": {"output": {}},
-            }
-            yield {
-                "event": "on_chain_end",
-                "name": "aggregator",
-                "data": {"output": {}},
-            }
+        """Test that analyze-image endpoint processes image and streams SSE.
+
+        The image flow streams image_processor_node directly (no LangGraph)
+        as ocr_token events, then analyzes the extracted paragraphs.
+        """
+        from tutor.schemas import GrammarResult, ReadingResult, VocabularyResult
+
+        async def mock_image_processor_node(state, token_queue=None):
+            if token_queue is not None:
+                await token_queue.put("Image text ")
+                await token_queue.put("content.")
+                await token_queue.put(None)
+            return {"extracted_text": "Image text content.", "input_text": "Image text content."}
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_reading_node(state, token_queue=None):
+            assert state["input_text"] == "Image text content."
+            assert state.get("image_data") is None
+            if token_queue is not None:
+                await token_queue.put("Reading content")
+                await token_queue.put(None)
+            return {"reading_result": ReadingResult(content="Reading content")}
+
+        async def mock_grammar_node(state, token_queue=None):
+            if token_queue is not None:
+                await token_queue.put(None)
+            return {"grammar_result": GrammarResult(content="")}
 
-        mock_graph.astream_events = mock_astream_events
+        async def mock_vocabulary_node(state, token_queue=None):
+            if token_queue is not None:
+                await token_queue.put(None)
+            return {"vocabulary_result": VocabularyResult(words=[])}
+
+        mock_graph.astream_events = MagicMock(side_effect=AssertionError("graph must not run"))
 
         # Valid base64 image (1x1 pixel PNG)
         base64_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
 
-        response = client.post(
-            "/api/v1/tutor/analyze-image",
-            json={
-                "image_data": base64_image,
-                "mime_type": "image/png",
-                "level": 3,
-            },
-        )
+        with patch("tutor.routers.tutor.image_processor_node", mock_image_processor_node), \
+             patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_reading_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_grammar_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_vocabulary_node):
+            response = client.post(
+                "/api/v1/tutor/analyze-image",
+                json={
+                    "image_data": base64_image,
+                    "mime_type": "image/png",
+                    "level": 3,
+                },
+            )
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "text/event-stream; charset=utf-8"
@@ -226,7 +773,104 @@ class TestAnalyzeImageEndpoint:
 
         # Verify events
         event_types = [e["event"] for e in events]
-        assert "done" in event_types
+        ocr_text = "".join(e["data"]["token"] for e in events if e["event"] == "ocr_token")
+        assert ocr_text == "Image text content."
+        assert "reading_token" in event_types
+        assert "reading_done" in event_types
+        assert event_types[-1] == "done"
+        mock_graph.astream_events.assert_not_called()
+
+    def test_analyze_image_pipelines_paragraphs_behind_ocr(self, client, monkeypatch):
+        """Test that paragraph analysis starts before OCR finishes and numbering continues."""
+        import asyncio
+
+        from tutor.config import get_settings
+        from tutor.schemas import GrammarResult, ReadingResult, VocabularyResult
+
+        monkeypatch.setattr(get_settings(), "OCR_SEGMENT_MIN_CHARS", 0)
+        first_segment_started = asyncio.Event()
+
+        async def mock_image_processor_node(state, token_queue=None):
+            await token_queue.put("First paragraph.\n\n")
+            # OCR only continues once analysis of paragraph 1 has begun
+            await asyncio.wait_for(first_segment_started.wait(), timeout=5)
+            await token_queue.put("Second paragraph.")
+            await token_queue.put(None)
+            return {"extracted_text": "First paragraph.\n\nSecond paragraph."}
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_reading_node(state, token_queue=None):
+            if state["input_text"] == "First paragraph.":
+                first_segment_started.set()
+            await token_queue.put("### 문장 1\n\n")
+            await token_queue.put(state["input_text"])
+            await token_queue.put(None)
+            return {"reading_result": ReadingResult(content=state["input_text"])}
+
+        async def mock_grammar_node(state, token_queue=None):
+            await token_queue.put(None)
+            return {"grammar_result": GrammarResult(content="")}
+
+        async def mock_vocabulary_node(state, token_queue=None):
+            assert state["input_text"] == "First paragraph.\n\nSecond paragraph."
+            await token_queue.put(None)
+            return {"vocabulary_result": VocabularyResult(words=[])}
+
+        base64_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+        with patch("tutor.routers.tutor.image_processor_node", mock_image_processor_node), \
+             patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_reading_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_grammar_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_vocabulary_node):
+            response = client.post(
+                "/api/v1/tutor/analyze-image",
+                json={"image_data": base64_image, "mime_type": "image/png", "level": 3},
+            )
+
+        events = self._parse_sse_events(response.text)
+        reading = "".join(e["data"]["token"] for e in events if e["event"] == "reading_token")
+        assert reading == (
+            "### 문장 1\n\nFirst paragraph.\n\n### 문장 2\n\nSecond paragraph."
+        )
+        assert events[-1]["event"] == "done"
+
+    def test_analyze_image_endpoint_emits_done_when_no_text(self, client):
+        """Test that analyze-image emits only done when OCR extracts nothing."""
+
+        async def mock_image_processor_node(state, token_queue=None):
+            return {"extracted_text": "", "input_text": ""}
+
+        base64_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+        with patch("tutor.routers.tutor.image_processor_node", mock_image_processor_node):
+            response = client.post(
+                "/api/v1/tutor/analyze-image",
+                json={"image_data": base64_image, "mime_type": "image/png", "level": 3},
+            )
+
+        events = self._parse_sse_events(response.text)
+        assert [e["event"] for e in events] == ["done"]
+
+    def test_analyze_image_endpoint_streams_error_on_ocr_failure(self, client):
+        """Test that OCR failures become an error SSE event."""
+
+        async def mock_image_processor_node(state, token_queue=None):
+            raise RuntimeError("이미지 처리 중 오류가 발생했습니다. 다시 시도해 주세요.")
+
+        base64_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+        with patch("tutor.routers.tutor.image_processor_node", mock_image_processor_node):
+            response = client.post(
+                "/api/v1/tutor/analyze-image",
+                json={"image_data": base64_image, "mime_type": "image/png", "level": 3},
+            )
+
+        events = self._parse_sse_events(response.text)
+        assert events[-1]["event"] == "error"
+        assert events[-1]["data"]["code"] == "processing_error"
 
     def test_analyze_image_endpoint_rejects_invalid_mime(self, client):
         """Test that analyze-image endpoint rejects invalid MIME types."""
@@ -258,6 +902,133 @@ class TestAnalyzeImageEndpoint:
 
         assert response.status_code == 400
 
+    def test_analyze_image_upload_accepts_multipart(self, client):
+        """Test that the upload endpoint passes the raw file bytes to OCR."""
+        import base64
+
+        png = base64.b64decode(
+            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+        )
+        seen = {}
+
+        async def mock_image_processor_node(state, token_queue=None):
+            from tutor.services.blob_store import get_blob_store
+
+            seen.update(state, image_bytes=get_blob_store().get(state["image_ref"]))
+            return {"extracted_text": "", "input_text": ""}
+
+        with patch("tutor.routers.tutor.image_processor_node", mock_image_processor_node):
+            response = client.post(
+                "/api/v1/tutor/analyze-image/upload",
+                files={"file": ("page.jpg", png, "image/jpeg")},
+                data={"level": "2"},
+            )
+
+        assert response.status_code == 200
+        events = self._parse_sse_events(response.text)
+        assert [e["event"] for e in events] == ["done"]
+        assert seen["image_bytes"] == png
+        assert "image_data" not in seen
+        assert seen["mime_type"] == "image/png"  # detected from content
+        assert seen["level"] == 2
+
+    def test_analyze_image_upload_accepts_raw_body(self, client):
+        """Test that the upload endpoint accepts an image/* body with ?level=."""
+        import base64
+
+        png = base64.b64decode(
+            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+        )
+        seen = {}
+
+        async def mock_image_processor_node(state, token_queue=None):
+            from tutor.services.blob_store import get_blob_store
+
+            seen.update(state, image_bytes=get_blob_store().get(state["image_ref"]))
+            return {"extracted_text": "", "input_text": ""}
+
+        with patch("tutor.routers.tutor.image_processor_node", mock_image_processor_node):
+            response = client.post(
+                "/api/v1/tutor/analyze-image/upload?level=4",
+                content=png,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+
+        assert response.status_code == 200
+        assert seen["image_bytes"] == png
+        assert seen["level"] == 4
+
+    def test_analyze_image_releases_blob_after_ocr(self, client):
+        """Test that the image is freed once OCR finishes, before analysis runs."""
+        from tutor.services.blob_store import get_blob_store
+
+        store = get_blob_store()
+        blobs_during_analysis = []
+
+        async def mock_image_processor_node(state, token_queue=None):
+            assert len(store) == 1
+            await token_queue.put("Some extracted text.")
+            await token_queue.put(None)
+            return {"extracted_text": "Some extracted text.", "input_text": "Some extracted text."}
+
+        async def mock_supervisor_node(state):
+            blobs_during_analysis.append(len(store))
+            assert state.get("image_ref") is None
+            return {"supervisor_analysis": None}
+
+        async def mock_agent(state, token_queue=None):
+            if token_queue is not None:
+                await token_queue.put(None)
+            return {}
+
+        base64_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+        with patch("tutor.routers.tutor.image_processor_node", mock_image_processor_node), \
+             patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_agent), \
+             patch("tutor.routers.tutor.grammar_node", mock_agent), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_agent):
+            response = client.post(
+                "/api/v1/tutor/analyze-image",
+                json={"image_data": base64_image, "mime_type": "image/png", "level": 3},
+            )
+
+        assert response.status_code == 200
+        assert blobs_during_analysis == [0]
+        assert len(store) == 0
+
+    def test_analyze_image_upload_rejects_oversized_body(self, client):
+        """Test that uploads over the size limit get 413."""
+        big = b"\x89PNG\r\n\x1a\n" + b"\0" * (10 * 1024 * 1024)
+
+        response = client.post(
+            "/api/v1/tutor/analyze-image/upload?level=3",
+            content=big,
+            headers={"Content-Type": "image/png"},
+        )
+
+        assert response.status_code == 413
+
+    def test_analyze_image_upload_rejects_non_image(self, client):
+        """Test that non-image content gets 400."""
+        response = client.post(
+            "/api/v1/tutor/analyze-image/upload?level=3",
+            content=b"GIF89a not allowed",
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+        assert response.status_code == 400
+
+    def test_analyze_image_upload_requires_level(self, client):
+        """Test that a missing level gets 422."""
+        response = client.post(
+            "/api/v1/tutor/analyze-image/upload",
+            content=b"\x89PNG\r\n\x1a\n",
+            headers={"Content-Type": "image/png"},
+        )
+
+        assert response.status_code == 422
+
     def _parse_sse_events(self, content: str) -> list[dict]:
         """Helper to parse SSE events from response text."""
         events = []
@@ -357,3 +1128,187 @@ class TestChatEndpoint:
             "/api/v1/tutor/chat", json={"session_id": "test-123", "question": "Hello"}
         )
         assert response.status_code == 422
+
+
+class TestWebSocketEndpoint:
+    """Tests for the /api/v1/tutor/ws session endpoint."""
+
+    def test_operations_are_multiplexed_on_one_connection(
+        self, client, mock_graph, mock_session_manager
+    ):
+        """Test that analyze and chat run over one socket with tagged SSE events."""
+        from tutor.schemas import ReadingResult
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put("### 문장 1\n\n")
+            await token_queue.put(None)
+            return {}
+
+        mock_session_manager.get = MagicMock(return_value={"messages": []})
+        mock_graph.ainvoke.return_value = {"reading_result": ReadingResult(content="답변")}
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node), \
+             client.websocket_connect("/api/v1/tutor/ws") as ws:
+            ws.send_json(
+                {"op": "analyze", "id": "a1", "text": "The fox jumps over it.", "level": 3}
+            )
+            ws.send_json({"op": "chat", "id": "c1", "question": "What is a fox?", "level": 3})
+            messages = []
+            while sum(m["event"] == "done" for m in messages) < 2:
+                messages.append(ws.receive_json())
+
+        analysis = [m for m in messages if m["id"] == "a1"]
+        assert {"id": "a1", "event": "reading_token", "data": {"token": "### 문장 1\n\n"}} in analysis
+        assert analysis[-1]["data"] == {"session_id": "test-session-123", "status": "complete"}
+        chat = [m for m in messages if m["id"] == "c1"]
+        assert [m["event"] for m in chat] == ["chat_chunk", "done"]
+        assert chat[0]["data"] == {"content": "답변", "role": "assistant"}
+
+    def test_invalid_messages_and_unknown_cancels_are_reported(self, client):
+        """Test that bad client messages get tagged error events, not a closed socket."""
+        with client.websocket_connect("/api/v1/tutor/ws") as ws:
+            ws.send_json({"op": "analyze", "id": "a1", "text": "short", "level": 3})
+            invalid = ws.receive_json()
+            ws.send_text("not json")
+            garbage = ws.receive_json()
+            ws.send_json({"op": "cancel", "id": "x1"})
+            unknown = ws.receive_json()
+
+        assert invalid["id"] == "a1"
+        assert invalid["event"] == "error"
+        assert invalid["data"]["code"] == "invalid_message"
+        assert "text" in invalid["data"]["message"]
+        assert garbage["id"] is None and garbage["data"]["code"] == "invalid_message"
+        assert unknown == {
+            "id": "x1",
+            "event": "error",
+            "data": {"message": "No running operation with this id", "code": "unknown_operation"},
+        }
+
+
+class TestJobsEndpoint:
+    """Tests for the /api/v1/tutor/jobs endpoints."""
+
+    @pytest.fixture
+    def jobs_client(self, app_with_mocks, monkeypatch):
+        """Client whose event loop outlives single requests, so jobs keep running."""
+        from tutor.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "PRELOAD_ON_STARTUP", False)
+        with TestClient(app_with_mocks) as client:
+            yield client
+
+    def test_job_lifecycle(self, jobs_client):
+        """Test submitting a job, polling its result and attaching to its stream."""
+        import time
+
+        from tutor.schemas import VocabularyResult, VocabularyWordEntry
+
+        async def mock_supervisor_node(state):
+            return {"supervisor_analysis": None}
+
+        async def mock_node(state, token_queue=None):
+            await token_queue.put("token")
+            await token_queue.put(None)
+            return {
+                "vocabulary_result": VocabularyResult(
+                    words=[VocabularyWordEntry(word="fox", content="여우")]
+                )
+            }
+
+        with patch("tutor.routers.tutor.supervisor_node", mock_supervisor_node), \
+             patch("tutor.routers.tutor.reading_node", mock_node), \
+             patch("tutor.routers.tutor.grammar_node", mock_node), \
+             patch("tutor.routers.tutor.vocabulary_node", mock_node):
+            submitted = jobs_client.post(
+                "/api/v1/tutor/jobs",
+                json={"kind": "analyze", "text": "This is a test text for analysis.", "level": 3},
+            )
+            assert submitted.status_code == 202
+            job_id = submitted.json()["job_id"]
+
+            for _ in range(100):
+                job = jobs_client.get(f"/api/v1/tutor/jobs/{job_id}").json()
+                if job["state"] not in ("queued", "running"):
+                    break
+                time.sleep(0.01)
+
+        assert job["state"] == "succeeded"
+        assert job["result"]["reading"] == "token"
+        assert job["result"]["vocabulary_words"] == [{"word": "fox", "content": "여우"}]
+        assert job["result"]["completed_sections"] == ["reading", "grammar", "vocabulary"]
+
+        events = jobs_client.get(f"/api/v1/tutor/jobs/{job_id}/events")
+        assert events.status_code == 200
+        assert "event: done" in events.text
+
+        # Cancelling a finished job leaves it unchanged
+        cancelled = jobs_client.delete(f"/api/v1/tutor/jobs/{job_id}")
+        assert cancelled.json()["state"] == "succeeded"
+
+    def test_cancel_running_job(self, jobs_client):
+        """Test that a running job can be cancelled."""
+
+        async def slow_supervisor_node(state):
+            await asyncio.sleep(10)
+
+        with patch("tutor.routers.tutor.supervisor_node", slow_supervisor_node):
+            job_id = jobs_client.post(
+                "/api/v1/tutor/jobs",
+                json={"kind": "analyze", "text": "This is a test text for analysis.", "level": 3},
+            ).json()["job_id"]
+            response = jobs_client.delete(f"/api/v1/tutor/jobs/{job_id}")
+
+        assert response.status_code == 200
+        assert response.json()["state"] == "cancelled"
+
+    def test_submit_is_rejected_while_the_job_queue_is_full(self, jobs_client, monkeypatch):
+        """Test that a full job queue answers 503 with Retry-After and keeps no image."""
+        from tutor.config import get_settings
+        from tutor.services.blob_store import get_blob_store
+
+        monkeypatch.setattr(get_settings(), "JOBS_MAX_CONCURRENCY", 1)
+        monkeypatch.setattr(get_settings(), "JOBS_MAX_QUEUED", 1)
+
+        async def slow_supervisor_node(state):
+            await asyncio.sleep(10)
+
+        body = {"kind": "analyze", "text": "This is a test text for analysis.", "level": 3}
+        base64_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+        with patch("tutor.routers.tutor.supervisor_node", slow_supervisor_node):
+            running = jobs_client.post("/api/v1/tutor/jobs", json=body).json()["job_id"]
+            queued = jobs_client.post("/api/v1/tutor/jobs", json=body).json()["job_id"]
+            rejected = jobs_client.post("/api/v1/tutor/jobs", json=body)
+            image = jobs_client.post(
+                "/api/v1/tutor/jobs",
+                json={"kind": "image", "image_data": base64_image, "mime_type": "image/png",
+                      "level": 3},
+            )
+            for job_id in (running, queued):
+                jobs_client.delete(f"/api/v1/tutor/jobs/{job_id}")
+
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "5"
+        assert rejected.json() == {"detail": "Job queue is full, retry later"}
+        assert image.status_code == 503
+        assert len(get_blob_store()) == 0
+
+    def test_job_validation_and_unknown_jobs(self, client):
+        """Test request validation and 404 for unknown jobs."""
+        assert client.post(
+            "/api/v1/tutor/jobs", json={"kind": "other", "text": "x" * 20, "level": 3}
+        ).status_code == 422
+        assert client.post(
+            "/api/v1/tutor/jobs",
+            json={"kind": "image", "image_data": "not-base64!", "mime_type": "image/png",
+                  "level": 3},
+        ).status_code == 400
+        assert client.get("/api/v1/tutor/jobs/missing").status_code == 404
+        assert client.get("/api/v1/tutor/jobs/missing/events").status_code == 404
+        assert client.delete("/api/v1/tutor/jobs/missing").status_code == 404
@@ -0,0 +1,101 @@
+"""Unit tests for admission control."""
+
+from __future__ import annotations
+
+import pytest
+
+from tutor.services.admission import AdmissionController, estimate_llm_tokens
+from tutor.services.loop_monitor import get_loop_monitor
+from tutor.services.metrics import metrics
+from tutor.services.token_budget import AGENT_MAX_TOKENS
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestEstimateLlmTokens:
+    """Test cases for estimate_llm_tokens."""
+
+    def test_longer_passages_cost_more(self):
+        short = estimate_llm_tokens({"input_text": "One sentence.", "level": 3})
+        long = estimate_llm_tokens({"input_text": "One sentence here. " * 20, "level": 3})
+
+        assert 0 < short < long <= sum(AGENT_MAX_TOKENS.values())
+
+    def test_images_count_ocr_and_agent_ceilings(self):
+        tokens = estimate_llm_tokens({"task_type": "image_process", "level": 3})
+
+        assert tokens == 2048 + sum(AGENT_MAX_TOKENS.values())
+
+
+class TestAdmissionController:
+    """Test cases for AdmissionController."""
+
+    @pytest.mark.parametrize("streams, expected", [
+        (0, "accepted"),
+        (7, "accepted"),
+        (8, "degraded"),
+        (10, "shed"),
+        (25, "shed"),
+    ])
+    def test_streams_in_flight(self, streams, expected):
+        metrics.set_gauge("sse_streams_in_flight", streams)
+        controller = AdmissionController(max_streams=10, degrade_ratio=0.8)
+
+        assert controller.state() == expected
+
+    def test_running_pipelines_reserve_their_work(self):
+        controller = AdmissionController(max_streams=0, max_queued_tokens=10_000)
+
+        with controller.admit(6000) as first, controller.admit(3000) as second:
+            assert (first, second) == (False, False)  # decided at 0 and 0.6 of the limit
+            assert metrics.get("admission_queued_tokens") == 9000
+            assert controller.state() == "degraded"
+            with controller.admit(2000) as third:
+                assert third is True
+                assert controller.state() == "shed"
+        assert controller.queued_tokens == 0
+        assert metrics.get("admission_requests_total", decision="accepted") == 2
+        assert metrics.get("admission_requests_total", decision="degraded") == 1
+
+    def test_sustained_event_loop_lag_sheds(self):
+        controller = AdmissionController(max_streams=0, max_loop_lag=0.2)
+        monitor = get_loop_monitor()
+        for _ in range(3):
+            monitor._record_lag(0.25)
+
+        assert controller.state() == "shed"
+
+    def test_single_lag_spike_does_not_shed(self):
+        controller = AdmissionController(max_streams=0, max_loop_lag=0.2)
+        monitor = get_loop_monitor()
+        for lag in (0.01, 0.02, 2.0, 0.01):
+            monitor._record_lag(lag)
+
+        assert monitor.lag_seconds == 0.01
+        assert controller.state() == "accepted"
+
+        monitor._record_lag(2.0)  # a second slow sample within the window
+        assert controller.state() == "shed"
+
+    def test_retry_after_grows_with_overload(self):
+        controller = AdmissionController(max_streams=10, retry_after_seconds=5)
+
+        metrics.set_gauge("sse_streams_in_flight", 10)
+        at_limit = controller.shed()
+        metrics.set_gauge("sse_streams_in_flight", 30)
+        overloaded = controller.shed()
+
+        assert (at_limit, overloaded) == (5, 15)
+        assert metrics.get("admission_requests_total", decision="shed") == 2
+
+    def test_zero_disables_every_limit(self):
+        metrics.set_gauge("sse_streams_in_flight", 1000)
+        controller = AdmissionController(max_streams=0, max_queued_tokens=0, max_loop_lag=0)
+
+        assert controller.load() == 0.0
+        assert controller.state() == "accepted"
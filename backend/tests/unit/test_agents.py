@@ -16,7 +16,7 @@ from __future__ import annotations
 
 import base64
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -108,7 +108,10 @@ class TestSupervisorAgent:
             await supervisor_node(base_state)
 
             mock_get_llm.assert_called_once_with(
-                mock_settings_obj.SUPERVISOR_MODEL, max_tokens=1024, timeout=30
+                mock_settings_obj.SUPERVISOR_MODEL,
+                max_tokens=1024,
+                timeout=30,
+                role="supervisor",
             )
 
     @pytest.mark.asyncio
@@ -242,7 +245,8 @@ class TestReadingAgent:
         """
         GIVEN a reading analysis request
         WHEN reading_node is called
-        THEN it should use READING_MODEL from config with max_tokens=6144 (R1, R2, R7)
+        THEN it should use READING_MODEL from config with a budgeted max_tokens
+        below the 6144 ceiling for a short passage (R1, R2, R7)
         """
         from tutor.agents.reading import reading_node
 
@@ -264,8 +268,9 @@ class TestReadingAgent:
             await reading_node(reading_state)
 
             mock_get_llm.assert_called_once_with(
-                mock_settings_obj.READING_MODEL, max_tokens=6144
+                mock_settings_obj.READING_MODEL, max_tokens=ANY, role="reading"
             )
+            assert 1024 <= mock_get_llm.call_args.kwargs["max_tokens"] < 6144
 
     @pytest.mark.asyncio
     async def test_reading_agent_uses_raw_llm_invocation(
@@ -339,6 +344,50 @@ class TestReadingAgent:
         assert "supervisor_context" in captured_prompt
         assert "사전 분석" in captured_prompt["supervisor_context"]
 
+    @pytest.mark.asyncio
+    async def test_reading_agent_sends_system_then_passage_and_records_usage(
+        self, reading_state: TutorState
+    ) -> None:
+        """
+        GIVEN a streaming LLM that reports usage on its final chunk
+        WHEN reading_node is called
+        THEN static instructions go in a system message, the passage in a user
+        message, and cached prompt tokens are recorded per agent
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        from tutor.agents.reading import reading_node
+        from tutor.services.metrics import metrics
+
+        metrics.reset()
+        content_chunk = MagicMock(content="Reading content", usage_metadata=None)
+        usage_chunk = MagicMock(content="", usage_metadata={
+            "input_tokens": 2000,
+            "output_tokens": 300,
+            "total_tokens": 2300,
+            "input_token_details": {"cache_read": 1536},
+        })
+        sent = []
+
+        async def mock_astream(messages):
+            sent.append(messages)
+            yield content_chunk
+            yield usage_chunk
+
+        mock_llm = MagicMock()
+        mock_llm.astream = mock_astream
+
+        with patch("tutor.agents.reading.get_llm", return_value=mock_llm):
+            await reading_node(reading_state)
+
+        system, passage = sent[0]
+        assert isinstance(system, SystemMessage)
+        assert isinstance(passage, HumanMessage)
+        assert reading_state["input_text"] in passage.content
+        assert reading_state["input_text"] not in system.content
+        assert metrics.get("llm_cached_input_tokens_total", agent="reading") == 1536
+        assert metrics.get("llm_input_tokens_total", agent="reading") == 2000
+
     @pytest.mark.asyncio
     async def test_reading_agent_includes_level_instructions(
         self, reading_state: TutorState
@@ -531,7 +580,10 @@ class TestGrammarAgent:
              patch("tutor.agents.grammar.get_settings", return_value=mock_settings_obj):
             await grammar_node(grammar_state)
 
-            mock_get_llm.assert_called_once_with(mock_settings_obj.GRAMMAR_MODEL)
+            mock_get_llm.assert_called_once_with(
+                mock_settings_obj.GRAMMAR_MODEL, max_tokens=ANY, role="grammar"
+            )
+            assert 1024 <= mock_get_llm.call_args.kwargs["max_tokens"] <= 4096
 
     @pytest.mark.asyncio
     async def test_grammar_agent_uses_raw_llm_invocation(
@@ -638,6 +690,29 @@ class TestGrammarAgent:
         assert result.get("grammar_result") is not None
         assert result["grammar_result"].content is not None
 
+    @pytest.mark.asyncio
+    async def test_grammar_node_reports_truncated_output(self, grammar_state: TutorState) -> None:
+        """An output cut off at max_tokens is kept but reported as a grammar_error."""
+        from tutor.agents.grammar import grammar_node
+
+        mock_chunk = MagicMock()
+        mock_chunk.content = "## 문법 포인트\n\n과거 진행형"
+        mock_chunk.response_metadata = {"finish_reason": "length"}
+
+        mock_llm = MagicMock()
+
+        async def mock_astream(_prompt):
+            yield mock_chunk
+
+        mock_llm.astream = mock_astream
+
+        with patch("tutor.agents.grammar.get_llm", return_value=mock_llm), \
+             patch("tutor.agents.grammar.render_prompt", return_value="Test prompt"):
+            result = await grammar_node(grammar_state)
+
+        assert "과거 진행형" in result["grammar_result"].content
+        assert "cut off" in result["grammar_error"]
+
     @pytest.mark.asyncio
     async def test_grammar_node_sends_sentinel_on_error(self, grammar_state: TutorState) -> None:
         """On error, grammar_node should put None sentinel and return grammar_error key."""
@@ -725,7 +800,8 @@ class TestVocabularyAgent:
         """
         GIVEN a vocabulary extraction request
         WHEN vocabulary_node is called
-        THEN it should use VOCABULARY_MODEL from config with max_tokens=6144 (R1, R2, R7)
+        THEN it should use VOCABULARY_MODEL from config with a budgeted max_tokens
+        below the 8192 ceiling for a short passage (R1, R2, R7)
         """
         from tutor.agents.vocabulary import vocabulary_node
 
@@ -747,8 +823,9 @@ class TestVocabularyAgent:
             await vocabulary_node(vocabulary_state)
 
             mock_get_llm.assert_called_once_with(
-                mock_settings_obj.VOCABULARY_MODEL, max_tokens=6144
+                mock_settings_obj.VOCABULARY_MODEL, max_tokens=ANY, role="vocabulary"
             )
+            assert 1024 <= mock_get_llm.call_args.kwargs["max_tokens"] < 8192
 
     @pytest.mark.asyncio
     async def test_vocabulary_agent_returns_empty_list_on_error(
@@ -961,7 +1038,7 @@ class TestImageProcessorAgent:
         mock_llm = AsyncMock()
         mock_llm.ainvoke = AsyncMock(return_value=mock_response)
 
-        with patch("tutor.agents.image_processor.ChatOpenAI", return_value=mock_llm):
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
             result = await image_processor_node(image_state)
 
         assert "extracted_text" in result
@@ -1008,11 +1085,258 @@ class TestImageProcessorAgent:
         mock_llm = AsyncMock()
         mock_llm.ainvoke = AsyncMock(return_value=mock_response)
 
-        with patch("tutor.agents.image_processor.ChatOpenAI", return_value=mock_llm):
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
             with pytest.raises(RuntimeError, match="이미지에서 텍스트를 찾을 수 없습니다"):
                 await image_processor_node(image_state)
 
 
+    @pytest.mark.asyncio
+    async def test_image_processor_sends_downscaled_image(self, image_state: TutorState) -> None:
+        """
+        GIVEN a large PNG photo
+        WHEN image_processor_node is called with preprocessing enabled (default)
+        THEN the vision call receives a smaller grayscale JPEG instead of the upload
+        """
+        import io
+
+        from PIL import Image
+
+        from tutor.agents.image_processor import image_processor_node
+
+        buffer = io.BytesIO()
+        Image.effect_noise((2000, 1500), 64).convert("RGB").save(buffer, format="PNG")
+        image_state["image_data"] = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        image_state["mime_type"] = "image/png"
+
+        mock_response = MagicMock()
+        mock_response.content = "Some text."
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
+            await image_processor_node(image_state)
+
+        message = mock_llm.ainvoke.call_args.args[0][0]
+        url = message.content[0]["image_url"]["url"]
+        assert url.startswith("data:image/jpeg;base64,")
+        assert len(url) < len(image_state["image_data"])
+
+    @pytest.mark.asyncio
+    async def test_image_processor_accepts_binary_upload(self, image_state: TutorState) -> None:
+        """
+        GIVEN a state carrying only an image_ref into the blob store (no base64 string)
+        WHEN image_processor_node is called
+        THEN the vision call still receives a base64 data URL
+        """
+        from tutor.agents.image_processor import image_processor_node
+        from tutor.services.blob_store import get_blob_store
+
+        image_bytes = b"\x89PNG\r\n\x1a\nnot really a png"
+        image_state["image_ref"] = get_blob_store().put(image_bytes)
+        image_state["mime_type"] = "image/png"
+
+        mock_response = MagicMock()
+        mock_response.content = "Uploaded text."
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
+            result = await image_processor_node(image_state)
+
+        message = mock_llm.ainvoke.call_args.args[0][0]
+        url = message.content[0]["image_url"]["url"]
+        assert url == "data:image/png;base64," + base64.b64encode(image_bytes).decode()
+        assert result["extracted_text"] == "Uploaded text."
+
+    @pytest.mark.asyncio
+    async def test_image_processor_streams_tokens_via_queue(self, image_state: TutorState) -> None:
+        """
+        GIVEN a state with image_data and a token_queue
+        WHEN image_processor_node streams the Vision response
+        THEN each token is put on the queue, followed by a None sentinel
+        """
+        import asyncio
+
+        from tutor.agents.image_processor import image_processor_node
+
+        image_state["image_data"] = base64.b64encode(b"fake image bytes").decode("utf-8")
+        image_state["mime_type"] = "image/jpeg"
+
+        async def mock_astream(messages):
+            for token in ["The quick ", "brown fox.", "\n"]:
+                chunk = MagicMock()
+                chunk.content = token
+                yield chunk
+
+        mock_llm = MagicMock()
+        mock_llm.astream = mock_astream
+        token_queue: asyncio.Queue = asyncio.Queue()
+
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
+            result = await image_processor_node(image_state, token_queue=token_queue)
+
+        tokens = []
+        while (token := token_queue.get_nowait()) is not None:
+            tokens.append(token)
+        assert tokens == ["The quick ", "brown fox.", "\n"]
+        assert result["extracted_text"] == "The quick brown fox."
+
+    @pytest.mark.asyncio
+    async def test_image_processor_sends_sentinel_on_error(self, image_state: TutorState) -> None:
+        """
+        GIVEN a token_queue and a Vision call that fails
+        WHEN image_processor_node is called
+        THEN a None sentinel is still put on the queue before RuntimeError is raised
+        """
+        import asyncio
+
+        from tutor.agents.image_processor import image_processor_node
+
+        image_state["image_data"] = base64.b64encode(b"fake image bytes").decode("utf-8")
+        image_state["mime_type"] = "image/jpeg"
+
+        async def failing_astream(messages):
+            raise Exception("Vision API down")
+            yield  # pragma: no cover
+
+        mock_llm = MagicMock()
+        mock_llm.astream = failing_astream
+        token_queue: asyncio.Queue = asyncio.Queue()
+
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
+            with pytest.raises(RuntimeError):
+                await image_processor_node(image_state, token_queue=token_queue)
+
+        assert token_queue.get_nowait() is None
+
+    @pytest.mark.asyncio
+    async def test_image_processor_serves_repeat_image_from_cache(
+        self, image_state: TutorState
+    ) -> None:
+        """
+        GIVEN an image that was already transcribed
+        WHEN the same image is processed again with a token_queue
+        THEN the cached text is streamed without a second Vision call
+        """
+        import asyncio
+
+        from tutor.agents.image_processor import image_processor_node
+
+        image_state["image_data"] = base64.b64encode(b"fake image bytes").decode("utf-8")
+        image_state["mime_type"] = "image/jpeg"
+
+        mock_response = MagicMock()
+        mock_response.content = "Cached page text."
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        token_queue: asyncio.Queue = asyncio.Queue()
+
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
+            await image_processor_node(image_state)
+            result = await image_processor_node(image_state, token_queue=token_queue)
+
+        assert mock_llm.ainvoke.await_count == 1
+        assert result["extracted_text"] == "Cached page text."
+        assert token_queue.get_nowait() == "Cached page text."
+        assert token_queue.get_nowait() is None
+
+    @pytest.mark.asyncio
+    async def test_image_processor_cache_disabled(
+        self, image_state: TutorState, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        GIVEN OCR_CACHE_ENABLED is False
+        WHEN the same image is processed twice
+        THEN the Vision API is called both times
+        """
+        from tutor.agents.image_processor import image_processor_node
+
+        monkeypatch.setenv("OCR_CACHE_ENABLED", "false")
+        image_state["image_data"] = base64.b64encode(b"fake image bytes").decode("utf-8")
+        image_state["mime_type"] = "image/jpeg"
+
+        mock_response = MagicMock()
+        mock_response.content = "Page text."
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
+            await image_processor_node(image_state)
+            await image_processor_node(image_state)
+
+        assert mock_llm.ainvoke.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_image_processor_same_layout_pages_not_shared(
+        self, image_state: TutorState
+    ) -> None:
+        """
+        GIVEN two pages of different text set in the same layout
+        WHEN both are processed
+        THEN each page gets its own OCR instead of the other page's cached text
+        """
+        import io
+
+        from PIL import Image, ImageDraw
+
+        from tutor.agents.image_processor import image_processor_node
+
+        def page(sentence: str) -> bytes:
+            image = Image.new("RGB", (600, 800), "white")
+            draw = ImageDraw.Draw(image)
+            for row in range(30):
+                draw.text((40, 40 + row * 24), (sentence * 3)[:90], fill="black")
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            return buffer.getvalue()
+
+        pages = [
+            page("The quick brown fox jumps over the lazy dog. "),
+            page("She sells sea shells by the sea shore today. "),
+        ]
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[MagicMock(content="Page A"), MagicMock(content="Page B")]
+        )
+
+        texts = []
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm):
+            for data in pages:
+                image_state["image_data"] = base64.b64encode(data).decode("utf-8")
+                image_state["mime_type"] = "image/png"
+                texts.append((await image_processor_node(image_state))["extracted_text"])
+
+        assert texts == ["Page A", "Page B"]
+        assert mock_llm.ainvoke.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_image_processor_records_ocr_usage(self, image_state: TutorState) -> None:
+        """
+        GIVEN a Vision response with usage metadata
+        WHEN image_processor_node runs OCR
+        THEN the call's tokens are recorded under the "ocr" agent
+        """
+        from tutor.agents.image_processor import image_processor_node
+        from tutor.services.metrics import metrics
+
+        metrics.reset()
+        image_state["image_data"] = base64.b64encode(b"fake image bytes").decode("utf-8")
+        image_state["mime_type"] = "image/jpeg"
+
+        mock_response = MagicMock()
+        mock_response.content = "Page text."
+        mock_response.usage_metadata = {"input_tokens": 120, "output_tokens": 4}
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+
+        with patch("langchain_openai.ChatOpenAI", return_value=mock_llm) as chat:
+            await image_processor_node(image_state)
+
+        assert chat.call_args.kwargs["stream_usage"] is True
+        assert metrics.get("llm_input_tokens_total", agent="ocr") == 120
+        assert metrics.get("llm_output_tokens_total", agent="ocr") == 4
+
+
 class TestAggregatorAgent:
     """Test cases for the result aggregation agent."""
 
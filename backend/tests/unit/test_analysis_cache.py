@@ -0,0 +1,185 @@
+"""Unit tests for the persistent analysis cache."""
+
+from __future__ import annotations
+
+import time
+
+from tutor.services.analysis_cache import (
+    AnalysisCache,
+    AnalysisResult,
+    PassageSegment,
+    analysis_key,
+    index_sentences,
+    plan_segments,
+    sentence_key,
+)
+from tutor.services.metrics import metrics
+from tutor.services.streaming import (
+    format_done_event,
+    format_grammar_error,
+    format_reading_token,
+    format_section_done,
+    format_vocabulary_chunk,
+)
+
+
+def _complete_result() -> AnalysisResult:
+    result = AnalysisResult()
+    for event in (
+        format_reading_token("Hello "),
+        format_reading_token("world"),
+        format_section_done("reading"),
+        format_section_done("grammar"),
+        format_vocabulary_chunk({"words": [{"word": "a", "content": "b"}]}),
+        format_section_done("vocabulary"),
+        format_done_event("s1"),
+    ):
+        result.feed(event)
+    return result
+
+
+class TestAnalysisResult:
+    """Test cases for AnalysisResult."""
+
+    def test_folds_events_into_result(self):
+        result = AnalysisResult()
+        for event in (
+            format_reading_token("Hello "),
+            format_reading_token("world"),
+            format_section_done("reading"),
+            format_grammar_error("boom"),
+            format_vocabulary_chunk({"words": [{"word": "a", "content": "b"}]}),
+            format_done_event("s1"),
+        ):
+            result.feed(event)
+
+        data = result.as_dict()
+        assert data["reading"] == "Hello world"
+        assert data["completed_sections"] == ["reading"]
+        assert data["errors"] == [
+            {"section": "grammar", "message": "boom", "code": "grammar_error"}
+        ]
+        assert data["vocabulary_words"] == [{"word": "a", "content": "b"}]
+        assert result.complete
+
+    def test_replay_events_rebuild_the_same_result(self):
+        original = _complete_result()
+        replayed = AnalysisResult()
+        for event in original.replay_events():
+            replayed.feed(event)
+
+        assert replayed.as_dict() == original.as_dict()
+
+
+class TestAnalysisKey:
+    """Test cases for analysis_key."""
+
+    def test_whitespace_is_normalized(self):
+        assert analysis_key("The fox  jumps.\n", 3) == analysis_key("The fox jumps.", 3)
+
+    def test_level_and_model_change_the_key(self, monkeypatch):
+        from tutor.config import get_settings
+
+        key = analysis_key("The fox jumps.", 3)
+        assert analysis_key("The fox jumps.", 4) != key
+
+        monkeypatch.setattr(get_settings(), "READING_MODEL", "gpt-4o")
+        assert analysis_key("The fox jumps.", 3) != key
+
+
+class TestAnalysisCache:
+    """Test cases for AnalysisCache."""
+
+    def test_round_trip(self):
+        metrics.reset()
+        cache = AnalysisCache(":memory:")
+        assert cache.get("k") is None
+
+        cache.put("k", 3, _complete_result())
+        hit = cache.get("k")
+
+        assert hit is not None and hit.complete
+        assert hit.as_dict() == _complete_result().as_dict()
+        assert len(cache) == 1
+        assert metrics.get("analysis_cache_lookups_total", result="hit") == 1
+        assert metrics.get("analysis_cache_lookups_total", result="miss") == 1
+
+    def test_shared_between_connections(self, tmp_path):
+        path = tmp_path / "cache" / "analysis.sqlite3"
+        writer = AnalysisCache(path)
+        writer.put("k", 3, _complete_result())
+        writer.close()
+
+        assert AnalysisCache(path).contains("k")
+
+    def test_expired_entries_are_misses(self):
+        cache = AnalysisCache(":memory:", ttl_seconds=0.01)
+        cache.put("k", 3, _complete_result())
+        time.sleep(0.02)
+
+        assert cache.get("k") is None
+        assert not cache.contains("k")
+
+
+def _sections(*sentences: str) -> str:
+    return "\n\n".join(
+        f"---\n\n### 문장 {i}\n\n> {sentence}" for i, sentence in enumerate(sentences, 1)
+    )
+
+
+class TestSentenceCache:
+    """Test cases for the per-sentence section cache."""
+
+    def test_sentence_key_depends_on_section_and_level(self):
+        key = sentence_key("The fox ran.", 3, "reading")
+
+        assert sentence_key(" The  fox ran. ", 3, "reading") == key
+        assert sentence_key("The fox ran.", 3, "grammar") != key
+        assert sentence_key("The fox ran.", 2, "reading") != key
+
+    def test_plan_reuses_sentences_with_cached_reading(self):
+        metrics.reset()
+        cache = AnalysisCache(":memory:")
+        sentences = ["A one.", "B two.", "C three.", "D four."]
+        assert index_sentences(cache, sentences[:2], 3, _sections(*sentences[:2])) == 2
+        assert index_sentences(cache, sentences[3:], 3, _sections(sentences[3])) == 1
+
+        segments = plan_segments(cache, sentences, 3)
+
+        assert segments == [
+            PassageSegment(["A one."], "---\n\n### 문장 1\n\n> A one."),
+            PassageSegment(["B two."], "---\n\n### 문장 1\n\n> B two."),
+            PassageSegment(["C three."], None),
+            PassageSegment(["D four."], "---\n\n### 문장 1\n\n> D four."),
+        ]
+        assert metrics.get("sentence_cache_lookups_total", result="hit") == 3
+        assert metrics.get("sentence_cache_lookups_total", result="miss") == 1
+
+    def test_sections_are_paired_by_the_sentence_they_quote(self):
+        cache = AnalysisCache(":memory:")
+        sentences = [
+            "The fox runs.", "It jumps high.", "The dog sleeps.", "Birds sing loudly today.",
+        ]
+        # Out of order, one sentence skipped, one quote that is not in the passage
+        markdown = (
+            "---\n\n### 문장 1\n\n> The dog / sleeps.\n\n"
+            "---\n\n### 문장 2\n\n> The fox / runs.\n\n"
+            "---\n\n### 문장 3\n\n> Nothing like / this passage."
+        )
+
+        assert index_sentences(cache, sentences, 3, markdown) == 2
+
+        segments = plan_segments(cache, sentences, 3)
+        assert segments == [
+            PassageSegment(["The fox runs."], "---\n\n### 문장 1\n\n> The fox / runs."),
+            PassageSegment(["It jumps high."], None),
+            PassageSegment(["The dog sleeps."], "---\n\n### 문장 1\n\n> The dog / sleeps."),
+            PassageSegment(["Birds sing loudly today."], None),
+        ]
+
+    def test_output_without_matching_sections_is_not_indexed(self):
+        cache = AnalysisCache(":memory:")
+
+        assert index_sentences(cache, ["A one.", "B two."], 3, _sections("Other text")) == 0
+        assert index_sentences(cache, ["A one."], 3, "no headings") == 0
+        assert cache.get_sentences([sentence_key("A one.", 3, "reading")]) == {}
@@ -0,0 +1,151 @@
+"""Unit tests for batch analysis and the pre-generation CLI."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from tutor.schemas import GrammarResult, ReadingResult, VocabularyResult, VocabularyWordEntry
+from tutor.services.analysis_cache import AnalysisCache, analysis_key
+from tutor.services.batch import (
+    BatchFormatError,
+    BatchItem,
+    BatchReport,
+    parse_batch_items,
+    run_batch,
+)
+
+PASSAGE = "The quick brown fox jumps over the lazy dog."
+
+
+async def _supervisor(state):
+    return {"supervisor_analysis": None}
+
+
+def _agent(section: str, result: dict):
+    async def node(state, token_queue=None):
+        await token_queue.put(f"{section} text")
+        await token_queue.put(None)
+        return result
+
+    return node
+
+
+def _patch_agents(reading=None, grammar=None, vocabulary=None):
+    reading = reading or _agent("reading", {"reading_result": ReadingResult(content="r")})
+    grammar = grammar or _agent("grammar", {"grammar_result": GrammarResult(content="g")})
+    vocabulary = vocabulary or _agent("vocabulary", {
+        "vocabulary_result": VocabularyResult(words=[VocabularyWordEntry(word="fox", content="c")])
+    })
+    return (
+        patch("tutor.services.batch.supervisor_node", _supervisor),
+        patch("tutor.services.batch.reading_node", reading),
+        patch("tutor.services.batch.grammar_node", grammar),
+        patch("tutor.services.batch.vocabulary_node", vocabulary),
+    )
+
+
+async def _run(items, cache, concurrency=2, **agents) -> BatchReport:
+    report = BatchReport(total=len(items))
+    patches = _patch_agents(**agents)
+    with patches[0], patches[1], patches[2], patches[3]:
+        async for outcome in run_batch(items, cache, concurrency):
+            report.add(outcome)
+    return report
+
+
+class TestParseBatchItems:
+    """Test cases for parse_batch_items."""
+
+    def test_parses_jsonl_with_default_ids(self):
+        lines = [json.dumps({"text": PASSAGE, "level": 3}), "", json.dumps(
+            {"id": "p2", "text": PASSAGE, "level": 1}
+        )]
+
+        items = parse_batch_items(lines)
+
+        assert items == [BatchItem("1", PASSAGE, 3), BatchItem("p2", PASSAGE, 1)]
+
+    @pytest.mark.parametrize("line", [
+        "not json",
+        json.dumps({"text": PASSAGE}),
+        json.dumps({"text": "short", "level": 3}),
+        json.dumps({"text": PASSAGE, "level": 9}),
+    ])
+    def test_rejects_invalid_lines(self, line):
+        with pytest.raises(BatchFormatError, match="line 1"):
+            parse_batch_items([line])
+
+    def test_rejects_duplicate_ids_and_too_many_items(self):
+        line = json.dumps({"id": "a", "text": PASSAGE, "level": 3})
+        with pytest.raises(BatchFormatError, match="duplicate"):
+            parse_batch_items([line, line])
+        with pytest.raises(BatchFormatError, match="more than 1"):
+            parse_batch_items([json.dumps({"text": PASSAGE, "level": 3})] * 2, max_items=1)
+
+
+class TestRunBatch:
+    """Test cases for run_batch."""
+
+    async def test_results_are_cached_and_reruns_resume(self):
+        cache = AnalysisCache(":memory:")
+        items = [BatchItem("a", PASSAGE, 3), BatchItem("b", PASSAGE, 4)]
+
+        first = await _run(items, cache)
+        second = await _run(items, cache)
+
+        assert first.counts == {"cached": 0, "succeeded": 2, "failed": 0}
+        assert second.counts == {"cached": 2, "succeeded": 0, "failed": 0}
+        cached = cache.get(analysis_key(PASSAGE, 3))
+        assert cached.as_dict()["reading"] == "reading text"
+        assert cached.vocabulary_words == [{"word": "fox", "content": "c"}]
+
+    async def test_failed_sections_are_reported_and_not_cached(self):
+        cache = AnalysisCache(":memory:")
+        failing = _agent("grammar", {"grammar_result": None, "grammar_error": "rate limited"})
+
+        report = await _run([BatchItem("a", PASSAGE, 3)], cache, grammar=failing)
+
+        assert report.counts["failed"] == 1
+        assert report.failures == [{"id": "a", "error": "grammar: rate limited"}]
+        assert not cache.contains(analysis_key(PASSAGE, 3))
+        assert report.as_dict()["passages_per_minute"] > 0
+
+    async def test_agent_exception_fails_passage(self):
+        async def broken(state, token_queue=None):
+            raise RuntimeError("boom")
+
+        report = await _run([BatchItem("a", PASSAGE, 3)], AnalysisCache(":memory:"), reading=broken)
+
+        assert report.failures == [{"id": "a", "error": "reading: boom"}]
+
+
+class TestCli:
+    """Test cases for the tutor-pregenerate CLI."""
+
+    def test_pregenerates_into_cache_and_writes_report(self, tmp_path, capsys):
+        from tutor.cli import main
+
+        passages = tmp_path / "workbook.jsonl"
+        passages.write_text(json.dumps({"id": "p1", "text": PASSAGE, "level": 3}) + "\n")
+        cache_path = tmp_path / "analysis.sqlite3"
+        report_path = tmp_path / "report.json"
+
+        patches = _patch_agents()
+        with patches[0], patches[1], patches[2], patches[3]:
+            status = main([str(passages), "--cache", str(cache_path), "--report", str(report_path)])
+
+        assert status == 0
+        assert "[1/1] p1: succeeded" in capsys.readouterr().out
+        assert json.loads(report_path.read_text())["succeeded"] == 1
+        assert AnalysisCache(cache_path).contains(analysis_key(PASSAGE, 3))
+
+    def test_invalid_input_exits_with_2(self, tmp_path):
+        from tutor.cli import main
+
+        passages = tmp_path / "workbook.jsonl"
+        passages.write_text("not json\n")
+
+        assert main([str(passages), "--cache", str(tmp_path / "c.sqlite3")]) == 2
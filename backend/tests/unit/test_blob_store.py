@@ -0,0 +1,93 @@
+"""Unit tests for the in-process blob store."""
+
+from __future__ import annotations
+
+import pytest
+
+from tutor.services.blob_store import BlobNotFoundError, BlobStore
+from tutor.services.metrics import metrics
+
+
+class TestBlobStore:
+    """Test cases for BlobStore."""
+
+    def test_put_and_get_share_the_same_object(self):
+        store = BlobStore()
+        data = b"image bytes"
+
+        blob_id = store.put(data)
+
+        assert store.get(blob_id) is data
+        assert len(store) == 1
+        assert store.total_bytes == len(data)
+
+    def test_release_frees_blob(self):
+        store = BlobStore()
+        blob_id = store.put(b"abc")
+
+        assert store.release(blob_id) is True
+        assert len(store) == 0
+        assert store.total_bytes == 0
+        with pytest.raises(BlobNotFoundError):
+            store.get(blob_id)
+
+    def test_retain_keeps_blob_until_last_release(self):
+        store = BlobStore()
+        blob_id = store.put(b"abc")
+        store.retain(blob_id)
+
+        assert store.release(blob_id) is False
+        assert store.get(blob_id) == b"abc"
+        assert store.release(blob_id) is True
+
+    def test_release_unknown_id_is_noop(self):
+        store = BlobStore()
+
+        assert store.release("missing") is False
+        with pytest.raises(BlobNotFoundError):
+            store.retain("missing")
+
+    def test_sweep_frees_expired_blobs(self, monkeypatch: pytest.MonkeyPatch):
+        import tutor.services.blob_store as blob_store_module
+
+        now = [1000.0]
+        monkeypatch.setattr(blob_store_module.time, "monotonic", lambda: now[0])
+        store = BlobStore(ttl_seconds=10)
+        leaked = store.put(b"leaked")
+
+        now[0] += 11
+        fresh = store.put(b"fresh")  # put sweeps expired blobs
+
+        assert len(store) == 1
+        assert store.get(fresh) == b"fresh"
+        with pytest.raises(BlobNotFoundError):
+            store.get(leaked)
+
+    def test_sweep_keeps_blobs_retained_by_another_holder(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        import tutor.services.blob_store as blob_store_module
+
+        now = [1000.0]
+        monkeypatch.setattr(blob_store_module.time, "monotonic", lambda: now[0])
+        store = BlobStore(ttl_seconds=10)
+        queued = store.put(b"queued job image")
+        store.retain(queued)  # held by a job waiting for a slot
+
+        now[0] += 1000
+        assert store.sweep() == 0
+        assert store.get(queued) == b"queued job image"
+
+        store.release(queued)  # the pipeline ran and let go; only the job holds it now
+        store.release(queued)
+        assert len(store) == 0
+
+    def test_records_gauges(self):
+        store = BlobStore()
+        blob_id = store.put(b"12345")
+
+        assert metrics.get("blob_store_bytes") == 5
+        assert metrics.get("blob_store_blobs") == 1
+
+        store.release(blob_id)
+        assert metrics.get("blob_store_bytes") == 0
@@ -121,6 +121,18 @@ class TestSettingsDefaultValues:
         # Assert
         assert settings.GLM_API_KEY is None
 
+    def test_rate_limiting_is_opt_in(self, clean_env: None) -> None:
+        """Rate limiting is off by default: behind the frontend proxy all users share one IP."""
+        # Arrange
+        os.environ["OPENAI_API_KEY"] = "test-openai-key"
+
+        # Act
+        settings = Settings()
+
+        # Assert
+        assert settings.RATE_LIMIT_ENABLED is False
+        assert settings.RATE_LIMIT_TRUST_FORWARDED is False
+
 
 class TestSettingsRequiredFields:
     """Tests for required field validation in Settings."""
@@ -0,0 +1,83 @@
+"""Unit tests for the CPU offload executor."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from tutor.agents.vocabulary import _build_vocabulary_result
+from tutor.config import get_settings
+from tutor.services import executor
+from tutor.services.executor import get_cpu_executor, run_cpu, shutdown_cpu_executor
+from tutor.services.metrics import metrics
+
+
+def _thread_name(_: str) -> str:
+    return threading.current_thread().name
+
+
+class TestRunCpu:
+    """Test cases for run_cpu."""
+
+    async def test_small_unmeasured_input_runs_inline(self):
+        metrics.reset()
+
+        name = await run_cpu(_thread_name, "x", size=10)
+
+        assert name == threading.current_thread().name
+        assert metrics.get("cpu_jobs_total", kind="_thread_name", mode="inline") == 1
+
+    async def test_large_unmeasured_input_is_offloaded(self):
+        metrics.reset()
+
+        name = await run_cpu(_thread_name, "x", size=1_000_000)
+
+        assert name.startswith("cpu")
+        assert metrics.get("cpu_jobs_total", kind="_thread_name", mode="offloaded") == 1
+
+    async def test_learned_cost_decides_placement(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "CPU_INLINE_MAX_MS", 2.0)
+        # 1 microsecond per unit: 1000 units = 1 ms (inline), 10000 units = 10 ms (offloaded)
+        executor._cost_per_unit["job"] = 1e-6
+
+        inline = await run_cpu(_thread_name, "x", size=1_000, kind="job")
+        offloaded = await run_cpu(_thread_name, "x", size=10_000, kind="job")
+
+        assert inline == threading.current_thread().name
+        assert offloaded.startswith("cpu")
+
+    async def test_cost_is_learned_per_kind(self):
+        await run_cpu(_thread_name, "x", size=100, kind="learned")
+
+        assert executor._cost_per_unit["learned"] > 0
+        assert "other" not in executor._cost_per_unit
+
+    async def test_exceptions_propagate_from_pool(self):
+        with pytest.raises(ValueError, match="bad"):
+            await run_cpu(int, "bad", size=1_000_000)
+
+    async def test_process_pool_runs_module_level_functions(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "CPU_EXECUTOR", "process")
+        monkeypatch.setattr(get_settings(), "CPU_EXECUTOR_WORKERS", 1)
+        text = "## apple\n\nA round fruit.\n\n---\n\n## run\n\nTo move fast."
+
+        result = await run_cpu(_build_vocabulary_result, text, size=1_000_000)
+
+        assert isinstance(get_cpu_executor(), ProcessPoolExecutor)
+        assert [w.word for w in result.words] == ["apple", "run"]
+
+
+class TestGetCpuExecutor:
+    """Test cases for the executor singleton."""
+
+    def test_thread_pool_by_default(self):
+        assert isinstance(get_cpu_executor(), ThreadPoolExecutor)
+        assert get_cpu_executor() is get_cpu_executor()
+
+    def test_shutdown_recreates_on_next_use(self):
+        first = get_cpu_executor()
+        shutdown_cpu_executor()
+
+        assert get_cpu_executor() is not first
@@ -469,3 +469,46 @@ class TestGraphEdges:
         # We verify the route function works correctly in RouteByTask tests
         graph = create_graph()
         assert graph is not None
+
+
+class TestLazyGraph:
+    """Test suite for deferred graph compilation and lazy imports."""
+
+    def test_get_graph_compiles_once(self) -> None:
+        """
+        Given: The graph module
+        When: get_graph is called twice and the legacy ``graph`` attribute is read
+        Then: The same compiled graph is returned each time
+        """
+        import tutor.graph
+        from tutor.graph import get_graph
+
+        assert get_graph() is get_graph()
+        assert tutor.graph.graph is get_graph()
+
+    def test_importing_app_skips_llm_stack(self) -> None:
+        """
+        Given: A fresh interpreter
+        When: tutor.main is imported
+        Then: LangGraph and langchain-openai are not imported yet
+        """
+        import os
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        code = (
+            "import sys, tutor.main; "
+            "print(sorted(m for m in ('langgraph', 'langchain_openai', 'openai') "
+            "if m in sys.modules))"
+        )
+        src = Path(__file__).parents[2] / "src"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONPATH": str(src), "OPENAI_API_KEY": "test"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,132 @@
+"""Unit tests for the asynchronous job manager."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tutor.services.jobs import JobManager, JobQueueFullError
+from tutor.services.metrics import metrics
+from tutor.services.streaming import (
+    format_done_event,
+    format_error_event,
+    format_reading_token,
+)
+
+
+async def _pipeline(*events: str, gate: asyncio.Event | None = None):
+    for event in events:
+        if gate is not None:
+            await gate.wait()
+        yield event
+
+
+async def _wait(job) -> None:
+    await asyncio.wait({job.task})
+
+
+class TestJobManager:
+    """Test cases for JobManager."""
+
+    async def test_job_runs_to_success(self):
+        metrics.reset()
+        manager = JobManager()
+        job = manager.submit(
+            "s1", "analyze", _pipeline(format_reading_token("x"), format_done_event("s1"))
+        )
+        assert job.state == "queued"
+
+        await _wait(job)
+
+        assert job.state == "succeeded"
+        assert job.result.as_dict()["reading"] == "x"
+        assert job.run.finished and job.run.last_seq == 2
+        assert metrics.get("jobs_total", state="succeeded") == 1
+        assert metrics.get("jobs", state="queued") == 0
+        assert metrics.get("jobs", state="running") == 0
+
+    async def test_pipeline_error_fails_job(self):
+        manager = JobManager()
+        job = manager.submit("s1", "analyze", _pipeline(format_error_event("bad", "processing_error")))
+
+        await _wait(job)
+
+        assert job.state == "failed"
+        assert job.error == "bad"
+
+    async def test_concurrency_is_bounded(self):
+        manager = JobManager(max_concurrency=1)
+        gate = asyncio.Event()
+        first = manager.submit("s1", "analyze", _pipeline(format_done_event("s1"), gate=gate))
+        second = manager.submit("s2", "analyze", _pipeline(format_done_event("s2"), gate=gate))
+        await asyncio.sleep(0.01)
+
+        assert (first.state, second.state) == ("running", "queued")
+
+        gate.set()
+        await _wait(second)
+        assert (first.state, second.state) == ("succeeded", "succeeded")
+
+    async def test_cancel_running_job(self):
+        manager = JobManager()
+        job = manager.submit("s1", "analyze", _pipeline(format_done_event("s1"), gate=asyncio.Event()))
+        await asyncio.sleep(0.01)
+
+        await manager.cancel(job.id)
+
+        assert job.state == "cancelled"
+        assert job.run.finished
+
+    async def test_cancel_queued_job_runs_cleanup(self):
+        manager = JobManager(max_concurrency=1)
+        released = []
+        manager.submit("s1", "analyze", _pipeline(format_done_event("s1"), gate=asyncio.Event()))
+        queued = manager.submit(
+            "s2", "image", _pipeline(format_done_event("s2")), cleanup=lambda: released.append(1)
+        )
+        await asyncio.sleep(0.01)
+
+        await manager.cancel(queued.id)
+
+        assert queued.state == "cancelled"
+        assert released == [1]
+        await manager.close()
+
+    async def test_cleanup_runs_when_a_job_finishes(self):
+        manager = JobManager()
+        released = []
+        job = manager.submit(
+            "s1", "image", _pipeline(format_done_event("s1")), cleanup=lambda: released.append(1)
+        )
+        await _wait(job)
+
+        assert job.state == "succeeded"
+        assert released == [1]
+
+    async def test_rejects_submissions_while_the_queue_is_full(self):
+        metrics.reset()
+        manager = JobManager(max_concurrency=1, max_queued=1)
+        gate = asyncio.Event()
+        manager.submit("s1", "analyze", _pipeline(format_done_event("s1"), gate=gate))
+        await asyncio.sleep(0.01)
+        queued = manager.submit("s2", "analyze", _pipeline(format_done_event("s2")))
+
+        assert manager.full
+        with pytest.raises(JobQueueFullError):
+            manager.submit("s3", "analyze", _pipeline(format_done_event("s3")))
+        assert metrics.get("jobs_rejected_total") == 1
+
+        gate.set()
+        await _wait(queued)
+        assert not manager.full
+        await _wait(manager.submit("s4", "analyze", _pipeline(format_done_event("s4"))))
+        await manager.close()
+
+    async def test_finished_jobs_expire(self):
+        manager = JobManager(ttl_seconds=0)
+        job = manager.submit("s1", "analyze", _pipeline(format_done_event("s1")))
+        await _wait(job)
+        await asyncio.sleep(0.01)
+
+        assert manager.get(job.id) is None
@@ -91,6 +91,15 @@ class TestGetLLM:
         assert isinstance(result, ChatOpenAI)
         assert result.max_retries == 2
 
+    def test_chatopenai_streams_usage(self) -> None:
+        """Test that OpenAI clients report token usage (incl. cached tokens) when streaming."""
+        mock_settings = _make_mock_settings()
+        with patch("tutor.models.llm.get_settings", return_value=mock_settings):
+            result = get_llm("gpt-4o-mini")
+
+        assert isinstance(result, ChatOpenAI)
+        assert result.stream_usage is True
+
     def test_glm_returns_chatmodel(self) -> None:
         """Test that GLM models return ChatOpenAI instance (R4)."""
         mock_settings = _make_mock_settings(glm_key="test-glm-key")
@@ -0,0 +1,85 @@
+"""Unit tests for the event-loop lag monitor and blocking-call detector."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from tutor.services.loop_monitor import LoopMonitor
+from tutor.services.metrics import metrics
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _run_monitor(monitor: LoopMonitor, during) -> None:  # noqa: ANN001
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    try:
+        await during()
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestLoopMonitor:
+    """Test cases for LoopMonitor."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    async def test_samples_lag(self):
+        monitor = LoopMonitor(interval=0.01)
+
+        async def block():
+            _block_the_loop(0.1)
+            await asyncio.sleep(0.05)
+
+        await _run_monitor(monitor, block)
+
+        lag = metrics.snapshot()["summaries"]["event_loop_lag_seconds"]
+        assert lag["count"] >= 2
+        assert lag["max"] >= 0.05
+        assert monitor.recent_stalls() == []
+
+    def test_lag_p90_ignores_a_single_spike(self):
+        monitor = LoopMonitor(lag_window=10)
+
+        monitor._record_lag(1.0)
+        assert monitor.lag_p90_seconds == 0.0
+
+        monitor._record_lag(0.5)
+        assert monitor.lag_p90_seconds == 0.5
+
+        for _ in range(10):
+            monitor._record_lag(0.01)
+        assert monitor.lag_p90_seconds == 0.01
+
+    async def test_detector_reports_blocking_call_with_stack(self):
+        monitor = LoopMonitor(interval=0.05, block_threshold=0.05)
+
+        async def block():
+            _block_the_loop(0.3)
+            await asyncio.sleep(0.05)
+
+        await _run_monitor(monitor, block)
+
+        stalls = monitor.recent_stalls()
+        assert len(stalls) == 1
+        assert stalls[0]["duration_ms"] >= 200
+        assert "_block_the_loop" in stalls[0]["samples"][0]
+        assert "test_detector_reports_blocking_call_with_stack" in stalls[0]["task"]
+        assert metrics.get("event_loop_stalls_total") == 1
+
+    async def test_short_pauses_are_not_stalls(self):
+        monitor = LoopMonitor(interval=0.05, block_threshold=0.2)
+
+        async def block():
+            for _ in range(3):
+                _block_the_loop(0.02)
+                await asyncio.sleep(0.02)
+
+        await _run_monitor(monitor, block)
+
+        assert monitor.recent_stalls() == []
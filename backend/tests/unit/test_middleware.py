@@ -0,0 +1,125 @@
+"""Unit tests for the SSE compression middleware."""
+
+from __future__ import annotations
+
+import zlib
+
+import pytest
+from starlette.responses import JSONResponse, StreamingResponse
+
+from tutor.middleware import AdmissionMiddleware, SSECompressionMiddleware, accepts_gzip
+from tutor.services.metrics import metrics
+from tutor.services.streaming import sse_encoder
+
+FRAMES = [sse_encoder.token("reading", f"### 문장 {i}\n\n해석 ") for i in range(1, 30)]
+
+
+async def _frames():
+    for frame in FRAMES:
+        yield frame
+
+
+def _sse_app(scope, receive, send):
+    return StreamingResponse(_frames(), media_type="text/event-stream")(scope, receive, send)
+
+
+async def _call(app, accept_encoding: str | None) -> list[dict]:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+    return await _run(SSECompressionMiddleware(app, level=6), scope)
+
+
+async def _run(app, scope: dict) -> list[dict]:
+    messages: list[dict] = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+class TestAcceptsGzip:
+    """Test cases for accepts_gzip."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, GZIP;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("deflate, br", False),
+        ("identity", False),
+        (None, False),
+    ])
+    def test_negotiation(self, header, expected):
+        assert accepts_gzip(header) is expected
+
+
+class TestSSECompressionMiddleware:
+    """Test cases for SSECompressionMiddleware."""
+
+    async def test_every_frame_is_decodable_when_it_arrives(self):
+        metrics.reset()
+        messages = await _call(_sse_app, "gzip")
+
+        headers = dict(messages[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert headers[b"vary"] == b"Accept-Encoding"
+
+        bodies = [m for m in messages if m["type"] == "http.response.body"]
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        decoded = [decoder.decompress(m["body"]) for m in bodies]
+        assert decoded[: len(FRAMES)] == FRAMES  # no frame waits for the next one
+        assert b"".join(decoded) == b"".join(FRAMES) and decoder.eof
+
+        raw = sum(len(f) for f in FRAMES)
+        sent = sum(len(m["body"]) for m in bodies)
+        assert sent < raw / 2
+        assert metrics.get("sse_compression_input_bytes_total") == raw
+        assert metrics.get("sse_compression_saved_bytes_total") == raw - sent
+
+    async def test_clients_without_gzip_get_identity(self):
+        messages = await _call(_sse_app, "identity")
+
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+        body = b"".join(m.get("body", b"") for m in messages[1:])
+        assert body == b"".join(FRAMES)
+
+    async def test_other_responses_are_untouched(self):
+        messages = await _call(JSONResponse({"status": "ok"}), "gzip")
+
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+        assert messages[1]["body"] == b'{"status":"ok"}'
+
+
+class TestAdmissionMiddleware:
+    """Test cases for AdmissionMiddleware."""
+
+    @pytest.fixture
+    def overloaded(self, monkeypatch):
+        monkeypatch.setenv("ADMISSION_MAX_STREAMS", "2")
+        metrics.reset()
+        metrics.set_gauge("sse_streams_in_flight", 3)
+        yield
+        metrics.reset()
+
+    async def test_sheds_analyses_with_retry_after(self, overloaded):
+        middleware = AdmissionMiddleware(_sse_app, paths=["/api/v1/tutor/analyze"])
+        scope = {"type": "http", "method": "POST", "path": "/api/v1/tutor/analyze", "headers": []}
+
+        messages = await _run(middleware, scope)
+
+        assert messages[0]["status"] == 503
+        assert dict(messages[0]["headers"])[b"retry-after"] == b"8"  # 5 s x 1.5 overload
+        assert metrics.get("admission_requests_total", decision="shed") == 1
+
+    async def test_other_requests_pass(self, overloaded):
+        middleware = AdmissionMiddleware(_sse_app, paths=["/api/v1/tutor/analyze"])
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/health", "headers": []}
+
+        messages = await _run(middleware, scope)
+
+        assert messages[0]["status"] == 200
@@ -0,0 +1,250 @@
+"""Unit tests for latency-aware model routing with failover."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from langchain_openai import ChatOpenAI
+
+from tutor.models.llm import get_llm
+from tutor.models.router import (
+    BackendUnavailableError,
+    ModelRouter,
+    RoutedChatModel,
+    parse_model_fallbacks,
+    served_model,
+)
+from tutor.services.metrics import metrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBackend:
+    """A local chat model with scripted latency and failures."""
+
+    def __init__(
+        self,
+        clock: FakeClock,
+        name: str,
+        ttft: float = 1.0,
+        token_seconds: float = 0.01,
+        fail: bool = False,
+        fail_after: int | None = None,
+    ) -> None:
+        self.clock = clock
+        self.name = name
+        self.ttft = ttft
+        self.token_seconds = token_seconds
+        self.fail = fail
+        self.fail_after = fail_after
+        self.calls = 0
+
+    async def astream(self, messages):
+        self.calls += 1
+        self.clock.now += self.ttft
+        if self.fail:
+            raise ConnectionError(f"{self.name} unreachable")
+        for i in range(10):
+            if i == self.fail_after:
+                raise ConnectionError(f"{self.name} dropped")
+            if i:
+                self.clock.now += self.token_seconds
+            yield SimpleNamespace(content=f"{self.name}-{i}", usage_metadata=None)
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        self.clock.now += self.ttft
+        if self.fail:
+            raise ConnectionError(f"{self.name} unreachable")
+        return SimpleNamespace(content=self.name)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def _router(clock: FakeClock, backends: dict[str, FakeBackend], **kwargs) -> ModelRouter:
+    fallbacks = {"reading": [name for name in backends if name != "primary"]}
+    return ModelRouter(
+        lambda model, max_tokens, timeout: backends[model], fallbacks, clock=clock, **kwargs
+    )
+
+
+async def _stream(router: ModelRouter) -> tuple[list[str], str | None]:
+    llm = router.llm("reading", "primary", max_tokens=1024)
+    tokens = [chunk.content async for chunk in llm.astream("passage")]
+    return tokens, llm.served_model
+
+
+class TestParseModelFallbacks:
+    """Test cases for parse_model_fallbacks."""
+
+    def test_parses_entries(self):
+        assert parse_model_fallbacks(" reading=glm-4-flash, grammar=gpt-4o | glm-4-flash,") == {
+            "reading": ["glm-4-flash"],
+            "grammar": ["gpt-4o", "glm-4-flash"],
+        }
+
+    @pytest.mark.parametrize("spec", ["reading", "reading=", "=gpt-4o", "reading=|"])
+    def test_rejects_malformed_entries(self, spec):
+        with pytest.raises(ValueError, match="role=model"):
+            parse_model_fallbacks(spec)
+
+
+class TestModelRouter:
+    """Test cases for ModelRouter and RoutedChatModel."""
+
+    async def test_routes_to_the_fastest_backend(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", ttft=2.0),
+            "fast": FakeBackend(clock, "fast", ttft=0.3),
+        }
+        router = _router(clock, backends)
+
+        served = [(await _stream(router))[1] for _ in range(5)]
+
+        # Each backend is measured once, then the faster one serves
+        assert served == ["primary", "fast", "fast", "fast", "fast"]
+        assert metrics.get("llm_backend_switches_total", role="reading", backend="fast") == 1
+        stats = router.backend("reading", "fast")
+        assert stats.ttft == pytest.approx(0.3)
+        assert stats.throughput == pytest.approx(100.0)  # 9 tokens in 0.09 s
+
+    async def test_throughput_counts_against_ttft(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", ttft=0.5, token_seconds=0.5),
+            "steady": FakeBackend(clock, "steady", ttft=1.0, token_seconds=0.01),
+        }
+        router = _router(clock, backends)
+
+        for _ in range(2):
+            await _stream(router)
+
+        assert (await _stream(router))[1] == "steady"
+
+    async def test_fails_over_before_the_first_token(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", fail=True),
+            "backup": FakeBackend(clock, "backup"),
+        }
+        router = _router(clock, backends)
+
+        tokens, served = await _stream(router)
+
+        assert served == "backup"
+        assert tokens == [f"backup-{i}" for i in range(10)]
+        assert metrics.get("llm_backend_failovers_total", role="reading", backend="primary") == 1
+        assert metrics.get(
+            "llm_backend_requests_total", role="reading", backend="primary", result="error"
+        ) == 1
+
+    async def test_mid_stream_failure_is_not_retried(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", fail_after=3),
+            "backup": FakeBackend(clock, "backup"),
+        }
+        router = _router(clock, backends)
+        llm = router.llm("reading", "primary")
+        tokens = []
+
+        with pytest.raises(ConnectionError, match="dropped"):
+            async for chunk in llm.astream("passage"):
+                tokens.append(chunk.content)
+
+        assert tokens == ["primary-0", "primary-1", "primary-2"]
+        assert backends["backup"].calls == 0
+
+    async def test_circuit_opens_and_recovers_after_cooldown(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", ttft=0.1, fail=True),
+            "backup": FakeBackend(clock, "backup", ttft=5.0),
+        }
+        router = _router(clock, backends, failure_threshold=2, cooldown_seconds=30)
+
+        for _ in range(4):
+            assert (await _stream(router))[1] == "backup"
+
+        assert backends["primary"].calls == 2
+        assert router.backend("reading", "primary").state == "open"
+        assert metrics.get("llm_backend_circuit_open", role="reading", backend="primary") == 1
+
+        backends["primary"].fail = False
+        clock.now += 30
+        assert (await _stream(router))[1] == "primary"  # the probe succeeds
+
+        assert router.backend("reading", "primary").state == "closed"
+        assert metrics.get("llm_backend_circuit_open", role="reading", backend="primary") == 0
+
+    async def test_failed_probe_reopens_the_circuit(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", fail=True),
+            "backup": FakeBackend(clock, "backup"),
+        }
+        router = _router(clock, backends, failure_threshold=1, cooldown_seconds=30)
+
+        await _stream(router)
+        clock.now += 30
+        assert (await _stream(router))[1] == "backup"
+        await _stream(router)
+
+        assert backends["primary"].calls == 2
+        assert router.backend("reading", "primary").state == "open"
+
+    async def test_raises_when_every_circuit_is_open(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", fail=True),
+            "backup": FakeBackend(clock, "backup", fail=True),
+        }
+        router = _router(clock, backends, failure_threshold=1)
+
+        with pytest.raises(ConnectionError, match="backup unreachable"):
+            await _stream(router)
+        with pytest.raises(BackendUnavailableError, match="reading"):
+            await _stream(router)
+
+    async def test_ainvoke_fails_over(self, clock):
+        backends = {
+            "primary": FakeBackend(clock, "primary", fail=True),
+            "backup": FakeBackend(clock, "backup"),
+        }
+        llm = _router(clock, backends).llm("reading", "primary")
+
+        response = await llm.ainvoke("prompt")
+
+        assert response.content == "backup"
+        assert served_model(llm, "primary") == "backup"
+
+
+class TestGetLlmRouting:
+    """Test cases for get_llm with agent roles."""
+
+    def test_routes_only_roles_with_fallbacks(self, monkeypatch):
+        monkeypatch.setenv("MODEL_FALLBACKS", "reading=gpt-4o")
+
+        assert isinstance(get_llm("gpt-4o-mini", role="reading"), RoutedChatModel)
+        assert isinstance(get_llm("gpt-4o-mini", role="grammar"), ChatOpenAI)
+        assert isinstance(get_llm("gpt-4o-mini"), ChatOpenAI)
+
+    def test_routing_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("MODEL_FALLBACKS", "reading=gpt-4o")
+        monkeypatch.setenv("MODEL_ROUTING_ENABLED", "false")
+
+        llm = get_llm("gpt-4o-mini", role="reading")
+
+        assert isinstance(llm, ChatOpenAI)
+        assert served_model(llm, "gpt-4o-mini") == "gpt-4o-mini"
@@ -0,0 +1,179 @@
+"""Unit tests for the WebSocket session multiplexer."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from tutor.services.metrics import metrics
+from tutor.services.multiplex import OperationRejectedError, SessionMultiplexer, tag_frame
+from tutor.services.streaming import SSE_HEARTBEAT_FRAME, sse_encoder
+
+
+async def _tokens(section: str, count: int, stopped: list | None = None):
+    try:
+        for i in range(count):
+            yield sse_encoder.token(section, f"{section}-{i}")
+            await asyncio.sleep(0)
+        yield sse_encoder.done("s1")
+    finally:
+        if stopped is not None:
+            stopped.append(section)
+
+
+async def _settle(condition, ticks: int = 200) -> None:
+    for _ in range(ticks):
+        if condition():
+            return
+        await asyncio.sleep(0)
+
+
+class TestTagFrame:
+    """Test cases for tag_frame."""
+
+    def test_wraps_event_and_data_with_operation_id(self):
+        message = tag_frame("a1", sse_encoder.token("reading", "문장 \"1\""))
+
+        assert json.loads(message) == {
+            "id": "a1",
+            "event": "reading_token",
+            "data": {"token": "문장 \"1\""},
+        }
+
+    def test_connection_errors_have_null_id(self):
+        message = json.loads(tag_frame(None, sse_encoder.error("bad", "invalid_message")))
+
+        assert message == {
+            "id": None,
+            "event": "error",
+            "data": {"message": "bad", "code": "invalid_message"},
+        }
+
+
+class TestSessionMultiplexer:
+    """Test cases for SessionMultiplexer."""
+
+    async def test_interleaves_concurrent_operations(self):
+        sent: list[dict] = []
+
+        async def send(text: str) -> None:
+            sent.append(json.loads(text))
+
+        async with SessionMultiplexer(send) as mux:
+            mux.start("a", _tokens("reading", 5))
+            mux.start("b", _tokens("grammar", 5))
+            await _settle(lambda: len(sent) == 12)
+
+        assert [m["event"] for m in sent if m["id"] == "a"] == ["reading_token"] * 5 + ["done"]
+        assert [m["event"] for m in sent if m["id"] == "b"] == ["grammar_token"] * 5 + ["done"]
+        ids = [m["id"] for m in sent]
+        assert ids != sorted(ids)  # interleaved, not one after the other
+        assert mux.active == 0
+
+    async def test_heartbeats_are_dropped(self):
+        sent: list[str] = []
+
+        async def events():
+            yield SSE_HEARTBEAT_FRAME
+            yield sse_encoder.done("s1")
+
+        async def send(text: str) -> None:
+            sent.append(text)
+
+        async with SessionMultiplexer(send) as mux:
+            mux.start("a", events())
+            await _settle(lambda: sent)
+
+        assert [json.loads(m)["event"] for m in sent] == ["done"]
+
+    async def test_slow_client_pauses_operations(self):
+        metrics.reset()
+        release = asyncio.Event()
+        sent: list[str] = []
+        produced = 0
+
+        async def events():
+            nonlocal produced
+            for i in range(20):
+                produced += 1
+                yield sse_encoder.token("reading", str(i))
+
+        async def send(text: str) -> None:
+            await release.wait()
+            sent.append(text)
+
+        async with SessionMultiplexer(send, send_queue_size=2) as mux:
+            mux.start("a", events())
+            await _settle(lambda: False, ticks=50)
+            assert produced <= 4  # queue of 2, one in send, one waiting to be queued
+            assert metrics.get("ws_send_waits_total") >= 1
+
+            release.set()
+            await _settle(lambda: len(sent) == 20)
+
+        assert produced == 20 and len(sent) == 20
+
+    async def test_cancel_stops_the_operation(self):
+        sent: list[dict] = []
+        stopped: list[str] = []
+
+        async def send(text: str) -> None:
+            sent.append(json.loads(text))
+
+        async with SessionMultiplexer(send) as mux:
+            mux.start("a", _tokens("reading", 10_000, stopped))
+            await _settle(lambda: len(sent) >= 3)
+            assert await mux.cancel("a") is True
+            assert await mux.cancel("a") is False
+            await _settle(lambda: sent[-1]["event"] == "error")
+
+        assert stopped == ["reading"]
+        assert sent[-1] == {
+            "id": "a",
+            "event": "error",
+            "data": {"message": "Operation cancelled", "code": "cancelled"},
+        }
+        assert mux.active == 0
+
+    async def test_cleanup_runs_when_cancelled_before_start(self):
+        cleaned: list[str] = []
+
+        async def send(text: str) -> None:
+            pass
+
+        async with SessionMultiplexer(send) as mux:
+            mux.start("a", _tokens("reading", 1), cleanup=lambda: cleaned.append("a"))
+            await mux.cancel("a")
+
+        assert cleaned == ["a"]
+
+    async def test_rejects_duplicate_ids_and_too_many_operations(self):
+        async def send(text: str) -> None:
+            pass
+
+        async with SessionMultiplexer(send, max_operations=2) as mux:
+            mux.start("a", _tokens("reading", 10_000))
+            with pytest.raises(OperationRejectedError) as duplicate:
+                mux.start("a", _tokens("reading", 1))
+            mux.start("b", _tokens("grammar", 10_000))
+            with pytest.raises(OperationRejectedError) as too_many:
+                mux.start("c", _tokens("vocabulary", 1))
+
+        assert duplicate.value.code == "duplicate_id"
+        assert too_many.value.code == "too_many_operations"
+
+    async def test_close_cancels_running_operations(self):
+        stopped: list[str] = []
+
+        async def send(text: str) -> None:
+            pass
+
+        async with SessionMultiplexer(send) as mux:
+            mux.start("a", _tokens("reading", 10_000, stopped))
+            mux.start("b", _tokens("grammar", 10_000, stopped))
+            await _settle(lambda: False, ticks=10)
+
+        assert sorted(stopped) == ["grammar", "reading"]
+        assert mux.active == 0
@@ -0,0 +1,102 @@
+"""Unit tests for the OCR result cache and metrics registry."""
+
+from __future__ import annotations
+
+from tutor.services.metrics import MetricsRegistry, metrics
+from tutor.services.ocr_cache import OcrCache, content_hash, record_lookup
+
+
+class TestContentHash:
+    """Test cases for content_hash."""
+
+    def test_same_content_same_hash(self):
+        assert content_hash("abc") == content_hash(b"abc")
+
+    def test_different_content_different_hash(self):
+        assert content_hash("abc") != content_hash("abd")
+
+    def test_namespace_separates_keys(self):
+        assert content_hash("abc", "gpt-4o-mini:low") != content_hash("abc", "gpt-4o-mini:high")
+
+
+class TestOcrCache:
+    """Test cases for OcrCache."""
+
+    def test_hit(self):
+        cache = OcrCache()
+        cache.store("k1", "page one")
+
+        assert cache.lookup("k1") == "page one"
+
+    def test_miss(self):
+        cache = OcrCache()
+        cache.store("k1", "page one")
+
+        assert cache.lookup("k2") is None
+
+    def test_restore_replaces_text(self):
+        cache = OcrCache()
+        cache.store("a", "A")
+        cache.store("a", "A2")
+
+        assert len(cache) == 1
+        assert cache.lookup("a") == "A2"
+
+    def test_lru_eviction(self):
+        cache = OcrCache(max_entries=2)
+        cache.store("a", "A")
+        cache.store("b", "B")
+        cache.lookup("a")  # refresh "a"
+        cache.store("c", "C")
+
+        assert len(cache) == 2
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") == "A"
+        assert cache.lookup("c") == "C"
+
+
+class TestCacheMetrics:
+    """Test cases for cache metric helpers."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_record_lookup_counts_results(self):
+        cache = OcrCache()
+        cache.store("k", "text")
+
+        record_lookup(cache.lookup("k") is not None, cache)
+        record_lookup(cache.lookup("other") is not None, cache)
+        record_lookup(False, cache)
+
+        assert metrics.get("ocr_cache_lookups_total", result="hit") == 1
+        assert metrics.get("ocr_cache_lookups_total", result="miss") == 2
+        assert metrics.get("ocr_cache_entries") == 1
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+
+    def test_counters_and_gauges(self):
+        registry = MetricsRegistry()
+        registry.inc("requests", kind="a")
+        registry.inc("requests", 2, kind="a")
+        registry.set_gauge("entries", 5)
+        registry.add_gauge("entries", -2)
+
+        assert registry.get("requests", kind="a") == 3
+        assert registry.get("requests", kind="b") == 0
+        assert registry.get("entries") == 3
+
+    def test_summary_percentiles(self):
+        registry = MetricsRegistry()
+        for value in range(1, 101):
+            registry.observe("latency", value)
+
+        summary = registry.snapshot()["summaries"]["latency"]
+
+        assert summary["count"] == 100
+        assert summary["mean"] == 50.5
+        assert summary["max"] == 100
+        assert summary["p50"] == 51
+        assert summary["p99"] == 100
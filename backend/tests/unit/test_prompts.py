@@ -7,7 +7,16 @@ Tests follow the RED-GREEN-REFACTOR TDD cycle.
 import pytest
 import yaml
 
-from tutor.prompts import get_level_instructions, load_prompt, render_prompt
+from tutor.prompts import (
+    AGENT_PROMPT_VARIABLES,
+    PromptRegistry,
+    PromptTemplate,
+    PromptTemplateError,
+    get_level_instructions,
+    get_prompt_registry,
+    load_prompt,
+    render_prompt,
+)
 
 
 class TestLoadPrompt:
@@ -137,3 +146,115 @@ class TestGetLevelInstructions:
         for level in range(1, 6):
             result = get_level_instructions(level)
             assert result == f"Level {level} instructions"
+
+
+class TestPromptTemplate:
+    """Test cases for PromptTemplate parsing and rendering."""
+
+    def test_parse_collects_fields(self):
+        template = PromptTemplate.parse("t.md", "Hi {name}, {{literal}} level {level}")
+
+        assert template.fields == {"name", "level"}
+        assert template.render(name="A", level=2, extra="ignored") == "Hi A, {literal} level 2"
+
+    @pytest.mark.parametrize("source", ["{0}", "{}", "{a.b}", "{a[0]}", "unclosed {", "{a:{b}}"])
+    def test_parse_rejects_bad_placeholders(self, source):
+        with pytest.raises(PromptTemplateError):
+            PromptTemplate.parse("bad.md", source)
+
+    def test_content_hash_tracks_source(self):
+        first = PromptTemplate.parse("t.md", "Hello {name}")
+
+        assert first.content_hash == PromptTemplate.parse("t.md", "Hello {name}").content_hash
+        assert first.content_hash != PromptTemplate.parse("t.md", "Hi {name}").content_hash
+
+    def test_render_missing_variable_names_it(self):
+        template = PromptTemplate.parse("t.md", "{text} {level}")
+
+        with pytest.raises(KeyError, match="level"):
+            template.render(text="x")
+
+
+class TestPromptRegistry:
+    """Test cases for PromptRegistry."""
+
+    @pytest.fixture
+    def prompts_dir(self, tmp_path):
+        directory = tmp_path / "prompts"
+        directory.mkdir()
+        (directory / "a.md").write_text("A {text}")
+        (directory / "raw.md").write_text('Reference JSON: {"key": 1}')
+        return directory
+
+    def test_renders_from_memory(self, prompts_dir, monkeypatch):
+        registry = PromptRegistry(prompts_dir)
+        registry.load_all()
+
+        def no_disk(*args, **kwargs):
+            raise AssertionError("render must not touch the disk")
+
+        monkeypatch.setattr("pathlib.Path.read_text", no_disk)
+        monkeypatch.setattr("pathlib.Path.exists", no_disk)
+
+        assert registry.render("a.md", text="x") == "A x"
+
+    def test_unparsable_file_only_fails_when_rendered_or_validated(self, prompts_dir):
+        registry = PromptRegistry(prompts_dir)
+        registry.load_all()
+
+        with pytest.raises(PromptTemplateError):
+            registry.render("raw.md")
+        with pytest.raises(PromptTemplateError):
+            registry.validate({"raw.md": frozenset()})
+
+    def test_validate_rejects_unknown_placeholders(self, prompts_dir):
+        registry = PromptRegistry(prompts_dir)
+        registry.load_all()
+
+        registry.validate({"a.md": frozenset({"text", "level"})})
+        with pytest.raises(PromptTemplateError, match="unknown placeholders"):
+            registry.validate({"a.md": frozenset({"level"})})
+        with pytest.raises(FileNotFoundError):
+            registry.validate({"missing.md": frozenset()})
+
+    def test_reload_changed_picks_up_edits_and_new_files(self, prompts_dir):
+        import os
+
+        registry = PromptRegistry(prompts_dir)
+        registry.load_all()
+        old_hash = registry.content_hash("a.md")
+
+        path = prompts_dir / "a.md"
+        path.write_text("B {text}")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+        (prompts_dir / "new.md").write_text("new")
+
+        assert sorted(registry.reload_changed()) == ["a.md", "new.md"]
+        assert registry.render("a.md", text="x") == "B x"
+        assert registry.content_hash("a.md") != old_hash
+        assert registry.reload_changed() == []
+
+    def test_reload_keeps_previous_agent_template_on_bad_edit(self, tmp_path):
+        import os
+
+        registry = PromptRegistry(tmp_path)
+        path = tmp_path / "reading.md"
+        path.write_text("Read {text}")
+        registry.load_all()
+
+        path.write_text("Read {text} {unknown_variable}")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+
+        assert registry.reload_changed() == []
+        assert registry.render("reading.md", text="x") == "Read x"
+
+    def test_global_registry_follows_prompts_dir(self, prompts_dir, monkeypatch):
+        monkeypatch.setattr("tutor.prompts.PROMPTS_DIR", prompts_dir)
+
+        registry = get_prompt_registry()
+
+        assert registry.directory == prompts_dir
+        assert get_prompt_registry() is registry
+
+    def test_packaged_agent_prompts_are_valid(self):
+        get_prompt_registry().validate(AGENT_PROMPT_VARIABLES)
@@ -21,27 +21,47 @@ class TestPromptFiles:
     def test_reading_prompt_exists(self):
         """Test that reading.md can be loaded and has required template variables."""
         result = load_prompt("reading.md")
-        assert "{text}" in result
         assert "{level}" in result
         assert "{level_instructions}" in result
-        assert "{supervisor_context}" in result
+        # The passage goes in a separate user message (passage.md)
+        assert "{text}" not in result
+        assert "{supervisor_context}" not in result
 
     def test_grammar_prompt_exists(self):
         """Test that grammar.md can be loaded and has required template variables."""
         result = load_prompt("grammar.md")
-        assert "{text}" in result
         assert "{level}" in result
         assert "{level_instructions}" in result
-        assert "{supervisor_context}" in result
+        # The passage goes in a separate user message (passage.md)
+        assert "{text}" not in result
+        assert "{supervisor_context}" not in result
 
     def test_vocabulary_prompt_exists(self):
         """Test that vocabulary.md can be loaded and has required template variables."""
         result = load_prompt("vocabulary.md")
-        assert "{text}" in result
         assert "{level}" in result
         assert "{level_instructions}" in result
+        # The passage goes in a separate user message (passage.md)
+        assert "{text}" not in result
+        assert "{supervisor_context}" not in result
+
+    def test_passage_prompt_exists(self):
+        """Test that passage.md carries the variable part of every agent prompt."""
+        result = load_prompt("passage.md")
+        assert "{text}" in result
         assert "{supervisor_context}" in result
 
+    def test_agent_system_prompts_share_prefix_across_levels(self):
+        """Test that level-specific text comes last so the static prefix is cacheable."""
+        for name in ("reading.md", "grammar.md", "vocabulary.md"):
+            rendered = [
+                render_prompt(name, level=level, level_instructions=get_level_instructions(level))
+                for level in (1, 5)
+            ]
+            prefix_length = len(load_prompt(name).split("{level}")[0])
+            assert rendered[0][:prefix_length] == rendered[1][:prefix_length]
+            assert prefix_length > len(rendered[0]) * 0.8
+
     def test_reading_prompt_korean_content(self):
         """Test that reading.md is written in Korean (SPEC-UPDATE-001)."""
         result = load_prompt("reading.md")
@@ -69,53 +89,37 @@ class TestPromptFiles:
     def test_render_reading_prompt(self):
         """Test rendering reading prompt with all required variables (SPEC-UPDATE-001)."""
         level_inst = get_level_instructions(3)
-        result = render_prompt(
-            "reading.md",
-            text="This is a test.",
-            level=3,
-            level_instructions=level_inst,
-            supervisor_context="",
-        )
+        system = render_prompt("reading.md", level=3, level_instructions=level_inst)
+        passage = render_prompt("passage.md", text="This is a test.", supervisor_context="")
+        result = system + passage
+        assert "This is a test." not in system
         assert "This is a test." in result
         assert "3" in result
 
     def test_render_grammar_prompt(self):
         """Test rendering grammar prompt with all required variables."""
         level_inst = get_level_instructions(2)
-        result = render_prompt(
-            "grammar.md",
-            text="The cat sat on the mat.",
-            level=2,
-            level_instructions=level_inst,
-            supervisor_context="",
-        )
+        system = render_prompt("grammar.md", level=2, level_instructions=level_inst)
+        passage = render_prompt("passage.md", text="The cat sat on the mat.", supervisor_context="")
+        result = system + passage
+        assert "The cat sat on the mat." not in system
         assert "The cat sat on the mat." in result
         assert "2" in result
 
     def test_render_vocabulary_prompt(self):
         """Test rendering vocabulary prompt with all required variables."""
         level_inst = get_level_instructions(4)
-        result = render_prompt(
-            "vocabulary.md",
-            text="The ephemeral beauty of cherry blossoms.",
-            level=4,
-            level_instructions=level_inst,
-            supervisor_context="",
-        )
+        system = render_prompt("vocabulary.md", level=4, level_instructions=level_inst)
+        passage = render_prompt("passage.md", text="The ephemeral beauty of cherry blossoms.", supervisor_context="")
+        result = system + passage
+        assert "The ephemeral beauty of cherry blossoms." not in system
         assert "ephemeral" in result
         assert "4" in result
 
     def test_render_reading_prompt_with_supervisor_context(self):
-        """Test rendering reading prompt includes supervisor context when provided."""
-        level_inst = get_level_instructions(3)
+        """Test rendering the passage message includes supervisor context when provided."""
         supervisor_ctx = "\n\n[사전 분석]\n전체 난이도: 3/5\n학습 포커스: reading, grammar"
-        result = render_prompt(
-            "reading.md",
-            text="Hello world.",
-            level=3,
-            level_instructions=level_inst,
-            supervisor_context=supervisor_ctx,
-        )
+        result = render_prompt("passage.md", text="Hello world.", supervisor_context=supervisor_ctx)
         assert "사전 분석" in result
         assert "Hello world." in result
 
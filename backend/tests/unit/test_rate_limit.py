@@ -0,0 +1,142 @@
+"""Unit tests for per-client token-bucket rate limiting."""
+
+from __future__ import annotations
+
+import pytest
+
+from tutor.services.metrics import metrics
+from tutor.services.rate_limit import (
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceededError,
+    SQLiteBucketStore,
+    get_rate_limiter,
+    parse_rate_limits,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    return SQLiteBucketStore(tmp_path / "buckets.sqlite3")
+
+
+class TestParseRateLimits:
+    """Test cases for parse_rate_limits."""
+
+    def test_parses_entries(self):
+        limits = parse_rate_limits(" analyze=300000/3600, chat=100/60,")
+
+        assert limits == {
+            "analyze": RateLimit(300000.0, 3600.0),
+            "chat": RateLimit(100.0, 60.0),
+        }
+        assert limits["chat"].rate == pytest.approx(100 / 60)
+
+    @pytest.mark.parametrize("spec", ["analyze=100", "analyze=0/60", "=100/60", "analyze=x/60"])
+    def test_rejects_malformed_entries(self, spec):
+        with pytest.raises(ValueError, match="endpoint=tokens/seconds"):
+            parse_rate_limits(spec)
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter with both bucket stores."""
+
+    async def test_charges_estimated_tokens_until_empty(self, store, clock):
+        limiter = RateLimiter(store, {"analyze": RateLimit(10_000, 100)}, clock=clock)
+
+        await limiter.charge("analyze", 6000, client_ip="1.2.3.4")
+        await limiter.charge("analyze", 4000, client_ip="1.2.3.4")
+        with pytest.raises(RateLimitExceededError) as exc:
+            await limiter.charge("analyze", 3000, client_ip="1.2.3.4")
+
+        assert exc.value.retry_after == pytest.approx(30.0)  # 100 tokens/s refill
+        await limiter.charge("analyze", 3000, client_ip="5.6.7.8")  # other clients unaffected
+
+        clock.now += 30
+        await limiter.charge("analyze", 3000, client_ip="1.2.3.4")
+
+    async def test_session_and_ip_buckets_are_charged_together(self, store, clock):
+        limiter = RateLimiter(store, {"chat": RateLimit(1000, 100)}, clock=clock)
+
+        await limiter.charge("chat", 800, client_ip="1.1.1.1", session_id="s1")
+        # A fresh IP still cannot overspend the session...
+        with pytest.raises(RateLimitExceededError):
+            await limiter.charge("chat", 800, client_ip="2.2.2.2", session_id="s1")
+        # ...and the refused request took nothing from the fresh IP's bucket
+        await limiter.charge("chat", 1000, client_ip="2.2.2.2", session_id="s2")
+
+    async def test_request_larger_than_bucket_needs_a_full_bucket(self, store, clock):
+        limiter = RateLimiter(store, {"analyze_image": RateLimit(1000, 10)}, clock=clock)
+
+        await limiter.charge("analyze_image", 50_000, client_ip="1.1.1.1")
+        with pytest.raises(RateLimitExceededError) as exc:
+            await limiter.charge("analyze_image", 50_000, client_ip="1.1.1.1")
+
+        assert exc.value.retry_after == pytest.approx(10.0)
+
+    async def test_endpoints_without_limit_and_anonymous_requests_pass(self, store, clock):
+        limiter = RateLimiter(store, {"analyze": RateLimit(1, 60)}, clock=clock)
+
+        for _ in range(3):
+            await limiter.charge("chat", 10**9, client_ip="1.1.1.1")
+            await limiter.charge("analyze", 10**9)
+
+    async def test_metrics(self, store, clock):
+        metrics.reset()
+        limiter = RateLimiter(store, {"analyze": RateLimit(100, 60)}, clock=clock)
+
+        await limiter.charge("analyze", 100, client_ip="1.1.1.1")
+        with pytest.raises(RateLimitExceededError):
+            await limiter.charge("analyze", 100, client_ip="1.1.1.1")
+
+        assert metrics.get("rate_limit_requests_total", endpoint="analyze", result="allowed") == 1
+        assert metrics.get("rate_limit_requests_total", endpoint="analyze", result="limited") == 1
+        assert metrics.get("rate_limit_charged_tokens_total", endpoint="analyze") == 100
+
+
+class TestSQLiteBucketStore:
+    """Test cases for the shared SQLite bucket store."""
+
+    async def test_workers_share_buckets(self, tmp_path, clock):
+        path = tmp_path / "shared.sqlite3"
+        limits = {"analyze": RateLimit(10_000, 3600)}
+        worker_a = RateLimiter(SQLiteBucketStore(path), limits, clock=clock)
+        worker_b = RateLimiter(SQLiteBucketStore(path), limits, clock=clock)
+
+        await worker_a.charge("analyze", 6000, client_ip="1.2.3.4")
+        with pytest.raises(RateLimitExceededError):
+            await worker_b.charge("analyze", 6000, client_ip="1.2.3.4")
+        await worker_b.charge("analyze", 4000, client_ip="1.2.3.4")
+
+
+class TestGetRateLimiter:
+    """Test cases for get_rate_limiter."""
+
+    def test_sqlite_backend(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("RATE_LIMIT_BACKEND", "sqlite")
+        monkeypatch.setenv("RATE_LIMIT_PATH", str(tmp_path / "limits.sqlite3"))
+
+        assert isinstance(get_rate_limiter()._store, SQLiteBucketStore)
+        assert (tmp_path / "limits.sqlite3").exists()
+
+    def test_unknown_backend(self, monkeypatch):
+        monkeypatch.setenv("RATE_LIMIT_BACKEND", "redis")
+
+        with pytest.raises(ValueError, match="RATE_LIMIT_BACKEND"):
+            get_rate_limiter()
@@ -0,0 +1,116 @@
+"""Unit tests for readiness probing."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from tutor.services.metrics import metrics
+from tutor.services.readiness import ReadinessProbe, streams_in_flight
+
+
+def _client(side_effect=None):
+    client = MagicMock()
+    client.models.list = AsyncMock(side_effect=side_effect)
+    return client
+
+
+class TestReadinessProbe:
+    """Test cases for ReadinessProbe."""
+
+    async def test_ready_when_all_checks_pass(self):
+        client = _client()
+        with patch("tutor.services.readiness._llm_clients", return_value=[client]):
+            report = await ReadinessProbe().check()
+
+        assert report["ready"] is True
+        assert set(report["checks"]) == {"prompts", "sessions", "llm"}
+        assert report["checks"]["llm"]["detail"] == "1 connection pools warm"
+        assert report["event_loop_lag_ms"] >= 0
+        client.models.list.assert_awaited_once()
+
+    async def test_llm_failure_makes_instance_not_ready(self):
+        client = _client(side_effect=ConnectionError("refused"))
+        with patch("tutor.services.readiness._llm_clients", return_value=[client]):
+            report = await ReadinessProbe().check()
+
+        assert report["ready"] is False
+        assert report["checks"]["llm"]["ok"] is False
+        assert "refused" in report["checks"]["llm"]["detail"]
+        assert metrics.get("readiness_check_ok", check="llm") == 0.0
+
+    async def test_llm_timeout_makes_instance_not_ready(self):
+        async def hang():
+            await asyncio.sleep(10)
+
+        client = MagicMock()
+        client.models.list = hang
+        with patch("tutor.services.readiness._llm_clients", return_value=[client]):
+            report = await ReadinessProbe(llm_timeout=0.01).check()
+
+        assert report["checks"]["llm"]["detail"].startswith("TimeoutError")
+
+    async def test_results_are_cached(self):
+        client = _client()
+        probe = ReadinessProbe(cache_seconds=60)
+        with patch("tutor.services.readiness._llm_clients", return_value=[client]):
+            await asyncio.gather(probe.check(), probe.check())
+            await probe.check()
+
+        client.models.list.assert_awaited_once()
+
+    async def test_llm_check_can_be_disabled(self, monkeypatch):
+        from tutor.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "READINESS_CHECK_LLM", False)
+
+        report = await ReadinessProbe().check()
+
+        assert report["ready"] is True
+        assert "llm" not in report["checks"]
+
+    async def test_missing_level_instructions_fail_prompts_check(self):
+        client = _client()
+        with patch("tutor.services.readiness._llm_clients", return_value=[client]), \
+             patch("tutor.services.readiness.get_level_instructions",
+                   side_effect=FileNotFoundError("level_instructions.yaml")):
+            report = await ReadinessProbe().check()
+
+        assert report["ready"] is False
+        assert report["checks"]["prompts"]["ok"] is False
+
+
+class TestLlmClients:
+    """Test cases for _llm_clients."""
+
+    def test_one_client_per_pool_including_ocr(self):
+        from tutor.agents.image_processor import create_ocr_llm
+        from tutor.config import get_settings
+        from tutor.services.readiness import _llm_clients
+
+        clients = _llm_clients()
+        pools = {id(client._client) for client in clients}
+
+        # Supervisor (30 s timeout), the other agents (120 s) and OCR (no timeout)
+        assert len(clients) == len(pools) == 3
+        assert id(create_ocr_llm(get_settings()).root_async_client._client) in pools
+
+    def test_fallback_backends_are_warmed(self, monkeypatch):
+        from tutor.services.readiness import _llm_clients
+
+        monkeypatch.setenv("GLM_API_KEY", "glm-test-key")
+        monkeypatch.setenv("MODEL_FALLBACKS", "reading=glm-4-flash")
+
+        base_urls = {str(client.base_url) for client in _llm_clients()}
+
+        assert "https://open.bigmodel.cn/api/paas/v4/" in base_urls
+
+
+class TestStreamsInFlight:
+    """Test cases for streams_in_flight."""
+
+    def test_reads_gauge(self):
+        metrics.reset()
+        metrics.add_gauge("sse_streams_in_flight", 2)
+
+        assert streams_in_flight() == 2
@@ -0,0 +1,153 @@
+"""Unit tests for resumable SSE stream replay."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tutor.services.metrics import metrics
+from tutor.services.replay import (
+    ReplayGoneError,
+    StreamRegistry,
+    StreamRun,
+    parse_last_event_id,
+)
+from tutor.services.streaming import format_sse_event, sse_encoder
+
+
+async def _collect(run: StreamRun, after: int = 0) -> list[str]:
+    return [event.decode() async for event in run.subscribe(after)]
+
+
+async def _events(*names: str, gate: asyncio.Event | None = None):
+    for i, name in enumerate(names):
+        if gate is not None and i == 1:
+            await gate.wait()
+        yield format_sse_event(name, {"i": i})
+
+
+class TestParseLastEventId:
+    """Test cases for parse_last_event_id."""
+
+    def test_parses_session_scoped_id(self):
+        assert parse_last_event_id("abc:7", "abc") == 7
+
+    def test_parses_bare_sequence(self):
+        assert parse_last_event_id("12", "abc") == 12
+
+    def test_rejects_other_session(self):
+        with pytest.raises(ValueError, match="another session"):
+            parse_last_event_id("xyz:3", "abc")
+
+    def test_rejects_malformed_value(self):
+        with pytest.raises(ValueError):
+            parse_last_event_id("abc:x", "abc")
+
+
+class TestStreamRun:
+    """Test cases for StreamRun."""
+
+    async def test_events_get_monotonic_ids(self):
+        run = StreamRun("s1", max_bytes=10_000)
+        run.append(format_sse_event("a", {}))
+        run.append(format_sse_event("b", {}))
+        run.finish()
+
+        events = await _collect(run)
+
+        assert [e.split("\n")[0] for e in events] == ["id: s1:1", "id: s1:2"]
+        assert events[1].endswith("event: b\ndata: {}\n\n")
+
+    async def test_subscribe_resumes_after_last_event_id(self):
+        run = StreamRun("s1", max_bytes=10_000)
+        for name in ("a", "b", "c"):
+            run.append(format_sse_event(name, {}))
+        run.finish()
+
+        events = await _collect(run, after=1)
+
+        assert [e.split("\n")[0] for e in events] == ["id: s1:2", "id: s1:3"]
+
+    async def test_subscriber_follows_live_events(self):
+        run = StreamRun("s1", max_bytes=10_000)
+        reader = asyncio.create_task(_collect(run))
+        await asyncio.sleep(0)
+
+        run.append(format_sse_event("a", {}))
+        await asyncio.sleep(0)
+        run.append(format_sse_event("b", {}))
+        run.finish()
+
+        assert len(await reader) == 2
+
+    async def test_coalesced_subscribe_sends_buffered_events_in_one_chunk(self):
+        run = StreamRun("s1", max_bytes=10_000)
+        for name in ("a", "b", "c"):
+            run.append(sse_encoder.event(name, {}))
+        run.finish()
+
+        chunks = [chunk async for chunk in run.subscribe(1, coalesce=True)]
+
+        assert chunks == [b"id: s1:2\nevent: b\ndata: {}\n\nid: s1:3\nevent: c\ndata: {}\n\n"]
+
+    async def test_buffer_evicts_oldest_events(self):
+        event = format_sse_event("token", {"token": "x" * 50})
+        run = StreamRun("s1", max_bytes=len(event) * 3)
+        for _ in range(10):
+            run.append(event)
+        run.finish()
+
+        with pytest.raises(ReplayGoneError):
+            run.check_available(0)
+        run.check_available(run.last_seq - 2)
+        assert metrics.get("stream_replay_evicted_total") > 0
+
+
+class TestStreamRegistry:
+    """Test cases for StreamRegistry."""
+
+    async def test_run_continues_after_reader_disconnects(self):
+        registry = StreamRegistry()
+        gate = asyncio.Event()
+        run = registry.start("s1", _events("a", "b", "c", gate=gate))
+
+        first = run.subscribe()
+        assert (await anext(first)).startswith(b"id: s1:1\n")
+        await first.aclose()  # client disconnects mid-stream
+
+        gate.set()
+        events = await _collect(run, after=1)
+
+        assert [e.split("\n")[1] for e in events] == ["event: b", "event: c"]
+        assert registry.get("s1") is run
+
+    async def test_heartbeats_are_not_buffered(self):
+        async def stream():
+            yield ": heartbeat\n\n"
+            yield format_sse_event("a", {})
+
+        registry = StreamRegistry()
+        run = registry.start("s1", stream())
+
+        events = await _collect(run)
+
+        assert len(events) == 1 and events[0].startswith("id: s1:1\n")
+
+    async def test_finished_runs_expire(self):
+        registry = StreamRegistry(ttl_seconds=0)
+        run = registry.start("s1", _events("a"))
+        await _collect(run)
+        await asyncio.sleep(0.01)
+
+        assert registry.get("s1") is None
+
+    async def test_close_cancels_running_streams(self):
+        registry = StreamRegistry()
+        run = registry.start("s1", _events("a", "b", gate=asyncio.Event()))
+        await asyncio.sleep(0)
+
+        await registry.close()
+
+        assert run.finished
+        assert run.last_seq == 1
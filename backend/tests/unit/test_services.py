@@ -2,22 +2,30 @@
 
 Tests for:
 - SessionManager: In-memory session management with TTL
-- SSE formatting: Server-Sent Events formatting utilities
+- SSE formatting: Server-Sent Events formatting utilities and the bytes encoder
 - Image validation and preprocessing: Image handling utilities
 """
 
 import base64
+import io
 import json
 from datetime import datetime, timedelta
 
 import pytest
 
 from tutor.services.image import (
+    ImageValidationError,
+    base64_decoded_size,
+    decode_image,
+    preprocess_image_bytes,
     preprocess_image_for_llm,
-    validate_image,
+    vision_target_size,
 )
 from tutor.services.session import SessionManager, session_manager
+from tutor.services import streaming
 from tutor.services.streaming import (
+    SSEEncoder,
+    dumps_json,
     format_done_event,
     format_error_event,
     format_grammar_chunk,
@@ -27,9 +35,17 @@ from tutor.services.streaming import (
     format_sse_event,
     format_vocabulary_chunk,
     format_vocabulary_error,
+    format_reading_token,
+    format_section_done,
     format_vocabulary_token,
+    is_heartbeat,
 )
 
+# Leading magic bytes of each allowed image format
+JPEG_HEADER = b"\xff\xd8\xff\xe0"
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+WEBP_HEADER = b"RIFF\x00\x00\x00\x00WEBP"
+
 
 class TestSessionManager:
     """Test suite for SessionManager class."""
@@ -327,21 +343,64 @@ class TestSSEFormatting:
         assert parsed["code"] == "grammar_error"
 
 
+class TestSSEEncoder:
+    """Test suite for the bytes SSE encoder."""
+
+    @staticmethod
+    def _parse(frame: bytes) -> tuple[str, dict]:
+        header, data = frame.decode().removesuffix("\n\n").split("\n")
+        return header.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+    def test_frames_carry_the_same_events_as_the_formatters(self):
+        """Test that encoded frames parse to the same events as the str formatters."""
+        encoder = SSEEncoder()
+        pairs = [
+            (encoder.token("reading", 'He said "안녕"\n'), format_reading_token('He said "안녕"\n')),
+            (encoder.section_done("grammar"), format_section_done("grammar")),
+            (encoder.section_error("reading", "boom"), format_reading_error("boom")),
+            (encoder.done("s1", usage={"calls": 1}), format_done_event("s1", {"calls": 1})),
+            (encoder.error("bad", "processing_error"), format_error_event("bad", "processing_error")),
+        ]
+
+        for frame, formatted in pairs:
+            assert isinstance(frame, bytes)
+            assert self._parse(frame) == self._parse(formatted.encode())
+
+    def test_static_frames_are_cached(self):
+        """Test that section done frames are built once."""
+        encoder = SSEEncoder()
+
+        assert encoder.section_done("reading") is encoder.section_done("reading")
+
+    def test_stdlib_fallback_without_orjson(self, monkeypatch):
+        """Test that the stdlib encoder produces the same compact UTF-8 JSON."""
+        data = {"token": "문장", "n": [1, 2]}
+        monkeypatch.setattr(streaming, "orjson", None)
+
+        assert dumps_json(data) == '{"token":"문장","n":[1,2]}'.encode()
+
+    def test_is_heartbeat(self):
+        """Test heartbeat detection for str and bytes events."""
+        assert is_heartbeat(": heartbeat\n\n") and is_heartbeat(b": heartbeat\n\n")
+        assert not is_heartbeat(b"event: done\n") and not is_heartbeat("event: done\n")
+
+
 class TestImageValidation:
     """Test suite for image validation and preprocessing functions."""
 
     def test_image_validate_valid_image(self):
         """Test that a valid image passes validation."""
-        # Arrange: Create a small valid base64 image
-        image_data = base64.b64encode(b"fake_image_data").decode()
+        # Arrange: Create a small base64 payload with a JPEG header
+        raw = JPEG_HEADER + b"fake_image_data"
+        image_data = base64.b64encode(raw).decode()
         mime_type = "image/jpeg"
 
-        # Act: Validate the image
-        is_valid, error_message = validate_image(image_data, mime_type)
+        # Act: Validate and decode the image
+        data, detected = decode_image(image_data, mime_type)
 
         # Assert: Should pass validation
-        assert is_valid is True
-        assert error_message == ""
+        assert data == raw
+        assert detected == "image/jpeg"
 
     def test_image_validate_unsupported_mime_type(self):
         """Test that unsupported MIME types fail validation."""
@@ -349,13 +408,9 @@ class TestImageValidation:
         image_data = base64.b64encode(b"fake_image_data").decode()
         mime_type = "image/gif"
 
-        # Act: Validate the image
-        is_valid, error_message = validate_image(image_data, mime_type)
-
-        # Assert: Should fail validation
-        assert is_valid is False
-        assert "Unsupported image format" in error_message
-        assert "image/gif" in error_message
+        # Act & Assert: Should fail validation
+        with pytest.raises(ImageValidationError, match="Unsupported image format.*image/gif"):
+            decode_image(image_data, mime_type)
 
     def test_image_validate_size_limit(self):
         """Test that images exceeding size limit fail validation."""
@@ -364,13 +419,9 @@ class TestImageValidation:
         image_data = base64.b64encode(large_data).decode()
         mime_type = "image/jpeg"
 
-        # Act: Validate the image
-        is_valid, error_message = validate_image(image_data, mime_type)
-
-        # Assert: Should fail validation
-        assert is_valid is False
-        assert "exceeds limit" in error_message
-        assert "10MB" in error_message
+        # Act & Assert: Should fail validation
+        with pytest.raises(ImageValidationError, match="exceeds limit.*10MB"):
+            decode_image(image_data, mime_type)
 
     def test_image_validate_invalid_base64(self):
         """Test that invalid base64 data fails validation."""
@@ -378,24 +429,64 @@ class TestImageValidation:
         invalid_base64 = "this_is_not_valid_base64!!!"
         mime_type = "image/jpeg"
 
-        # Act: Validate the image
-        is_valid, error_message = validate_image(invalid_base64, mime_type)
-
-        # Assert: Should fail validation
-        assert is_valid is False
-        assert "Invalid base64 data" in error_message
+        # Act & Assert: Should fail validation
+        with pytest.raises(ImageValidationError, match="Invalid base64 data"):
+            decode_image(invalid_base64, mime_type)
 
     def test_image_validate_all_allowed_mime_types(self):
         """Test that all allowed MIME types pass validation."""
-        # Arrange: Test all allowed MIME types
-        allowed_types = ["image/jpeg", "image/png", "image/webp"]
-        image_data = base64.b64encode(b"fake_image_data").decode()
+        # Arrange: Test all allowed MIME types with matching file headers
+        headers = {"image/jpeg": JPEG_HEADER, "image/png": PNG_HEADER, "image/webp": WEBP_HEADER}
 
         # Act & Assert: Each type should pass
-        for mime_type in allowed_types:
-            is_valid, error_message = validate_image(image_data, mime_type)
-            assert is_valid is True, f"Failed for {mime_type}: {error_message}"
-            assert error_message == ""
+        for mime_type, header in headers.items():
+            image_data = base64.b64encode(header + b"fake_image_data").decode()
+            _, detected = decode_image(image_data, mime_type)
+            assert detected == mime_type
+
+    def test_image_validate_rejects_non_image_content(self):
+        """Test that data without a known image header fails validation."""
+        image_data = base64.b64encode(b"fake_image_data!").decode()
+
+        with pytest.raises(ImageValidationError, match="not a valid image/jpeg"):
+            decode_image(image_data, "image/jpeg")
+
+    def test_image_validate_rejects_bad_base64_after_header(self):
+        """Test that invalid base64 after a valid header is still caught."""
+        image_data = base64.b64encode(JPEG_HEADER + b"x" * 600_000).decode()
+        image_data = image_data[:500_000] + "!!!!" + image_data[500_004:]
+
+        with pytest.raises(ImageValidationError, match="Invalid base64 data"):
+            decode_image(image_data, "image/jpeg")
+
+    def test_base64_decoded_size_matches_decode(self):
+        """Test that decoded size is computed without decoding."""
+        for length in range(0, 10):
+            encoded = base64.b64encode(b"a" * length).decode()
+            assert base64_decoded_size(encoded) == length
+
+    def test_base64_decoded_size_rejects_bad_length(self):
+        """Test that a length that is not a multiple of 4 is rejected."""
+        with pytest.raises(ImageValidationError, match="multiple of 4"):
+            base64_decoded_size("abcde")
+
+    def test_decode_image_returns_bytes_and_detected_type(self):
+        """Test that decode_image decodes once and reports the sniffed type."""
+        raw = PNG_HEADER + b"payload"
+
+        data, mime_type = decode_image(base64.b64encode(raw).decode(), "image/jpeg")
+
+        assert data == raw
+        assert isinstance(data, bytes)
+        # Declared type came from the file extension; the content is a PNG
+        assert mime_type == "image/png"
+
+    def test_decode_image_raises_on_invalid_input(self):
+        """Test that decode_image raises ImageValidationError."""
+        with pytest.raises(ImageValidationError, match="Unsupported image format"):
+            decode_image(base64.b64encode(JPEG_HEADER).decode(), "image/gif")
+        with pytest.raises(ImageValidationError, match="Invalid base64 data"):
+            decode_image(base64.b64encode(JPEG_HEADER).decode() + "====", "image/jpeg")
 
 
 class TestImagePreprocessing:
@@ -449,3 +540,69 @@ class TestImagePreprocessing:
         assert set(result.keys()) == {"type", "image_url"}
         assert isinstance(result["image_url"], dict)
         assert set(result["image_url"].keys()) == {"url"}
+
+
+class TestImageDownscaling:
+    """Test suite for vision-sized image preprocessing (preprocess_image_bytes)."""
+
+    @staticmethod
+    def _page_photo(size=(3000, 2000), exif_orientation=None) -> bytes:
+        """Build a JPEG 'photo' of a white page with dark text in the middle."""
+        from PIL import Image, ImageDraw
+
+        image = Image.new("RGB", size, (250, 250, 245))
+        draw = ImageDraw.Draw(image)
+        w, h = size
+        draw.rectangle((w // 4, h // 4, 3 * w // 4, 3 * h // 4), fill=(20, 20, 20))
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        if exif_orientation is not None:
+            exif[0x0112] = exif_orientation
+        image.save(buffer, format="JPEG", quality=95, exif=exif)
+        return buffer.getvalue()
+
+    def test_vision_target_size_low_detail(self):
+        """Low detail fits the longest side in 512 px."""
+        assert vision_target_size(4000, 3000, "low") == (512, 384)
+
+    def test_vision_target_size_high_detail(self):
+        """High detail caps the shortest side at 768 px."""
+        assert vision_target_size(4000, 3000, "high") == (1024, 768)
+
+    def test_vision_target_size_never_upscales(self):
+        """Small images keep their size."""
+        assert vision_target_size(300, 200, "high") == (300, 200)
+        assert vision_target_size(300, 200, "low") == (300, 200)
+
+    def test_preprocess_shrinks_to_grayscale_jpeg(self):
+        """Large photos become small grayscale JPEGs at the low-detail size."""
+        from PIL import Image
+
+        original = self._page_photo()
+        prepared = preprocess_image_bytes(original, "low")
+
+        assert prepared.mime_type == "image/jpeg"
+        assert len(prepared.data) < len(original)
+        assert max(prepared.width, prepared.height) <= 512
+        assert Image.open(io.BytesIO(prepared.data)).mode == "L"
+
+    def test_preprocess_crops_blank_margins(self):
+        """Blank margins around the text block are removed before resizing."""
+        prepared = preprocess_image_bytes(self._page_photo(size=(1000, 1000)), "high")
+
+        # Content is the central 500x500 box plus 2% padding on each side
+        assert prepared.width < 600
+        assert prepared.height < 600
+
+    def test_preprocess_applies_exif_orientation(self):
+        """A landscape sensor image tagged 'rotate 90' comes out portrait."""
+        prepared = preprocess_image_bytes(
+            self._page_photo(size=(3000, 1000), exif_orientation=6), "low"
+        )
+
+        assert prepared.height > prepared.width
+
+    def test_preprocess_rejects_undecodable_bytes(self):
+        """Garbage input raises ImageValidationError."""
+        with pytest.raises(ImageValidationError):
+            preprocess_image_bytes(b"not an image", "low")
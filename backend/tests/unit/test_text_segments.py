@@ -0,0 +1,130 @@
+"""Unit tests for streaming text segmentation helpers."""
+
+from __future__ import annotations
+
+from tutor.utils.text_segments import (
+    ParagraphAccumulator,
+    SentenceHeadingRenumberer,
+    split_sentence_sections,
+    split_sentences,
+)
+
+
+def _feed_all(renumberer: SentenceHeadingRenumberer, tokens: list[str]) -> str:
+    return "".join(renumberer.feed(t) for t in tokens) + renumberer.flush()
+
+
+class TestParagraphAccumulator:
+    """Test cases for ParagraphAccumulator."""
+
+    def test_emits_paragraph_when_blank_line_arrives(self):
+        acc = ParagraphAccumulator()
+
+        assert acc.feed("First para") == []
+        assert acc.feed("graph.\n") == []
+        assert acc.feed("\nSecond") == ["First paragraph."]
+        assert acc.flush() == "Second"
+
+    def test_emits_multiple_paragraphs_from_one_token(self):
+        acc = ParagraphAccumulator()
+
+        assert acc.feed("One.\n\nTwo.\n  \nThree") == ["One.", "Two."]
+        assert acc.flush() == "Three"
+
+    def test_keeps_single_line_breaks_inside_paragraph(self):
+        acc = ParagraphAccumulator()
+
+        assert acc.feed("Line one\nline two\n\n") == ["Line one\nline two"]
+
+    def test_short_paragraphs_merge_with_next(self):
+        acc = ParagraphAccumulator(min_chars=20)
+
+        assert acc.feed("Title\n\n") == []
+        assert acc.feed("A long enough paragraph.\n\n") == ["Title\n\nA long enough paragraph."]
+
+    def test_flush_empty_returns_empty_string(self):
+        acc = ParagraphAccumulator()
+
+        assert acc.flush() == ""
+
+
+class TestSentenceHeadingRenumberer:
+    """Test cases for SentenceHeadingRenumberer."""
+
+    def test_first_segment_is_unchanged(self):
+        renumberer = SentenceHeadingRenumberer()
+        renumberer.start_segment()
+
+        text = "### 문장 1\n\n내용\n### 문장 2\n\n더 많은 내용"
+        assert _feed_all(renumberer, [text]) == text
+
+    def test_second_segment_continues_numbering(self):
+        renumberer = SentenceHeadingRenumberer()
+        renumberer.start_segment()
+        _feed_all(renumberer, ["### 문장 1\n\na\n### 문장 2\n\nb\n"])
+
+        renumberer.start_segment()
+        out = _feed_all(renumberer, ["### 문장 1\n\nc\n### 문장 2\n\nd\n"])
+
+        assert out == "### 문장 3\n\nc\n### 문장 4\n\nd\n"
+
+    def test_heading_split_across_tokens(self):
+        renumberer = SentenceHeadingRenumberer()
+        renumberer.start_segment()
+        _feed_all(renumberer, ["### 문장 1\n"])
+        renumberer.start_segment()
+
+        tokens = ["#", "## 문", "장 ", "1", "\n", "본문"]
+        outputs = [renumberer.feed(t) for t in tokens]
+
+        # Heading is held back until its newline, then released renumbered
+        assert outputs[:4] == ["", "", "", ""]
+        assert outputs[4] == "### 문장 2\n"
+        assert outputs[5] == "본문"
+
+    def test_non_heading_text_streams_immediately(self):
+        renumberer = SentenceHeadingRenumberer()
+        renumberer.start_segment()
+
+        assert renumberer.feed("Hello") == "Hello"
+        assert renumberer.feed(" ### 문장 1") == " ### 문장 1"
+
+    def test_other_headings_pass_through(self):
+        renumberer = SentenceHeadingRenumberer()
+        renumberer.start_segment()
+        _feed_all(renumberer, ["### 문장 1\n"])
+        renumberer.start_segment()
+
+        assert _feed_all(renumberer, ["#### 단위별 해석\n"]) == "#### 단위별 해석\n"
+
+
+class TestSplitSentences:
+    """Test cases for split_sentences."""
+
+    def test_splits_on_terminal_punctuation(self):
+        text = 'The fox ran.  "Is it fast?" she asked!\nYes. 3 dogs followed'
+
+        assert split_sentences(text) == [
+            "The fox ran.", '"Is it fast?" she asked!', "Yes.", "3 dogs followed",
+        ]
+
+    def test_empty_text(self):
+        assert split_sentences("  \n ") == []
+
+
+class TestSplitSentenceSections:
+    """Test cases for split_sentence_sections."""
+
+    def test_sections_are_renumbered_from_one(self):
+        markdown = (
+            "머리말\n\n---\n\n### 문장 1\n\n> A / b\n\n"
+            "---\n\n### 문장 2\n\n> C / d\n\n#### 읽기 지시\n\n멈추지 마라\n\n---\n"
+        )
+
+        assert split_sentence_sections(markdown) == [
+            "---\n\n### 문장 1\n\n> A / b",
+            "---\n\n### 문장 1\n\n> C / d\n\n#### 읽기 지시\n\n멈추지 마라",
+        ]
+
+    def test_text_without_headings_has_no_sections(self):
+        assert split_sentence_sections("그냥 텍스트") == []
@@ -0,0 +1,123 @@
+"""Unit tests for adaptive max_tokens budgeting."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from tutor.schemas import SentenceEntry, SupervisorAnalysis
+from tutor.services.metrics import metrics
+from tutor.services.token_budget import (
+    AGENT_MAX_TOKENS,
+    TokenBudget,
+    TokenBudgeter,
+    count_sentences,
+    finish_reason_of,
+    get_token_budgeter,
+    plan_max_tokens,
+    record_budget_outcome,
+    truncation_error,
+)
+
+
+class TestCountSentences:
+    """Test cases for count_sentences."""
+
+    def test_prefers_supervisor_segmentation(self):
+        analysis = SupervisorAnalysis(
+            sentences=[SentenceEntry(text=t, difficulty=3, focus=[]) for t in "abcd"]
+        )
+
+        assert count_sentences({"input_text": "One. Two.", "supervisor_analysis": analysis}) == 4
+
+    def test_falls_back_to_punctuation(self):
+        text = 'He said "Stop!" Then he left. Did she follow? Yes'
+
+        assert count_sentences({"input_text": text}) == 3
+
+    def test_is_at_least_one(self):
+        assert count_sentences({"input_text": ""}) == 1
+
+
+class TestTokenBudgeter:
+    """Test cases for TokenBudgeter."""
+
+    def test_budget_grows_with_passage_and_is_clamped(self):
+        budgeter = TokenBudgeter(min_tokens=1024)
+
+        short = budgeter.budget("reading", 3, sentences=1, passage_tokens=15)
+        medium = budgeter.budget("reading", 3, sentences=8, passage_tokens=160)
+        long = budgeter.budget("reading", 3, sentences=60, passage_tokens=1200)
+
+        assert short == 1024
+        assert short < medium < long
+        assert long == AGENT_MAX_TOKENS["reading"]
+
+    def test_learns_output_ratio_per_agent_and_level(self):
+        budgeter = TokenBudgeter(min_tokens=0)
+        before = budgeter.budget("grammar", 2, sentences=5, passage_tokens=100)
+        plan = TokenBudget("grammar", 2, 5, 100, before)
+
+        for _ in range(50):
+            budgeter.observe(plan, output_tokens=356, truncated=False)
+
+        after = budgeter.budget("grammar", 2, sentences=5, passage_tokens=100)
+        assert after < before
+        # Length estimates are per level; other levels keep the prior
+        assert budgeter.budget("grammar", 4, sentences=5, passage_tokens=100) > after
+
+    def test_truncation_widens_headroom(self):
+        budgeter = TokenBudgeter(min_tokens=0)
+        before = budgeter.budget("vocabulary", 3, sentences=5, passage_tokens=100)
+        plan = TokenBudget("vocabulary", 3, 5, 100, before)
+
+        budgeter.observe(plan, output_tokens=before, truncated=True)
+
+        assert budgeter.budget("vocabulary", 3, sentences=5, passage_tokens=100) > before
+        assert metrics.get("llm_budget_calls_total", agent="vocabulary", truncated="true") >= 1
+        assert metrics.get("llm_budget_truncation_rate", agent="vocabulary") > 0
+
+
+class TestPlanMaxTokens:
+    """Test cases for plan_max_tokens and record_budget_outcome."""
+
+    def test_plans_from_state(self):
+        plan = plan_max_tokens(
+            "reading", {"input_text": "A short passage. Two sentences.", "level": 1}, "gpt-4o-mini"
+        )
+
+        assert plan.agent == "reading"
+        assert plan.level == 1
+        assert plan.sentences == 2
+        assert plan.passage_tokens > 0
+        assert plan.max_tokens < AGENT_MAX_TOKENS["reading"]
+
+    def test_disabled_uses_fixed_ceiling(self, monkeypatch):
+        from tutor.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "TOKEN_BUDGET_ENABLED", False)
+
+        plan = plan_max_tokens("vocabulary", {"input_text": "Hi."}, "gpt-4o-mini")
+
+        assert plan.max_tokens == AGENT_MAX_TOKENS["vocabulary"]
+
+    def test_length_finish_reason_counts_as_truncated(self):
+        plan = TokenBudget("reading", 3, 1, 10, 1024)
+
+        assert record_budget_outcome(plan, 1024, "max_tokens") is True
+
+        assert get_token_budgeter().budget("reading", 3, 1, 10) > 1024
+
+    def test_complete_output_is_not_truncated(self):
+        plan = TokenBudget("grammar", 3, 1, 10, 1024)
+
+        assert record_budget_outcome(plan, 300, "stop") is False
+        assert truncation_error(plan) == "The grammar section was cut off at 1024 tokens"
+
+
+class TestFinishReasonOf:
+    """Test cases for finish_reason_of."""
+
+    def test_reads_response_metadata(self):
+        assert finish_reason_of(MagicMock(response_metadata={"finish_reason": "length"})) == "length"
+        assert finish_reason_of(MagicMock(response_metadata={})) is None
+        assert finish_reason_of(MagicMock()) is None
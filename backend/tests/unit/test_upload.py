@@ -0,0 +1,109 @@
+"""Unit tests for streaming image upload parsing."""
+
+from __future__ import annotations
+
+import pytest
+
+from tutor.services.upload import (
+    SPOOL_MAX_MEMORY,
+    UploadFormatError,
+    UploadTooLargeError,
+    read_image_upload,
+)
+
+BOUNDARY = "testboundary"
+
+
+async def _chunks(data: bytes, size: int = 1000):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _multipart(file_bytes: bytes | None, **fields: str) -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    if file_bytes is not None:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="a.png"\r\n'
+            "Content-Type: image/png\r\n\r\n".encode()
+            + file_bytes
+            + b"\r\n"
+        )
+    parts.append(f"--{BOUNDARY}--\r\n".encode())
+    return b"".join(parts)
+
+
+class TestReadImageUpload:
+    """Test cases for read_image_upload."""
+
+    @pytest.mark.asyncio
+    async def test_reads_raw_body(self):
+        upload = await read_image_upload("image/png", None, _chunks(b"abc" * 1000), 10_000)
+
+        assert upload.data == b"abc" * 1000
+        assert upload.fields == {}
+
+    @pytest.mark.asyncio
+    async def test_reads_multipart_file_and_fields(self):
+        file_bytes = bytes(range(256)) * 50  # contains CR/LF and boundary-like bytes
+        body = _multipart(file_bytes, level="3")
+
+        upload = await read_image_upload(
+            f"multipart/form-data; boundary={BOUNDARY}", str(len(body)), _chunks(body, 97), 100_000
+        )
+
+        assert upload.data == file_bytes
+        assert upload.fields == {"level": "3"}
+
+    @pytest.mark.asyncio
+    async def test_spools_large_uploads(self):
+        data = b"x" * (SPOOL_MAX_MEMORY + 10)
+
+        upload = await read_image_upload(
+            "application/octet-stream", None, _chunks(data, 65536), len(data)
+        )
+
+        assert upload.data == data
+
+    @pytest.mark.asyncio
+    async def test_rejects_declared_oversize_without_reading(self):
+        async def never_read():
+            raise AssertionError("body should not be read")
+            yield b""  # pragma: no cover
+
+        with pytest.raises(UploadTooLargeError):
+            await read_image_upload("image/png", "20000", never_read(), 10_000)
+
+    @pytest.mark.asyncio
+    async def test_enforces_cap_while_reading(self):
+        # No Content-Length (chunked transfer): cap applies as bytes arrive
+        with pytest.raises(UploadTooLargeError):
+            await read_image_upload("image/png", None, _chunks(b"x" * 20_000), 10_000)
+
+        body = _multipart(b"x" * 20_000)
+        with pytest.raises(UploadTooLargeError):
+            await read_image_upload(
+                f"multipart/form-data; boundary={BOUNDARY}", None, _chunks(body), 10_000
+            )
+
+    @pytest.mark.asyncio
+    async def test_rejects_missing_file_part(self):
+        body = _multipart(None, level="3")
+
+        with pytest.raises(UploadFormatError, match="Missing 'file' part"):
+            await read_image_upload(
+                f"multipart/form-data; boundary={BOUNDARY}", None, _chunks(body), 10_000
+            )
+
+    @pytest.mark.asyncio
+    async def test_rejects_unsupported_content_type(self):
+        with pytest.raises(UploadFormatError, match="Content-Type"):
+            await read_image_upload("application/json", None, _chunks(b"{}"), 10_000)
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_body(self):
+        with pytest.raises(UploadFormatError, match="empty"):
+            await read_image_upload("image/png", None, _chunks(b""), 10_000)
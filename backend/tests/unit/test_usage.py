@@ -0,0 +1,198 @@
+"""Unit tests for LLM usage accounting."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tutor.services.metrics import metrics
+from tutor.services.usage import (
+    UsageLedger,
+    UsageTracker,
+    count_tokens,
+    estimate_cost,
+    get_usage_tracker,
+    load_encodings,
+    record_llm_usage,
+    track_request_usage,
+)
+
+
+class TestRecordLlmUsage:
+    """Test cases for record_llm_usage."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_records_tokens_and_cache_ratio(self):
+        record_llm_usage("grammar", {
+            "input_tokens": 1000,
+            "output_tokens": 200,
+            "total_tokens": 1200,
+            "input_token_details": {"cache_read": 768},
+        })
+
+        assert metrics.get("llm_calls_total", agent="grammar") == 1
+        assert metrics.get("llm_input_tokens_total", agent="grammar") == 1000
+        assert metrics.get("llm_cached_input_tokens_total", agent="grammar") == 768
+        assert metrics.get("llm_output_tokens_total", agent="grammar") == 200
+        ratio = metrics.snapshot()["summaries"]["llm_prompt_cache_hit_ratio{agent=grammar}"]
+        assert ratio["mean"] == 0.768
+
+    def test_missing_cache_details_count_as_zero(self):
+        record_llm_usage("reading", {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+
+        assert metrics.get("llm_cached_input_tokens_total", agent="reading") == 0
+
+    def test_missing_usage_is_estimated_from_text(self):
+        with patch("tutor.services.usage._encoding_for", return_value=None):
+            record = record_llm_usage(
+                "vocabulary", None, model="gpt-4o-mini", prompt="a" * 400, completion="어휘" * 3
+            )
+
+        assert record.estimated
+        assert record.input_tokens == 100
+        assert record.output_tokens == 4
+        assert metrics.get("llm_usage_estimated_total", agent="vocabulary") == 1
+        assert metrics.get("llm_calls_total", agent="vocabulary") == 1
+        assert metrics.get("llm_output_tokens_total", agent="vocabulary") == 4
+
+    def test_estimate_includes_message_text_and_extra_tokens(self):
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        messages = [SystemMessage(content="a" * 40), HumanMessage(content="b" * 39)]
+        with patch("tutor.services.usage._encoding_for", return_value=None):
+            record = record_llm_usage("ocr", None, prompt=messages, extra_input_tokens=85)
+
+        assert record.input_tokens == 20 + 85
+
+    def test_records_cost_and_latency(self):
+        record_llm_usage(
+            "grammar",
+            {"input_tokens": 1_000_000, "output_tokens": 0},
+            model="gpt-4o-mini",
+            latency=1.5,
+        )
+
+        assert metrics.get("llm_cost_usd_total", agent="grammar") == pytest.approx(0.15)
+        assert metrics.snapshot()["summaries"]["llm_call_seconds{agent=grammar}"]["sum"] == 1.5
+
+
+class TestCountTokens:
+    """Test cases for count_tokens."""
+
+    def test_empty_text_is_zero(self):
+        assert count_tokens("") == 0
+
+    def test_fallback_weights_non_ascii_heavier(self):
+        with patch("tutor.services.usage._encoding_for", return_value=None):
+            assert count_tokens("abcd" * 10) == 10
+            assert count_tokens("가나다") == 2
+
+    def test_uses_encoding_only_once_loaded(self, monkeypatch):
+        monkeypatch.setattr("tutor.services.usage._encodings", {})
+        encoding = MagicMock()
+        encoding.encode.return_value = [1, 2, 3]
+
+        with patch("tutor.services.usage._load_encoding", return_value=encoding) as load:
+            assert count_tokens("abcd" * 10, "gpt-4o-mini") == 10  # not loaded yet
+            load.assert_not_called()
+
+            load_encodings(["gpt-4o-mini", "gpt-4o-mini"])
+
+            assert count_tokens("abcd" * 10, "gpt-4o-mini") == 3
+        load.assert_called_once_with("gpt-4o-mini")
+
+    def test_failed_load_falls_back_to_estimate(self, monkeypatch):
+        monkeypatch.setattr("tutor.services.usage._encodings", {})
+
+        with patch("tiktoken.encoding_for_model", side_effect=OSError("offline")):
+            load_encodings(["gpt-4o-mini"])
+
+        assert count_tokens("abcd" * 10, "gpt-4o-mini") == 10
+
+
+class TestEstimateCost:
+    """Test cases for estimate_cost."""
+
+    def test_cached_tokens_use_discounted_price(self):
+        cost = estimate_cost("gpt-4o-mini", 1_000_000, 500_000, 1_000_000)
+
+        assert cost == pytest.approx(0.5 * 0.15 + 0.5 * 0.075 + 0.60)
+
+    def test_longest_prefix_wins(self):
+        assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0, 0) == pytest.approx(0.15)
+        assert estimate_cost("gpt-4o-2024-08-06", 1_000_000, 0, 0) == pytest.approx(2.50)
+
+    def test_unknown_model_is_free(self):
+        assert estimate_cost("glm-4-flash", 1000, 0, 1000) == 0.0
+
+
+class TestRequestLedger:
+    """Test cases for per-request usage ledgers."""
+
+    async def test_tasks_record_into_the_request_ledger(self):
+        async def agent(name):
+            record_llm_usage(name, {"input_tokens": 10, "output_tokens": 5})
+
+        with track_request_usage("s1", level=3) as ledger:
+            await asyncio.gather(
+                asyncio.create_task(agent("reading")), asyncio.create_task(agent("grammar"))
+            )
+
+        summary = ledger.summary()
+        assert summary["total"]["calls"] == 2
+        assert summary["total"]["input_tokens"] == 20
+        assert set(summary["by_agent"]) == {"reading", "grammar"}
+        assert get_usage_tracker().session_totals("s1")["by_level"]["3"]["calls"] == 2
+
+    def test_calls_outside_a_request_are_not_ledgered(self):
+        record_llm_usage("reading", {"input_tokens": 10, "output_tokens": 5})
+
+        assert get_usage_tracker().window_totals(3600)["total"]["calls"] == 0
+
+
+class TestUsageTracker:
+    """Test cases for UsageTracker aggregation."""
+
+    @staticmethod
+    def _ledger(session_id, agent="reading", level=3, tokens=100):
+        ledger = UsageLedger(session_id=session_id, level=level)
+        with patch("tutor.services.usage._current_ledger") as current:
+            current.get.return_value = ledger
+            record_llm_usage(agent, {"input_tokens": tokens, "output_tokens": tokens})
+        return ledger
+
+    def test_session_totals_accumulate_across_requests(self):
+        tracker = UsageTracker()
+        tracker.add(self._ledger("s1"))
+        tracker.add(self._ledger("s1", agent="grammar"))
+
+        totals = tracker.session_totals("s1")
+
+        assert totals["total"]["calls"] == 2
+        assert set(totals["by_agent"]) == {"reading", "grammar"}
+        assert tracker.session_totals("unknown") is None
+
+    def test_sessions_are_evicted_lru(self):
+        tracker = UsageTracker(max_sessions=2)
+        for session_id in ("a", "b", "c"):
+            tracker.add(self._ledger(session_id))
+
+        assert tracker.session_totals("a") is None
+        assert tracker.session_totals("c") is not None
+
+    def test_window_totals_only_count_recent_buckets(self):
+        tracker = UsageTracker(window_seconds=3600)
+        now = 1_000_020.0
+        tracker.add(self._ledger("old", tokens=1), now=now - 600)
+        tracker.add(self._ledger("new", level=1, tokens=7), now=now)
+
+        recent = tracker.window_totals(60, now=now)
+        hour = tracker.window_totals(3600, now=now)
+
+        assert recent["total"]["input_tokens"] == 7
+        assert recent["by_level"] == {"1": recent["total"]}
+        assert hour["total"]["input_tokens"] == 8
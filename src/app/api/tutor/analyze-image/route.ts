@@ -27,9 +27,15 @@ export async function POST(request: NextRequest) {
     const base64 = Buffer.from(arrayBuffer).toString("base64");
     const mimeType = file.type || "image/jpeg";
 
+    // Pass the client address on so the backend can rate-limit per user, not per proxy
+    const forwardedFor = request.headers.get("x-forwarded-for");
+
     const response = await fetch(`${BACKEND_URL}/api/v1/tutor/analyze-image`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: {
+        "Content-Type": "application/json",
+        ...(forwardedFor ? { "X-Forwarded-For": forwardedFor } : {}),
+      },
       body: JSON.stringify({
         image_data: base64,
         mime_type: mimeType,
@@ -23,10 +23,14 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    // Pass the client address on so the backend can rate-limit per user, not per proxy
+    const forwardedFor = request.headers.get("x-forwarded-for");
+
     const response = await fetch(`${BACKEND_URL}/api/v1/tutor/chat`, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
+        ...(forwardedFor ? { "X-Forwarded-For": forwardedFor } : {}),
       },
       body: JSON.stringify({ sessionId, message, level }),
     });